@@ -0,0 +1,91 @@
+"""
+Admin API routes, protected by the ADMIN_TOKEN environment variable.
+"""
+
+import hmac
+import logging
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.services.profiler import get_max_profile_seconds, load_profile, profile_process
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def check_admin_token(token: Optional[str]) -> None:
+    """
+    Verify an admin token against ADMIN_TOKEN.
+
+    Admin features are disabled when ADMIN_TOKEN is not set.
+
+    Args:
+        token: Token sent by the client
+
+    Raises:
+        HTTPException: If admin features are disabled or the token is wrong
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency rejecting requests without a valid X-Admin-Token header."""
+    check_admin_token(x_admin_token)
+
+
+@router.get("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10, gt=0, description="How long to sample"),
+    interval_ms: float = Query(5, gt=0, description="Pause between samples in milliseconds"),
+) -> PlainTextResponse:
+    """
+    Sample the stacks of every thread of this worker for a while.
+
+    Args:
+        seconds: How long to sample, at most PROFILE_MAX_SECONDS
+        interval_ms: Pause between samples
+
+    Returns:
+        Folded stacks, for flamegraph.pl, speedscope or inferno
+
+    Raises:
+        HTTPException: If the duration is too long or a profile is already running
+    """
+    max_seconds = get_max_profile_seconds()
+    if seconds > max_seconds:
+        raise HTTPException(status_code=400, detail=f"Profiles are limited to {max_seconds:g} seconds")
+
+    try:
+        profiler = await profile_process(seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    logger.info(f"Served process profile ({profiler.samples} samples over {profiler.duration_seconds:.2f}s)")
+    return PlainTextResponse(profiler.folded())
+
+
+@router.get("/admin/profiles/{analysis_id}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def get_analysis_profile(analysis_id: str) -> PlainTextResponse:
+    """
+    Get the profile of an analysis run with the X-Profile header.
+
+    Args:
+        analysis_id: Analysis ID returned by /api/analyze
+
+    Returns:
+        Folded stacks of the analysis
+
+    Raises:
+        HTTPException: If there is no profile for the analysis
+    """
+    folded = load_profile(analysis_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail=f"No profile found for analysis: {analysis_id}")
+    return PlainTextResponse(folded)
@@ -2,27 +2,44 @@
 Analysis API routes.
 """
 
+import os
+import sys
+import time
 import uuid
 import logging
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
 
+from app.api.routes.admin import check_admin_token
+from app.api.routes.results import RESULT_SECTIONS
 from app.models.analysis import AnalysisRequest, AnalysisResponse
 from app.services.company_service import CompanyService
 from app.services.resume_analysis_service import ResumeAnalysisService
 from app.services.role_matching_service import RoleMatchingService
 from app.services.gap_analysis_service import GapAnalysisService
 from app.services.timeline_service import TimelineService
+from app.services.role_requirements_service import RoleRequirementsService
+from app.services.resume_preview import ResumePreviewService
+from app.services.session_store import SessionStore
+from app.services.llm_service import DEFAULT_MODEL
+from app.services.metrics import ANALYSES_IN_PROGRESS, QUEUE_WAIT_SECONDS, metric_context, track_phase
+from app.services.profiler import exclusive_profile, get_max_profile_seconds, profile_running, save_profile
+from app.services.tracing import span
+from app.prompts.role_requirements import format_role_requirements
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 company_service = CompanyService()
+session_store = SessionStore()
 
 # Lazy initialization to avoid requiring API key at import time
 _resume_analysis_service = None
 _role_matching_service = None
 _gap_analysis_service = None
 _timeline_service = None
+_role_requirements_service = None
+_resume_preview_service = None
 
 
 def get_resume_analysis_service():
@@ -57,8 +74,271 @@ def get_timeline_service():
     return _timeline_service
 
 
+def get_role_requirements_service():
+    """Get or create role requirements service instance."""
+    global _role_requirements_service
+    if _role_requirements_service is None:
+        _role_requirements_service = RoleRequirementsService()
+    return _role_requirements_service
+
+
+def get_resume_preview_service():
+    """Get or create resume preview service instance."""
+    global _resume_preview_service
+    if _resume_preview_service is None:
+        _resume_preview_service = ResumePreviewService()
+    return _resume_preview_service
+
+
+def get_analysis_services() -> list:
+    """Create every service an analysis uses, such as during warm-up."""
+    return [
+        get_resume_analysis_service(),
+        get_role_requirements_service(),
+        get_role_matching_service(),
+        get_gap_analysis_service(),
+        get_timeline_service(),
+        get_resume_preview_service(),
+    ]
+
+
+async def _get_role_context(role_description: str) -> str:
+    """
+    Get the role text passed to the matching, gap and timeline phases.
+
+    Uses the cached structured requirements when they are shorter than the
+    raw description, and falls back to the raw description otherwise.
+
+    Args:
+        role_description: Job role description from the request
+
+    Returns:
+        Role text for downstream prompts
+    """
+    try:
+        requirements = await get_role_requirements_service().get_requirements(role_description)
+    except Exception as e:
+        logger.warning(f"Role requirements unavailable, using raw description: {e}")
+        return role_description
+
+    if not requirements:
+        return role_description
+
+    compact = format_role_requirements(requirements)
+    if not compact or len(compact) >= len(role_description):
+        return role_description
+
+    logger.info(f"Using extracted role requirements ({len(role_description)} -> {len(compact)} chars)")
+    return compact
+
+
+async def _run_analysis(
+    request: AnalysisRequest,
+    resume_file_path: str,
+    analysis_id: str | None = None,
+    profile: bool = False,
+) -> None:
+    """
+    Run the four LLM analysis phases, saving each phase's results to the session.
+
+    Each phase is timed, labels the LLM metrics recorded inside it, and is
+    traced as a span of the analysis trace. Token usage is recorded in the
+    token ledger under the analysis and session.
+
+    Args:
+        request: Analysis request
+        resume_file_path: Path to the uploaded resume file
+        analysis_id: Analysis ID, used as the trace ID
+        profile: Sample this analysis's stacks and save them as its profile;
+            skipped if another profile is running
+
+    Raises:
+        Exception: If any phase fails
+    """
+    with (
+        metric_context(analysis_id=analysis_id, session_id=request.session_id),
+        span("analysis", trace_id=analysis_id, session_id=request.session_id, company=request.company),
+    ):
+        if profile and profile_running():
+            logger.warning(f"A profile is already running; analysis {analysis_id} runs unprofiled")
+            profile = False
+        if not profile:
+            await _run_phases(request, resume_file_path)
+            return
+
+        # Only stacks running inside this analysis are sampled, for at most
+        # PROFILE_MAX_SECONDS, and never alongside another profile. The
+        # profile is saved, and another may start, as soon as sampling stops.
+        profile_id = analysis_id or request.session_id
+        async with exclusive_profile(
+            root_frame=sys._getframe(),
+            max_seconds=get_max_profile_seconds(),
+            on_stop=lambda profiler: save_profile(profile_id, profiler),
+        ):
+            await _run_phases(request, resume_file_path)
+
+
+async def _run_phases(request: AnalysisRequest, resume_file_path: str) -> None:
+    """Run the four analysis phases in order; see _run_analysis."""
+    model = os.getenv("ANTHROPIC_MODEL", DEFAULT_MODEL)
+    
+    # Phase 1: Perform resume analysis using LLM
+    logger.info(f"Phase 1: Starting resume analysis for session: {request.session_id}")
+    resume_analysis_service = get_resume_analysis_service()
+    with track_phase("resume_analysis", request.company, model), span("phase.resume_analysis"):
+        analysis_result = await resume_analysis_service.analyze_resume(
+            resume_file_path=resume_file_path,
+            session_id=request.session_id,
+        )
+    
+    logger.info(f"Resume analysis completed successfully")
+    logger.info(f"Extracted {len(analysis_result.get('skills', {}).get('programming_languages', []))} programming languages")
+    logger.info(f"Found {len(analysis_result.get('experience', []))} work experiences")
+    logger.info(f"Found {len(analysis_result.get('projects', []))} projects")
+    
+    # Extract role requirements once per posting, shared by phases 2-4
+    with track_phase("role_requirements", request.company, model), span("phase.role_requirements"):
+        role_context = await _get_role_context(request.role_description)
+    
+    # Phase 2: Perform role matching analysis
+    logger.info(f"Phase 2: Starting role matching analysis for session: {request.session_id}")
+    role_matching_service = get_role_matching_service()
+    with track_phase("role_matching", request.company, model), span("phase.role_matching"):
+        match_result = await role_matching_service.analyze_match(
+            session_id=request.session_id,
+            company_id=request.company,
+            role_description=role_context,
+            job_posting=request.role_description,
+        )
+    
+    logger.info(f"Role matching analysis completed successfully")
+    logger.info(f"Scores - ATS: {match_result.get('ats_score', {}).get('score', 0)}, "
+               f"Role Match: {match_result.get('role_match_score', {}).get('score', 0)}, "
+               f"Company Fit: {match_result.get('company_fit_score', {}).get('score', 0)}, "
+               f"Overall: {match_result.get('overall_score', {}).get('score', 0)}")
+    
+    # Phase 3: Perform gap analysis
+    logger.info(f"Phase 3: Starting gap analysis for session: {request.session_id}")
+    gap_analysis_service = get_gap_analysis_service()
+    with track_phase("gap_analysis", request.company, model), span("phase.gap_analysis"):
+        gap_result = await gap_analysis_service.analyze_gaps(
+            session_id=request.session_id,
+            company_id=request.company,
+            role_description=role_context,
+        )
+    
+    logger.info(f"Gap analysis completed successfully")
+    logger.info(f"Gaps identified - Total: {gap_result.get('summary', {}).get('total_gaps', 0)}, "
+               f"High: {gap_result.get('summary', {}).get('high_priority_count', 0)}, "
+               f"Medium: {gap_result.get('summary', {}).get('medium_priority_count', 0)}, "
+               f"Low: {gap_result.get('summary', {}).get('low_priority_count', 0)}")
+    
+    # Phase 4: Generate development timeline
+    logger.info(f"Phase 4: Starting timeline generation for session: {request.session_id}")
+    timeline_service = get_timeline_service()
+    with track_phase("timeline", request.company, model), span("phase.timeline"):
+        timeline_result = await timeline_service.generate_timeline(
+            session_id=request.session_id,
+            role_description=role_context,
+            target_deadline=request.target_deadline,
+        )
+    
+    logger.info(f"Timeline generation completed successfully")
+    logger.info(f"Timeline - Phases: {len(timeline_result.get('phases', []))}, "
+               f"Weeks: {timeline_result.get('metadata', {}).get('total_weeks', 0)}, "
+               f"Total hours: {timeline_result.get('metadata', {}).get('total_hours', 0)}")
+
+
+async def _run_analysis_in_background(
+    request: AnalysisRequest,
+    resume_file_path: str,
+    analysis_id: str,
+    queued_at: float | None = None,
+    profile: bool = False,
+) -> None:
+    """
+    Run the full analysis after a preview response has been sent.
+
+    Failures are recorded on the saved preview, since there is no response
+    left to report them in. The analysis was counted in progress when it was
+    queued, and stops counting when it ends.
+
+    Args:
+        request: Analysis request
+        resume_file_path: Path to the uploaded resume file
+        analysis_id: Analysis ID, used as the trace ID
+        queued_at: time.perf_counter() value when the analysis was queued
+        profile: Save a profile of the analysis
+    """
+    if queued_at is not None:
+        QUEUE_WAIT_SECONDS.observe(time.perf_counter() - queued_at, company=request.company)
+
+    try:
+        await _run_analysis(request, resume_file_path, analysis_id, profile)
+    except Exception as e:
+        logger.error(f"Background analysis failed for session {request.session_id}: {e}")
+        preview_service = get_resume_preview_service()
+        preview = preview_service.session_store.load(request.session_id, "preview")
+        if preview is not None:
+            preview["full_analysis_status"] = "failed"
+            preview["full_analysis_error"] = str(e)
+            preview_service.save_preview(request.session_id, preview)
+    finally:
+        ANALYSES_IN_PROGRESS.dec(mode="preview")
+
+
+def _clear_previous_results(session_id: str) -> None:
+    """
+    Remove results and any preview left by an earlier analysis of the session.
+
+    Otherwise /api/results would report the old results as completed, or
+    show an old preview, while the new analysis is still running. The
+    extracted resume text is kept, since the uploaded resume is unchanged.
+
+    Args:
+        session_id: Session ID
+    """
+    removed = [name for name in [*RESULT_SECTIONS, "preview"] if session_store.delete(session_id, name)]
+    if removed:
+        logger.info(f"Cleared previous results for session {session_id}: {', '.join(removed)}")
+
+
+async def _create_preview(request: AnalysisRequest, resume_dir: Path) -> dict:
+    """
+    Build and save the provisional local preview for a session.
+
+    Args:
+        request: Analysis request
+        resume_dir: Directory holding uploaded resumes
+
+    Returns:
+        Preview dictionary
+
+    Raises:
+        HTTPException: If the resume text cannot be extracted
+    """
+    preview_service = get_resume_preview_service()
+    try:
+        resume_text = await preview_service.get_resume_text(request.session_id, resume_dir)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Failed to extract text from resume: {str(e)}"
+        )
+
+    preview = preview_service.build_preview(resume_text, request.role_description)
+    preview["full_analysis_status"] = "processing"
+    preview_service.save_preview(request.session_id, preview)
+    return preview
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
+async def analyze_resume(
+    request: AnalysisRequest,
+    background_tasks: BackgroundTasks,
+    x_profile: bool = Header(False),
+    x_admin_token: Optional[str] = Header(None),
+) -> AnalysisResponse:
     """
     Start complete resume analysis process using LLM.
     
@@ -71,6 +351,9 @@ async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
     4. Extracts structured data (skills, experience, education, projects)
     5. Saves results to data/sessions/{session_id}/resume_analysis.json
     
+    Between phases 1 and 2 the role description is reduced to structured
+    requirements, extracted once per posting and cached across candidates.
+    
     Phase 2 - Role Matching:
     6. Loads resume analysis results
     7. Loads company tenets
@@ -92,17 +375,41 @@ async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
     19. Creates phases, tasks, milestones, and weekly breakdown
     20. Saves results to data/sessions/{session_id}/timeline.json
     
+    Results and previews from an earlier analysis of the session are removed
+    first, so /api/results never reports them as the new analysis's.
+    
+    In preview mode the response is returned without waiting for the LLM: it
+    carries a provisional preview (regex-extracted sections and contact info,
+    taxonomy skills and the local ATS score), saved to
+    data/sessions/{session_id}/preview.json, while the four phases run in the
+    background and replace it when finished.
+    
+    With an X-Profile: true header and a valid X-Admin-Token, the analysis is
+    profiled and its folded stacks served at /api/admin/profiles/{analysis_id}.
+    Like /api/admin/profile, only one profile runs at a time (409 otherwise)
+    and sampling stops after PROFILE_MAX_SECONDS.
+    
     Args:
-        request: Analysis request with session_id, company, role_description, target_deadline
+        request: Analysis request with session_id, company, role_description,
+            target_deadline and mode
+        background_tasks: Runs the full analysis after a preview response
+        x_profile: Profile this analysis
+        x_admin_token: Admin token, required for profiling
         
     Returns:
         AnalysisResponse with analysis_id and status
         
     Raises:
-        HTTPException: If validation fails, session not found, or analysis fails
+        HTTPException: If validation fails, session not found, a profile is
+            already running, or analysis fails
     """
     logger.info(f"Received analysis request for session: {request.session_id}")
     
+    if x_profile:
+        check_admin_token(x_admin_token)
+        if profile_running():
+            raise HTTPException(status_code=409, detail="A profile is already running")
+    
     # Validate company ID
     if not company_service.validate_company_id(request.company):
         raise HTTPException(
@@ -126,64 +433,27 @@ async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
     
     # Generate unique analysis ID
     analysis_id = str(uuid.uuid4())
+    _clear_previous_results(request.session_id)
     
-    try:
-        # Phase 1: Perform resume analysis using LLM
-        logger.info(f"Phase 1: Starting resume analysis for session: {request.session_id}")
-        resume_analysis_service = get_resume_analysis_service()
-        analysis_result = await resume_analysis_service.analyze_resume(
-            resume_file_path=resume_file_path,
-            session_id=request.session_id,
+    if request.mode == "preview":
+        with span("preview", trace_id=analysis_id, session_id=request.session_id):
+            preview = await _create_preview(request, resume_dir)
+        ANALYSES_IN_PROGRESS.inc(mode="preview")
+        background_tasks.add_task(
+            _run_analysis_in_background, request, resume_file_path, analysis_id, time.perf_counter(), x_profile
         )
-        
-        logger.info(f"Resume analysis completed successfully")
-        logger.info(f"Extracted {len(analysis_result.get('skills', {}).get('programming_languages', []))} programming languages")
-        logger.info(f"Found {len(analysis_result.get('experience', []))} work experiences")
-        logger.info(f"Found {len(analysis_result.get('projects', []))} projects")
-        
-        # Phase 2: Perform role matching analysis
-        logger.info(f"Phase 2: Starting role matching analysis for session: {request.session_id}")
-        role_matching_service = get_role_matching_service()
-        match_result = await role_matching_service.analyze_match(
-            session_id=request.session_id,
-            company_id=request.company,
-            role_description=request.role_description,
-        )
-        
-        logger.info(f"Role matching analysis completed successfully")
-        logger.info(f"Scores - ATS: {match_result.get('ats_score', {}).get('score', 0)}, "
-                   f"Role Match: {match_result.get('role_match_score', {}).get('score', 0)}, "
-                   f"Company Fit: {match_result.get('company_fit_score', {}).get('score', 0)}, "
-                   f"Overall: {match_result.get('overall_score', {}).get('score', 0)}")
-        
-        # Phase 3: Perform gap analysis
-        logger.info(f"Phase 3: Starting gap analysis for session: {request.session_id}")
-        gap_analysis_service = get_gap_analysis_service()
-        gap_result = await gap_analysis_service.analyze_gaps(
-            session_id=request.session_id,
-            company_id=request.company,
-            role_description=request.role_description,
-        )
-        
-        logger.info(f"Gap analysis completed successfully")
-        logger.info(f"Gaps identified - Total: {gap_result.get('summary', {}).get('total_gaps', 0)}, "
-                   f"High: {gap_result.get('summary', {}).get('high_priority_count', 0)}, "
-                   f"Medium: {gap_result.get('summary', {}).get('medium_priority_count', 0)}, "
-                   f"Low: {gap_result.get('summary', {}).get('low_priority_count', 0)}")
-        
-        # Phase 4: Generate development timeline
-        logger.info(f"Phase 4: Starting timeline generation for session: {request.session_id}")
-        timeline_service = get_timeline_service()
-        timeline_result = await timeline_service.generate_timeline(
+        logger.info(f"Preview ready for session {request.session_id}; full analysis queued")
+        return AnalysisResponse(
+            analysis_id=analysis_id,
             session_id=request.session_id,
-            role_description=request.role_description,
-            target_deadline=request.target_deadline,
+            status="processing",
+            message="Provisional preview ready. The full analysis is running and will replace it when finished.",
+            preview=preview,
         )
-        
-        logger.info(f"Timeline generation completed successfully")
-        logger.info(f"Timeline - Phases: {len(timeline_result.get('phases', []))}, "
-                   f"Weeks: {timeline_result.get('metadata', {}).get('total_weeks', 0)}, "
-                   f"Total hours: {timeline_result.get('metadata', {}).get('total_hours', 0)}")
+    
+    try:
+        with ANALYSES_IN_PROGRESS.track(mode="full"):
+            await _run_analysis(request, resume_file_path, analysis_id, x_profile)
         
         return AnalysisResponse(
             analysis_id=analysis_id,
@@ -0,0 +1,64 @@
+"""
+ATS scoring API routes.
+"""
+
+import logging
+from fastapi import APIRouter, HTTPException
+
+from app.models.ats import ATSScoreRequest, ATSScoreResponse
+from app.services.ats_scorer import ATSScorer
+from app.services.file_service import UPLOAD_DIR
+from app.services.resume_preview import ResumePreviewService
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+ats_scorer = ATSScorer()
+preview_service = ResumePreviewService(ats_scorer)
+
+
+async def _get_resume_text(session_id: str) -> str:
+    """
+    Get the resume text for a session, parsing the uploaded file if needed.
+
+    Args:
+        session_id: Session ID from resume upload
+
+    Returns:
+        Resume text
+
+    Raises:
+        HTTPException: If no resume was uploaded or it cannot be parsed
+    """
+    try:
+        return await preview_service.get_resume_text(session_id, UPLOAD_DIR)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Failed to extract text from resume: {str(e)}"
+        )
+
+
+@router.post("/ats-score", response_model=ATSScoreResponse)
+async def score_resume(request: ATSScoreRequest) -> ATSScoreResponse:
+    """
+    Compute an instant, preliminary ATS score without calling the LLM.
+
+    Keyword coverage and formatting are scored locally and deterministically
+    by the same scorer the full analysis uses, so a score is available in
+    milliseconds while the LLM phases are still running.
+
+    Args:
+        request: Session ID and job role description
+
+    Returns:
+        ATSScoreResponse with score, keyword matches and formatting notes
+
+    Raises:
+        HTTPException: If the resume is missing or cannot be parsed
+    """
+    resume_text = await _get_resume_text(request.session_id)
+    result = ats_scorer.score(resume_text, request.role_description)
+    logger.info(f"Preliminary ATS score for session {request.session_id}: {result['score']}")
+    return ATSScoreResponse(session_id=request.session_id, **result)
@@ -2,7 +2,8 @@
 Companies API routes.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import Response
 
 from app.models.company import CompaniesResponse
 from app.services.company_service import CompanyService
@@ -12,12 +13,33 @@ company_service = CompanyService()
 
 
 @router.get("/companies", response_model=CompaniesResponse)
-async def get_companies() -> CompaniesResponse:
+async def get_companies(
+    q: str | None = Query(None, max_length=100, description="Company ID or name prefix"),
+    offset: int = Query(0, ge=0, description="Number of companies to skip"),
+    limit: int | None = Query(None, ge=1, le=500, description="Maximum companies to return"),
+) -> Response:
     """
     Get list of available companies for resume evaluation.
 
+    Without parameters every company is returned from a response body
+    serialized once per registry reload.
+
+    Args:
+        q: Optional case-insensitive prefix of the company ID or name
+        offset: Number of matching companies to skip
+        limit: Maximum number of companies to return
+
     Returns:
-        CompaniesResponse containing list of companies with metadata
+        CompaniesResponse containing a page of companies and the total match count
     """
-    companies = company_service.get_all_companies()
-    return CompaniesResponse(companies=companies)
+    if not q and offset == 0 and limit is None:
+        return Response(
+            content=company_service.get_companies_json(),
+            media_type="application/json",
+        )
+
+    companies, total = company_service.search_companies(q, offset, limit)
+    return Response(
+        content=CompaniesResponse(companies=companies, total=total).model_dump_json(),
+        media_type="application/json",
+    )
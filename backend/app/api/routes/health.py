@@ -1,8 +1,11 @@
-"""Health check endpoint"""
-from fastapi import APIRouter
+"""Health check endpoints"""
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 from datetime import datetime
 from typing import Dict
 
+from app.services.readiness import ReadinessChecker
+
 router = APIRouter()
 
 @router.get("/health")
@@ -10,6 +13,8 @@ async def health_check() -> Dict[str, str]:
     """
     Health check endpoint to verify API is running
     
+    Answers as soon as the process serves requests, for liveness checks.
+    
     Returns:
         Dict with status and timestamp
     """
@@ -18,3 +23,33 @@ async def health_check() -> Dict[str, str]:
         "timestamp": datetime.utcnow().isoformat(),
         "service": "Ready2Intern API"
     }
+
+@router.get("/ready")
+async def readiness_check(request: Request) -> JSONResponse:
+    """
+    Readiness endpoint for load balancers
+    
+    Reports ready only once startup warm-up has finished, with the steps
+    analyses depend on (imports, services) successful, and the instance is
+    not saturated: analyses in progress and LLM calls in flight are under
+    their limits, the disk under data/ has headroom, the tenet and skill
+    caches load and the parser threads respond. Load shifts to other
+    instances while this returns 503; /api/health keeps answering.
+    
+    Args:
+        request: Incoming request, giving access to the app state
+    
+    Returns:
+        200 with the probe results when ready, 503 while starting, warming
+        up or failing a probe
+    """
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+
+    checker = getattr(request.app.state, "readiness", None) or ReadinessChecker()
+    report = await checker.report(warmup)
+    return JSONResponse(
+        status_code=200 if report["status"] == "ready" else 503,
+        content={"timestamp": datetime.utcnow().isoformat(), **report},
+    )
@@ -0,0 +1,21 @@
+"""Prometheus metrics endpoint"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services.metrics import REGISTRY
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Expose phase latencies, LLM latencies, retries, parse fallbacks and token counts
+
+    Returns:
+        Metrics in the Prometheus text format
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
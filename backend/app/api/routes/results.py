@@ -2,103 +2,326 @@
 Results API routes.
 """
 
-import json
 import logging
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
 
 from app.models.results import ResultsResponse
+from app.services.serializers import get_serializer
+from app.services.session_store import SessionStore
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+session_store = SessionStore()
 
+# Result sections, named after the session documents that hold them
+RESULT_SECTIONS = [
+    "resume_analysis",
+    "match_analysis",
+    "gap_analysis",
+    "timeline",
+]
+
+
+def _get_session_dir(session_id: str) -> Path:
+    """
+    Resolve the session directory, raising 404 if it doesn't exist.
 
-@router.get("/results/{session_id}", response_model=ResultsResponse)
-async def get_results(session_id: str) -> ResultsResponse:
-    """
-    Retrieve complete analysis results for a session.
-    
-    Loads all analysis JSON files from the session directory and combines
-    them into a single response object. Returns partial results if some
-    files are missing.
-    
     Args:
         session_id: Session ID from resume upload
-        
+
     Returns:
-        ResultsResponse with all available analysis data
-        
+        Path to the session directory
+
     Raises:
-        HTTPException: If session directory doesn't exist or no results found
+        HTTPException: If session directory doesn't exist
     """
-    logger.info(f"Fetching results for session: {session_id}")
-    
-    # Check if session directory exists
-    session_dir = Path(f"data/sessions/{session_id}")
+    session_dir = session_store.session_dir(session_id)
     if not session_dir.exists():
         raise HTTPException(
             status_code=404,
             detail=f"Session not found: {session_id}"
         )
-    
-    # Define expected result files
-    result_files = {
-        "resume_analysis": session_dir / "resume_analysis.json",
-        "match_analysis": session_dir / "match_analysis.json",
-        "gap_analysis": session_dir / "gap_analysis.json",
-        "timeline": session_dir / "timeline.json",
-    }
-    
-    # Load available results
+    return session_dir
+
+
+def _parse_sections(sections: str | None) -> list[str]:
+    """
+    Parse the comma-separated ``sections`` query parameter.
+
+    Args:
+        sections: Comma-separated section names, or None for all sections
+
+    Returns:
+        List of requested section names
+
+    Raises:
+        HTTPException: If an unknown section is requested
+    """
+    if sections is None:
+        return list(RESULT_SECTIONS)
+
+    requested = [s.strip() for s in sections.split(",") if s.strip()]
+    unknown = [s for s in requested if s not in RESULT_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Unknown result section(s): {', '.join(unknown)}. "
+                f"Valid sections: {', '.join(RESULT_SECTIONS)}"
+            )
+        )
+    return requested
+
+
+def _load_section(session_id: str, key: str) -> dict | None:
+    """
+    Load a single result section, returning None if missing or unreadable.
+
+    Args:
+        session_id: Session ID from resume upload
+        key: Result section name
+
+    Returns:
+        Parsed section data or None
+    """
+    try:
+        return session_store.load(session_id, key)
+    except Exception as e:
+        logger.error(f"Failed to load {key}: {e}")
+        return None
+
+
+def _build_results(session_id: str, requested: list[str]) -> ResultsResponse:
+    """
+    Build a results response containing only the requested sections.
+
+    Status is derived from which result files exist, so sections that were
+    not requested are never parsed. The match analysis is the only exception:
+    it is read whenever present to report the overall score. Until every
+    section exists, the provisional preview is included if there is one.
+
+    Args:
+        session_id: Session ID from resume upload
+        requested: Section names to include in the response
+
+    Returns:
+        ResultsResponse with the requested sections populated
+
+    Raises:
+        HTTPException: If session directory doesn't exist or no results found
+    """
+    _get_session_dir(session_id)
+
+    # Load requested results and check the presence of the rest
     results = {}
-    missing_files = []
-    
-    for key, file_path in result_files.items():
-        if file_path.exists():
-            try:
-                with open(file_path, "r") as f:
-                    results[key] = json.load(f)
-                logger.info(f"Loaded {key} for session {session_id}")
-            except Exception as e:
-                logger.error(f"Failed to load {key}: {e}")
-                results[key] = None
-                missing_files.append(key)
+    available = {}
+
+    for key in RESULT_SECTIONS:
+        if key in requested or key == "match_analysis":
+            results[key] = _load_section(session_id, key)
+            available[key] = results[key] is not None
         else:
+            available[key] = session_store.exists(session_id, key)
+
+        if not available[key]:
             logger.warning(f"Missing {key} for session {session_id}")
-            results[key] = None
-            missing_files.append(key)
-    
+
+    missing_files = [key for key, present in available.items() if not present]
+
+    # A provisional preview stands in until the full results are all in
+    preview = _load_section(session_id, "preview") if missing_files else None
+
     # Check if we have at least some results
-    if all(v is None for v in results.values()):
+    if not any(available.values()) and preview is None:
         raise HTTPException(
             status_code=404,
             detail=f"No analysis results found for session: {session_id}"
         )
-    
+
     # Extract overall score from match analysis if available
     overall_score = None
     if results.get("match_analysis"):
         overall_score_data = results["match_analysis"].get("overall_score", {})
         overall_score = overall_score_data.get("score")
-    
+
     # Determine status
     if not missing_files:
         status = "completed"
         message = "Complete analysis results available"
-    elif results.get("resume_analysis"):
+    elif preview is not None and preview.get("full_analysis_status") == "processing":
+        status = "processing"
+        message = (
+            "Provisional preview available; full analysis in progress. "
+            f"Missing: {', '.join(missing_files)}"
+        )
+    elif available["resume_analysis"]:
         status = "partial"
         message = f"Partial results available. Missing: {', '.join(missing_files)}"
     else:
         status = "failed"
         message = "Analysis incomplete or failed"
-    
+
     return ResultsResponse(
         session_id=session_id,
         status=status,
-        resume_analysis=results.get("resume_analysis"),
-        match_analysis=results.get("match_analysis"),
-        gap_analysis=results.get("gap_analysis"),
-        timeline=results.get("timeline"),
         overall_score=overall_score,
         message=message,
+        preview=preview,
+        **{key: results.get(key) for key in requested},
     )
+
+
+@router.get("/results/{session_id}", response_model=ResultsResponse)
+async def get_results(
+    session_id: str,
+    sections: str | None = Query(
+        None,
+        description=(
+            "Comma-separated result sections to include "
+            "(resume_analysis, match_analysis, gap_analysis, timeline). "
+            "Defaults to all sections."
+        ),
+    ),
+) -> ResultsResponse:
+    """
+    Retrieve analysis results for a session.
+
+    Loads the requested analysis JSON files from the session directory and
+    combines them into a single response object. Sections that were not
+    requested are returned as null and are not read from disk. Returns
+    partial results if some files are missing.
+
+    Args:
+        session_id: Session ID from resume upload
+        sections: Optional comma-separated list of sections to include
+
+    Returns:
+        ResultsResponse with the requested analysis data
+
+    Raises:
+        HTTPException: If session directory doesn't exist or no results found
+    """
+    logger.info(f"Fetching results for session: {session_id}")
+    requested = _parse_sections(sections)
+    return _build_results(session_id, requested)
+
+
+@router.get("/results/{session_id}/status", response_model=ResultsResponse)
+async def get_results_status(session_id: str) -> ResultsResponse:
+    """
+    Retrieve analysis status and overall score without any result sections.
+
+    Intended for status polling: only the match analysis is read (for the
+    overall score); all other files are checked for existence only.
+
+    Args:
+        session_id: Session ID from resume upload
+
+    Returns:
+        ResultsResponse with status, overall score and message
+
+    Raises:
+        HTTPException: If session directory doesn't exist or no results found
+    """
+    return _build_results(session_id, [])
+
+
+@router.get("/results/{session_id}/{section}")
+async def get_result_section(
+    session_id: str,
+    section: str,
+    accept_encoding: str | None = Header(None),
+) -> Response:
+    """
+    Retrieve a single analysis result section.
+
+    Documents stored as JSON are returned as-is, without being parsed and
+    re-serialized. Compressed documents are sent still compressed, with a
+    matching Content-Encoding, when the client accepts that encoding;
+    otherwise they are decompressed on the fly. Documents stored in other
+    formats are converted to JSON.
+
+    Args:
+        session_id: Session ID from resume upload
+        section: Result section name (resume_analysis, match_analysis,
+            gap_analysis, timeline)
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        The section's JSON document
+
+    Raises:
+        HTTPException: If the section is unknown or its results don't exist
+    """
+    if section not in RESULT_SECTIONS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown result section: {section}"
+        )
+
+    _get_session_dir(session_id)
+    document = session_store.find(session_id, section)
+    if document is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {section} results found for session: {session_id}"
+        )
+    # Reading a section counts as an access, like SessionStore.load
+    session_store.touch(session_id)
+
+    encoding = document.codec.content_encoding
+    headers = {"Vary": "Accept-Encoding"} if encoding else None
+
+    if document.serializer.media_type != "application/json":
+        with document.codec.open(document.path) as f:
+            content = get_serializer("json").dumps(document.serializer.load(f))
+    elif encoding is None:
+        content = document.path.read_bytes()
+    elif _accepts_encoding(accept_encoding, encoding):
+        # Pass the compressed bytes straight through
+        content = document.path.read_bytes()
+        headers["Content-Encoding"] = encoding
+    else:
+        with document.codec.open(document.path) as f:
+            content = f.read()
+
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _accepts_encoding(accept_encoding: str | None, encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a content encoding.
+
+    Every entry is considered: an entry naming the encoding takes precedence
+    over "*", q=0 excludes it, and a coding listed twice gets the lower q.
+
+    Args:
+        accept_encoding: Accept-Encoding header value, if any
+        encoding: Content encoding to check (e.g. "gzip")
+
+    Returns:
+        True if the client accepts the encoding, False otherwise
+    """
+    if not accept_encoding:
+        return False
+
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, *params = entry.split(";")
+        coding = coding.strip().lower()
+        if coding not in (encoding, "*"):
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = min(quality, qualities.get(coding, quality))
+
+    quality = qualities.get(encoding, qualities.get("*", 0.0))
+    return quality > 0
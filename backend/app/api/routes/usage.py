@@ -0,0 +1,57 @@
+"""
+Token usage and cost API routes, protected by the admin token.
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.routes.admin import require_admin
+from app.services.token_ledger import GROUP_FIELDS, get_token_ledger
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/usage", dependencies=[Depends(require_admin)])
+async def get_usage(
+    group_by: str = Query("day", description=f"One of: {', '.join(GROUP_FIELDS)}"),
+    since: Optional[date] = Query(None, description="First UTC day included"),
+    until: Optional[date] = Query(None, description="Last UTC day included"),
+    company: Optional[str] = Query(None, description="Only usage for this company"),
+    phase: Optional[str] = Query(None, description="Only usage in this analysis phase"),
+) -> Dict[str, Any]:
+    """
+    Report LLM token usage and cost from the token ledger.
+
+    Each group reports calls, input, output and cache token counts, cost,
+    cost per phase, and what prompt caching saved against sending the cached
+    tokens as plain input. Calls served by the fake backend are excluded
+    from the totals and groups and reported under "simulated".
+
+    Args:
+        group_by: Group by analysis_id, session_id, day, phase, company or model
+        since: First UTC day included
+        until: Last UTC day included
+        company: Only usage for this company
+        phase: Only usage in this analysis phase
+
+    Returns:
+        Totals and per-group usage
+
+    Raises:
+        HTTPException: If group_by is not a known field
+    """
+    if group_by not in GROUP_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid group_by: {group_by}. Expected one of: {', '.join(GROUP_FIELDS)}"
+        )
+
+    # The ledger grows with every call, so read it off the event loop
+    return await asyncio.to_thread(
+        get_token_ledger().aggregate, group_by, since, until, company, phase
+    )
@@ -1,11 +1,23 @@
 """FastAPI main application entry point"""
+import time
+
+# Taken before the imports below, so the startup report includes them
+IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+import asyncio
 import logging
 
-from app.api.routes import health, upload, companies, analyze, results
+from app.api.routes import health, upload, companies, analyze, results, ats, metrics, admin, usage
+from app.services.lazy_imports import deferred_modules
+from app.services.loop_monitor import LoopMonitor
+from app.services.readiness import ReadinessChecker
+from app.services.session_sweeper import SessionSweeper
+from app.services.warmup import Warmup
 
 # Load environment variables
 load_dotenv()
@@ -17,11 +29,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
+
+async def startup(app: FastAPI) -> None:
+    """Run on application startup"""
+    logger.info("Ready2Intern API starting up...")
+    logger.info(f"CORS enabled for origins: {origins}")
+
+    # Start the session sweeper in the background
+    session_sweeper = SessionSweeper()
+    app.state.session_sweeper = session_sweeper
+    app.state.session_sweeper_task = None
+    if session_sweeper.enabled:
+        app.state.session_sweeper_task = asyncio.create_task(session_sweeper.run())
+
+    # Sample event-loop lag, and report blocking calls when a threshold is set
+    loop_monitor = LoopMonitor()
+    app.state.loop_monitor = loop_monitor
+    app.state.loop_monitor_task = None
+    if loop_monitor.enabled:
+        app.state.loop_monitor_task = asyncio.create_task(loop_monitor.run())
+
+    # Warm up imports, tenets, skills, clients and parser threads in the
+    # background; /api/ready reports ready once it finishes
+    warmup = Warmup(services_factory=analyze.get_analysis_services)
+    app.state.warmup = warmup
+    app.state.warmup_task = asyncio.create_task(warmup.run())
+
+    # After warm-up, /api/ready probes saturation, disk and caches
+    app.state.readiness = ReadinessChecker()
+
+
+async def shutdown(app: FastAPI) -> None:
+    """Run on application shutdown"""
+    logger.info("Ready2Intern API shutting down...")
+
+    sweeper_task = getattr(app.state, "session_sweeper_task", None)
+    if sweeper_task is not None:
+        sweeper_task.cancel()
+
+    loop_monitor_task = getattr(app.state, "loop_monitor_task", None)
+    if loop_monitor_task is not None:
+        loop_monitor_task.cancel()
+
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task is not None:
+        warmup_task.cancel()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run startup before serving and shutdown after, reporting startup time.
+
+    Heavy dependencies stay deferred until warm-up or first use; the report
+    lists those not yet imported when serving starts.
+    """
+    started = time.perf_counter()
+    await startup(app)
+    app.state.startup_report = {
+        "import_seconds": round(IMPORT_SECONDS, 3),
+        "startup_seconds": round(time.perf_counter() - started, 3),
+        "deferred_modules": deferred_modules(),
+    }
+    logger.info(
+        f"Startup finished: imports {IMPORT_SECONDS * 1000:.0f} ms, "
+        f"startup {app.state.startup_report['startup_seconds'] * 1000:.0f} ms; "
+        f"deferred until first use: {', '.join(app.state.startup_report['deferred_modules']) or 'none'}"
+    )
+    try:
+        yield
+    finally:
+        await shutdown(app)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Ready2Intern API",
     description="AI-powered resume evaluator for tech internships",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -44,14 +132,8 @@ app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(companies.router, prefix="/api", tags=["companies"])
 app.include_router(analyze.router, prefix="/api", tags=["analyze"])
 app.include_router(results.router, prefix="/api", tags=["results"])
-
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup"""
-    logger.info("Ready2Intern API starting up...")
-    logger.info(f"CORS enabled for origins: {origins}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown"""
-    logger.info("Ready2Intern API shutting down...")
+app.include_router(ats.router, prefix="/api", tags=["ats"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
+app.include_router(usage.router, prefix="/api", tags=["usage"])
+# Served at the conventional scrape path, outside /api
+app.include_router(metrics.router, tags=["metrics"])
@@ -2,14 +2,17 @@
 Analysis request and response models.
 """
 
+from typing import Any, Dict, Literal
 from pydantic import BaseModel, Field, field_validator
 
+from app.services.company_service import get_company_registry
+
 
 class AnalysisRequest(BaseModel):
     """Request model for POST /api/analyze endpoint."""
 
     session_id: str = Field(..., description="Session ID from resume upload")
-    company: str = Field(..., description="Selected company ID (amazon, meta, google)")
+    company: str = Field(..., description="Selected company ID (see GET /api/companies)")
     role_description: str = Field(
         ...,
         min_length=50,
@@ -19,6 +22,13 @@ class AnalysisRequest(BaseModel):
     target_deadline: str | None = Field(
         None, description="Optional target application deadline (ISO date)"
     )
+    mode: Literal["full", "preview"] = Field(
+        "full",
+        description=(
+            "'full' waits for the complete LLM analysis; 'preview' returns a provisional "
+            "local preview immediately and runs the full analysis in the background"
+        ),
+    )
 
     @field_validator("role_description")
     @classmethod
@@ -38,13 +48,13 @@ class AnalysisRequest(BaseModel):
     @field_validator("company")
     @classmethod
     def validate_company(cls, v: str) -> str:
-        """Validate company ID."""
-        valid_companies = ["amazon", "meta", "google"]
-        if v.lower() not in valid_companies:
+        """Validate company ID against the company registry, returning the manifest's ID."""
+        company = get_company_registry().find_company(v.strip())
+        if company is None:
             raise ValueError(
-                f"Invalid company. Must be one of: {', '.join(valid_companies)}"
+                f"Invalid company '{v}'. See GET /api/companies for available companies"
             )
-        return v.lower()
+        return company.id
 
 
 class AnalysisResponse(BaseModel):
@@ -54,3 +64,6 @@ class AnalysisResponse(BaseModel):
     session_id: str
     status: str
     message: str
+    preview: Dict[str, Any] | None = Field(
+        None, description="Provisional local results, returned in preview mode"
+    )
@@ -0,0 +1,34 @@
+"""
+ATS scoring request and response models.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class ATSScoreRequest(BaseModel):
+    """Request model for POST /api/ats-score endpoint."""
+
+    session_id: str = Field(..., description="Session ID from resume upload")
+    role_description: str = Field(
+        ...,
+        min_length=50,
+        max_length=10000,
+        description="Job role description (50-10,000 characters)",
+    )
+
+
+class ATSScoreResponse(BaseModel):
+    """Response model for POST /api/ats-score endpoint."""
+
+    session_id: str
+    score: int = Field(..., ge=0, le=100, description="ATS score (0-100)")
+    keyword_coverage: int = Field(
+        ..., ge=0, le=100, description="Weighted share of role keywords found in the resume"
+    )
+    matched_keywords: list[str]
+    missing_keywords: list[str]
+    formatting_score: int = Field(..., ge=0, le=100)
+    formatting_notes: str
+    provisional: bool = Field(
+        True, description="Preliminary local score; the full analysis refines the explanation"
+    )
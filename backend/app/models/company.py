@@ -21,3 +21,4 @@ class CompaniesResponse(BaseModel):
     """Response model for GET /api/companies endpoint."""
 
     companies: list[Company]
+    total: int  # Number of companies matching the query, before pagination
@@ -10,7 +10,9 @@ class ResultsResponse(BaseModel):
     """Response model for GET /api/results/{session_id} endpoint."""
 
     session_id: str = Field(..., description="Session ID")
-    status: str = Field(..., description="Analysis status (completed, partial, failed)")
+    status: str = Field(
+        ..., description="Analysis status (completed, processing, partial, failed)"
+    )
     resume_analysis: Dict[str, Any] | None = Field(
         None, description="Resume analysis results"
     )
@@ -23,6 +25,9 @@ class ResultsResponse(BaseModel):
     timeline: Dict[str, Any] | None = Field(
         None, description="Development timeline with phases"
     )
+    preview: Dict[str, Any] | None = Field(
+        None, description="Provisional local preview, until the full analysis completes"
+    )
     overall_score: int | None = Field(
         None, description="Overall match score (0-100)", ge=0, le=100
     )
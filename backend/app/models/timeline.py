@@ -19,7 +19,17 @@ class Task(BaseModel):
     dependencies: List[str] = Field(default_factory=list, description="Task IDs that must be completed first")
     resources: List[str] = Field(default_factory=list, description="Resources needed for this task")
     success_criteria: str
-
+    start_week: Optional[int] = Field(None, description="Week the task is scheduled to start")
+    end_week: Optional[int] = Field(None, description="Week the task is scheduled to end")
+    earliest_start: Optional[int] = Field(
+        None, description="Earliest start, in hours from the start of the plan"
+    )
+    latest_start: Optional[int] = Field(
+        None, description="Latest start that does not delay the plan, in hours"
+    )
+    slack: Optional[int] = Field(
+        None, description="Hours the task can slip without delaying the plan (0 on the critical path)"
+    )
 
 class Milestone(BaseModel):
     """Milestone checkpoint in the timeline."""
@@ -71,6 +81,16 @@ class TimelineMetadata(BaseModel):
     target_deadline: Optional[str] = None  # ISO date string
     intensity_level: Literal["light", "moderate", "intensive"]
     feasibility_assessment: str
+    scheduled_weeks: Optional[int] = Field(
+        None, description="Weeks the tasks take at the weekly hours budget"
+    )
+    feasible: Optional[bool] = Field(
+        None, description="Whether the tasks fit the hours available before the deadline"
+    )
+    plan_adjustments: List[str] = Field(
+        default_factory=list,
+        description="Dependency repairs and deferrals made to keep the plan feasible"
+    )
 
 
 class TimelineResult(BaseModel):
@@ -81,7 +101,11 @@ class TimelineResult(BaseModel):
     weekly_breakdown: List[WeeklySummary]
     critical_path: List[str] = Field(
         default_factory=list,
-        description="Task IDs that are critical to complete on time"
+        description="Longest chain of dependent task IDs by estimated hours"
+    )
+    deferred_tasks: List[Task] = Field(
+        default_factory=list,
+        description="Tasks left out because they did not fit before the deadline"
     )
     flexibility_notes: List[str] = Field(
         default_factory=list,
@@ -2,6 +2,8 @@
 Prompt templates for gap analysis and recommendations.
 """
 
+from app.services.prompt_budget import PromptBudget
+
 
 SYSTEM_PROMPT = """You are an expert career coach and technical mentor specializing in helping students and early-career professionals prepare for tech internships.
 
@@ -283,14 +285,19 @@ def create_gap_analysis_prompt(
     match_analysis: dict,
     role_description: str,
     company_tenets: str,
+    token_budget: int | None = None,
 ) -> str:
     """
     Create a prompt for gap analysis.
     
+    Lists from the match analysis are filled within the token budget, gaps
+    and concerns before strengths, and earlier list entries first.
+    
     Args:
         match_analysis: Role matching analysis results
         role_description: Job role description
         company_tenets: Company values and culture description
+        token_budget: Input-token budget, defaults to the configured gap analysis budget
         
     Returns:
         Formatted prompt string
@@ -301,55 +308,35 @@ def create_gap_analysis_prompt(
     company_fit_data = match_analysis.get("company_fit_score", {})
     overall_data = match_analysis.get("overall_score", {})
     
-    # Extract specific fields
-    ats_score = ats_score_data.get("score", 0)
-    role_match_score = role_match_data.get("score", 0)
-    company_fit_score = company_fit_data.get("score", 0)
-    overall_score = overall_data.get("score", 0)
-    
-    # Extract keyword matches
     keyword_data = ats_score_data.get("keyword_matches", {})
-    matched_keywords = ", ".join(keyword_data.get("matched_keywords", [])[:15])
-    missing_keywords = ", ".join(keyword_data.get("missing_keywords", [])[:15])
-    
-    # Extract technical skills
     tech_skills = role_match_data.get("technical_skills_match", {})
-    matched_skills = ", ".join(tech_skills.get("matched_skills", [])[:10])
-    missing_skills = ", ".join(tech_skills.get("missing_skills", [])[:10])
-    
-    # Extract experience gaps
     experience_data = role_match_data.get("experience_match", {})
-    experience_gaps = ", ".join(experience_data.get("experience_gaps", [])[:5])
-    
-    # Extract value alignments
-    value_alignments = []
-    for alignment in company_fit_data.get("value_alignments", [])[:3]:
-        value_alignments.append(
-            f"{alignment.get('company_value', 'N/A')} ({alignment.get('strength', 'N/A')})"
-        )
-    value_alignments_str = ", ".join(value_alignments) if value_alignments else "None identified"
-    
-    # Extract concerns
-    potential_concerns = ", ".join(company_fit_data.get("potential_concerns", [])[:3])
-    key_concerns = ", ".join(overall_data.get("key_concerns", [])[:3])
+    value_alignments = [
+        f"{alignment.get('company_value', 'N/A')} ({alignment.get('strength', 'N/A')})"
+        for alignment in company_fit_data.get("value_alignments", [])
+    ]
     
-    # Get recommendation
-    recommendation = overall_data.get("recommendation", "unknown")
+    # Priority of the first entry of each list; each later entry is one less important
+    budget = PromptBudget("gap_analysis", token_budget)
+    for placeholder, items, priority in [
+        ("missing_skills", tech_skills.get("missing_skills", []), 0),
+        ("experience_gaps", experience_data.get("experience_gaps", []), 0),
+        ("missing_keywords", keyword_data.get("missing_keywords", []), 5),
+        ("key_concerns", overall_data.get("key_concerns", []), 5),
+        ("potential_concerns", company_fit_data.get("potential_concerns", []), 10),
+        ("value_alignments", value_alignments, 10),
+        ("matched_skills", tech_skills.get("matched_skills", []), 10),
+        ("matched_keywords", keyword_data.get("matched_keywords", []), 15),
+    ]:
+        budget.section(placeholder, separator=", ").add_all([str(item) for item in items], priority=priority, step=1)
     
-    return GAP_ANALYSIS_PROMPT.format(
-        ats_score=ats_score,
-        matched_keywords=matched_keywords or "None",
-        missing_keywords=missing_keywords or "None",
-        role_match_score=role_match_score,
-        matched_skills=matched_skills or "None",
-        missing_skills=missing_skills or "None",
-        experience_gaps=experience_gaps or "None",
-        company_fit_score=company_fit_score,
-        value_alignments=value_alignments_str,
-        potential_concerns=potential_concerns or "None",
-        overall_score=overall_score,
-        recommendation=recommendation,
-        key_concerns=key_concerns or "None",
+    return budget.render(
+        GAP_ANALYSIS_PROMPT,
+        ats_score=ats_score_data.get("score", 0),
+        role_match_score=role_match_data.get("score", 0),
+        company_fit_score=company_fit_data.get("score", 0),
+        overall_score=overall_data.get("score", 0),
+        recommendation=overall_data.get("recommendation", "unknown"),
         role_description=role_description,
         company_tenets=company_tenets,
     )
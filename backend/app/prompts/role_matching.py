@@ -2,6 +2,9 @@
 Prompt templates for role matching and scoring.
 """
 
+from app.services.prompt_budget import PromptBudget
+from app.services.skill_taxonomy import get_skill_taxonomy
+
 
 SYSTEM_PROMPT = """You are an expert technical recruiter and ATS (Applicant Tracking System) specialist with deep knowledge of tech industry hiring practices.
 
@@ -43,13 +46,7 @@ Please provide a comprehensive matching analysis in the following JSON format:
     "weaknesses": [
       "Weakness 1 with specific evidence",
       "Weakness 2 with specific evidence"
-    ],
-    "keyword_matches": {{{{
-      "matched_keywords": ["keyword1", "keyword2", "..."],
-      "missing_keywords": ["keyword1", "keyword2", "..."]
-    }}}},
-    "formatting_score": 0-100,
-    "formatting_notes": "Comments on resume structure, clarity, and ATS-friendliness"
+    ]
   }}}},
   "role_match_score": {{{{
     "score": 0-100,
@@ -161,6 +158,7 @@ Please provide a comprehensive matching analysis in the following JSON format:
 9. All scores must be integers between 0 and 100
 10. Provide constructive, actionable feedback
 11. Keep explanations concise to ensure complete JSON response
+12. Keyword matches and formatting are scored separately; do not list them
 """
 
 
@@ -168,6 +166,7 @@ def create_role_matching_prompt(
     resume_summary: dict,
     role_description: str,
     company_tenets: str,
+    token_budget: int | None = None,
 ) -> str:
     """
     Create a prompt for role matching analysis.
@@ -176,94 +175,100 @@ def create_role_matching_prompt(
         resume_summary: Parsed resume data from resume analysis
         role_description: Job role description
         company_tenets: Company values and culture description
+        token_budget: Input-token budget, defaults to the configured role matching budget
         
     Returns:
         Formatted prompt string
     """
-    # Format resume summary into readable text
-    resume_text = _format_resume_summary(resume_summary)
+    budget = PromptBudget("role_matching", token_budget)
+    _add_resume_summary(budget, resume_summary)
     
-    return ROLE_MATCHING_PROMPT.format(
-        resume_summary=resume_text,
+    return budget.render(
+        ROLE_MATCHING_PROMPT,
         role_description=role_description,
         company_tenets=company_tenets,
     )
 
 
-def _format_resume_summary(resume_data: dict) -> str:
+def _add_resume_summary(budget: PromptBudget, resume_data: dict) -> None:
     """
-    Format resume data into a readable summary for the prompt.
+    Add resume data to the prompt budget as a readable summary.
+    
+    Headline facts (skills, degrees, job titles, project names) are most
+    important; descriptions, later achievements, certifications and awards
+    are the first to go when the budget is tight.
     
     Args:
+        budget: Prompt budget the resume_summary sections are added to
         resume_data: Parsed resume data dictionary
-        
-    Returns:
-        Formatted resume summary string
     """
-    sections = []
-    
     # Personal Info
     if "personal_info" in resume_data:
         info = resume_data["personal_info"]
-        sections.append(f"**Candidate:** {info.get('name', 'N/A')}")
+        section = budget.section("resume_summary")
+        section.add(f"**Candidate:** {info.get('name', 'N/A')}", priority=0)
         if info.get('email') != 'Not provided':
-            sections.append(f"**Email:** {info.get('email')}")
+            section.add(f"**Email:** {info.get('email')}", priority=0)
     
     # Summary
     if "summary" in resume_data:
-        sections.append(f"\n**Summary:**\n{resume_data['summary']}")
+        budget.section("resume_summary", header="\n**Summary:**").add(resume_data["summary"], priority=2)
     
     # Education
     if "education" in resume_data and resume_data["education"]:
-        sections.append("\n**Education:**")
+        section = budget.section("resume_summary", header="\n**Education:**")
         for edu in resume_data["education"]:
-            sections.append(f"- {edu.get('degree', 'N/A')} from {edu.get('institution', 'N/A')}")
+            degree = section.add(f"- {edu.get('degree', 'N/A')} from {edu.get('institution', 'N/A')}", priority=1)
             if edu.get('gpa') != 'Not provided':
-                sections.append(f"  GPA: {edu.get('gpa')}")
+                section.add(f"  GPA: {edu.get('gpa')}", priority=2, parent=degree)
             if edu.get('relevant_coursework'):
-                sections.append(f"  Coursework: {', '.join(edu['relevant_coursework'][:5])}")
+                section.add(f"  Coursework: {', '.join(edu['relevant_coursework'])}", priority=3, parent=degree)
     
-    # Skills
+    # Skills, normalized to canonical names with duplicates across lists removed
     if "skills" in resume_data:
         skills = resume_data["skills"]
-        sections.append("\n**Skills:**")
-        if skills.get("programming_languages"):
-            sections.append(f"- Programming: {', '.join(skills['programming_languages'])}")
-        if skills.get("frameworks_libraries"):
-            sections.append(f"- Frameworks: {', '.join(skills['frameworks_libraries'])}")
-        if skills.get("tools_technologies"):
-            sections.append(f"- Tools: {', '.join(skills['tools_technologies'])}")
-        if skills.get("databases"):
-            sections.append(f"- Databases: {', '.join(skills['databases'])}")
+        taxonomy = get_skill_taxonomy()
+        seen = set()
+        section = budget.section("resume_summary", header="\n**Skills:**")
+        for key, label in [
+            ("programming_languages", "Programming"),
+            ("frameworks_libraries", "Frameworks"),
+            ("tools_technologies", "Tools"),
+            ("databases", "Databases"),
+        ]:
+            names = [name for name in taxonomy.canonicalize_list(skills.get(key) or []) if name not in seen]
+            seen.update(names)
+            if names:
+                section.add(f"- {label}: {', '.join(names)}", priority=1)
     
-    # Experience
+    # Experience, with each role's achievements in order of importance
     if "experience" in resume_data and resume_data["experience"]:
-        sections.append("\n**Experience:**")
+        section = budget.section("resume_summary", header="\n**Experience:**")
         for exp in resume_data["experience"]:
-            sections.append(f"- {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')} ({exp.get('duration', 'N/A')})")
-            if exp.get('achievements'):
-                for achievement in exp['achievements'][:3]:
-                    sections.append(f"  • {achievement}")
+            role = section.add(
+                f"- {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')} ({exp.get('duration', 'N/A')})",
+                priority=1,
+            )
+            achievements = [f"  • {achievement}" for achievement in exp.get('achievements') or []]
+            section.add_all(achievements, priority=2, step=1, parent=role)
     
     # Projects
     if "projects" in resume_data and resume_data["projects"]:
-        sections.append("\n**Projects:**")
+        section = budget.section("resume_summary", header="\n**Projects:**")
         for proj in resume_data["projects"]:
-            sections.append(f"- {proj.get('name', 'N/A')}")
-            sections.append(f"  {proj.get('description', 'N/A')}")
+            project = section.add(f"- {proj.get('name', 'N/A')}", priority=1)
+            section.add(f"  {proj.get('description', 'N/A')}", priority=2, parent=project)
             if proj.get('technologies'):
-                sections.append(f"  Technologies: {', '.join(proj['technologies'])}")
+                section.add(f"  Technologies: {', '.join(proj['technologies'])}", priority=3, parent=project)
     
     # Certifications
     if "certifications" in resume_data and resume_data["certifications"]:
-        sections.append("\n**Certifications:**")
+        section = budget.section("resume_summary", header="\n**Certifications:**")
         for cert in resume_data["certifications"]:
-            sections.append(f"- {cert.get('name', 'N/A')} from {cert.get('issuer', 'N/A')}")
+            section.add(f"- {cert.get('name', 'N/A')} from {cert.get('issuer', 'N/A')}", priority=4)
     
     # Awards
     if "awards_honors" in resume_data and resume_data["awards_honors"]:
-        sections.append("\n**Awards & Honors:**")
+        section = budget.section("resume_summary", header="\n**Awards & Honors:**")
         for award in resume_data["awards_honors"]:
-            sections.append(f"- {award.get('name', 'N/A')}")
-    
-    return "\n".join(sections)
+            section.add(f"- {award.get('name', 'N/A')}", priority=5)
@@ -0,0 +1,91 @@
+"""
+Prompt templates for extracting structured requirements from a role description.
+"""
+
+
+SYSTEM_PROMPT = """You are an expert technical recruiter who reads internship job postings and extracts their requirements precisely.
+
+Extract only what the posting states. Do not invent requirements, and keep every item short."""
+
+
+ROLE_REQUIREMENTS_PROMPT = """Extract the requirements from the following job role description.
+
+## JOB ROLE DESCRIPTION
+
+{role_description}
+
+---
+
+Please provide the requirements in the following JSON format:
+
+{{
+  "role_title": "Title of the role",
+  "seniority": "Level of the role (e.g., 'Intern', 'New Grad')",
+  "required_skills": ["Skill or technology explicitly required", "..."],
+  "preferred_skills": ["Skill or technology listed as preferred or a plus", "..."],
+  "responsibilities": ["Main responsibility, one short phrase each", "..."],
+  "qualifications": ["Education, degree, graduation date or experience requirement", "..."],
+  "soft_skills": ["Soft skill or behavior the posting asks for", "..."],
+  "keywords": ["Terms an ATS would screen for", "..."],
+  "logistics": "Location, dates, duration or work arrangement if stated, otherwise 'Not specified'"
+}}
+
+## IMPORTANT NOTES
+
+1. Keep the wording of skills and technologies as written in the posting
+2. Use at most 12 items per list and at most 12 words per item
+3. Use an empty list when the posting says nothing about a category
+4. **CRITICAL**: Return ONLY valid JSON, no additional text or markdown formatting
+"""
+
+# List fields in the order they are rendered for downstream prompts
+REQUIREMENT_LISTS = [
+    ("required_skills", "Required skills"),
+    ("preferred_skills", "Preferred skills"),
+    ("responsibilities", "Responsibilities"),
+    ("qualifications", "Qualifications"),
+    ("soft_skills", "Soft skills"),
+    ("keywords", "Keywords"),
+]
+
+
+def create_role_requirements_prompt(role_description: str) -> str:
+    """
+    Create a prompt for role requirement extraction.
+
+    Args:
+        role_description: Job role description
+
+    Returns:
+        Formatted prompt string
+    """
+    return ROLE_REQUIREMENTS_PROMPT.format(role_description=role_description)
+
+
+def format_role_requirements(requirements: dict) -> str:
+    """
+    Format extracted requirements as a compact role description for prompts.
+
+    Args:
+        requirements: Extracted role requirements
+
+    Returns:
+        Formatted requirements string
+    """
+    sections = []
+
+    title = requirements.get("role_title")
+    seniority = requirements.get("seniority")
+    if title:
+        sections.append(f"**Role:** {title}" + (f" ({seniority})" if seniority else ""))
+
+    for field, label in REQUIREMENT_LISTS:
+        items = requirements.get(field) or []
+        if items:
+            sections.append(f"**{label}:** {'; '.join(items)}")
+
+    logistics = requirements.get("logistics")
+    if logistics and logistics != "Not specified":
+        sections.append(f"**Logistics:** {logistics}")
+
+    return "\n".join(sections)
@@ -2,6 +2,11 @@
 Prompt templates for timeline generation.
 """
 
+from app.services.prompt_budget import PromptBudget
+
+# Gaps of higher priority are kept first when the prompt budget is tight
+GAP_PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
 
 SYSTEM_PROMPT = """You are an expert career coach and project planner specializing in helping students prepare for tech internships.
 
@@ -49,6 +54,7 @@ TIMELINE_GENERATION_PROMPT = """Based on the gap analysis, create a personalized
 **Target Deadline:** {target_deadline}
 **Weeks Available:** {weeks_available}
 **Recommended Hours/Week:** {hours_per_week}
+**Total Hours Budget:** {total_hours_budget}
 
 ---
 
@@ -58,15 +64,12 @@ TIMELINE_GENERATION_PROMPT = """Based on the gap analysis, create a personalized
 
 ---
 
-Please create a comprehensive development timeline in the following JSON format:
+Please create a comprehensive development timeline in the following JSON format.
+The week-by-week schedule, phase weeks, milestone dates and critical path are
+computed from your tasks' hours and dependencies, so do not include them:
 
 {{{{
   "metadata": {{{{
-    "total_weeks": {weeks_available},
-    "total_hours": 0,
-    "hours_per_week": {hours_per_week},
-    "start_date": "{start_date}",
-    "target_deadline": "{target_deadline}",
     "intensity_level": "light|moderate|intensive",
     "feasibility_assessment": "Assessment of whether timeline is realistic given constraints"
   }}}},
@@ -76,8 +79,6 @@ Please create a comprehensive development timeline in the following JSON format:
       "phase_number": 1,
       "title": "Phase title",
       "description": "What this phase accomplishes",
-      "start_week": 1,
-      "end_week": 2,
       "focus_areas": ["Focus area 1", "Focus area 2"],
       "tasks": [
         {{{{
@@ -97,28 +98,13 @@ Please create a comprehensive development timeline in the following JSON format:
           "milestone_id": "milestone_1",
           "title": "Milestone title",
           "description": "What this milestone represents",
-          "target_date": "YYYY-MM-DD",
           "completion_criteria": ["Criterion 1", "Criterion 2"],
           "deliverables": ["Deliverable 1", "Deliverable 2"]
         }}}}
       ],
-      "estimated_hours_per_week": 10,
       "success_metrics": ["Metric 1", "Metric 2"]
     }}}}
   ],
-  "weekly_breakdown": [
-    {{{{
-      "week_number": 1,
-      "start_date": "YYYY-MM-DD",
-      "end_date": "YYYY-MM-DD",
-      "phase": "Phase 1: Foundation",
-      "focus": "What to focus on this week",
-      "tasks": ["Task title 1", "Task title 2"],
-      "estimated_hours": 10,
-      "key_deliverable": "Main thing to complete this week"
-    }}}}
-  ],
-  "critical_path": ["task_1", "task_3", "task_5"],
   "flexibility_notes": [
     "What can be adjusted if timeline is too aggressive",
     "Alternative approaches if certain tasks take longer"
@@ -159,25 +145,19 @@ Organize the timeline into 3-4 logical phases:
 - Each task should be **specific and actionable**
 - Include **realistic time estimates** (don't underestimate)
 - Reference **gap_ids** from the gap analysis
-- Specify **dependencies** between tasks
+- Specify **dependencies** between tasks; tasks are scheduled in dependency order
 - Provide **success criteria** for completion
 - List **resources** needed (courses, tutorials, etc.)
 
-### Weekly Breakdown
-- Provide a **week-by-week plan** for the entire timeline
-- Keep weekly hours **realistic** (10-15 hours for students with classes)
-- Identify the **key deliverable** for each week
-- Balance **different types of activities** (learning, building, practicing)
-
 ### Timeline Realism
 - **If timeline is too short**: Focus on highest-priority gaps only
 - **If timeline is adequate**: Cover high and medium priority gaps
 - **If timeline is generous**: Include low priority gaps and stretch goals
-- Always include **buffer time** for unexpected challenges
+- Keep the total task hours within the **total hours budget**, leaving some buffer
 - Build in **review and iteration** time for projects
 
-### Critical Path
-- Identify tasks that **must be completed** to be competitive
+### Priorities
+- Mark tasks that **must be completed** to be competitive as high priority
 - These are typically:
   - High-priority technical skills for the role
   - At least one substantial portfolio project
@@ -200,15 +180,12 @@ Organize the timeline into 3-4 logical phases:
 3. **CRITICAL**: Ensure all JSON arrays and objects are properly closed
 4. All task_ids, milestone_ids, and phase_ids must be unique
 5. Gap_ids must reference actual gaps from the gap analysis
-6. Weekly breakdown should cover all weeks from start to deadline
-7. Total hours should sum up realistically across all tasks
-8. Hours per week should be realistic for a student (typically 10-15 hours)
-9. Phase dates should be sequential and not overlap
-10. Success criteria should be measurable and specific
-11. Dependencies should only reference task_ids that exist
-12. Critical path should include 5-10 most important tasks
-13. If deadline is very soon (< 4 weeks), focus only on highest-impact activities
-14. If deadline is far (> 12 weeks), include more comprehensive skill development
+6. Total hours should sum up realistically across all tasks
+7. List phases and their tasks in the order they should be worked on
+8. Success criteria should be measurable and specific
+9. Dependencies should only reference task_ids that exist
+10. If deadline is very soon (< 4 weeks), focus only on highest-impact activities
+11. If deadline is far (> 12 weeks), include more comprehensive skill development
 """
 
 
@@ -219,10 +196,13 @@ def create_timeline_prompt(
     start_date: str,
     weeks_available: int,
     hours_per_week: int = 12,
+    token_budget: int | None = None,
 ) -> str:
     """
     Create a prompt for timeline generation.
     
+    Gaps are filled within the token budget, high priority gaps first.
+    
     Args:
         gap_analysis: Gap analysis results
         role_description: Job role description
@@ -230,69 +210,48 @@ def create_timeline_prompt(
         start_date: Start date (ISO date string)
         weeks_available: Number of weeks available
         hours_per_week: Recommended hours per week
+        token_budget: Input-token budget, defaults to the configured timeline budget
         
     Returns:
         Formatted prompt string
     """
-    # Extract summary data
     summary = gap_analysis.get("summary", {})
-    total_gaps = summary.get("total_gaps", 0)
-    high_priority_count = summary.get("high_priority_count", 0)
-    medium_priority_count = summary.get("medium_priority_count", 0)
-    low_priority_count = summary.get("low_priority_count", 0)
-    estimated_preparation_time = summary.get("estimated_preparation_time", "Unknown")
-    overall_assessment = summary.get("overall_assessment", "No assessment available")
-    
-    # Extract technical gaps summary
-    technical_gaps = gap_analysis.get("technical_gaps", [])
-    technical_gaps_count = len(technical_gaps)
-    technical_gaps_summary = "\n".join([
-        f"- [{gap.get('priority', 'medium').upper()}] {gap.get('title', 'Untitled')}: {gap.get('description', 'No description')}"
-        for gap in technical_gaps[:5]  # Limit to top 5
-    ]) or "None identified"
-    
-    # Extract experience gaps summary
-    experience_gaps = gap_analysis.get("experience_gaps", [])
-    experience_gaps_count = len(experience_gaps)
-    experience_gaps_summary = "\n".join([
-        f"- [{gap.get('priority', 'medium').upper()}] {gap.get('title', 'Untitled')}: {gap.get('description', 'No description')}"
-        for gap in experience_gaps[:5]
-    ]) or "None identified"
-    
-    # Extract company fit gaps summary
-    company_fit_gaps = gap_analysis.get("company_fit_gaps", [])
-    company_fit_gaps_count = len(company_fit_gaps)
-    company_fit_gaps_summary = "\n".join([
-        f"- [{gap.get('priority', 'medium').upper()}] {gap.get('title', 'Untitled')}: {gap.get('description', 'No description')}"
-        for gap in company_fit_gaps[:5]
-    ]) or "None identified"
+    budget = PromptBudget("timeline", token_budget)
+    gap_counts = {}
     
-    # Extract resume optimization gaps summary
-    resume_gaps = gap_analysis.get("resume_optimization_gaps", [])
-    resume_gaps_count = len(resume_gaps)
-    resume_gaps_summary = "\n".join([
-        f"- [{gap.get('priority', 'medium').upper()}] {gap.get('title', 'Untitled')}: {gap.get('description', 'No description')}"
-        for gap in resume_gaps[:5]
-    ]) or "None identified"
+    for category, placeholder in [
+        ("technical_gaps", "technical_gaps_summary"),
+        ("experience_gaps", "experience_gaps_summary"),
+        ("company_fit_gaps", "company_fit_gaps_summary"),
+        ("resume_optimization_gaps", "resume_gaps_summary"),
+    ]:
+        gaps = gap_analysis.get(category, [])
+        gap_counts[category] = len(gaps)
+        section = budget.section(placeholder)
+        for index, gap in enumerate(gaps):
+            priority = gap.get("priority", "medium")
+            section.add(
+                f"- [{priority.upper()}] {gap.get('title', 'Untitled')}: {gap.get('description', 'No description')}",
+                priority=10 * GAP_PRIORITY_RANK.get(priority, 1) + index,
+            )
     
-    return TIMELINE_GENERATION_PROMPT.format(
-        total_gaps=total_gaps,
-        high_priority_count=high_priority_count,
-        medium_priority_count=medium_priority_count,
-        low_priority_count=low_priority_count,
-        estimated_preparation_time=estimated_preparation_time,
-        overall_assessment=overall_assessment,
-        technical_gaps_count=technical_gaps_count,
-        technical_gaps_summary=technical_gaps_summary,
-        experience_gaps_count=experience_gaps_count,
-        experience_gaps_summary=experience_gaps_summary,
-        company_fit_gaps_count=company_fit_gaps_count,
-        company_fit_gaps_summary=company_fit_gaps_summary,
-        resume_gaps_count=resume_gaps_count,
-        resume_gaps_summary=resume_gaps_summary,
+    return budget.render(
+        TIMELINE_GENERATION_PROMPT,
+        empty="None identified",
+        total_gaps=summary.get("total_gaps", 0),
+        high_priority_count=summary.get("high_priority_count", 0),
+        medium_priority_count=summary.get("medium_priority_count", 0),
+        low_priority_count=summary.get("low_priority_count", 0),
+        estimated_preparation_time=summary.get("estimated_preparation_time", "Unknown"),
+        overall_assessment=summary.get("overall_assessment", "No assessment available"),
+        technical_gaps_count=gap_counts["technical_gaps"],
+        experience_gaps_count=gap_counts["experience_gaps"],
+        company_fit_gaps_count=gap_counts["company_fit_gaps"],
+        resume_gaps_count=gap_counts["resume_optimization_gaps"],
         target_deadline=target_deadline,
         weeks_available=weeks_available,
         hours_per_week=hours_per_week,
+        total_hours_budget=weeks_available * hours_per_week,
         role_description=role_description,
         start_date=start_date,
     )
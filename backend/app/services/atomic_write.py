@@ -0,0 +1,111 @@
+"""
+Atomic file writes: write to a temporary file, optionally fsync, then rename.
+
+Readers either see the previous complete file or the new complete file, never
+a partially written one.
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# Durability levels, from fastest to safest:
+#   none - rely on the OS to flush; atomic against concurrent readers only
+#   file - fsync the file before renaming; survives a crash of this process
+#   full - also fsync the directory so the rename itself survives power loss
+DURABILITY_LEVELS = ("none", "file", "full")
+
+# mkstemp creates files readable by the owner only; new files get the mode
+# open() would give them instead. The umask can only be read by setting it,
+# so it is read once at import rather than on every write.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def get_durability(durability: str | None = None) -> str:
+    """
+    Resolve the write durability level.
+
+    Args:
+        durability: Level name, or None to read the SESSION_WRITE_DURABILITY
+            environment variable (default "file")
+
+    Returns:
+        Durability level name
+
+    Raises:
+        ValueError: If the level is unknown
+    """
+    durability = (durability or os.getenv("SESSION_WRITE_DURABILITY", "file")).lower()
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(
+            f"Invalid durability level: {durability}. "
+            f"Must be one of: {', '.join(DURABILITY_LEVELS)}"
+        )
+    return durability
+
+
+def atomic_write_bytes(path: str | Path, data: bytes, durability: str | None = None) -> Path:
+    """
+    Atomically replace a file's contents.
+
+    The data is written to a temporary file in the destination directory and
+    renamed over the destination, which is atomic on POSIX and Windows. The
+    file keeps the destination's permissions, or gets the umask's default
+    permissions if it is new.
+
+    Args:
+        path: Destination file path
+        data: Bytes to write
+        durability: Durability level (none, file, full); defaults to
+            SESSION_WRITE_DURABILITY
+
+    Returns:
+        Destination path
+    """
+    path = Path(path)
+    durability = get_durability(durability)
+
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(temp_path, _file_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if durability == "full":
+        _fsync_directory(path.parent)
+
+    return path
+
+
+def _file_mode(path: Path) -> int:
+    """Permissions for a file written to path: the existing file's, or the default."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Flush a directory entry update to disk, where the platform allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,193 @@
+"""
+Local, deterministic ATS (Applicant Tracking System) scoring.
+
+Scores keyword coverage of the role description by the resume and applies a
+formatting heuristic, in milliseconds and without the LLM. The same inputs
+always produce the same score.
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict
+
+from app.services.skill_taxonomy import SkillTaxonomy, get_skill_taxonomy
+from app.services.tenet_retrieval import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Share of the ATS score from keyword coverage; the rest is formatting
+KEYWORD_WEIGHT = 0.7
+
+# Maximum number of role keywords considered
+MAX_KEYWORDS = 30
+
+# Skills count double towards coverage compared to plain role terms
+SKILL_WEIGHT = 2
+
+# Words every posting uses, which say nothing about the role
+GENERIC_ROLE_WORDS = """
+    ability able experience experienced familiarity intern interns internship
+    knowledge looking plus preferred qualifications required requirements
+    responsibilities role skills strong student students team understanding
+    work working year years
+""".split()
+
+_WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#./-]*")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(\+?\d[\d\s().-]{8,}\d)")
+_QUANTIFIED = re.compile(r"\d+(\.\d+)?\s*(%|x\b|k\b|\+|users|ms\b|hours)", re.IGNORECASE)
+_SECTIONS = {
+    "education": re.compile(r"^\W*education\b", re.IGNORECASE | re.MULTILINE),
+    "experience": re.compile(r"^\W*(work |professional )?experience\b", re.IGNORECASE | re.MULTILINE),
+    "skills": re.compile(r"^\W*(technical )?skills\b", re.IGNORECASE | re.MULTILINE),
+    "projects": re.compile(r"^\W*projects?\b", re.IGNORECASE | re.MULTILINE),
+}
+
+
+class ATSScorer:
+    """Scores resumes against role descriptions without the LLM."""
+
+    def __init__(self, taxonomy: SkillTaxonomy | None = None):
+        """
+        Initialize the scorer.
+
+        Args:
+            taxonomy: Skill taxonomy used to recognize skills, defaults to
+                the shared taxonomy
+        """
+        self.taxonomy = taxonomy or get_skill_taxonomy()
+        self._generic_terms = set(tokenize(" ".join(GENERIC_ROLE_WORDS)))
+
+    def extract_skills(self, text: str) -> list[str]:
+        """
+        Find known skills in text, normalized to their canonical names.
+
+        Args:
+            text: Resume or role text
+
+        Returns:
+            Canonical skill names in order of first appearance
+        """
+        return self.taxonomy.extract(text)
+
+    def extract_keywords(self, role_description: str) -> tuple[list[str], list[str]]:
+        """
+        Extract the keywords an ATS would screen a role description for.
+
+        Args:
+            role_description: Job role description
+
+        Returns:
+            Tuple of (canonical skills, other repeated role terms)
+        """
+        skills = self.extract_skills(role_description)
+        excluded = {term for skill in skills for term in tokenize(skill)}
+        excluded.update(self._generic_terms)
+
+        # Terms repeated in the posting are what it emphasizes; report each
+        # by the first word form it appeared as rather than by its stem
+        counts: Counter = Counter()
+        surface_forms: dict[str, str] = {}
+        for word in _WORD.findall(role_description.lower()):
+            for term in tokenize(word):
+                if len(term) > 3 and not term.isdigit() and term not in excluded:
+                    counts[term] += 1
+                    surface_forms.setdefault(term, word.strip(".-/"))
+        terms = [surface_forms[term] for term, count in counts.most_common() if count >= 2]
+
+        skills = skills[:MAX_KEYWORDS]
+        return skills, terms[:MAX_KEYWORDS - len(skills)]
+
+    def score(self, resume_text: str, role_description: str) -> Dict[str, Any]:
+        """
+        Compute the ATS score of a resume for a role.
+
+        Args:
+            resume_text: Resume text
+            role_description: Job role description
+
+        Returns:
+            Dictionary with score, keyword coverage, matched and missing
+            keywords, and formatting score and notes
+        """
+        skills, terms = self.extract_keywords(role_description)
+        resume_skills = set(self.extract_skills(resume_text))
+        resume_terms = set(tokenize(resume_text))
+        term_stems = {term: tokenize(term) for term in terms}
+
+        matched, missing = [], []
+        matched_weight = total_weight = 0
+        for keyword, present, weight in (
+            [(skill, skill in resume_skills, SKILL_WEIGHT) for skill in skills]
+            + [(term, set(term_stems[term]) <= resume_terms, 1) for term in terms]
+        ):
+            total_weight += weight
+            if present:
+                matched.append(keyword)
+                matched_weight += weight
+            else:
+                missing.append(keyword)
+
+        coverage = round(100 * matched_weight / total_weight) if total_weight else 0
+        formatting_score, formatting_notes = self.score_formatting(resume_text)
+        score = round(KEYWORD_WEIGHT * coverage + (1 - KEYWORD_WEIGHT) * formatting_score)
+
+        return {
+            "score": score,
+            "keyword_coverage": coverage,
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "formatting_score": formatting_score,
+            "formatting_notes": formatting_notes,
+        }
+
+    def score_formatting(self, resume_text: str) -> tuple[int, str]:
+        """
+        Score how well a resume's structure survives ATS parsing.
+
+        Checks contact details, standard section headings, quantified
+        achievements and overall length.
+
+        Args:
+            resume_text: Resume text
+
+        Returns:
+            Tuple of (score 0-100, notes)
+        """
+        score = 0
+        notes = []
+
+        if _EMAIL.search(resume_text):
+            score += 15
+        else:
+            notes.append("No email address found")
+        if _PHONE.search(resume_text):
+            score += 10
+        else:
+            notes.append("No phone number found")
+
+        missing_sections = [name for name, pattern in _SECTIONS.items() if not pattern.search(resume_text)]
+        score += 10 * (len(_SECTIONS) - len(missing_sections))
+        if missing_sections:
+            notes.append(f"Missing standard section headings: {', '.join(missing_sections)}")
+
+        quantified = sum(1 for line in resume_text.splitlines() if _QUANTIFIED.search(line))
+        if quantified >= 3:
+            score += 15
+        elif quantified:
+            score += 8
+            notes.append("Few quantified achievements")
+        else:
+            notes.append("No quantified achievements")
+
+        word_count = len(resume_text.split())
+        if 250 <= word_count <= 1000:
+            score += 20
+        elif 150 <= word_count <= 1500:
+            score += 10
+            notes.append(f"Resume length ({word_count} words) is outside the typical 250-1000 words")
+        else:
+            notes.append(f"Resume length ({word_count} words) is far from the typical 250-1000 words")
+
+        return score, "; ".join(notes) if notes else "Standard, ATS-friendly structure"
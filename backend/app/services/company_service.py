@@ -1,55 +1,330 @@
 """
 Company service for managing company data and tenets.
+
+Companies are defined by JSON manifests in data/company-manifests/. Each
+manifest holds one company object or a list of them; the tenets text lives
+in data/company-tenets/ and is referenced by the manifest's tenets_file.
 """
 
+import json
+import logging
 import os
+import threading
+import time
+from bisect import bisect_left
 from pathlib import Path
 
-from app.models.company import Company
+from app.models.company import Company, CompaniesResponse
+from app.services.tenet_retrieval import get_tenet_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_DIR = "data/company-manifests"
+DEFAULT_TENETS_DIR = "data/company-tenets"
+
+
+class CompanyIndex:
+    """
+    Immutable snapshot of the loaded companies.
+
+    Companies keep manifest order: manifest files by name, then the order
+    within each file. Lookups by ID are dictionary hits and prefix searches
+    bisect a sorted list of lowercased search keys.
+    """
+
+    def __init__(self, companies: list[Company]):
+        """
+        Build the index.
+
+        Args:
+            companies: Loaded companies, in manifest order
+        """
+        self.companies = list(companies)
+        self.by_id = {company.id: company for company in self.companies}
+        self.by_lower_id = {}
+        for company in self.companies:
+            self.by_lower_id.setdefault(company.id.lower(), company)
+
+        # (search key, position in self.companies), sorted by key
+        keys = set()
+        for position, company in enumerate(self.companies):
+            for key in (company.id, company.name, company.display_name):
+                keys.add((key.lower(), position))
+        self.search_keys = sorted(keys)
+
+        self.companies_json = CompaniesResponse(
+            companies=self.companies, total=len(self.companies)
+        ).model_dump_json().encode("utf-8")
+
+    def search(self, prefix: str) -> list[Company]:
+        """
+        Find companies whose ID, name or display name starts with a prefix.
+
+        Args:
+            prefix: Case-insensitive prefix
+
+        Returns:
+            Matching companies, in manifest order
+        """
+        prefix = prefix.lower()
+        positions = set()
+        start = bisect_left(self.search_keys, (prefix, -1))
+        for key, position in self.search_keys[start:]:
+            if not key.startswith(prefix):
+                break
+            positions.add(position)
+        return [self.companies[position] for position in sorted(positions)]
+
+
+class CompanyRegistry:
+    """
+    Process-wide registry of companies and their tenets.
+
+    The manifest directory is re-scanned at most once per reload interval and
+    only re-parsed when a manifest was added, removed or modified. Tenets are
+    preloaded and re-read only when their file's modification time changes.
+    """
+
+    def __init__(
+        self,
+        manifest_dir: str | Path = DEFAULT_MANIFEST_DIR,
+        tenets_dir: str | Path = DEFAULT_TENETS_DIR,
+        reload_interval: float | None = None,
+    ):
+        """
+        Initialize the registry and load all manifests and tenets.
+
+        Args:
+            manifest_dir: Directory containing company manifest files
+            tenets_dir: Directory containing company tenets files
+            reload_interval: Minimum seconds between manifest directory scans.
+                Defaults to the COMPANY_RELOAD_INTERVAL environment variable
+                (default 5); 0 checks on every access.
+        """
+        self.manifest_dir = Path(manifest_dir)
+        self.tenets_dir = Path(tenets_dir)
+        if reload_interval is None:
+            reload_interval = float(os.getenv("COMPANY_RELOAD_INTERVAL", "5"))
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._index = CompanyIndex([])
+        self._signature: tuple | None = None
+        self._last_check = 0.0
+        # company_id -> (tenets path, mtime, tenets text)
+        self._tenets: dict[str, tuple[Path, float, str]] = {}
+
+        self.reload(force=True)
+        for company_id in self._index.by_id:
+            self.get_tenets(company_id)
+        logger.info(
+            f"Loaded tenets for {len(self._tenets)} of {len(self._index.companies)} companies"
+        )
+
+    @property
+    def companies(self) -> list[Company]:
+        """All companies, in manifest order."""
+        return list(self._current().companies)
+
+    @property
+    def companies_json(self) -> bytes:
+        """Pre-serialized CompaniesResponse listing every company."""
+        return self._current().companies_json
+
+    def get_company(self, company_id: str) -> Company | None:
+        """Look up a company by ID."""
+        return self._current().by_id.get(company_id)
+
+    def find_company(self, company_id: str) -> Company | None:
+        """
+        Look up a company by ID as given, falling back to a case-insensitive match.
+
+        Args:
+            company_id: Company identifier, possibly in a different case
+
+        Returns:
+            Company whose manifest ID matches, or None if not found
+        """
+        index = self._current()
+        return index.by_id.get(company_id) or index.by_lower_id.get(company_id.lower())
+
+    def search(
+        self, query: str | None = None, offset: int = 0, limit: int | None = None
+    ) -> tuple[list[Company], int]:
+        """
+        List companies, optionally filtered by prefix and paginated.
+
+        Args:
+            query: Case-insensitive prefix of the company ID or name
+            offset: Number of matching companies to skip
+            limit: Maximum number of companies to return (None for all)
+
+        Returns:
+            Tuple of (page of companies, total number of matches)
+        """
+        index = self._current()
+        matches = index.search(query) if query else index.companies
+        end = None if limit is None else offset + limit
+        return matches[offset:end], len(matches)
+
+    def get_tenets(self, company_id: str) -> str | None:
+        """
+        Get a company's tenets, re-reading the file only if it changed.
+
+        Args:
+            company_id: Company identifier
+
+        Returns:
+            Company tenets as string, or None if not found
+        """
+        company = self.get_company(company_id)
+        if company is None:
+            return None
+
+        tenets_path = self.tenets_dir / company.tenets_file
+        try:
+            mtime = tenets_path.stat().st_mtime
+        except OSError:
+            self._tenets.pop(company_id, None)
+            return None
+
+        cached = self._tenets.get(company_id)
+        if cached is not None and cached[:2] == (tenets_path, mtime):
+            return cached[2]
+
+        with self._lock:
+            cached = self._tenets.get(company_id)
+            if cached is not None and cached[:2] == (tenets_path, mtime):
+                return cached[2]
+            try:
+                tenets = tenets_path.read_text(encoding="utf-8")
+            except Exception:
+                return None
+            self._tenets[company_id] = (tenets_path, mtime, tenets)
+            # Build the retrieval index now rather than on the first analysis
+            get_tenet_index(tenets)
+            logger.info(f"Loaded tenets for {company_id} from {tenets_path}")
+            return tenets
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-load the manifests if any of them changed.
+
+        Args:
+            force: Re-parse the manifests even if nothing changed
+
+        Returns:
+            True if the company index was rebuilt
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            signature = self._scan_manifests()
+            if not force and signature == self._signature:
+                return False
+
+            companies = {}
+            for file_name, _, _ in signature:
+                for company in self._read_manifest(self.manifest_dir / file_name):
+                    if company.id in companies:
+                        logger.warning(f"Duplicate company ID '{company.id}' in {file_name}")
+                    companies[company.id] = company
+
+            self._index = CompanyIndex(list(companies.values()))
+            self._signature = signature
+            for company_id in list(self._tenets):
+                if company_id not in companies:
+                    del self._tenets[company_id]
+
+        logger.info(f"Loaded {len(companies)} companies from {self.manifest_dir}")
+        return True
+
+    def _current(self) -> CompanyIndex:
+        """Current index, re-scanning the manifests once the interval has passed."""
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Failed to reload company manifests: {str(e)}")
+        return self._index
+
+    def _scan_manifests(self) -> tuple:
+        """Name, mtime and size of every manifest file, used to detect changes."""
+        try:
+            entries = list(os.scandir(self.manifest_dir))
+        except OSError:
+            return ()
+
+        signature = []
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(signature))
+
+    def _read_manifest(self, path: Path) -> list[Company]:
+        """Parse one manifest file; invalid manifests are logged and skipped."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = [data]
+            return [Company(**entry) for entry in data]
+        except Exception as e:
+            logger.error(f"Skipping invalid company manifest {path}: {str(e)}")
+            return []
+
+
+_registries: dict[tuple[Path, Path], CompanyRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_company_registry(
+    manifest_dir: str | Path = DEFAULT_MANIFEST_DIR,
+    tenets_dir: str | Path = DEFAULT_TENETS_DIR,
+) -> CompanyRegistry:
+    """
+    Get the shared registry for a pair of directories, creating it on first use.
+
+    Args:
+        manifest_dir: Directory containing company manifest files
+        tenets_dir: Directory containing company tenets files
+
+    Returns:
+        Shared CompanyRegistry instance
+    """
+    key = (Path(manifest_dir).resolve(), Path(tenets_dir).resolve())
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = CompanyRegistry(manifest_dir, tenets_dir)
+                _registries[key] = registry
+    return registry
 
 
 class CompanyService:
     """Service for managing company information and tenets."""
 
-    # Company data configuration
-    COMPANIES = [
-        {
-            "id": "amazon",
-            "name": "amazon",
-            "display_name": "Amazon",
-            "color": "#FF9900",  # Amazon orange
-            "logo_url": "/logos/amazon.svg",
-            "tenets_file": "amazon-leadership-principles.txt",
-            "description": "Evaluated against Amazon's 16 Leadership Principles",
-        },
-        {
-            "id": "meta",
-            "name": "meta",
-            "display_name": "Meta",
-            "color": "#0081FB",  # Meta blue
-            "logo_url": "/logos/meta.svg",
-            "tenets_file": "meta-core-values.txt",
-            "description": "Evaluated against Meta's Core Values and cultural principles",
-        },
-        {
-            "id": "google",
-            "name": "google",
-            "display_name": "Google",
-            "color": "#4285F4",  # Google blue
-            "logo_url": "/logos/google.svg",
-            "tenets_file": "google-principles.txt",
-            "description": "Evaluated against Google's principles and 'Googleyness'",
-        },
-    ]
-
-    def __init__(self, tenets_dir: str = "data/company-tenets"):
+    def __init__(
+        self,
+        tenets_dir: str = DEFAULT_TENETS_DIR,
+        manifest_dir: str = DEFAULT_MANIFEST_DIR,
+    ):
         """
         Initialize the company service.
 
         Args:
             tenets_dir: Directory containing company tenets files
+            manifest_dir: Directory containing company manifest files
         """
         self.tenets_dir = Path(tenets_dir)
+        self.manifest_dir = Path(manifest_dir)
+
+    @property
+    def registry(self) -> CompanyRegistry:
+        """Shared registry, loaded on first use rather than at import."""
+        return get_company_registry(self.manifest_dir, self.tenets_dir)
 
     def get_all_companies(self) -> list[Company]:
         """
@@ -58,7 +333,32 @@ class CompanyService:
         Returns:
             List of Company objects
         """
-        return [Company(**company_data) for company_data in self.COMPANIES]
+        return self.registry.companies
+
+    def get_companies_json(self) -> bytes:
+        """
+        Get the pre-serialized response listing all companies.
+
+        Returns:
+            JSON-encoded CompaniesResponse
+        """
+        return self.registry.companies_json
+
+    def search_companies(
+        self, query: str | None = None, offset: int = 0, limit: int | None = None
+    ) -> tuple[list[Company], int]:
+        """
+        Search companies by ID or name prefix, with pagination.
+
+        Args:
+            query: Case-insensitive prefix to match
+            offset: Number of matches to skip
+            limit: Maximum number of companies to return (None for all)
+
+        Returns:
+            Tuple of (page of companies, total number of matches)
+        """
+        return self.registry.search(query, offset, limit)
 
     def get_company_by_id(self, company_id: str) -> Company | None:
         """
@@ -70,14 +370,11 @@ class CompanyService:
         Returns:
             Company object if found, None otherwise
         """
-        for company_data in self.COMPANIES:
-            if company_data["id"] == company_id:
-                return Company(**company_data)
-        return None
+        return self.registry.get_company(company_id)
 
     def get_company_tenets(self, company_id: str) -> str | None:
         """
-        Load company tenets from file.
+        Load company tenets, served from the shared registry's cache.
 
         Args:
             company_id: Company identifier
@@ -85,18 +382,7 @@ class CompanyService:
         Returns:
             Company tenets as string, or None if not found
         """
-        company = self.get_company_by_id(company_id)
-        if not company:
-            return None
-
-        tenets_path = self.tenets_dir / company.tenets_file
-        if not tenets_path.exists():
-            return None
-
-        try:
-            return tenets_path.read_text(encoding="utf-8")
-        except Exception:
-            return None
+        return self.registry.get_tenets(company_id)
 
     def validate_company_id(self, company_id: str) -> bool:
         """
@@ -108,4 +394,4 @@ class CompanyService:
         Returns:
             True if valid, False otherwise
         """
-        return any(c["id"] == company_id for c in self.COMPANIES)
+        return self.registry.get_company(company_id) is not None
@@ -0,0 +1,155 @@
+"""
+Compression codecs for session artifacts.
+
+Compressed files carry the codec's extension after the serializer's
+(e.g. ``timeline.json.gz``). Reading always picks the codec from the file
+extension and decompresses as a stream.
+"""
+
+import gzip
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+
+class Codec:
+    """Base class for compression codecs. The base codec stores data as-is."""
+
+    name = "none"
+    extension = ""
+    content_encoding = None
+
+    def __init__(self, level: int | None = None):
+        """
+        Initialize the codec.
+
+        Args:
+            level: Compression level, or None for the codec's default
+        """
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress data.
+
+        Args:
+            data: Uncompressed bytes
+
+        Returns:
+            Compressed bytes
+        """
+        return data
+
+    def open(self, file_path: Path) -> BinaryIO:
+        """
+        Open a file for streamed, decompressed reading.
+
+        Args:
+            file_path: Path to a file written by this codec
+
+        Returns:
+            Binary file object yielding decompressed bytes
+        """
+        return open(file_path, "rb")
+
+
+class GzipCodec(Codec):
+    """gzip compression from the standard library."""
+
+    name = "gzip"
+    extension = ".gz"
+    content_encoding = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps output deterministic for identical documents
+        return gzip.compress(data, compresslevel=self.level or 6, mtime=0)
+
+    def open(self, file_path: Path) -> BinaryIO:
+        return gzip.open(file_path, "rb")
+
+
+class ZstdCodec(Codec):
+    """Zstandard compression using the zstandard package."""
+
+    name = "zstd"
+    extension = ".zst"
+    content_encoding = "zstd"
+
+    def __init__(self, level: int | None = None):
+        import zstandard
+
+        super().__init__(level)
+        self._zstandard = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=level or 3)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def open(self, file_path: Path) -> BinaryIO:
+        decompressor = self._zstandard.ZstdDecompressor()
+        return decompressor.stream_reader(open(file_path, "rb"), closefd=True)
+
+
+CODECS = {
+    Codec.name: Codec,
+    GzipCodec.name: GzipCodec,
+    ZstdCodec.name: ZstdCodec,
+}
+
+
+def get_codec(name: str | None = None, level: int | None = None) -> Codec:
+    """
+    Create a compression codec by name.
+
+    Args:
+        name: Codec name (none, gzip, zstd). Defaults to the
+            SESSION_COMPRESSION environment variable, or "none".
+        level: Compression level. Defaults to the
+            SESSION_COMPRESSION_LEVEL environment variable, if set.
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the codec is unknown or its library isn't installed
+    """
+    name = (name or os.getenv("SESSION_COMPRESSION", "none")).lower()
+    if level is None and os.getenv("SESSION_COMPRESSION_LEVEL"):
+        level = int(os.getenv("SESSION_COMPRESSION_LEVEL"))
+
+    if name not in CODECS:
+        raise ValueError(
+            f"Unknown compression codec: {name}. Must be one of: {', '.join(CODECS)}"
+        )
+
+    try:
+        return _create_codec(name, level)
+    except ImportError as e:
+        raise ValueError(f"Compression codec '{name}' requires {e.name}, which is not installed") from e
+
+
+def get_codec_for_extension(extension: str) -> Codec | None:
+    """
+    Find a codec able to read files with the given extension.
+
+    Args:
+        extension: Codec extension including the dot, or "" for uncompressed
+
+    Returns:
+        Codec instance, or None if no installed codec handles it
+    """
+    for name, codec_class in CODECS.items():
+        if codec_class.extension != extension:
+            continue
+        try:
+            return _create_codec(name, None)
+        except ImportError:
+            return None
+    return None
+
+
+@lru_cache(maxsize=None)
+def _create_codec(name: str, level: int | None) -> Codec:
+    """Create (once per level) the codec registered under ``name``."""
+    return CODECS[name](level)
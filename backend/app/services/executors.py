@@ -0,0 +1,75 @@
+"""
+Dedicated thread pools for blocking work awaited from the event loop.
+
+asyncio.to_thread runs everything on the loop's default executor, which has
+min(32, CPUs + 4) threads shared by file I/O, the session sweeper and the
+readiness probes. LLM calls hold a thread for the whole response, and
+resume parsing is CPU-bound, so each gets a bounded pool of its own: a
+burst of analyses then waits for its pool instead of starving parsing, or
+the probes, of threads.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_parser_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_llm_threads() -> int:
+    """
+    Get the number of threads LLM calls run on.
+
+    Sized to the calls in flight readiness allows (READY_MAX_LLM_IN_FLIGHT,
+    default 32), so that limit can actually be reached; 0 there falls back
+    to the default of 32.
+    """
+    return int(os.getenv("READY_MAX_LLM_IN_FLIGHT", "32")) or 32
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Get the thread pool LLM calls run on, creating it on first use."""
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = ThreadPoolExecutor(max_workers=get_llm_threads(), thread_name_prefix="llm")
+    return _llm_executor
+
+
+def get_parser_threads() -> int:
+    """Get the number of threads resume parsing runs on (PARSER_THREADS, default 4)."""
+    return int(os.getenv("PARSER_THREADS", "4"))
+
+
+def get_parser_executor() -> ThreadPoolExecutor:
+    """Get the thread pool resume parsing runs on, creating it on first use."""
+    global _parser_executor
+    if _parser_executor is None:
+        _parser_executor = ThreadPoolExecutor(max_workers=get_parser_threads(), thread_name_prefix="parser")
+    return _parser_executor
+
+
+async def run_in_executor(executor: ThreadPoolExecutor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function on a thread pool and wait for it.
+
+    Like asyncio.to_thread, the function runs in a copy of the caller's
+    context, so metric labels and trace spans carry over to the thread.
+
+    Args:
+        executor: Pool to run on
+        func: Blocking function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        What func returns
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
@@ -0,0 +1,250 @@
+"""
+Deterministic fake LLM backend for offline benchmarks and tests.
+
+Selected with LLM_BACKEND=fake, it stands in for the Anthropic client inside
+LLMService, so retries, metrics and tracing run exactly as in production.
+Each call replays a recorded response for the analysis phase, recognised by
+its system prompt, after an injected delay; a configurable share of
+responses is cut short to exercise the JSON repair paths.
+
+Recordings are plain files named <phase>.json or <phase>.<n>.json holding
+the raw response text. Setting LLM_RECORD_DIR on a real run saves responses
+in this layout.
+"""
+
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from app.prompts import (
+    gap_analysis,
+    resume_analysis,
+    role_matching,
+    role_requirements,
+    timeline_generation,
+)
+from app.services.prompt_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+FAKE_RESPONSES_DIR = Path("data/fake-llm")
+
+# Analysis phase by the system prompt its service sends
+PHASE_SYSTEM_PROMPTS = {
+    resume_analysis.SYSTEM_PROMPT: "resume_analysis",
+    role_requirements.SYSTEM_PROMPT: "role_requirements",
+    role_matching.SYSTEM_PROMPT: "role_matching",
+    gap_analysis.SYSTEM_PROMPT: "gap_analysis",
+    timeline_generation.SYSTEM_PROMPT: "timeline",
+}
+UNKNOWN_PHASE = "unknown"
+
+
+def detect_phase(system_prompt: Optional[str]) -> str:
+    """
+    Identify the analysis phase of an LLM call from its system prompt.
+
+    Args:
+        system_prompt: System prompt sent with the call
+
+    Returns:
+        Phase name, or "unknown"
+    """
+    return PHASE_SYSTEM_PROMPTS.get(system_prompt or "", UNKNOWN_PHASE)
+
+
+def record_response(record_dir: str | Path, system_prompt: Optional[str], text: str) -> Path:
+    """
+    Save a real LLM response as a recording the fake backend can replay.
+
+    Args:
+        record_dir: Directory of recordings
+        system_prompt: System prompt sent with the call
+        text: Response text
+
+    Returns:
+        Path of the recording
+    """
+    record_dir = Path(record_dir)
+    record_dir.mkdir(parents=True, exist_ok=True)
+    phase = detect_phase(system_prompt)
+    path = record_dir / f"{phase}.{time.time_ns()}.json"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def load_recordings(responses_dir: str | Path) -> Dict[str, List[str]]:
+    """
+    Load recorded responses by phase.
+
+    Args:
+        responses_dir: Directory of <phase>.json and <phase>.<n>.json files
+
+    Returns:
+        Response texts by phase, in file name order
+    """
+    recordings: Dict[str, List[str]] = {}
+    for path in sorted(Path(responses_dir).glob("*.json")):
+        phase = path.name.split(".", 1)[0]
+        recordings.setdefault(phase, []).append(path.read_text(encoding="utf-8"))
+    return recordings
+
+
+@dataclass
+class FakeTextBlock:
+    """Text content block of a fake response."""
+
+    text: str
+    type: str = "text"
+
+
+@dataclass
+class FakeUsage:
+    """Token usage of a fake response."""
+
+    input_tokens: int
+    output_tokens: int
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+
+
+@dataclass
+class FakeMessage:
+    """Fake response with the attributes LLMService reads."""
+
+    content: List[FakeTextBlock]
+    usage: FakeUsage
+    model: str = ""
+    stop_reason: str = "end_turn"
+
+
+@dataclass
+class FakeMessages:
+    """The messages resource of the fake client."""
+
+    client: "FakeAnthropicClient"
+
+    def create(self, **kwargs) -> FakeMessage:
+        """Return the next recorded response; see FakeAnthropicClient.complete."""
+        return self.client.complete(**kwargs)
+
+
+@dataclass
+class FakeAnthropicClient:
+    """
+    Replays recorded responses in place of the Anthropic client.
+
+    Calls block for the injected latency like the real synchronous client.
+    Latency and truncation draw from a seeded generator, so a run is
+    reproducible.
+    """
+
+    recordings: Dict[str, List[str]]
+    latency: float = 0.0
+    jitter: float = 0.0
+    truncate_rate: float = 0.0
+    seed: int = 0
+    calls: int = 0
+    _cycles: Dict[str, Iterator[str]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self.messages = FakeMessages(self)
+        self._random = random.Random(self.seed)
+
+    def complete(
+        self,
+        model: str = "",
+        max_tokens: int = 4096,
+        system: str = "",
+        messages: Optional[List[Dict[str, str]]] = None,
+        **kwargs,
+    ) -> FakeMessage:
+        """
+        Produce the next recorded response for the call's phase.
+
+        Args:
+            model: Model name, echoed in the response
+            max_tokens: Output limit; longer recordings are cut to it
+            system: System prompt, used to identify the phase
+            messages: Conversation messages
+            **kwargs: Other API parameters, ignored
+
+        Returns:
+            Fake response
+
+        Raises:
+            ValueError: If there is no recording for the phase
+        """
+        phase = detect_phase(system)
+        with self._lock:
+            if phase not in self._cycles:
+                if not self.recordings.get(phase):
+                    raise ValueError(f"No recorded fake LLM response for phase: {phase}")
+                self._cycles[phase] = itertools.cycle(self.recordings[phase])
+            text = next(self._cycles[phase])
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            truncate_at = (
+                self._random.randint(1, max(1, len(text) - 1))
+                if self._random.random() < self.truncate_rate else None
+            )
+            self.calls += 1
+
+        stop_reason = "end_turn"
+        if truncate_at is not None:
+            text, stop_reason = text[:truncate_at], "max_tokens"
+        output_tokens = estimate_tokens(text)
+        if output_tokens > max_tokens:
+            text, stop_reason = text[:max_tokens * 4], "max_tokens"
+            output_tokens = max_tokens
+
+        if delay > 0:
+            time.sleep(delay)
+
+        prompt = "".join(message.get("content", "") for message in messages or [])
+        return FakeMessage(
+            content=[FakeTextBlock(text)],
+            usage=FakeUsage(
+                input_tokens=estimate_tokens(system) + estimate_tokens(prompt),
+                output_tokens=output_tokens,
+            ),
+            model=model,
+            stop_reason=stop_reason,
+        )
+
+
+def create_fake_client() -> FakeAnthropicClient:
+    """
+    Create the fake client configured in the environment.
+
+    FAKE_LLM_RESPONSES_DIR is the recordings directory (default
+    data/fake-llm), FAKE_LLM_LATENCY and FAKE_LLM_JITTER the fixed and
+    random extra delay per call in seconds, FAKE_LLM_TRUNCATE_RATE the share
+    of responses cut short, and FAKE_LLM_SEED the random seed.
+
+    Returns:
+        Fake client
+    """
+    responses_dir = os.getenv("FAKE_LLM_RESPONSES_DIR", str(FAKE_RESPONSES_DIR))
+    recordings = load_recordings(responses_dir)
+    if not recordings:
+        logger.warning(f"No fake LLM recordings found in {responses_dir}")
+
+    client = FakeAnthropicClient(
+        recordings=recordings,
+        latency=float(os.getenv("FAKE_LLM_LATENCY", "0")),
+        jitter=float(os.getenv("FAKE_LLM_JITTER", "0")),
+        truncate_rate=float(os.getenv("FAKE_LLM_TRUNCATE_RATE", "0")),
+        seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+    )
+    logger.info(
+        f"Fake LLM backend with {sum(len(texts) for texts in recordings.values())} recordings "
+        f"(latency {client.latency}s + up to {client.jitter}s, truncate rate {client.truncate_rate})"
+    )
+    return client
@@ -6,6 +6,8 @@ from typing import Tuple
 from fastapi import UploadFile, HTTPException
 import logging
 
+from app.services.atomic_write import atomic_write_bytes
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -83,8 +85,7 @@ class FileService:
         
         # Save file
         try:
-            with open(file_path, "wb") as f:
-                f.write(content)
+            atomic_write_bytes(file_path, content)
             logger.info(f"File saved: {file_path} ({file_size} bytes)")
             return str(file_path), file_size
         except Exception as e:
@@ -4,12 +4,15 @@ Gap analysis service that identifies skill/experience gaps and generates recomme
 
 import json
 import logging
-from pathlib import Path
 from typing import Dict, Any, Optional
-from json_repair import repair_json
 
+from app.services.lazy_imports import lazy_import
 from app.services.llm_service import LLMService
+from app.services.metrics import PARSE_FALLBACKS
+from app.services.session_store import SessionStore
 from app.services.company_service import CompanyService
+from app.services.tenet_retrieval import collect_text, select_relevant_tenets
+from app.services.tracing import traced
 from app.prompts.gap_analysis import (
     SYSTEM_PROMPT,
     create_gap_analysis_prompt,
@@ -17,6 +20,9 @@ from app.prompts.gap_analysis import (
 
 logger = logging.getLogger(__name__)
 
+# Imported on first use, to keep app startup fast
+json_repair = lazy_import("json_repair")
+
 
 class GapAnalysisService:
     """Service for identifying gaps and generating recommendations."""
@@ -24,6 +30,7 @@ class GapAnalysisService:
     def __init__(self):
         """Initialize gap analysis service."""
         self.llm_service = LLMService()
+        self.session_store = SessionStore()
         self.company_service = CompanyService()
         logger.info("GapAnalysisService initialized")
     
@@ -64,6 +71,12 @@ class GapAnalysisService:
             if not company_tenets:
                 raise Exception(f"Company tenets not found for: {company_id}")
             
+            # Keep only the principles relevant to this match and role
+            company_tenets = select_relevant_tenets(
+                company_tenets,
+                query=f"{role_description}\n{collect_text(match_data)}",
+            )
+            
             # Step 3: Create prompt for LLM
             prompt = create_gap_analysis_prompt(
                 match_analysis=match_data,
@@ -112,15 +125,12 @@ class GapAnalysisService:
             Match analysis dictionary or None if not found
         """
         try:
-            analysis_file = Path(f"data/sessions/{session_id}/match_analysis.json")
+            data = self.session_store.load(session_id, "match_analysis")
             
-            if not analysis_file.exists():
+            if data is None:
                 logger.warning(f"Match analysis not found for session: {session_id}")
                 return None
             
-            with open(analysis_file, "r") as f:
-                data = json.load(f)
-            
             logger.info(f"Loaded match analysis for session: {session_id}")
             return data
             
@@ -128,6 +138,7 @@ class GapAnalysisService:
             logger.error(f"Failed to load match analysis: {e}")
             return None
     
+    @traced("gap_analysis.parse_response")
     def _parse_llm_response(self, llm_response: str) -> Dict[str, Any]:
         """
         Parse LLM response into structured format using json-repair library.
@@ -166,8 +177,9 @@ class GapAnalysisService:
                 
                 try:
                     # Use json-repair library to fix malformed JSON
-                    repaired_json = repair_json(response)
+                    repaired_json = json_repair.repair_json(response)
                     parsed = json.loads(repaired_json)
+                    PARSE_FALLBACKS.inc(method="repair")
                     logger.info("Successfully repaired and parsed JSON")
                 except Exception as repair_error:
                     logger.error(f"JSON repair failed: {repair_error}")
@@ -181,8 +193,9 @@ class GapAnalysisService:
                         logger.info(f"Extracted JSON boundaries from {start_idx} to {end_idx}")
                         
                         try:
-                            repaired_json = repair_json(response)
+                            repaired_json = json_repair.repair_json(response)
                             parsed = json.loads(repaired_json)
+                            PARSE_FALLBACKS.inc(method="extract_repair")
                             logger.info("Successfully repaired extracted JSON")
                         except Exception:
                             logger.error("All JSON repair attempts failed")
@@ -227,6 +240,7 @@ class GapAnalysisService:
             logger.error(f"Unexpected error parsing response: {e}")
             raise ValueError(f"Failed to parse LLM response: {str(e)}") from e
     
+    @traced("gap_analysis.validate")
     def _validate_gap_data(self, gap_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate and enrich gap analysis data.
@@ -273,6 +287,7 @@ class GapAnalysisService:
         
         return gap_data
     
+    @traced("gap_analysis.save")
     def _save_gap_results(
         self,
         session_id: str,
@@ -286,14 +301,8 @@ class GapAnalysisService:
             gap_result: Gap analysis results
         """
         try:
-            # Create session directory
-            session_dir = Path(f"data/sessions/{session_id}")
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
             # Save gap analysis
-            output_file = session_dir / "gap_analysis.json"
-            with open(output_file, "w") as f:
-                json.dump(gap_result, f, indent=2)
+            output_file = self.session_store.save(session_id, "gap_analysis", gap_result)
             
             logger.info(f"Gap analysis results saved to: {output_file}")
             
@@ -312,15 +321,12 @@ class GapAnalysisService:
             Gap analysis results dictionary or None if not found
         """
         try:
-            output_file = Path(f"data/sessions/{session_id}/gap_analysis.json")
+            results = self.session_store.load(session_id, "gap_analysis")
             
-            if not output_file.exists():
+            if results is None:
                 logger.warning(f"Gap analysis results not found for session: {session_id}")
                 return None
             
-            with open(output_file, "r") as f:
-                results = json.load(f)
-            
             logger.info(f"Loaded gap analysis results for session: {session_id}")
             return results
             
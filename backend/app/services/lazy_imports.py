@@ -0,0 +1,89 @@
+"""
+Deferred imports of heavy dependencies.
+
+The Anthropic SDK, PyPDF2, python-docx and json-repair take a large share
+of the app's import time but are only needed once an analysis runs. Modules
+using them hold a LazyModule instead, so the app starts serving (and
+answering /api/health) before paying for them.
+"""
+
+import importlib
+import threading
+import types
+from typing import Any, Dict, List
+
+_lock = threading.Lock()
+# Stand-ins by module name, shared by every module deferring the same import
+_lazy_modules: Dict[str, "LazyModule"] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the stand-in without importing the module.
+
+        Args:
+            name: Absolute name of the module
+        """
+        super().__init__(name)
+        self._module = None
+        self._load_lock = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        """Import the module, once."""
+        if self._module is None:
+            with self._load_lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the module has been imported."""
+        return self._module is not None
+
+    def __getattr__(self, attribute: str) -> Any:
+        # Only called for attributes not set on the stand-in itself, so
+        # patching an attribute in tests shadows the real module's
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a module that is imported on first use instead of now.
+
+    Args:
+        name: Absolute name of the module
+
+    Returns:
+        Stand-in forwarding attribute access to the module
+    """
+    with _lock:
+        if name not in _lazy_modules:
+            _lazy_modules[name] = LazyModule(name)
+        return _lazy_modules[name]
+
+
+def load_lazy_modules() -> List[str]:
+    """
+    Import every deferred module now, such as during warm-up.
+
+    Returns:
+        Names of the modules imported by this call
+    """
+    loaded = []
+    for name, module in sorted(_lazy_modules.items()):
+        if not module.loaded:
+            module._load()
+            loaded.append(name)
+    return loaded
+
+
+def deferred_modules() -> List[str]:
+    """Get the names of deferred modules not imported yet."""
+    return sorted(name for name, module in _lazy_modules.items() if not module.loaded)
@@ -2,31 +2,55 @@
 LLM service for interacting with Anthropic Claude API.
 """
 
+import asyncio
 import os
 import logging
-import time
 from typing import Any, Optional
-from anthropic import Anthropic, APIError, APITimeoutError, RateLimitError
+
+from app.services.executors import get_llm_executor, run_in_executor
+from app.services.fake_llm import create_fake_client, record_response
+from app.services.lazy_imports import lazy_import
+from app.services.metrics import LLM_CALLS_IN_FLIGHT, LLM_RESPONSE_SECONDS, LLM_RETRIES, LLM_TOKENS
+from app.services.token_ledger import get_token_ledger
+from app.services.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Imported on first use, to keep app startup fast
+anthropic = lazy_import("anthropic")
+
+DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+
 
 class LLMService:
     """Service for interacting with Anthropic Claude API with retry logic."""
     
     def __init__(self):
-        """Initialize LLM service with API key from environment."""
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        """
+        Initialize LLM service with API key from environment.
+        
+        LLM_BACKEND=fake replaces the API client with recorded responses
+        (see app.services.fake_llm), for benchmarks without an API key.
+        """
+        self.backend = os.getenv("LLM_BACKEND", "anthropic").lower()
+        if self.backend == "fake":
+            self.client = create_fake_client()
+        elif self.backend == "anthropic":
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+            self.client = anthropic.Anthropic(api_key=api_key)
+        else:
+            raise ValueError(f"Unknown LLM_BACKEND: {self.backend}")
         
-        self.client = Anthropic(api_key=api_key)
         # Allow model to be configured via environment variable
-        self.model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+        self.model = os.getenv("ANTHROPIC_MODEL", DEFAULT_MODEL)
         self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
         self.base_delay = int(os.getenv("LLM_RETRY_DELAY", "1"))  # seconds
+        # Save responses for replay by the fake backend
+        self.record_dir = os.getenv("LLM_RECORD_DIR")
         
-        logger.info(f"LLMService initialized with model: {self.model}")
+        logger.info(f"LLMService initialized with model: {self.model} ({self.backend} backend)")
     
     async def generate_completion(
         self,
@@ -58,48 +82,61 @@ class LLMService:
                 messages = [{"role": "user", "content": prompt}]
                 
                 # Call Claude API
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    system=system_prompt if system_prompt else "",
-                    messages=messages,
-                )
+                with span("llm.attempt", attempt=attempt + 1, model=self.model) as attempt_span:
+                    with LLM_RESPONSE_SECONDS.time(model=self.model), LLM_CALLS_IN_FLIGHT.track():
+                        # The client is synchronous; wait for it on the LLM threads
+                        response = await run_in_executor(
+                            get_llm_executor(),
+                            self.client.messages.create,
+                            model=self.model,
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                            system=system_prompt if system_prompt else "",
+                            messages=messages,
+                        )
+                    attempt_span.set_attribute("input_tokens", getattr(response.usage, "input_tokens", None))
+                    attempt_span.set_attribute("output_tokens", getattr(response.usage, "output_tokens", None))
                 
                 # Extract text from response
                 if response.content and len(response.content) > 0:
                     result = response.content[0].text
+                    await self._record_usage(response.usage)
+                    if self.record_dir:
+                        record_response(self.record_dir, system_prompt, result)
                     logger.info(f"Claude API call successful (tokens: {response.usage.input_tokens} in, {response.usage.output_tokens} out)")
                     return result
                 else:
                     raise ValueError("Empty response from Claude API")
                 
-            except RateLimitError as e:
+            except anthropic.RateLimitError as e:
                 logger.warning(f"Rate limit hit on attempt {attempt + 1}: {e}")
                 if attempt < self.max_retries - 1:
+                    LLM_RETRIES.inc(model=self.model, reason="rate_limit")
                     delay = self.base_delay * (2 ** attempt)  # Exponential backoff
                     logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     logger.error("Max retries reached for rate limit")
                     raise Exception(f"Rate limit exceeded after {self.max_retries} attempts") from e
                     
-            except APITimeoutError as e:
+            except anthropic.APITimeoutError as e:
                 logger.warning(f"API timeout on attempt {attempt + 1}: {e}")
                 if attempt < self.max_retries - 1:
+                    LLM_RETRIES.inc(model=self.model, reason="timeout")
                     delay = self.base_delay * (2 ** attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     logger.error("Max retries reached for timeout")
                     raise Exception(f"API timeout after {self.max_retries} attempts") from e
                     
-            except APIError as e:
+            except anthropic.APIError as e:
                 logger.error(f"API error on attempt {attempt + 1}: {e}")
                 if attempt < self.max_retries - 1:
+                    LLM_RETRIES.inc(model=self.model, reason="api_error")
                     delay = self.base_delay * (2 ** attempt)
                     logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     logger.error("Max retries reached for API error")
                     raise Exception(f"API error after {self.max_retries} attempts") from e
@@ -109,3 +146,19 @@ class LLMService:
                 raise Exception(f"Unexpected error calling Claude API: {str(e)}") from e
         
         raise Exception("Failed to generate completion after all retries")
+    
+    async def _record_usage(self, usage: Any) -> None:
+        """
+        Record the token counts of a response in the metrics and the token ledger.
+        
+        The ledger appends to a file, so it is written off the event loop.
+        
+        Args:
+            usage: Usage block of an API response
+        """
+        for kind in ("input", "output", "cache_read_input", "cache_creation_input"):
+            tokens = getattr(usage, f"{kind}_tokens", None)
+            # Cache counts are absent or None when prompt caching is not used
+            if isinstance(tokens, int):
+                LLM_TOKENS.observe(tokens, model=self.model, kind=kind.replace("_input", ""))
+        await asyncio.to_thread(get_token_ledger().record, self.model, usage, backend=self.backend)
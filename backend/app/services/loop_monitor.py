@@ -0,0 +1,136 @@
+"""
+Event-loop lag sampler and blocking-call detector.
+
+The sampler sleeps for a short interval in a loop and records how late it
+wakes up. Synchronous work on the event loop (API calls, time.sleep, PDF
+parsing, file I/O) delays every request sharing the loop, and shows up here
+as lag.
+
+When blocking detection is on, a watchdog thread checks that the sampler
+keeps waking up. If the loop stalls for longer than the threshold, the
+watchdog captures the loop thread's stack, which points at the blocking
+call, and logs it when the loop recovers.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from app.services.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Reports of recent stalls kept for inspection
+MAX_BLOCK_REPORTS = 20
+
+
+@dataclass
+class BlockReport:
+    """A stall of the event loop and where it was blocked."""
+
+    started: float
+    duration_seconds: float
+    stack: str
+
+
+class LoopMonitor:
+    """Samples event-loop lag and optionally reports calls blocking the loop."""
+
+    def __init__(
+        self,
+        interval_seconds: float | None = None,
+        block_threshold_seconds: float | None = None,
+    ):
+        """
+        Initialize the loop monitor.
+
+        Args:
+            interval_seconds: Pause between lag samples
+                (LOOP_LAG_INTERVAL, default 0.5; 0 disables the monitor)
+            block_threshold_seconds: Report stalls longer than this with a
+                stack trace (LOOP_BLOCK_THRESHOLD_MS, default 0 = off)
+        """
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None
+            else float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+        )
+        self.block_threshold_seconds = (
+            block_threshold_seconds if block_threshold_seconds is not None
+            else float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "0")) / 1000
+        )
+        # Wake up often enough that a healthy loop never looks stalled
+        if self.block_threshold_seconds > 0:
+            self.interval_seconds = min(self.interval_seconds or math.inf, self.block_threshold_seconds / 2)
+
+        self.max_lag_seconds = 0.0
+        self.blocks: Deque[BlockReport] = deque(maxlen=MAX_BLOCK_REPORTS)
+        self._last_wakeup = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lag sampling is configured."""
+        return self.interval_seconds > 0
+
+    async def run(self) -> None:
+        """Sample lag forever. Cancel the task to stop."""
+        logger.info(
+            f"Event loop monitor started (interval: {self.interval_seconds:g}s, "
+            f"block threshold: {self.block_threshold_seconds * 1000:g} ms)"
+        )
+        self._loop_thread_id = threading.get_ident()
+        self._last_wakeup = time.monotonic()
+        watchdog = None
+        if self.block_threshold_seconds > 0:
+            self._stop.clear()
+            watchdog = threading.Thread(target=self._watch, name="loop-block-watchdog", daemon=True)
+            watchdog.start()
+        try:
+            while True:
+                await asyncio.sleep(self.interval_seconds)
+                now = time.monotonic()
+                lag = max(0.0, now - self._last_wakeup - self.interval_seconds)
+                self._last_wakeup = now
+                self.max_lag_seconds = max(self.max_lag_seconds, lag)
+                EVENT_LOOP_LAG_SECONDS.observe(lag)
+        finally:
+            self._stop.set()
+            if watchdog is not None:
+                watchdog.join()
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop's stack while it is stalled."""
+        poll = self.block_threshold_seconds / 4
+        stalled_since: Optional[float] = None
+        stack = ""
+        while not self._stop.wait(poll):
+            last_wakeup = self._last_wakeup
+            overdue = time.monotonic() - last_wakeup - self.interval_seconds
+            if stalled_since is not None and last_wakeup != stalled_since:
+                # The loop woke up again: the stall lasted until this wakeup
+                self._report(stalled_since, last_wakeup - stalled_since - self.interval_seconds, stack)
+                stalled_since = None
+            if overdue > self.block_threshold_seconds and stalled_since is None:
+                stalled_since = last_wakeup
+                stack = self._loop_stack()
+
+    def _loop_stack(self) -> str:
+        """Format the current stack of the event loop's thread."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        return "".join(traceback.format_stack(frame)) if frame is not None else ""
+
+    def _report(self, started: float, duration: float, stack: str) -> None:
+        """Record and log a stall of the event loop."""
+        EVENT_LOOP_BLOCKS.inc()
+        self.blocks.append(BlockReport(started=started, duration_seconds=duration, stack=stack))
+        logger.warning(f"Event loop blocked for {duration * 1000:.0f} ms in:\n{stack}")
+
@@ -0,0 +1,424 @@
+"""
+In-process metrics served in the Prometheus text format.
+
+Analysis phases, LLM calls and response parsing record histograms and
+counters here, scraped from the /metrics endpoint. Labels that the code
+recording a metric does not know (such as the company being analyzed, deep
+inside an LLM call) are taken from the metric context set around each phase.
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds, in seconds or tokens
+PHASE_SECONDS_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+LLM_SECONDS_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 45, 60, 90, 120)
+QUEUE_SECONDS_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (0, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+UNKNOWN_LABEL = "unknown"
+
+_metric_context: ContextVar[Dict[str, str]] = ContextVar("metric_context", default={})
+
+
+def current_labels() -> Dict[str, str]:
+    """Get the labels set by the enclosing metric contexts."""
+    return _metric_context.get()
+
+
+@contextmanager
+def metric_context(**labels: Optional[str]) -> Iterator[None]:
+    """
+    Set default label values for metrics recorded inside the block.
+
+    Contexts nest, with inner values taking precedence; labels given as None
+    are left as set by the enclosing context.
+
+    Args:
+        **labels: Label values by name
+    """
+    merged = {**_metric_context.get(), **{name: value for name, value in labels.items() if value is not None}}
+    token = _metric_context.set(merged)
+    try:
+        yield
+    finally:
+        _metric_context.reset(token)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    """Format label pairs as {name="value",...}, or nothing if there are none."""
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, keeping whole numbers free of a decimal point."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the metric's labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Optional[str]]) -> Tuple[str, ...]:
+        """Resolve label values from the arguments, then the metric context."""
+        unexpected = set(labels) - set(self.labelnames)
+        if unexpected:
+            raise ValueError(f"Unknown labels for {self.name}: {', '.join(sorted(unexpected))}")
+        context = current_labels()
+        return tuple(
+            str(labels.get(name) or context.get(name) or UNKNOWN_LABEL)
+            for name in self.labelnames
+        )
+
+    def render(self) -> List[str]:
+        """
+        Render the metric in the text exposition format.
+
+        Returns:
+            Lines including the HELP and TYPE comments
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def clear(self) -> None:
+        """Remove all recorded values."""
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        """Render the recorded values, called with the lock held."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count, such as retries."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Optional[str]) -> None:
+        """
+        Increase the count.
+
+        Args:
+            amount: Non-negative amount to add
+            **labels: Label values; missing ones come from the metric context
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Optional[str]) -> float:
+        """Get the current count for a set of labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """Value that goes up and down, such as work in progress."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Optional[str]) -> None:
+        """
+        Increase the value.
+
+        Args:
+            amount: Amount to add
+            **labels: Label values; missing ones come from the metric context
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Optional[str]) -> None:
+        """Decrease the value."""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: Optional[str]) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def value(self, **labels: Optional[str]) -> float:
+        """Get the current value for a set of labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def total(self) -> float:
+        """Get the sum of the values over all label sets."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(list(zip(self.labelnames, key)))} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets, such as latencies."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LLM_SECONDS_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: count in each bucket (plus +Inf), sum of values
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: Optional[str]) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Observed value
+            **labels: Label values; missing ones come from the metric context
+        """
+        key = self._label_values(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0) + value
+
+    @contextmanager
+    def time(self, **labels: Optional[str]) -> Iterator[None]:
+        """Observe the wall time of the block in seconds, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Optional[str]) -> int:
+        """Get the number of values observed for a set of labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            return sum(self._counts.get(key, []))
+
+    def sum(self, **labels: Optional[str]) -> float:
+        """Get the sum of values observed for a set of labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            return self._sums.get(key, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, counts in sorted(self._counts.items()):
+            pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _format_labels(pairs + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric to the registry.
+
+        Args:
+            metric: Metric to add
+
+        Returns:
+            The metric
+
+        Raises:
+            ValueError: If a metric with the same name is registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Remove all recorded values, keeping the metrics registered."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+PHASE_SECONDS = REGISTRY.register(Histogram(
+    "analysis_phase_seconds",
+    "Wall time of each analysis phase.",
+    ["phase", "model", "company", "status"],
+    PHASE_SECONDS_BUCKETS,
+))
+QUEUE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "analysis_queue_wait_seconds",
+    "Time a queued background analysis waited before starting.",
+    ["company"],
+    QUEUE_SECONDS_BUCKETS,
+))
+LLM_RESPONSE_SECONDS = REGISTRY.register(Histogram(
+    "llm_response_seconds",
+    "Time from sending an LLM request to receiving its response, per attempt.",
+    ["phase", "model", "company"],
+    LLM_SECONDS_BUCKETS,
+))
+LLM_TOKENS = REGISTRY.register(Histogram(
+    "llm_tokens",
+    "Tokens per LLM call, by kind (input, output, cache_read, cache_creation).",
+    ["phase", "model", "company", "kind"],
+    TOKEN_BUCKETS,
+))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "llm_retries_total",
+    "LLM calls retried after a rate limit, timeout or API error.",
+    ["phase", "model", "company", "reason"],
+))
+PARSE_FALLBACKS = REGISTRY.register(Counter(
+    "llm_parse_fallbacks_total",
+    "LLM responses that needed extraction or repair before parsing as JSON.",
+    ["phase", "model", "company", "method"],
+))
+PROMPT_TOKENS = REGISTRY.register(Histogram(
+    "prompt_tokens",
+    "Estimated input tokens of each assembled prompt, before sending.",
+    ["phase"],
+    TOKEN_BUCKETS,
+))
+PROMPT_ITEMS_DROPPED = REGISTRY.register(Counter(
+    "prompt_items_dropped_total",
+    "Prompt items left out to stay within the phase's token budget.",
+    ["phase"],
+))
+PROMPT_BUDGET_OVERRUNS = REGISTRY.register(Counter(
+    "prompt_budget_overruns_total",
+    "Prompts whose fixed content alone exceeded the phase's token budget.",
+    ["phase"],
+))
+ANALYSES_IN_PROGRESS = REGISTRY.register(Gauge(
+    "analyses_in_progress",
+    "Analyses queued or running, by mode; preview analyses wait in the background queue.",
+    ["mode"],
+))
+LLM_CALLS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "llm_calls_in_flight",
+    "LLM API calls waiting for a response.",
+))
+EVENT_LOOP_LAG_SECONDS = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up from a timed sleep; high values mean blocking work on the loop.",
+    [],
+    LOOP_LAG_BUCKETS,
+))
+EVENT_LOOP_BLOCKS = REGISTRY.register(Counter(
+    "event_loop_blocks_total",
+    "Times the event loop was blocked for longer than the detection threshold.",
+))
+
+
+@contextmanager
+def track_phase(phase: str, company: Optional[str] = None, model: Optional[str] = None) -> Iterator[None]:
+    """
+    Time an analysis phase and label the metrics recorded inside it.
+
+    Args:
+        phase: Phase name
+        company: Company being analyzed
+        model: LLM model used by the phase
+    """
+    with metric_context(phase=phase, company=company, model=model):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield
+            status = "ok"
+        finally:
+            PHASE_SECONDS.observe(time.perf_counter() - started, status=status)
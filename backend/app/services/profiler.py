@@ -0,0 +1,265 @@
+"""
+Sampling profiler for the live process, producing folded stacks.
+
+A daemon thread reads the stacks of the other threads at a fixed interval
+and counts identical stacks. Sampling only reads frames, so the profiled
+code runs unmodified and the cost is bounded by the sampling rate, which
+makes it safe to run on a production worker.
+
+Output is in the folded format read by flamegraph.pl, speedscope and
+inferno: one line per distinct stack, frames from the root separated by
+semicolons, followed by the sample count.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import FrameType
+from typing import AsyncIterator, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = Path("data/profiles")
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+# Sampling faster than this costs more than it tells
+MIN_INTERVAL_SECONDS = 0.001
+
+
+def get_max_profile_seconds() -> float:
+    """Longest profile an admin may request (PROFILE_MAX_SECONDS, default 60)."""
+    return float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Name a frame as module:function."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+class SamplingProfiler:
+    """Counts the stacks of running threads, sampled from a background thread."""
+
+    def __init__(
+        self,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        root_frame: Optional[FrameType] = None,
+        max_seconds: Optional[float] = None,
+        on_stop: Optional[Callable[["SamplingProfiler"], None]] = None,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval_seconds: Pause between samples
+            root_frame: Only count stacks running inside this frame, with the
+                frame as their root; None samples every thread
+            max_seconds: Stop sampling after this long even if not stopped;
+                None samples until stopped
+            on_stop: Called with the profiler once sampling has stopped, on
+                the sampling thread, whether stopped or out of time
+        """
+        self.interval_seconds = max(interval_seconds, MIN_INTERVAL_SECONDS)
+        self.root_frame = root_frame
+        self.max_seconds = max_seconds
+        self.on_stop = on_stop
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.duration_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._sampling = False
+
+    @property
+    def running(self) -> bool:
+        """Whether samples are still being taken."""
+        return self._sampling
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._sampling = True
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        if self._thread is None:
+            return
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        # Restrict sampling to the code running inside the with block
+        if self.root_frame is None:
+            self.root_frame = sys._getframe(1)
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        """Sampling thread: take a sample every interval until stopped or out of time."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            if self.max_seconds is not None and time.perf_counter() - self._started >= self.max_seconds:
+                logger.info(f"Profile reached its {self.max_seconds:g}s limit; sampling stopped")
+                break
+            self.sample(exclude_thread=own_id)
+
+        self.duration_seconds = time.perf_counter() - self._started
+        if self.max_seconds is not None:
+            self.duration_seconds = min(self.duration_seconds, self.max_seconds)
+        self._sampling = False
+        if self.on_stop is not None:
+            try:
+                self.on_stop(self)
+            except Exception as e:
+                logger.error(f"Failed to handle stopped profile: {e}")
+
+    def sample(self, exclude_thread: Optional[int] = None) -> None:
+        """
+        Record the current stack of every thread.
+
+        Args:
+            exclude_thread: Thread ID not to sample, such as the sampler's own
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude_thread:
+                continue
+            labels = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                labels.append(_frame_label(current))
+                if current is self.root_frame:
+                    break
+                current = current.f_back
+            else:
+                if self.root_frame is not None:
+                    continue
+            labels.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def folded(self) -> str:
+        """Format the counted stacks in the folded format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# Profiler currently sampling, if any
+_active_profiler: Optional[SamplingProfiler] = None
+
+
+def profile_running() -> bool:
+    """Whether a profile is being taken."""
+    return _active_profiler is not None and _active_profiler.running
+
+
+@asynccontextmanager
+async def exclusive_profile(
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    root_frame: Optional[FrameType] = None,
+    max_seconds: Optional[float] = None,
+    on_stop: Optional[Callable[[SamplingProfiler], None]] = None,
+) -> AsyncIterator[SamplingProfiler]:
+    """
+    Sample stacks while the with block runs.
+
+    Only one profile runs at a time, so the sampling overhead is bounded.
+    A profile stopped by max_seconds no longer counts as running, even if
+    the with block goes on.
+
+    Args:
+        interval_seconds: Pause between samples
+        root_frame: Only count stacks running inside this frame; None
+            samples every thread
+        max_seconds: Stop sampling after this long
+        on_stop: Called with the profiler once sampling has stopped, e.g. to
+            save it as soon as max_seconds is reached
+
+    Yields:
+        Profiler, stopped when the block exits
+
+    Raises:
+        RuntimeError: If a profile is already running
+    """
+    global _active_profiler
+    if profile_running():
+        raise RuntimeError("A profile is already running")
+    profiler = SamplingProfiler(interval_seconds, root_frame, max_seconds, on_stop)
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if _active_profiler is profiler:
+            _active_profiler = None
+
+
+async def profile_process(seconds: float, interval_seconds: float = DEFAULT_INTERVAL_SECONDS) -> SamplingProfiler:
+    """
+    Profile every thread of the process for a while.
+
+    Args:
+        seconds: How long to sample
+        interval_seconds: Pause between samples
+
+    Returns:
+        Stopped profiler holding the samples
+
+    Raises:
+        RuntimeError: If a profile is already running
+    """
+    async with exclusive_profile(interval_seconds) as profiler:
+        logger.info(f"Profiling process for {seconds:g}s every {profiler.interval_seconds * 1000:g} ms")
+        await asyncio.sleep(seconds)
+    return profiler
+
+
+def save_profile(profile_id: str, profiler: SamplingProfiler, profiles_dir: str | Path = PROFILES_DIR) -> Path:
+    """
+    Save a profile's folded stacks.
+
+    Args:
+        profile_id: Profile ID, such as the analysis ID
+        profiler: Stopped profiler
+        profiles_dir: Directory of saved profiles
+
+    Returns:
+        Path of the saved profile
+    """
+    profiles_dir = Path(profiles_dir)
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    path = profiles_dir / f"{profile_id}.folded"
+    path.write_text(profiler.folded(), encoding="utf-8")
+    logger.info(f"Saved profile {profile_id} ({profiler.samples} samples over {profiler.duration_seconds:.2f}s)")
+    return path
+
+
+def load_profile(profile_id: str, profiles_dir: str | Path = PROFILES_DIR) -> Optional[str]:
+    """
+    Load a saved profile's folded stacks.
+
+    Args:
+        profile_id: Profile ID
+        profiles_dir: Directory of saved profiles
+
+    Returns:
+        Folded stacks, or None if there is no such profile
+    """
+    path = Path(profiles_dir) / f"{profile_id}.folded"
+    if path.name != f"{profile_id}.folded" or not path.is_file():
+        return None
+    return path.read_text(encoding="utf-8")
@@ -0,0 +1,246 @@
+"""
+Token-budgeted prompt assembly.
+
+Prompt builders add their variable content as prioritized items instead of
+slicing lists to fixed lengths. Items are then chosen by priority until the
+phase's input-token budget is used up, and rendered in their original order.
+Token counts are estimated locally, without calling the API. The final
+estimate, dropped items and budget overruns are recorded as metrics per phase.
+"""
+
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.services.metrics import PROMPT_BUDGET_OVERRUNS, PROMPT_ITEMS_DROPPED, PROMPT_TOKENS
+
+logger = logging.getLogger(__name__)
+
+# Default input-token budget per analysis phase, including the fixed template
+DEFAULT_TOKEN_BUDGETS = {
+    "role_matching": 6000,
+    "gap_analysis": 6000,
+    "timeline": 5000,
+}
+FALLBACK_TOKEN_BUDGET = 6000
+
+# Words are split into pieces of about this many characters by the tokenizer
+_CHARS_PER_WORD_PIECE = 4
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in text.
+
+    Counts each punctuation character as one token and each word as one
+    token per four characters, which tracks BPE tokenizers closely enough
+    for budgeting English prose, lists and JSON.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        tokens += math.ceil(len(piece) / _CHARS_PER_WORD_PIECE) if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+def get_token_budget(phase: str) -> int:
+    """
+    Get the input-token budget of an analysis phase.
+
+    Read from the PROMPT_TOKEN_BUDGET_<PHASE> environment variable (e.g.
+    PROMPT_TOKEN_BUDGET_GAP_ANALYSIS), falling back to the phase default.
+
+    Args:
+        phase: Phase name (role_matching, gap_analysis, timeline)
+
+    Returns:
+        Token budget
+    """
+    default = DEFAULT_TOKEN_BUDGETS.get(phase, FALLBACK_TOKEN_BUDGET)
+    return int(os.getenv(f"PROMPT_TOKEN_BUDGET_{phase.upper()}", str(default)))
+
+
+@dataclass
+class PromptItem:
+    """A line or block of prompt content."""
+
+    text: str
+    priority: int
+    parent: Optional["PromptItem"] = None
+    tokens: int = 0
+    included: bool = False
+
+
+@dataclass
+class PromptSection:
+    """Items rendered together under an optional header."""
+
+    placeholder: str
+    header: Optional[str] = None
+    separator: str = "\n"
+    items: List[PromptItem] = field(default_factory=list)
+
+    def add(self, text: str, priority: int = 0, parent: Optional[PromptItem] = None) -> PromptItem:
+        """
+        Add an item to the section.
+
+        Args:
+            text: Item text
+            priority: Lower is more important; items are chosen in priority order
+            parent: Item this one belongs under; it is only included with its parent
+
+        Returns:
+            The added item, usable as a parent
+        """
+        tokens = estimate_tokens(text) + estimate_tokens(self.separator) + 1
+        item = PromptItem(text=text, priority=priority, parent=parent, tokens=tokens)
+        self.items.append(item)
+        return item
+
+    def add_all(self, texts: List[str], priority: int = 0, step: int = 0, parent: Optional[PromptItem] = None) -> None:
+        """
+        Add several items, each optionally less important than the one before.
+
+        Args:
+            texts: Item texts in order of importance
+            priority: Priority of the first item
+            step: Priority added for each following item
+            parent: Item these belong under
+        """
+        for index, text in enumerate(texts):
+            self.add(text, priority + index * step, parent)
+
+    def render(self) -> str:
+        """Render the included items, or an empty string if there are none."""
+        text = self.separator.join(item.text for item in self.items if item.included)
+        if not text:
+            return ""
+        return f"{self.header}\n{text}" if self.header is not None else text
+
+
+class PromptBudget:
+    """Assembles a prompt from a template and prioritized sections within a token budget."""
+
+    def __init__(self, phase: str, token_budget: Optional[int] = None):
+        """
+        Initialize the prompt budget.
+
+        Args:
+            phase: Analysis phase, used for the default budget and in logs
+            token_budget: Input-token budget, defaults to the phase's configured budget
+        """
+        self.phase = phase
+        self.token_budget = token_budget if token_budget is not None else get_token_budget(phase)
+        self.sections: List[PromptSection] = []
+        self.prompt_tokens = 0
+        self.dropped_items = 0
+
+    def section(
+        self,
+        placeholder: str,
+        header: Optional[str] = None,
+        separator: str = "\n",
+    ) -> PromptSection:
+        """
+        Create a section that renders into a template placeholder.
+
+        Several sections may share a placeholder; they are joined by newlines
+        in the order they were created.
+
+        Args:
+            placeholder: Template field the section renders into
+            header: Line shown above the section's items, if any are included
+            separator: Text between the section's items
+
+        Returns:
+            The new section
+        """
+        section = PromptSection(placeholder=placeholder, header=header, separator=separator)
+        self.sections.append(section)
+        return section
+
+    def render_sections(self, fixed_tokens: int = 0) -> Dict[str, str]:
+        """
+        Choose items within the budget and render each placeholder.
+
+        Args:
+            fixed_tokens: Tokens used by everything outside the sections
+
+        Returns:
+            Rendered text by placeholder
+        """
+        available = self.token_budget - fixed_tokens
+        candidates = [(section, item) for section in self.sections for item in section.items]
+        # Most important first; ties keep the order the items were added in
+        order = sorted(range(len(candidates)), key=lambda index: (candidates[index][1].priority, index))
+
+        opened = set()
+        self.dropped_items = 0
+        for index in order:
+            section, item = candidates[index]
+            cost = item.tokens
+            if id(section) not in opened and section.header is not None:
+                cost += estimate_tokens(section.header) + 1
+            if (item.parent is None or item.parent.included) and cost <= available:
+                item.included = True
+                available -= cost
+                opened.add(id(section))
+            else:
+                item.included = False
+                self.dropped_items += 1
+
+        rendered: Dict[str, List[str]] = {}
+        for section in self.sections:
+            text = section.render()
+            parts = rendered.setdefault(section.placeholder, [])
+            if text:
+                parts.append(text)
+        return {placeholder: "\n".join(parts) for placeholder, parts in rendered.items()}
+
+    def render(self, template: str, empty: str = "None", **fixed: str) -> str:
+        """
+        Render a prompt template within the budget.
+
+        The estimated token count of the prompt is kept in prompt_tokens.
+
+        Args:
+            template: Template with placeholders for the fixed values and sections
+            empty: Text for placeholders whose sections have no included items
+            **fixed: Values always included in full
+
+        Returns:
+            The rendered prompt
+        """
+        placeholders = {section.placeholder for section in self.sections}
+        skeleton = template.format(**fixed, **{placeholder: "" for placeholder in placeholders})
+        sections = self.render_sections(estimate_tokens(skeleton))
+
+        prompt = template.format(
+            **fixed,
+            **{placeholder: text or empty for placeholder, text in sections.items()},
+        )
+        self.prompt_tokens = estimate_tokens(prompt)
+        PROMPT_TOKENS.observe(self.prompt_tokens, phase=self.phase)
+        if self.dropped_items:
+            PROMPT_ITEMS_DROPPED.inc(self.dropped_items, phase=self.phase)
+
+        logger.info(
+            f"Prompt for {self.phase}: ~{self.prompt_tokens} input tokens "
+            f"(budget {self.token_budget}, {self.dropped_items} items dropped)"
+        )
+        if self.prompt_tokens > self.token_budget:
+            PROMPT_BUDGET_OVERRUNS.inc(phase=self.phase)
+            logger.warning(
+                f"Prompt for {self.phase} exceeds its token budget by "
+                f"~{self.prompt_tokens - self.token_budget} tokens of fixed content"
+            )
+        return prompt
@@ -0,0 +1,215 @@
+"""
+Readiness probes deciding whether an instance should receive traffic.
+
+An instance reports not ready while warm-up is running or after a warm-up
+step that analyses depend on failed (such as creating the LLM clients
+without an API key), and also when it is saturated (too many analyses
+queued or LLM calls in flight), when the disk under data/ is nearly full,
+when the tenet and skill caches cannot be loaded, or when the worker
+threads that resume parsing runs on do not respond. Load balancers then route new students elsewhere instead of to an
+instance whose requests would time out.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.services.company_service import get_company_registry
+from app.services.executors import get_parser_executor, run_in_executor
+from app.services.metrics import ANALYSES_IN_PROGRESS, LLM_CALLS_IN_FLIGHT
+from app.services.role_requirements_service import ROLE_REQUIREMENTS_DIR
+from app.services.session_store import SESSIONS_DIR
+from app.services.skill_taxonomy import get_skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path("data")
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one readiness probe."""
+
+    name: str
+    ok: bool
+    detail: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+
+class ReadinessChecker:
+    """Runs the readiness probes against configurable limits."""
+
+    def __init__(
+        self,
+        max_queue_depth: int | None = None,
+        max_llm_in_flight: int | None = None,
+        min_free_mb: float | None = None,
+        pool_timeout_seconds: float | None = None,
+        data_dir: str | Path = DATA_DIR,
+    ):
+        """
+        Initialize the readiness checker.
+
+        Args:
+            max_queue_depth: Not ready above this many analyses in progress
+                (READY_MAX_QUEUE_DEPTH, default 50; 0 disables)
+            max_llm_in_flight: Not ready above this many LLM calls waiting
+                for a response (READY_MAX_LLM_IN_FLIGHT, default 32; 0 disables);
+                also the size of the LLM thread pool
+            min_free_mb: Not ready below this much free disk under data_dir
+                (READY_MIN_FREE_MB, default 500; 0 disables)
+            pool_timeout_seconds: Not ready when a no-op task on the parser
+                threads takes longer than this (READY_POOL_TIMEOUT, default 2)
+            data_dir: Directory holding sessions, uploads and caches
+        """
+        self.max_queue_depth = (
+            max_queue_depth if max_queue_depth is not None
+            else int(os.getenv("READY_MAX_QUEUE_DEPTH", "50"))
+        )
+        self.max_llm_in_flight = (
+            max_llm_in_flight if max_llm_in_flight is not None
+            else int(os.getenv("READY_MAX_LLM_IN_FLIGHT", "32"))
+        )
+        self.min_free_mb = (
+            min_free_mb if min_free_mb is not None
+            else float(os.getenv("READY_MIN_FREE_MB", "500"))
+        )
+        self.pool_timeout_seconds = (
+            pool_timeout_seconds if pool_timeout_seconds is not None
+            else float(os.getenv("READY_POOL_TIMEOUT", "2"))
+        )
+        self.data_dir = Path(data_dir)
+
+    async def check(self) -> List[ProbeResult]:
+        """
+        Run every probe.
+
+        Returns:
+            Probe results; a probe that raises is reported as failed
+        """
+        results = []
+        for name, probe in [
+            ("queue", self._probe_queue),
+            ("llm", self._probe_llm),
+            ("disk", self._probe_disk),
+            ("caches", self._probe_caches),
+            ("parser_pool", self._probe_parser_pool),
+        ]:
+            try:
+                results.append(await probe())
+            except Exception as e:
+                logger.warning(f"Readiness probe {name} failed: {e}")
+                results.append(ProbeResult(name, False, error=str(e)))
+        return results
+
+    async def report(self, warmup: Any = None) -> Dict[str, Any]:
+        """
+        Decide readiness from warm-up progress and the probes.
+
+        Args:
+            warmup: Startup warm-up, or None if the app has not started
+
+        Returns:
+            Status (ready, warming_up or not_ready), the failing checks
+            (probes and failed required warm-up steps), the warm-up report
+            and each probe's result
+        """
+        probes = await self.check()
+        failing = [probe.name for probe in probes if not probe.ok]
+        if warmup is not None and warmup.finished:
+            failing += [f"warmup.{name}" for name in warmup.failed_required_steps()]
+        if warmup is not None and not warmup.finished:
+            status = "warming_up"
+        elif failing:
+            status = "not_ready"
+        else:
+            status = "ready"
+        if failing:
+            logger.warning(f"Instance not ready; failing checks: {', '.join(failing)}")
+        return {
+            "status": status,
+            "failing": failing,
+            "warmup": warmup.report() if warmup is not None else None,
+            "probes": {probe.name: _describe(probe) for probe in probes},
+        }
+
+    async def _probe_queue(self) -> ProbeResult:
+        """Analyses queued or running, against the limit."""
+        by_mode = {mode: int(ANALYSES_IN_PROGRESS.value(mode=mode)) for mode in ("full", "preview")}
+        depth = sum(by_mode.values())
+        ok = not self.max_queue_depth or depth <= self.max_queue_depth
+        return ProbeResult("queue", ok, {"depth": depth, **by_mode, "limit": self.max_queue_depth})
+
+    async def _probe_llm(self) -> ProbeResult:
+        """LLM calls waiting for a response, against the limit."""
+        in_flight = int(LLM_CALLS_IN_FLIGHT.total())
+        ok = not self.max_llm_in_flight or in_flight <= self.max_llm_in_flight
+        return ProbeResult("llm", ok, {"in_flight": in_flight, "limit": self.max_llm_in_flight})
+
+    async def _probe_disk(self) -> ProbeResult:
+        """Free space on the volume holding the data directory."""
+        usage = await asyncio.to_thread(shutil.disk_usage, self.data_dir if self.data_dir.exists() else ".")
+        free_mb = usage.free / 2**20
+        ok = not self.min_free_mb or free_mb >= self.min_free_mb
+        return ProbeResult("disk", ok, {
+            "free_mb": round(free_mb, 1),
+            "free_percent": round(100 * usage.free / usage.total, 1) if usage.total else 0.0,
+            "limit_mb": self.min_free_mb,
+        })
+
+    async def _probe_caches(self) -> ProbeResult:
+        """Tenet and skill caches load, and the cache directories accept writes."""
+        def inspect() -> Dict[str, Any]:
+            registry = get_company_registry()
+            companies = registry.companies
+            with_tenets = sum(1 for company in companies if registry.get_tenets(company.id))
+            skills = len(get_skill_taxonomy().skills)
+            writable = {
+                str(directory): _writable(directory)
+                for directory in (SESSIONS_DIR, ROLE_REQUIREMENTS_DIR)
+            }
+            return {
+                "companies": len(companies),
+                "companies_with_tenets": with_tenets,
+                "skills": skills,
+                "writable": writable,
+            }
+
+        detail = await asyncio.to_thread(inspect)
+        ok = detail["companies"] > 0 and detail["skills"] > 0 and all(detail["writable"].values())
+        return ProbeResult("caches", ok, detail)
+
+    async def _probe_parser_pool(self) -> ProbeResult:
+        """A no-op on the parser threads completes promptly."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(run_in_executor(get_parser_executor(), lambda: None), self.pool_timeout_seconds)
+        except asyncio.TimeoutError:
+            return ProbeResult(
+                "parser_pool", False, {"timeout_seconds": self.pool_timeout_seconds},
+                error="parser threads did not respond",
+            )
+        return ProbeResult("parser_pool", True, {"response_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+
+def _describe(probe: ProbeResult) -> Dict[str, Any]:
+    """Flatten a probe result for the readiness response."""
+    described = {"ok": probe.ok, **probe.detail}
+    if probe.error:
+        described["error"] = probe.error
+    return described
+
+
+def _writable(directory: Path) -> bool:
+    """Whether files can be created in a directory, creating it if needed."""
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return False
+    return os.access(directory, os.W_OK)
+
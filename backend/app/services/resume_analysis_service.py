@@ -4,11 +4,13 @@ Resume analysis service that orchestrates resume parsing and LLM analysis.
 
 import json
 import logging
-from pathlib import Path
 from typing import Dict, Any, Optional
 
+from app.services.executors import get_parser_executor, run_in_executor
 from app.services.llm_service import LLMService
+from app.services.session_store import SessionStore
 from app.services.resume_parser import ResumeParser
+from app.services.tracing import traced
 from app.prompts.resume_analysis import (
     SYSTEM_PROMPT,
     create_resume_analysis_prompt,
@@ -23,6 +25,7 @@ class ResumeAnalysisService:
     def __init__(self):
         """Initialize resume analysis service."""
         self.llm_service = LLMService()
+        self.session_store = SessionStore()
         self.resume_parser = ResumeParser()
         logger.info("ResumeAnalysisService initialized")
     
@@ -34,6 +37,9 @@ class ResumeAnalysisService:
         """
         Analyze a resume and extract structured information.
         
+        Text already extracted for the session, e.g. by the preview, is
+        reused; otherwise the file is parsed on a worker thread.
+        
         Args:
             resume_file_path: Path to the resume file
             session_id: Session ID for saving results
@@ -47,17 +53,27 @@ class ResumeAnalysisService:
         logger.info(f"Starting resume analysis for session: {session_id}")
         
         try:
-            # Step 1: Extract text from resume
-            logger.info("Extracting text from resume...")
-            resume_text, error = self.resume_parser.extract_text(resume_file_path)
-            
-            if error:
-                raise Exception(f"Failed to extract text from resume: {error}")
-            
-            if not resume_text.strip():
-                raise Exception("Resume appears to be empty")
-            
-            logger.info(f"Extracted {len(resume_text)} characters from resume")
+            # Step 1: Extract text from resume, unless the preview already did
+            resume_text = self._load_resume_text(session_id)
+            if resume_text:
+                logger.info(f"Reusing {len(resume_text)} characters of resume text extracted earlier")
+            else:
+                logger.info("Extracting text from resume...")
+                # PDF parsing is CPU-bound; keep it off the event loop, on the parser threads
+                resume_text, error = await run_in_executor(
+                    get_parser_executor(), self.resume_parser.extract_text, resume_file_path
+                )
+                
+                if error:
+                    raise Exception(f"Failed to extract text from resume: {error}")
+                
+                if not resume_text.strip():
+                    raise Exception("Resume appears to be empty")
+                
+                logger.info(f"Extracted {len(resume_text)} characters from resume")
+                
+                # Keep the raw text for local ATS scoring in later phases
+                self._save_resume_text(session_id, resume_text)
             
             # Step 2: Create prompt for LLM
             prompt = create_resume_analysis_prompt(resume_text)
@@ -86,6 +102,7 @@ class ResumeAnalysisService:
             logger.error(f"Resume analysis failed: {e}")
             raise Exception(f"Failed to analyze resume: {str(e)}") from e
     
+    @traced("resume_analysis.parse_response")
     def _parse_llm_response(self, llm_response: str) -> Dict[str, Any]:
         """
         Parse LLM response into structured format.
@@ -162,6 +179,7 @@ class ResumeAnalysisService:
             logger.error(f"Unexpected error parsing response: {e}")
             raise ValueError(f"Failed to parse LLM response: {str(e)}") from e
     
+    @traced("resume_analysis.save")
     def _save_analysis_results(
         self,
         session_id: str,
@@ -175,14 +193,8 @@ class ResumeAnalysisService:
             analysis_result: Parsed analysis results
         """
         try:
-            # Create session directory
-            session_dir = Path(f"data/sessions/{session_id}")
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
             # Save resume analysis
-            output_file = session_dir / "resume_analysis.json"
-            with open(output_file, "w") as f:
-                json.dump(analysis_result, f, indent=2)
+            output_file = self.session_store.save(session_id, "resume_analysis", analysis_result)
             
             logger.info(f"Analysis results saved to: {output_file}")
             
@@ -190,6 +202,39 @@ class ResumeAnalysisService:
             logger.error(f"Failed to save analysis results: {e}")
             raise Exception(f"Failed to save analysis results: {str(e)}") from e
     
+    def _load_resume_text(self, session_id: str) -> Optional[str]:
+        """
+        Load resume text extracted earlier in the session; failures are logged and ignored.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            Resume text, or None if none was saved
+        """
+        try:
+            document = self.session_store.load(session_id, "resume_text")
+        except Exception as e:
+            logger.warning(f"Failed to load resume text: {e}")
+            return None
+        if document and document.get("text"):
+            return document["text"]
+        return None
+    
+    @traced("resume_analysis.save_resume_text")
+    def _save_resume_text(self, session_id: str, resume_text: str) -> None:
+        """
+        Save the extracted resume text; failures are logged and ignored.
+        
+        Args:
+            session_id: Session ID
+            resume_text: Text extracted from the resume file
+        """
+        try:
+            self.session_store.save(session_id, "resume_text", {"text": resume_text})
+        except Exception as e:
+            logger.warning(f"Failed to save resume text: {e}")
+    
     def load_analysis_results(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Load saved analysis results from file system.
@@ -201,15 +246,12 @@ class ResumeAnalysisService:
             Analysis results dictionary or None if not found
         """
         try:
-            output_file = Path(f"data/sessions/{session_id}/resume_analysis.json")
+            results = self.session_store.load(session_id, "resume_analysis")
             
-            if not output_file.exists():
+            if results is None:
                 logger.warning(f"Analysis results not found for session: {session_id}")
                 return None
             
-            with open(output_file, "r") as f:
-                results = json.load(f)
-            
             logger.info(f"Loaded analysis results for session: {session_id}")
             return results
             
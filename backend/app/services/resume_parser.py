@@ -5,8 +5,13 @@ Resume parsing service for extracting text from PDF and DOCX files.
 import logging
 from pathlib import Path
 from typing import Tuple
-import PyPDF2
-from docx import Document
+
+from app.services.lazy_imports import lazy_import
+from app.services.tracing import traced
+
+# Imported on first use, to keep app startup fast
+PyPDF2 = lazy_import("PyPDF2")
+docx = lazy_import("docx")
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,7 @@ class ResumeParser:
         """Initialize resume parser."""
         logger.info("ResumeParser initialized")
     
+    @traced("resume_parser.extract_text")
     def extract_text(self, file_path: str) -> Tuple[str, str]:
         """
         Extract text content from resume file.
@@ -103,7 +109,7 @@ class ResumeParser:
         logger.info(f"Extracting text from DOCX: {file_path}")
         
         try:
-            doc = Document(file_path)
+            doc = docx.Document(file_path)
             
             # Extract text from paragraphs
             text_content = []
@@ -0,0 +1,216 @@
+"""
+Provisional resume preview built locally, without the LLM.
+
+Sections are split on standard headings, contact details are found with
+regular expressions, skills come from the skill taxonomy and the ATS score
+from the local scorer. The preview is shown while the full LLM analysis runs
+and is replaced by it when ready.
+"""
+
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+from app.services.ats_scorer import ATSScorer
+from app.services.executors import get_parser_executor, run_in_executor
+from app.services.file_service import UPLOAD_DIR
+from app.services.resume_parser import ResumeParser
+from app.services.session_store import SessionStore
+from app.services.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Heading patterns by canonical section name; a heading is a short line on its own
+SECTION_HEADINGS = {
+    "summary": r"(professional )?summary|profile|objective|about( me)?",
+    "education": r"education|academic background",
+    "experience": r"((work|professional|relevant) )?experience|employment( history)?",
+    "projects": r"((personal|academic|technical|selected) )?projects?",
+    "skills": r"(technical )?skills|technologies|skills (and|&) interests",
+    "certifications": r"certifications?|licenses( (and|&) certifications)?",
+    "awards": r"awards|honou?rs( (and|&) awards)?|achievements",
+    "leadership": r"leadership|activities|extracurriculars?|involvement|volunteer(ing)?",
+}
+_HEADINGS = [
+    (name, re.compile(rf"^\W*({pattern})\s*(:\s*(?P<rest>.*))?$", re.IGNORECASE))
+    for name, pattern in SECTION_HEADINGS.items()
+]
+_MAX_HEADING_LENGTH = 40
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"\+?\(?\d[\d\s().-]{8,}\d")
+_LINKEDIN = re.compile(r"(https?://)?(www\.)?linkedin\.com/in/[\w-]+/?", re.IGNORECASE)
+_GITHUB = re.compile(r"(https?://)?(www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+
+
+class ResumePreviewService:
+    """Service for building provisional resume previews without the LLM."""
+
+    def __init__(self, ats_scorer: ATSScorer | None = None):
+        """
+        Initialize resume preview service.
+
+        Args:
+            ats_scorer: Local ATS scorer, whose taxonomy is also used for skills
+        """
+        self.ats_scorer = ats_scorer or ATSScorer()
+        self.resume_parser = ResumeParser()
+        self.session_store = SessionStore()
+        logger.info("ResumePreviewService initialized")
+
+    async def get_resume_text(self, session_id: str, upload_dir: str | Path = UPLOAD_DIR) -> str:
+        """
+        Get the resume text for a session, parsing the uploaded file if needed.
+
+        Text extracted earlier in the session is reused; otherwise the file is
+        parsed off the event loop and the text saved for the full analysis.
+
+        Args:
+            session_id: Session ID from resume upload
+            upload_dir: Directory holding uploaded resumes
+
+        Returns:
+            Resume text
+
+        Raises:
+            FileNotFoundError: If no resume was uploaded for the session
+            ValueError: If the resume cannot be parsed or is empty
+        """
+        document = self.session_store.load(session_id, "resume_text")
+        if document and document.get("text"):
+            return document["text"]
+
+        session_files = list(Path(upload_dir).glob(f"{session_id}_*"))
+        if not session_files:
+            raise FileNotFoundError(f"No resume found for session: {session_id}")
+
+        # PDF parsing is CPU-bound; keep it off the event loop, on the parser threads
+        resume_text, error = await run_in_executor(
+            get_parser_executor(), self.resume_parser.extract_text, str(session_files[0])
+        )
+        if error or not resume_text.strip():
+            raise ValueError(error or "resume appears to be empty")
+
+        self.session_store.save(session_id, "resume_text", {"text": resume_text})
+        return resume_text
+
+    def build_preview(self, resume_text: str, role_description: str) -> Dict[str, Any]:
+        """
+        Build a provisional resume structure and ATS score.
+
+        Args:
+            resume_text: Resume text
+            role_description: Job role description
+
+        Returns:
+            Dictionary with contact info, sections, skills by category and
+            the local ATS score, flagged as provisional
+        """
+        return {
+            "provisional": True,
+            "personal_info": self.extract_contact_info(resume_text),
+            "sections": self.split_sections(resume_text),
+            "skills": self.extract_skills(resume_text),
+            "ats_score": self.ats_scorer.score(resume_text, role_description),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @traced("resume_preview.save")
+    def save_preview(self, session_id: str, preview: Dict[str, Any]) -> None:
+        """
+        Save a preview to the session; failures only lose the preview.
+
+        Args:
+            session_id: Session ID from resume upload
+            preview: Preview from build_preview
+        """
+        try:
+            self.session_store.save(session_id, "preview", preview)
+        except Exception as e:
+            logger.warning(f"Failed to save resume preview: {e}")
+
+    @staticmethod
+    def split_sections(resume_text: str) -> Dict[str, str]:
+        """
+        Split resume text on standard section headings.
+
+        Args:
+            resume_text: Resume text
+
+        Returns:
+            Section text by canonical section name, in resume order; text
+            before the first heading is returned under "header"
+        """
+        sections: Dict[str, list[str]] = {"header": []}
+        current = "header"
+        for line in resume_text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            for name, pattern in _HEADINGS:
+                match = pattern.match(stripped)
+                # "Skills: Python, Java" starts a section inline
+                if match and (match.group("rest") or len(stripped) <= _MAX_HEADING_LENGTH):
+                    current = name
+                    sections.setdefault(current, [])
+                    stripped = (match.group("rest") or "").strip()
+                    break
+            if stripped:
+                sections[current].append(stripped)
+
+        return {name: "\n".join(lines) for name, lines in sections.items() if lines}
+
+    @staticmethod
+    def extract_contact_info(resume_text: str) -> Dict[str, str | None]:
+        """
+        Find contact details in resume text.
+
+        Args:
+            resume_text: Resume text
+
+        Returns:
+            Dictionary with name, email, phone, linkedin and github (None
+            where not found)
+        """
+        def first(pattern: re.Pattern) -> str | None:
+            match = pattern.search(resume_text)
+            return match.group(0).strip() if match else None
+
+        # The name is usually the first line, before any contact details
+        name = None
+        for line in resume_text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            words = line.split()
+            if len(words) <= 5 and not any(char.isdigit() or char in "@/|" for char in line):
+                name = line
+            break
+
+        return {
+            "name": name,
+            "email": first(_EMAIL),
+            "phone": first(_PHONE),
+            "linkedin": first(_LINKEDIN),
+            "github": first(_GITHUB),
+        }
+
+    def extract_skills(self, resume_text: str) -> Dict[str, list[str]]:
+        """
+        Find taxonomy skills in resume text, grouped by category.
+
+        Args:
+            resume_text: Resume text
+
+        Returns:
+            Canonical skill names by taxonomy category, in order of first appearance
+        """
+        skills: Dict[str, list[str]] = {}
+        for match in self.ats_scorer.taxonomy.find(resume_text):
+            names = skills.setdefault(match.skill.category, [])
+            if match.skill.name not in names:
+                names.append(match.skill.name)
+        return skills
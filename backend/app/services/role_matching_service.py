@@ -4,11 +4,15 @@ Role matching service that analyzes resume fit for job roles and company culture
 
 import json
 import logging
-from pathlib import Path
 from typing import Dict, Any, Optional
 
+from app.services.ats_scorer import ATSScorer
 from app.services.llm_service import LLMService
+from app.services.metrics import PARSE_FALLBACKS
+from app.services.session_store import SessionStore
 from app.services.company_service import CompanyService
+from app.services.tenet_retrieval import collect_text, select_relevant_tenets
+from app.services.tracing import traced
 from app.prompts.role_matching import (
     SYSTEM_PROMPT,
     create_role_matching_prompt,
@@ -23,7 +27,9 @@ class RoleMatchingService:
     def __init__(self):
         """Initialize role matching service."""
         self.llm_service = LLMService()
+        self.session_store = SessionStore()
         self.company_service = CompanyService()
+        self.ats_scorer = ATSScorer()
         logger.info("RoleMatchingService initialized")
     
     async def analyze_match(
@@ -31,6 +37,7 @@ class RoleMatchingService:
         session_id: str,
         company_id: str,
         role_description: str,
+        job_posting: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Analyze how well a resume matches a role and company.
@@ -38,7 +45,10 @@ class RoleMatchingService:
         Args:
             session_id: Session ID for loading resume analysis
             company_id: Company ID (amazon, meta, google)
-            role_description: Job role description
+            role_description: Job role description, or the requirements
+                extracted from it, for the LLM prompt
+            job_posting: Full job posting the local ATS score is computed
+                against; defaults to role_description
             
         Returns:
             Dictionary containing match analysis with scores
@@ -56,6 +66,13 @@ class RoleMatchingService:
             if not resume_data:
                 raise Exception(f"Resume analysis not found for session: {session_id}")
             
+            # Compute the deterministic ATS score locally before calling the LLM,
+            # against the posting itself so it matches POST /api/ats-score
+            local_ats = self.ats_scorer.score(
+                self._load_resume_text(session_id, resume_data), job_posting or role_description
+            )
+            logger.info(f"Local ATS score: {local_ats['score']} (keyword coverage {local_ats['keyword_coverage']}%)")
+            
             # Step 2: Load company tenets
             logger.info(f"Loading company tenets for: {company_id}")
             company_tenets = self.company_service.get_company_tenets(company_id)
@@ -63,6 +80,12 @@ class RoleMatchingService:
             if not company_tenets:
                 raise Exception(f"Company tenets not found for: {company_id}")
             
+            # Keep only the principles relevant to this resume and role
+            company_tenets = select_relevant_tenets(
+                company_tenets,
+                query=f"{role_description}\n{collect_text(resume_data)}",
+            )
+            
             # Step 3: Create prompt for LLM
             prompt = create_role_matching_prompt(
                 resume_summary=resume_data,
@@ -85,7 +108,7 @@ class RoleMatchingService:
             
             # Step 6: Validate and calculate scores
             logger.info("Validating scores...")
-            match_result = self._validate_and_calculate_scores(match_result)
+            match_result = self._validate_and_calculate_scores(match_result, local_ats)
             
             # Step 7: Save results to file system
             logger.info("Saving match analysis results...")
@@ -111,15 +134,12 @@ class RoleMatchingService:
             Resume analysis dictionary or None if not found
         """
         try:
-            analysis_file = Path(f"data/sessions/{session_id}/resume_analysis.json")
+            data = self.session_store.load(session_id, "resume_analysis")
             
-            if not analysis_file.exists():
+            if data is None:
                 logger.warning(f"Resume analysis not found for session: {session_id}")
                 return None
             
-            with open(analysis_file, "r") as f:
-                data = json.load(f)
-            
             logger.info(f"Loaded resume analysis for session: {session_id}")
             return data
             
@@ -127,6 +147,29 @@ class RoleMatchingService:
             logger.error(f"Failed to load resume analysis: {e}")
             return None
     
+    def _load_resume_text(self, session_id: str, resume_data: Dict[str, Any]) -> str:
+        """
+        Load the raw resume text saved by resume analysis.
+        
+        Falls back to the text of the structured resume data for sessions
+        analyzed before the raw text was saved.
+        
+        Args:
+            session_id: Session ID
+            resume_data: Resume analysis results
+            
+        Returns:
+            Resume text
+        """
+        try:
+            document = self.session_store.load(session_id, "resume_text")
+            if document and document.get("text"):
+                return document["text"]
+        except Exception as e:
+            logger.warning(f"Failed to load resume text: {e}")
+        return collect_text(resume_data)
+    
+    @traced("role_matching.parse_response")
     def _parse_llm_response(self, llm_response: str) -> Dict[str, Any]:
         """
         Parse LLM response into structured format.
@@ -170,6 +213,7 @@ class RoleMatchingService:
                     response = response[start_idx:end_idx + 1]
                     logger.info(f"Extracted JSON from position {start_idx} to {end_idx}")
                     parsed = json.loads(response)
+                    PARSE_FALLBACKS.inc(method="extract")
                 else:
                     raise
             
@@ -202,16 +246,40 @@ class RoleMatchingService:
             logger.error(f"Unexpected error parsing response: {e}")
             raise ValueError(f"Failed to parse LLM response: {str(e)}") from e
     
-    def _validate_and_calculate_scores(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+    @traced("role_matching.validate")
+    def _validate_and_calculate_scores(
+        self,
+        match_data: Dict[str, Any],
+        local_ats: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Validate scores and calculate overall score if needed.
         
+        When a local ATS score is given it replaces the LLM's ATS score,
+        keyword lists and formatting score, so they are the same on every
+        run. The LLM's explanation, strengths and weaknesses are kept.
+        
         Args:
             match_data: Parsed match analysis data
+            local_ats: Optional result of ATSScorer.score
             
         Returns:
             Validated match data with calculated overall score
         """
+        if local_ats is not None:
+            ats_data = match_data.setdefault("ats_score", {})
+            if "score" in ats_data:
+                ats_data["llm_score"] = ats_data["score"]
+            ats_data["score"] = local_ats["score"]
+            ats_data["keyword_coverage"] = local_ats["keyword_coverage"]
+            ats_data["keyword_matches"] = {
+                "matched_keywords": local_ats["matched_keywords"],
+                "missing_keywords": local_ats["missing_keywords"],
+            }
+            ats_data["formatting_score"] = local_ats["formatting_score"]
+            ats_data["formatting_notes"] = local_ats["formatting_notes"]
+            ats_data["scoring_method"] = "local"
+        
         # Extract individual scores
         ats_score = match_data.get("ats_score", {}).get("score", 0)
         role_match_score = match_data.get("role_match_score", {}).get("score", 0)
@@ -266,6 +334,7 @@ class RoleMatchingService:
         
         return match_data
     
+    @traced("role_matching.save")
     def _save_match_results(
         self,
         session_id: str,
@@ -279,14 +348,8 @@ class RoleMatchingService:
             match_result: Match analysis results
         """
         try:
-            # Create session directory
-            session_dir = Path(f"data/sessions/{session_id}")
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
             # Save match analysis
-            output_file = session_dir / "match_analysis.json"
-            with open(output_file, "w") as f:
-                json.dump(match_result, f, indent=2)
+            output_file = self.session_store.save(session_id, "match_analysis", match_result)
             
             logger.info(f"Match analysis results saved to: {output_file}")
             
@@ -305,15 +368,12 @@ class RoleMatchingService:
             Match analysis results dictionary or None if not found
         """
         try:
-            output_file = Path(f"data/sessions/{session_id}/match_analysis.json")
+            results = self.session_store.load(session_id, "match_analysis")
             
-            if not output_file.exists():
+            if results is None:
                 logger.warning(f"Match analysis results not found for session: {session_id}")
                 return None
             
-            with open(output_file, "r") as f:
-                results = json.load(f)
-            
             logger.info(f"Loaded match analysis results for session: {session_id}")
             return results
             
@@ -0,0 +1,241 @@
+"""
+Role requirements service that extracts structured requirements from job postings.
+
+The same posting is usually pasted for many candidates, so requirements are
+extracted once per normalized role description and cached in memory and on
+disk. The downstream prompts receive the compact form instead of the raw text.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.services.atomic_write import atomic_write_bytes
+from app.services.lazy_imports import lazy_import
+from app.services.llm_service import LLMService
+from app.services.metrics import PARSE_FALLBACKS
+from app.services.tracing import traced
+from app.prompts.role_requirements import (
+    REQUIREMENT_LISTS,
+    SYSTEM_PROMPT,
+    create_role_requirements_prompt,
+)
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use, to keep app startup fast
+json_repair = lazy_import("json_repair")
+
+ROLE_REQUIREMENTS_DIR = Path("data/role-requirements")
+
+
+def normalize_role_description(role_description: str) -> str:
+    """
+    Normalize a role description so trivially different pastes share a cache entry.
+
+    Args:
+        role_description: Job role description
+
+    Returns:
+        Case-folded text with whitespace collapsed
+    """
+    return " ".join(role_description.split()).casefold()
+
+
+def role_description_hash(role_description: str) -> str:
+    """
+    Compute the cache key for a role description.
+
+    Args:
+        role_description: Job role description
+
+    Returns:
+        SHA-256 hex digest of the normalized description
+    """
+    normalized = normalize_role_description(role_description)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class RoleRequirementsService:
+    """Service for extracting and caching structured role requirements."""
+
+    def __init__(self, cache_dir: str | Path = ROLE_REQUIREMENTS_DIR):
+        """
+        Initialize role requirements service.
+
+        Args:
+            cache_dir: Directory for the on-disk requirements cache
+        """
+        self.llm_service = LLMService()
+        self.cache_dir = Path(cache_dir)
+        self.memory_cache_size = int(os.getenv("ROLE_REQUIREMENTS_CACHE_SIZE", "256"))
+        self._memory_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # Extractions in progress, so concurrent requests share one LLM call
+        self._in_flight: dict[str, asyncio.Future] = {}
+        logger.info("RoleRequirementsService initialized")
+
+    async def get_requirements(self, role_description: str) -> Optional[Dict[str, Any]]:
+        """
+        Get structured requirements for a role description.
+
+        Args:
+            role_description: Job role description
+
+        Returns:
+            Requirements dictionary, or None if extraction failed and the
+            caller should fall back to the raw role description
+        """
+        key = role_description_hash(role_description)
+
+        requirements = self._get_cached(key)
+        if requirements is not None:
+            return requirements
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_requirements(key, role_description))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            logger.warning(f"Role requirement extraction failed, using raw description: {e}")
+            return None
+
+    async def _extract_requirements(self, key: str, role_description: str) -> Dict[str, Any]:
+        """
+        Extract requirements with the LLM and cache them.
+
+        Args:
+            key: Cache key of the role description
+            role_description: Job role description
+
+        Returns:
+            Requirements dictionary
+
+        Raises:
+            Exception: If extraction fails
+        """
+        logger.info(f"Extracting role requirements for {key[:12]}...")
+        llm_response = await self.llm_service.generate_completion(
+            prompt=create_role_requirements_prompt(role_description),
+            system_prompt=SYSTEM_PROMPT,
+            max_tokens=2048,
+            temperature=0.0,  # Same posting should always yield the same requirements
+        )
+
+        requirements = self._validate_requirements(self._parse_llm_response(llm_response))
+        self._save_requirements(key, requirements)
+        self._remember(key, requirements)
+        return requirements
+
+    def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up requirements in the memory cache, then on disk."""
+        requirements = self._memory_cache.get(key)
+        if requirements is not None:
+            self._memory_cache.move_to_end(key)
+            return requirements
+
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                requirements = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable role requirements cache {cache_file}: {e}")
+            return None
+
+        self._remember(key, requirements)
+        return requirements
+
+    def _remember(self, key: str, requirements: Dict[str, Any]) -> None:
+        """Add requirements to the memory cache, evicting the least recently used."""
+        self._memory_cache[key] = requirements
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > self.memory_cache_size:
+            self._memory_cache.popitem(last=False)
+
+    @traced("role_requirements.save")
+    def _save_requirements(self, key: str, requirements: Dict[str, Any]) -> None:
+        """Write requirements to the on-disk cache; failures only cost a re-extraction."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(
+                self.cache_dir / f"{key}.json",
+                json.dumps(requirements, ensure_ascii=False).encode("utf-8"),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache role requirements: {e}")
+
+    @traced("role_requirements.parse_response")
+    def _parse_llm_response(self, llm_response: str) -> Dict[str, Any]:
+        """
+        Parse LLM response into structured format.
+
+        Args:
+            llm_response: Raw response from LLM
+
+        Returns:
+            Parsed dictionary
+
+        Raises:
+            ValueError: If response cannot be parsed
+        """
+        response = llm_response.strip()
+
+        # Remove markdown code blocks if present
+        if response.startswith("```json"):
+            response = response[7:]
+        elif response.startswith("```"):
+            response = response[3:]
+
+        if response.endswith("```"):
+            response = response[:-3]
+
+        response = response.strip()
+
+        try:
+            parsed = json.loads(response)
+        except json.JSONDecodeError:
+            parsed = json.loads(json_repair.repair_json(response))
+            PARSE_FALLBACKS.inc(method="repair")
+
+        if not isinstance(parsed, dict):
+            raise ValueError("Invalid JSON response from LLM: expected an object")
+        return parsed
+
+    @traced("role_requirements.validate")
+    def _validate_requirements(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ensure every expected field is present with the right type.
+
+        Args:
+            requirements: Parsed requirements
+
+        Returns:
+            Validated requirements
+
+        Raises:
+            ValueError: If no requirements were extracted
+        """
+        for field, _ in REQUIREMENT_LISTS:
+            items = requirements.get(field)
+            if not isinstance(items, list):
+                items = []
+            requirements[field] = [str(item).strip() for item in items if str(item).strip()]
+
+        for field in ["role_title", "seniority", "logistics"]:
+            if not isinstance(requirements.get(field), str):
+                requirements[field] = "Not specified" if field == "logistics" else ""
+
+        if not any(requirements[field] for field, _ in REQUIREMENT_LISTS):
+            raise ValueError("No requirements extracted from role description")
+
+        return requirements
@@ -0,0 +1,177 @@
+"""
+Serializers for session artifacts.
+
+Each serializer turns an analysis document into bytes and back, and owns the
+file extension used for it on disk. Loading always picks the serializer from
+the file extension, so files written with one format stay readable after the
+configured format changes.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, BinaryIO
+
+
+class Serializer:
+    """Base class for session artifact serializers."""
+
+    name = ""
+    extension = ""
+    media_type = "application/octet-stream"
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serialize data to bytes.
+
+        Args:
+            data: JSON-compatible data
+
+        Returns:
+            Serialized bytes
+        """
+        raise NotImplementedError
+
+    def loads(self, raw: bytes) -> Any:
+        """
+        Deserialize bytes produced by ``dumps``.
+
+        Args:
+            raw: Serialized bytes
+
+        Returns:
+            Deserialized data
+        """
+        raise NotImplementedError
+
+    def load(self, file: BinaryIO) -> Any:
+        """
+        Deserialize data from a binary file object.
+
+        Args:
+            file: Readable binary file object
+
+        Returns:
+            Deserialized data
+        """
+        return self.loads(file.read())
+
+
+class JSONSerializer(Serializer):
+    """Compact JSON using the standard library."""
+
+    name = "json"
+    extension = ".json"
+    media_type = "application/json"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        # Also reads the pretty-printed files written by older versions
+        return json.loads(raw)
+
+
+class OrjsonSerializer(Serializer):
+    """Compact JSON using orjson (fast native encoder)."""
+
+    name = "orjson"
+    extension = ".json"
+    media_type = "application/json"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def loads(self, raw: bytes) -> Any:
+        return self._orjson.loads(raw)
+
+
+class MsgpackSerializer(Serializer):
+    """Compact binary encoding using MessagePack."""
+
+    name = "msgpack"
+    extension = ".msgpack"
+    media_type = "application/msgpack"
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def dumps(self, data: Any) -> bytes:
+        return self._msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Any:
+        return self._msgpack.unpackb(raw, raw=False)
+
+    def load(self, file: BinaryIO) -> Any:
+        # Unpack incrementally instead of buffering the whole file
+        unpacker = self._msgpack.Unpacker(file, raw=False)
+        return next(unpacker)
+
+
+SERIALIZERS = {
+    JSONSerializer.name: JSONSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(name: str | None = None) -> Serializer:
+    """
+    Create a serializer by name.
+
+    Args:
+        name: Serializer name (json, orjson, msgpack). Defaults to the
+            SESSION_SERIALIZER environment variable, or "json".
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the serializer is unknown or its library isn't installed
+    """
+    name = (name or os.getenv("SESSION_SERIALIZER", "json")).lower()
+
+    if name not in SERIALIZERS:
+        raise ValueError(
+            f"Unknown serializer: {name}. Must be one of: {', '.join(SERIALIZERS)}"
+        )
+
+    try:
+        return _create_serializer(name)
+    except ImportError as e:
+        raise ValueError(f"Serializer '{name}' requires {e.name}, which is not installed") from e
+
+
+def get_serializer_for_extension(extension: str) -> Serializer | None:
+    """
+    Find a serializer able to read files with the given extension.
+
+    Prefers faster implementations when several share an extension.
+
+    Args:
+        extension: File extension including the dot (e.g. ".json")
+
+    Returns:
+        Serializer instance, or None if no installed serializer handles it
+    """
+    for name in ("orjson", "json", "msgpack"):
+        if SERIALIZERS[name].extension != extension:
+            continue
+        try:
+            return _create_serializer(name)
+        except ImportError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def _create_serializer(name: str) -> Serializer:
+    """Create (once) the serializer registered under ``name``."""
+    return SERIALIZERS[name]()
@@ -0,0 +1,234 @@
+"""
+Session store for reading and writing analysis artifacts.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from app.services.atomic_write import atomic_write_bytes, get_durability
+from app.services.compression import (
+    CODECS,
+    Codec,
+    get_codec,
+    get_codec_for_extension,
+)
+from app.services.serializers import (
+    SERIALIZERS,
+    Serializer,
+    get_serializer,
+    get_serializer_for_extension,
+)
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_DIR = Path("data/sessions")
+
+
+class StoredDocument(NamedTuple):
+    """A document file on disk and the formats needed to read it."""
+
+    path: Path
+    serializer: Serializer
+    codec: Codec
+
+
+class SessionStore:
+    """Stores analysis documents under data/sessions/{session_id}/."""
+
+    def __init__(
+        self,
+        base_dir: str | Path = SESSIONS_DIR,
+        serializer: Optional[Serializer] = None,
+        codec: Optional[Codec] = None,
+        durability: Optional[str] = None,
+    ):
+        """
+        Initialize the session store.
+
+        Args:
+            base_dir: Directory containing one subdirectory per session
+            serializer: Serializer for new documents. Defaults to the one
+                configured by the SESSION_SERIALIZER environment variable.
+            codec: Compression codec for new documents. Defaults to the one
+                configured by the SESSION_COMPRESSION environment variable.
+            durability: Write durability level (none, file, full). Defaults to
+                the SESSION_WRITE_DURABILITY environment variable.
+        """
+        self.base_dir = Path(base_dir)
+        self.serializer = serializer or get_serializer()
+        self.codec = codec or get_codec()
+        self.durability = get_durability(durability)
+
+    def session_dir(self, session_id: str) -> Path:
+        """
+        Get the directory holding a session's documents.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Path to the session directory
+        """
+        return self.base_dir / session_id
+
+    def find(self, session_id: str, name: str) -> Optional[StoredDocument]:
+        """
+        Locate a stored document and the formats able to read it.
+
+        Files in the configured format are preferred; files written in any
+        other known format or compression are still found.
+
+        Args:
+            session_id: Session ID
+            name: Document name (e.g. "resume_analysis")
+
+        Returns:
+            StoredDocument, or None if not stored
+        """
+        session_dir = self.session_dir(session_id)
+        for serializer_ext, codec_ext in self._extensions():
+            file_path = session_dir / f"{name}{serializer_ext}{codec_ext}"
+            if not file_path.exists():
+                continue
+
+            serializer = self._serializer_for(serializer_ext)
+            codec = self._codec_for(codec_ext)
+            if serializer is not None and codec is not None:
+                return StoredDocument(file_path, serializer, codec)
+        return None
+
+    def exists(self, session_id: str, name: str) -> bool:
+        """
+        Check whether a document is stored for a session.
+
+        Args:
+            session_id: Session ID
+            name: Document name
+
+        Returns:
+            True if the document exists, False otherwise
+        """
+        return self.find(session_id, name) is not None
+
+    def save(self, session_id: str, name: str, data: Any) -> Path:
+        """
+        Serialize, compress and write a document, replacing any previous version.
+
+        The write is atomic: concurrent readers see either the previous
+        version or the new one, never a partially written file.
+
+        Args:
+            session_id: Session ID
+            name: Document name
+            data: JSON-compatible document
+
+        Returns:
+            Path of the written file
+        """
+        session_dir = self.session_dir(session_id)
+        session_dir.mkdir(parents=True, exist_ok=True)
+
+        output_file = session_dir / f"{name}{self.serializer.extension}{self.codec.extension}"
+        atomic_write_bytes(
+            output_file,
+            self.codec.compress(self.serializer.dumps(data)),
+            durability=self.durability,
+        )
+
+        # Remove copies left behind in other formats so they can't shadow this one
+        for serializer_ext, codec_ext in self._extensions():
+            stale_file = session_dir / f"{name}{serializer_ext}{codec_ext}"
+            if stale_file != output_file and stale_file.exists():
+                stale_file.unlink()
+
+        return output_file
+
+    def load(self, session_id: str, name: str) -> Optional[Any]:
+        """
+        Read and deserialize a document, decompressing it as a stream.
+
+        Args:
+            session_id: Session ID
+            name: Document name
+
+        Returns:
+            Deserialized document, or None if not stored
+
+        Raises:
+            Exception: If the stored file cannot be decoded
+        """
+        document = self.find(session_id, name)
+        if document is None:
+            return None
+
+        self.touch(session_id)
+        with document.codec.open(document.path) as f:
+            return document.serializer.load(f)
+
+    def delete(self, session_id: str, name: str) -> bool:
+        """
+        Remove a document in every format it is stored in.
+
+        Args:
+            session_id: Session ID
+            name: Document name
+
+        Returns:
+            True if a file was removed, False if none was stored
+        """
+        session_dir = self.session_dir(session_id)
+        removed = False
+        for serializer_ext, codec_ext in self._extensions():
+            try:
+                (session_dir / f"{name}{serializer_ext}{codec_ext}").unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def touch(self, session_id: str) -> None:
+        """
+        Record an access to a session.
+
+        The session directory's mtime serves as its last-access time for the
+        session sweeper's least-recently-accessed eviction.
+
+        Args:
+            session_id: Session ID
+        """
+        try:
+            os.utime(self.session_dir(session_id))
+        except OSError:
+            pass
+
+    def _extensions(self) -> list[tuple[str, str]]:
+        """Known (serializer, codec) extension pairs, configured format first."""
+        serializer_exts = [self.serializer.extension]
+        for serializer_class in SERIALIZERS.values():
+            if serializer_class.extension not in serializer_exts:
+                serializer_exts.append(serializer_class.extension)
+
+        codec_exts = [self.codec.extension]
+        for codec_class in CODECS.values():
+            if codec_class.extension not in codec_exts:
+                codec_exts.append(codec_class.extension)
+
+        return [
+            (serializer_ext, codec_ext)
+            for serializer_ext in serializer_exts
+            for codec_ext in codec_exts
+        ]
+
+    def _serializer_for(self, extension: str) -> Optional[Serializer]:
+        """Serializer used to read files with the given extension."""
+        if extension == self.serializer.extension:
+            return self.serializer
+        return get_serializer_for_extension(extension)
+
+    def _codec_for(self, extension: str) -> Optional[Codec]:
+        """Codec used to read files with the given extension."""
+        if extension == self.codec.extension:
+            return self.codec
+        return get_codec_for_extension(extension)
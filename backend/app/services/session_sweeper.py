@@ -0,0 +1,267 @@
+"""
+Background sweeper that evicts expired sessions and enforces a disk budget.
+
+The sweeper is off unless SESSION_TTL_HOURS or SESSION_DISK_BUDGET_MB is set,
+since it deletes session results and uploaded resumes.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.file_service import UPLOAD_DIR
+from app.services.session_store import SESSIONS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Sessions touched this recently are never evicted, so in-flight analyses survive
+ACTIVE_SESSION_GRACE_SECONDS = 15 * 60
+
+
+@dataclass
+class SessionUsage:
+    """Disk usage of one session across data/sessions and data/resumes."""
+
+    session_id: str
+    last_access: float = 0.0
+    size_bytes: int = 0
+    paths: list[Path] = field(default_factory=list)
+
+
+@dataclass
+class SweepReport:
+    """What a sweep reclaimed."""
+
+    sessions_scanned: int = 0
+    sessions_evicted: int = 0
+    files_reclaimed: int = 0
+    bytes_reclaimed: int = 0
+    duration_seconds: float = 0.0
+
+
+class SessionSweeper:
+    """Evicts sessions past their TTL, then least-recently-accessed ones over budget."""
+
+    def __init__(
+        self,
+        sessions_dir: str | Path = SESSIONS_DIR,
+        resumes_dir: str | Path = UPLOAD_DIR,
+        ttl_seconds: float | None = None,
+        disk_budget_bytes: int | None = None,
+        interval_seconds: float | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Initialize the session sweeper.
+
+        Args:
+            sessions_dir: Directory containing one subdirectory per session
+            resumes_dir: Directory containing uploaded resumes
+            ttl_seconds: Evict sessions not accessed for this long
+                (SESSION_TTL_HOURS, default 0 = never expire)
+            disk_budget_bytes: Evict least-recently-accessed sessions while
+                total usage exceeds this (SESSION_DISK_BUDGET_MB, default 0 = unlimited)
+            interval_seconds: Pause between sweeps (SESSION_SWEEP_INTERVAL, default 300)
+            batch_size: Sessions evicted per step before yielding
+                (SESSION_SWEEP_BATCH, default 50)
+        """
+        self.sessions_dir = Path(sessions_dir)
+        self.resumes_dir = Path(resumes_dir)
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else float(os.getenv("SESSION_TTL_HOURS", "0")) * 3600
+        )
+        self.disk_budget_bytes = (
+            disk_budget_bytes if disk_budget_bytes is not None
+            else int(float(os.getenv("SESSION_DISK_BUDGET_MB", "0")) * 1024 * 1024)
+        )
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None
+            else float(os.getenv("SESSION_SWEEP_INTERVAL", "300"))
+        )
+        self.batch_size = batch_size or int(os.getenv("SESSION_SWEEP_BATCH", "50"))
+
+        self.total_files_reclaimed = 0
+        self.total_bytes_reclaimed = 0
+        self.last_report: SweepReport | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a TTL or a disk budget is configured."""
+        return self.ttl_seconds > 0 or self.disk_budget_bytes > 0
+
+    async def run(self) -> None:
+        """Sweep forever, pausing between sweeps. Cancel the task to stop."""
+        logger.info(
+            f"Session sweeper started (TTL: {self.ttl_seconds / 3600:g}h, "
+            f"budget: {self.disk_budget_bytes} bytes, interval: {self.interval_seconds:g}s)"
+        )
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def sweep(self) -> SweepReport:
+        """
+        Run one sweep.
+
+        Directory scans and deletions run in worker threads, and eviction
+        proceeds in batches, so request handling on the event loop is never
+        blocked for long.
+
+        Returns:
+            SweepReport describing what was reclaimed
+        """
+        started = time.monotonic()
+        report = SweepReport()
+
+        sessions = await asyncio.to_thread(self._collect_usage)
+        report.sessions_scanned = len(sessions)
+
+        victims = self._select_victims(sessions, now=time.time())
+        for start in range(0, len(victims), self.batch_size):
+            batch = victims[start:start + self.batch_size]
+            files, size = await asyncio.to_thread(self._evict, batch)
+            report.sessions_evicted += len(batch)
+            report.files_reclaimed += files
+            report.bytes_reclaimed += size
+
+        report.duration_seconds = time.monotonic() - started
+        self.total_files_reclaimed += report.files_reclaimed
+        self.total_bytes_reclaimed += report.bytes_reclaimed
+        self.last_report = report
+
+        if report.sessions_evicted:
+            logger.info(
+                f"Session sweep reclaimed {report.files_reclaimed} files "
+                f"({report.bytes_reclaimed} bytes) from {report.sessions_evicted} "
+                f"of {report.sessions_scanned} sessions in {report.duration_seconds:.2f}s"
+            )
+        return report
+
+    def _select_victims(self, sessions: dict[str, SessionUsage], now: float) -> list[SessionUsage]:
+        """
+        Choose sessions to evict: expired ones first, then the least recently
+        accessed until usage fits within the disk budget.
+
+        Args:
+            sessions: Usage per session ID
+            now: Current wall-clock time
+
+        Returns:
+            Sessions to evict
+        """
+        by_age = sorted(sessions.values(), key=lambda s: s.last_access)
+        evictable = [s for s in by_age if now - s.last_access > ACTIVE_SESSION_GRACE_SECONDS]
+
+        victims = []
+        if self.ttl_seconds > 0:
+            victims = [s for s in evictable if now - s.last_access > self.ttl_seconds]
+
+        if self.disk_budget_bytes > 0:
+            remaining = sum(s.size_bytes for s in by_age) - sum(s.size_bytes for s in victims)
+            chosen = {s.session_id for s in victims}
+            for usage in evictable:
+                if remaining <= self.disk_budget_bytes:
+                    break
+                if usage.session_id not in chosen:
+                    victims.append(usage)
+                    remaining -= usage.size_bytes
+
+        return victims
+
+    def _collect_usage(self) -> dict[str, SessionUsage]:
+        """Scan session and resume directories and aggregate usage per session."""
+        sessions: dict[str, SessionUsage] = {}
+
+        if self.sessions_dir.exists():
+            with os.scandir(self.sessions_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    usage = sessions.setdefault(entry.name, SessionUsage(entry.name))
+                    usage.last_access = max(usage.last_access, entry.stat().st_mtime)
+                    _, size, last_modified = _tree_usage(entry.path)
+                    usage.size_bytes += size
+                    usage.last_access = max(usage.last_access, last_modified)
+                    usage.paths.append(Path(entry.path))
+
+        if self.resumes_dir.exists():
+            with os.scandir(self.resumes_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file(follow_symlinks=False) or "_" not in entry.name:
+                        continue
+                    session_id = entry.name.split("_", 1)[0]
+                    usage = sessions.setdefault(session_id, SessionUsage(session_id))
+                    stat = entry.stat()
+                    usage.size_bytes += stat.st_size
+                    usage.last_access = max(usage.last_access, stat.st_mtime)
+                    usage.paths.append(Path(entry.path))
+
+        return sessions
+
+    def _evict(self, victims: list[SessionUsage]) -> tuple[int, int]:
+        """
+        Delete all files belonging to the given sessions.
+
+        Args:
+            victims: Sessions to delete
+
+        Returns:
+            Tuple of (files_deleted, bytes_deleted)
+        """
+        files_deleted = 0
+        bytes_deleted = 0
+
+        for usage in victims:
+            for path in usage.paths:
+                try:
+                    if path.is_dir() and not path.is_symlink():
+                        # Session directories may hold subdirectories too
+                        files, size, _ = _tree_usage(path)
+                        shutil.rmtree(path)
+                        files_deleted += files
+                        bytes_deleted += size
+                    else:
+                        size = path.stat().st_size
+                        path.unlink()
+                        files_deleted += 1
+                        bytes_deleted += size
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    logger.warning(f"Failed to evict {path}: {e}")
+
+            logger.debug(f"Evicted session: {usage.session_id}")
+
+        return files_deleted, bytes_deleted
+
+
+def _tree_usage(path: str | Path) -> tuple[int, int, float]:
+    """
+    Measure the files under a directory, at any depth.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Tuple of (file_count, total_bytes, latest_mtime)
+    """
+    files = size = 0
+    last_modified = 0.0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                stat = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            files += 1
+            size += stat.st_size
+            last_modified = max(last_modified, stat.st_mtime)
+    return files, size, last_modified
@@ -0,0 +1,235 @@
+"""
+Skill taxonomy with canonical names and aliases, matched with Aho-Corasick.
+
+All aliases are compiled into one automaton, so resume and role text is
+scanned in a single linear pass regardless of how many skills the taxonomy
+holds. The taxonomy lives in data/skill-taxonomy.json.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+SKILL_TAXONOMY_FILE = Path("data/skill-taxonomy.json")
+
+# Characters that may be part of an alias token, so a match must not be
+# directly preceded or followed by one of them ("java" must not match inside
+# "javascript", "c" must not match in "c++")
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+
+@dataclass
+class Skill:
+    """A canonical skill and the names it appears under."""
+
+    name: str
+    category: str
+    aliases: list[str] = field(default_factory=list)  # Matched case-insensitively
+    case_sensitive_aliases: list[str] = field(default_factory=list)  # e.g. "Go", "R"
+
+
+class SkillMatch(NamedTuple):
+    """A skill found in text."""
+
+    start: int
+    end: int
+    skill: Skill
+
+
+class SkillTaxonomy:
+    """Skill taxonomy compiled into an Aho-Corasick automaton."""
+
+    def __init__(self, skills: list[Skill]):
+        """
+        Build the taxonomy and its automaton.
+
+        Args:
+            skills: Skills with their aliases
+        """
+        self.skills = {skill.name: skill for skill in skills}
+
+        # alias (lowercase) -> (skill, exact spelling required or None)
+        self._patterns: list[tuple[str, Skill, str | None]] = []
+        self._by_alias: dict[str, Skill] = {}
+        for skill in skills:
+            for alias in skill.aliases + [skill.name]:
+                self._by_alias.setdefault(alias.lower(), skill)
+            for alias in skill.aliases:
+                self._patterns.append((alias.lower(), skill, None))
+            for alias in skill.case_sensitive_aliases:
+                self._patterns.append((alias.lower(), skill, alias))
+
+        self._build_automaton()
+        logger.info(f"Compiled skill taxonomy: {len(self.skills)} skills, {len(self._patterns)} aliases")
+
+    def _build_automaton(self) -> None:
+        """Build the goto, failure and output functions over all aliases."""
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]  # pattern indexes ending at each state
+
+        for index, (alias, _, _) in enumerate(self._patterns):
+            state = 0
+            for char in alias:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # Breadth-first: a state's failure link is the longest proper suffix
+        # of its path that is also a path from the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> list[SkillMatch]:
+        """
+        Find all skill mentions in text.
+
+        Matches must start and end on word boundaries. Where mentions overlap
+        the leftmost, then longest, wins ("spring boot" over "spring").
+
+        Args:
+            text: Resume or role text
+
+        Returns:
+            Non-overlapping matches in text order
+        """
+        lowered = text.lower()
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        candidates = []
+
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = position + 1
+            if end < len(lowered) and lowered[end] in _WORD_CHARS and lowered[position] in _WORD_CHARS:
+                continue
+            for index in output[state]:
+                alias, skill, exact = patterns[index]
+                start = end - len(alias)
+                if start > 0 and lowered[start - 1] in _WORD_CHARS and lowered[start] in _WORD_CHARS:
+                    continue
+                if exact is not None and not self._exact_match(text, start, exact):
+                    continue
+                candidates.append(SkillMatch(start, end, skill))
+
+        matches = []
+        last_end = 0
+        for match in sorted(candidates, key=lambda m: (m.start, -m.end)):
+            if match.start >= last_end:
+                matches.append(match)
+                last_end = match.end
+        return matches
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Find skills in text, normalized to their canonical names.
+
+        Args:
+            text: Resume or role text
+
+        Returns:
+            Canonical skill names in order of first appearance
+        """
+        return list(dict.fromkeys(match.skill.name for match in self.find(text)))
+
+    def canonicalize(self, name: str) -> str:
+        """
+        Map a skill name to its canonical form.
+
+        Args:
+            name: Skill name, e.g. from an LLM-extracted skills list
+
+        Returns:
+            Canonical name, or the input stripped if it is not in the taxonomy
+        """
+        name = name.strip()
+        skill = self._by_alias.get(name.lower())
+        return skill.name if skill is not None else name
+
+    def canonicalize_list(self, names: list[str]) -> list[str]:
+        """
+        Canonicalize a list of skill names, dropping duplicates.
+
+        Args:
+            names: Skill names
+
+        Returns:
+            Canonical names in their original order
+        """
+        return list(dict.fromkeys(self.canonicalize(name) for name in names if name.strip()))
+
+    @staticmethod
+    def _exact_match(text: str, start: int, alias: str) -> bool:
+        """Check a case-sensitive alias, which is not matched at sentence start."""
+        if text[start:start + len(alias)] != alias:
+            return False
+        if alias.isupper():
+            return True
+        # "Go" opening a sentence is more likely the verb
+        preceding = text[:start].rstrip(" \t")
+        return bool(preceding) and preceding[-1] not in ".!?"
+
+
+def load_skill_taxonomy(path: str | Path) -> SkillTaxonomy:
+    """
+    Load a taxonomy file.
+
+    Args:
+        path: JSON file with a "skills" list
+
+    Returns:
+        Compiled SkillTaxonomy (empty if the file is missing or invalid)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        skills = [Skill(**entry) for entry in data["skills"]]
+    except Exception as e:
+        logger.error(f"Failed to load skill taxonomy from {path}: {str(e)}")
+        skills = []
+    return SkillTaxonomy(skills)
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path: str) -> SkillTaxonomy:
+    """Load a taxonomy once per path."""
+    return load_skill_taxonomy(path)
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """
+    Get the shared skill taxonomy.
+
+    The file is set by the SKILL_TAXONOMY_FILE environment variable (default
+    data/skill-taxonomy.json) and compiled once per process.
+
+    Returns:
+        Shared SkillTaxonomy
+    """
+    return _load_cached(os.getenv("SKILL_TAXONOMY_FILE", str(SKILL_TAXONOMY_FILE)))
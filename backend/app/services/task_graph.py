@@ -0,0 +1,270 @@
+"""
+Dependency graph over timeline tasks with critical path analysis.
+
+Every pass over the graph (cycle repair, topological sort, earliest and
+latest start) is linear in the number of tasks and dependencies.
+"""
+
+import heapq
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class CyclicDependencyError(ValueError):
+    """Raised when task dependencies form a cycle."""
+
+    def __init__(self, task_ids: List[str]):
+        self.task_ids = task_ids
+        super().__init__(f"Task dependencies form a cycle through: {', '.join(task_ids)}")
+
+
+class TaskTiming(NamedTuple):
+    """Critical path timing of a task, in hours from the start of the plan."""
+
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+    slack: int
+
+
+def task_hours(task: Dict[str, Any]) -> int:
+    """
+    Get a task's estimated hours as a non-negative integer.
+
+    Args:
+        task: Task dictionary
+
+    Returns:
+        Estimated hours, 0 if missing or invalid
+    """
+    try:
+        return max(0, round(float(task.get("estimated_hours") or 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def assign_task_ids(tasks: List[Dict[str, Any]]) -> None:
+    """
+    Give every task a unique task_id, replacing missing or duplicate ones.
+
+    Args:
+        tasks: Tasks, updated in place
+    """
+    seen = set()
+    for index, task in enumerate(tasks, start=1):
+        task_id = task.get("task_id")
+        if not task_id or task_id in seen:
+            task_id = f"task_{index}"
+            while task_id in seen:
+                task_id += "_"
+            task["task_id"] = task_id
+        seen.add(task_id)
+
+
+class TaskGraph:
+    """Tasks and their dependencies, for ordering and critical path analysis."""
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        """
+        Build the graph.
+
+        Dependencies on unknown tasks, on the task itself, and repeated
+        dependencies are left out of the graph; repair() also removes them
+        from the task dictionaries.
+
+        Args:
+            tasks: Tasks with unique task_id keys, in written order
+        """
+        self.tasks = {task["task_id"]: task for task in tasks}
+        self.order = list(self.tasks)
+        self.hours = {task_id: task_hours(task) for task_id, task in self.tasks.items()}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {task_id: [] for task_id in self.order}
+
+        for task_id, task in self.tasks.items():
+            dependencies = []
+            for dep in task.get("dependencies") or []:
+                if dep in self.tasks and dep != task_id and dep not in dependencies:
+                    dependencies.append(dep)
+            self.dependencies[task_id] = dependencies
+            for dep in dependencies:
+                self.dependents[dep].append(task_id)
+
+    def find_back_edges(self) -> List[tuple[str, str]]:
+        """
+        Find the dependencies that close a cycle.
+
+        Uses an iterative depth-first search in written order, so for each
+        cycle the dependency pointing back to the earliest written task on
+        it is reported.
+
+        Returns:
+            (task_id, dependency) pairs whose removal makes the graph acyclic
+        """
+        visiting, done = 1, 2
+        state: Dict[str, int] = {}
+        back_edges = []
+
+        for root in self.order:
+            if root in state:
+                continue
+            state[root] = visiting
+            stack = [(root, iter(self.dependencies[root]))]
+            while stack:
+                task_id, deps = stack[-1]
+                dep = next(deps, None)
+                if dep is None:
+                    state[task_id] = done
+                    stack.pop()
+                elif dep not in state:
+                    state[dep] = visiting
+                    stack.append((dep, iter(self.dependencies[dep])))
+                elif state[dep] == visiting:
+                    back_edges.append((task_id, dep))
+        return back_edges
+
+    def break_cycles(self) -> List[tuple[str, str]]:
+        """
+        Remove the dependencies that close a cycle from the graph.
+
+        The task dictionaries are left unchanged; see repair().
+
+        Returns:
+            (task_id, dependency) pairs that were removed
+        """
+        back_edges = self.find_back_edges()
+        for task_id, dep in back_edges:
+            self.dependencies[task_id].remove(dep)
+            self.dependents[dep].remove(task_id)
+        return back_edges
+
+    def repair(self) -> List[str]:
+        """
+        Make the dependencies valid, updating the task dictionaries.
+
+        Removes dependencies on unknown tasks and on the task itself, and
+        breaks every cycle by removing the dependency that closes it.
+
+        Returns:
+            Descriptions of the changes made
+        """
+        repairs = []
+        for task_id, task in self.tasks.items():
+            declared = task.get("dependencies") or []
+            for dep in declared:
+                if dep not in self.tasks:
+                    repairs.append(f"Removed dependency of {task_id} on unknown task {dep}")
+                elif dep == task_id:
+                    repairs.append(f"Removed dependency of {task_id} on itself")
+
+        for task_id, dep in self.break_cycles():
+            repairs.append(f"Removed dependency of {task_id} on {dep} to break a cycle")
+
+        for task_id, task in self.tasks.items():
+            if task.get("dependencies") != self.dependencies[task_id]:
+                task["dependencies"] = list(self.dependencies[task_id])
+
+        for repair in repairs:
+            logger.warning(repair)
+        return repairs
+
+    def topological_order(self, key: Callable[[str], Any] | None = None) -> List[str]:
+        """
+        Order the tasks so that every task comes after its dependencies.
+
+        Args:
+            key: Sort key choosing among tasks that are ready at the same
+                time; defaults to written order
+
+        Returns:
+            Task IDs in dependency order
+
+        Raises:
+            CyclicDependencyError: If the dependencies form a cycle
+        """
+        position = {task_id: index for index, task_id in enumerate(self.order)}
+        key = key or position.__getitem__
+        waiting = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        ready = [(key(task_id), position[task_id], task_id) for task_id, count in waiting.items() if not count]
+        heapq.heapify(ready)
+
+        ordered = []
+        while ready:
+            _, _, task_id = heapq.heappop(ready)
+            ordered.append(task_id)
+            for dependent in self.dependents[task_id]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    heapq.heappush(ready, (key(dependent), position[dependent], dependent))
+
+        if len(ordered) < len(self.order):
+            raise CyclicDependencyError([task_id for task_id in self.order if waiting[task_id]])
+        return ordered
+
+    def compute_timings(self) -> Dict[str, TaskTiming]:
+        """
+        Compute earliest and latest start and slack for every task.
+
+        Assumes dependent tasks wait for their dependencies and nothing else,
+        so the plan takes as long as its longest dependency chain.
+
+        Returns:
+            Timing by task ID
+
+        Raises:
+            CyclicDependencyError: If the dependencies form a cycle
+        """
+        ordered = self.topological_order()
+
+        earliest_finish: Dict[str, int] = {}
+        for task_id in ordered:
+            start = max((earliest_finish[dep] for dep in self.dependencies[task_id]), default=0)
+            earliest_finish[task_id] = start + self.hours[task_id]
+
+        duration = max(earliest_finish.values(), default=0)
+        latest_start: Dict[str, int] = {}
+        timings = {}
+        for task_id in reversed(ordered):
+            finish = min((latest_start[dependent] for dependent in self.dependents[task_id]), default=duration)
+            latest_start[task_id] = finish - self.hours[task_id]
+            start = earliest_finish[task_id] - self.hours[task_id]
+            timings[task_id] = TaskTiming(
+                earliest_start=start,
+                earliest_finish=earliest_finish[task_id],
+                latest_start=latest_start[task_id],
+                latest_finish=finish,
+                slack=latest_start[task_id] - start,
+            )
+        return timings
+
+    def critical_path(self, timings: Dict[str, TaskTiming] | None = None) -> List[str]:
+        """
+        Find the chain of tasks that determines how long the plan takes.
+
+        Args:
+            timings: Result of compute_timings, computed if not given
+
+        Returns:
+            Task IDs with no slack, from the first to the last on the chain
+        """
+        timings = timings or self.compute_timings()
+        if not timings:
+            return []
+
+        # Follow zero-slack tasks from the first written task finishing last
+        duration = max(timing.earliest_finish for timing in timings.values())
+        task_id = next(task_id for task_id in self.order if timings[task_id].earliest_finish == duration)
+        path = [task_id]
+        while True:
+            predecessors = [
+                dep for dep in self.dependencies[task_id]
+                if timings[dep].slack == 0 and timings[dep].earliest_finish == timings[task_id].earliest_start
+            ]
+            if not predecessors:
+                break
+            task_id = predecessors[0]
+            path.append(task_id)
+        return path[::-1]
@@ -0,0 +1,316 @@
+"""
+Local retrieval of the company principles most relevant to a candidate.
+
+Each tenets file is split into principles and indexed with BM25 once per
+tenets version. At prompt time only the top-k principles for the resume and
+role are included, instead of the whole file. Everything runs in-process with
+no network access or model.
+"""
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_NUMBERED = re.compile(r"^\d+\.\s+\S")
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    """
+    a about above after all also an and any are as at be been being both but by
+    can could did do does doing for from had has have having how i if in into is
+    it its just more most no not of on only or other our out over own same should
+    so some such than that the their them then there these they this those to
+    too under up very was we were what when where which while who why will with
+    would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercased, lightly stemmed terms without stopwords.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms
+    """
+    return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _stem(token: str) -> str:
+    """Strip common English suffixes so "shipping" and "ships" match "ship"."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+@dataclass
+class Principle:
+    """One principle from a tenets file."""
+
+    section: int  # Index of the section the principle belongs to
+    title: str
+    text: str
+    heading: str = ""  # Lines introducing a bullet list, shared by its bullets
+
+
+@dataclass
+class TenetDocument:
+    """A tenets file split into preamble, sections and principles."""
+
+    preamble: str
+    sections: list[str] = field(default_factory=list)  # Heading and intro text
+    principles: list[Principle] = field(default_factory=list)
+
+
+def split_tenets(tenets: str) -> TenetDocument:
+    """
+    Split a tenets file into principles.
+
+    Numbered paragraphs ("1. Customer Obsession") start a principle, and the
+    paragraphs that follow (such as "For interns:" notes) belong to it until
+    the next principle, heading or "---" separator. Each "- Name: ..." bullet
+    is a principle of its own. Other paragraphs are kept as the preamble or
+    as the introduction of their section.
+
+    Args:
+        tenets: Full tenets text
+
+    Returns:
+        TenetDocument
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", tenets.strip()) if p.strip()]
+
+    preamble: list[str] = []
+    sections: list[list[str]] = []
+    principles: list[Principle] = []
+    current: Principle | None = None
+
+    def start_section(text: str | None = None) -> None:
+        sections.append([text] if text else [])
+
+    for paragraph in paragraphs:
+        first_line = paragraph.splitlines()[0]
+
+        if paragraph == "---" or set(paragraph) == {"-"}:
+            current = None
+            if sections or principles:
+                start_section()
+            continue
+
+        if _NUMBERED.match(first_line):
+            if not sections:
+                start_section()
+            title = re.sub(r"^\d+\.\s+", "", first_line).strip()
+            current = Principle(len(sections) - 1, title, paragraph)
+            principles.append(current)
+            continue
+
+        is_heading = "\n" not in paragraph and paragraph.endswith(":") and len(paragraph) < 80
+        if is_heading:
+            current = None
+            if sections and not sections[-1]:
+                sections[-1].append(paragraph)
+            else:
+                start_section(paragraph)
+            continue
+
+        if current is not None:
+            current.text += "\n\n" + paragraph
+            continue
+
+        if not sections:
+            preamble.append(paragraph)
+            continue
+
+        lines = paragraph.splitlines()
+        bullets = [line for line in lines if line.startswith("- ")]
+        if not bullets:
+            sections[-1].append(paragraph)
+            continue
+
+        heading = "\n".join(line for line in lines if not line.startswith("- "))
+        for line in bullets:
+            title = line[2:].split(":", 1)[0].strip()
+            principles.append(Principle(len(sections) - 1, title, line, heading))
+
+    return TenetDocument(
+        preamble="\n\n".join(preamble),
+        sections=["\n\n".join(section) for section in sections],
+        principles=principles,
+    )
+
+
+class TenetIndex:
+    """BM25 index over the principles of one tenets file."""
+
+    def __init__(self, tenets: str):
+        """
+        Split and index a tenets file.
+
+        Args:
+            tenets: Full tenets text
+        """
+        self.tenets = tenets
+        self.document = split_tenets(tenets)
+
+        # The title is counted twice so that naming a principle weighs heavily
+        self._term_freqs = [
+            Counter(tokenize(f"{p.title} {p.title} {p.text}")) for p in self.document.principles
+        ]
+        lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        doc_freqs: Counter = Counter()
+        for tf in self._term_freqs:
+            doc_freqs.update(tf.keys())
+        count = len(self._term_freqs)
+        self._idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()
+        }
+
+    def score(self, query: str) -> list[float]:
+        """
+        Score every principle against a query.
+
+        Args:
+            query: Free text, e.g. resume summary and role description
+
+        Returns:
+            BM25 score per principle, in document order
+        """
+        query_terms = Counter(term for term in tokenize(query) if term in self._idf)
+        scores = []
+        for tf, length in zip(self._term_freqs, self._lengths):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._avg_length)
+            score = 0.0
+            for term, query_count in query_terms.items():
+                freq = tf.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (BM25_K1 + 1) / (freq + norm) * query_count
+            scores.append(score)
+        return scores
+
+    def select(self, query: str, top_k: int) -> str:
+        """
+        Render the tenets with only the top-k principles for a query.
+
+        Selected principles keep their original wording, numbering and order,
+        under their section headings.
+
+        Args:
+            query: Free text to rank principles against
+            top_k: Number of principles to keep
+
+        Returns:
+            Reduced tenets text, or the full text if nothing would be dropped
+        """
+        principles = self.document.principles
+        if top_k <= 0 or len(principles) <= top_k:
+            return self.tenets
+
+        scores = self.score(query)
+        ranked = sorted(range(len(principles)), key=lambda i: (-scores[i], i))
+        selected = sorted(ranked[:top_k])
+
+        parts = [self.document.preamble] if self.document.preamble else []
+        last_section = None
+        last_heading = None
+        for i in selected:
+            principle = principles[i]
+            if principle.section != last_section:
+                last_section = principle.section
+                last_heading = None
+                if self.document.sections[principle.section]:
+                    parts.append(self.document.sections[principle.section])
+
+            if principle.heading and principle.heading == last_heading:
+                # Keep consecutive bullets of one list together
+                parts[-1] += "\n" + principle.text
+                continue
+            last_heading = principle.heading or None
+            if principle.heading:
+                parts.append(f"{principle.heading}\n{principle.text}")
+            else:
+                parts.append(principle.text)
+        return "\n\n".join(parts)
+
+
+@lru_cache(maxsize=64)
+def get_tenet_index(tenets: str) -> TenetIndex:
+    """
+    Get the index for a tenets text, building it on first use.
+
+    Args:
+        tenets: Full tenets text
+
+    Returns:
+        Cached TenetIndex
+    """
+    index = TenetIndex(tenets)
+    logger.info(f"Indexed {len(index.document.principles)} principles")
+    return index
+
+
+def collect_text(data: Any) -> str:
+    """
+    Flatten the string values of nested analysis data into one text.
+
+    Args:
+        data: Dictionary, list or scalar from an analysis result
+
+    Returns:
+        Space-separated text of all string values
+    """
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return ""
+    return " ".join(text for text in map(collect_text, data) if text)
+
+
+def get_tenet_top_k() -> int:
+    """
+    Number of principles to include in prompts.
+
+    Configured by the TENET_TOP_K environment variable (default 6); 0
+    includes every principle.
+    """
+    return int(os.getenv("TENET_TOP_K", "6"))
+
+
+def select_relevant_tenets(tenets: str, query: str, top_k: int | None = None) -> str:
+    """
+    Reduce a tenets text to the principles most relevant to a query.
+
+    Args:
+        tenets: Full tenets text
+        query: Resume and role text to rank principles against
+        top_k: Number of principles to keep, defaults to TENET_TOP_K
+
+    Returns:
+        Tenets text containing only the selected principles
+    """
+    if top_k is None:
+        top_k = get_tenet_top_k()
+
+    selected = get_tenet_index(tenets).select(query, top_k)
+    if len(selected) < len(tenets):
+        logger.info(f"Selected top {top_k} principles ({len(tenets)} -> {len(selected)} chars)")
+    return selected
@@ -0,0 +1,265 @@
+"""
+Deterministic weekly scheduling of timeline tasks.
+
+The LLM writes the phases and their tasks; everything that is plain
+arithmetic over task hours, dependencies and the weekly hours budget is
+computed here instead: task order, the week-by-week breakdown, phase and
+milestone dates, each task's slack, and the critical path.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from app.services.task_graph import TaskGraph, TaskTiming, assign_task_ids, task_hours
+
+logger = logging.getLogger(__name__)
+
+# Ready tasks within a phase are scheduled in this order
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+class TimelineScheduler:
+    """Packs timeline tasks into weeks under a weekly hours budget."""
+
+    def __init__(self, hours_per_week: int):
+        """
+        Initialize the scheduler.
+
+        Args:
+            hours_per_week: Hours the candidate can spend each week
+        """
+        self.hours_per_week = max(1, hours_per_week)
+
+    def schedule(
+        self,
+        timeline_data: Dict[str, Any],
+        start_date: date,
+        weeks_available: int,
+        critical_path: List[str] | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Schedule the tasks of a timeline and fill in everything derived from it.
+
+        Tasks are worked on one at a time in dependency order, so each task
+        starts when the previous one ends. Sets each task's start and end
+        week, each phase's weeks and hours per week, milestone dates and the
+        weekly breakdown. Each task's earliest and latest start and slack,
+        and the critical path, come from the same critical path analysis of
+        the dependency graph, so critical path tasks have no slack.
+
+        Args:
+            timeline_data: Timeline with LLM-written phases and tasks
+            start_date: Date the plan starts
+            weeks_available: Weeks until the target deadline
+            critical_path: Critical path already computed for these tasks;
+                computed here if not given
+
+        Returns:
+            The timeline data, updated in place
+        """
+        phases = timeline_data.get("phases") or []
+        tasks, phase_indexes = self._collect_tasks(phases)
+        graph = self._build_graph(tasks)
+        ordered = self._order(graph, phase_indexes)
+
+        # Hour offsets from the start of the plan
+        cursor = 0
+        spans: Dict[str, tuple[int, int]] = {}
+        for task in ordered:
+            hours = task_hours(task)
+            spans[task["task_id"]] = (cursor, cursor + hours)
+            task["start_week"] = self._week_of(cursor)
+            task["end_week"] = self._week_of(cursor + hours, end=True) if hours else task["start_week"]
+            cursor += hours
+
+        scheduled_weeks = self._week_of(cursor, end=True) if cursor else 0
+        total_weeks = max(weeks_available, scheduled_weeks, 1)
+
+        timings = graph.compute_timings()
+        self._set_slack(graph, timings)
+        self._schedule_phases(phases, start_date)
+        timeline_data["weekly_breakdown"] = self._build_weekly_breakdown(
+            phases, ordered, spans, start_date, total_weeks
+        )
+        timeline_data["critical_path"] = (
+            critical_path if critical_path is not None else graph.critical_path(timings)
+        )
+
+        metadata = timeline_data.setdefault("metadata", {})
+        metadata["hours_per_week"] = self.hours_per_week
+        metadata["scheduled_weeks"] = scheduled_weeks
+        if scheduled_weeks > weeks_available:
+            logger.warning(
+                f"Timeline needs {scheduled_weeks} weeks at {self.hours_per_week} hours/week, "
+                f"{weeks_available} available"
+            )
+
+        logger.info(f"Scheduled {len(ordered)} tasks ({cursor} hours) into {scheduled_weeks} weeks")
+        return timeline_data
+
+    def order_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        phase_indexes: Dict[str, int] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Order tasks so that every task comes after its dependencies.
+
+        Among tasks whose dependencies are done, earlier phases go first, then
+        higher priority, then the order the tasks were written in.
+        Dependencies on unknown tasks are ignored, and cycles are broken by
+        ignoring the dependency that closes them.
+
+        Args:
+            tasks: Tasks with unique task_id keys, in written order
+            phase_indexes: Index of each task's phase, by task ID
+
+        Returns:
+            Tasks in scheduling order
+        """
+        return self._order(self._build_graph(tasks), phase_indexes)
+
+    def critical_path(self, tasks: List[Dict[str, Any]]) -> List[str]:
+        """
+        Find the longest chain of dependent tasks by estimated hours.
+
+        Args:
+            tasks: Tasks with unique task_id keys
+
+        Returns:
+            Task IDs of the chain, in order
+        """
+        return self._build_graph(tasks).critical_path()
+
+    @staticmethod
+    def _build_graph(tasks: List[Dict[str, Any]]) -> TaskGraph:
+        """Build the task graph, ignoring dependencies that close a cycle."""
+        graph = TaskGraph(tasks)
+        for task_id, dep in graph.break_cycles():
+            logger.warning(f"Ignoring dependency of {task_id} on {dep}, which closes a cycle")
+        return graph
+
+    @staticmethod
+    def _order(graph: TaskGraph, phase_indexes: Dict[str, int] | None) -> List[Dict[str, Any]]:
+        """Order the graph's tasks by dependencies, then phase, then priority."""
+        phase_indexes = phase_indexes or {}
+
+        def rank(task_id: str) -> tuple:
+            priority = PRIORITY_RANK.get(graph.tasks[task_id].get("priority"), 1)
+            return (phase_indexes.get(task_id, 0), priority)
+
+        return [graph.tasks[task_id] for task_id in graph.topological_order(key=rank)]
+
+    @staticmethod
+    def _set_slack(graph: TaskGraph, timings: Dict[str, TaskTiming]) -> None:
+        """Set each task's earliest and latest start and slack, in hours."""
+        for task_id, timing in timings.items():
+            task = graph.tasks[task_id]
+            task["earliest_start"] = timing.earliest_start
+            task["latest_start"] = timing.latest_start
+            task["slack"] = timing.slack
+
+    def _collect_tasks(self, phases: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Gather all tasks with unique IDs, and the index of each task's phase."""
+        tasks = [task for phase in phases for task in phase.get("tasks") or []]
+        assign_task_ids(tasks)
+        phase_indexes = {
+            task["task_id"]: phase_index
+            for phase_index, phase in enumerate(phases)
+            for task in phase.get("tasks") or []
+        }
+        return tasks, phase_indexes
+
+    def _schedule_phases(self, phases: List[Dict[str, Any]], start_date: date) -> None:
+        """Derive phase weeks, hours per week and milestone dates from the tasks."""
+        previous_end = 1
+        for phase in phases:
+            tasks = phase.get("tasks") or []
+            if tasks:
+                phase["start_week"] = min(task["start_week"] for task in tasks)
+                phase["end_week"] = max(task["end_week"] for task in tasks)
+            else:
+                phase["start_week"] = phase["end_week"] = previous_end
+            previous_end = phase["end_week"]
+
+            weeks = phase["end_week"] - phase["start_week"] + 1
+            phase["estimated_hours_per_week"] = round(sum(task_hours(task) for task in tasks) / weeks)
+
+            _, phase_end = self._week_dates(start_date, phase["end_week"])
+            for milestone in phase.get("milestones") or []:
+                milestone["target_date"] = phase_end.isoformat()
+
+    def _build_weekly_breakdown(
+        self,
+        phases: List[Dict[str, Any]],
+        ordered: List[Dict[str, Any]],
+        spans: Dict[str, tuple[int, int]],
+        start_date: date,
+        total_weeks: int,
+    ) -> List[Dict[str, Any]]:
+        """Build the week-by-week plan from the task schedule."""
+        phase_of = {
+            task["task_id"]: self._phase_label(phase)
+            for phase in phases
+            for task in phase.get("tasks") or []
+        }
+        last_phase = self._phase_label(phases[-1]) if phases else "Review"
+
+        weeks = []
+        for week in range(1, total_weeks + 1):
+            week_start_hour = (week - 1) * self.hours_per_week
+            week_end_hour = week * self.hours_per_week
+
+            # Hours each task gets this week, in scheduling order
+            work = []
+            for task in ordered:
+                start, end = spans[task["task_id"]]
+                overlap = min(end, week_end_hour) - max(start, week_start_hour)
+                if overlap > 0 or (start == end and task["start_week"] == week):
+                    work.append((task, max(overlap, 0), end <= week_end_hour))
+
+            week_start, week_end = self._week_dates(start_date, week)
+            entry = {
+                "week_number": week,
+                "start_date": week_start.isoformat(),
+                "end_date": week_end.isoformat(),
+                "tasks": [task.get("title", task["task_id"]) for task, _, _ in work],
+                "estimated_hours": sum(hours for _, hours, _ in work),
+            }
+
+            if work:
+                main_task = max(work, key=lambda item: item[1])[0]
+                finished = [task for task, _, done in work if done]
+                entry["phase"] = phase_of[main_task["task_id"]]
+                entry["focus"] = main_task.get("title", main_task["task_id"])
+                entry["key_deliverable"] = (
+                    f"Complete: {finished[-1].get('title', finished[-1]['task_id'])}"
+                    if finished else f"Progress on: {entry['focus']}"
+                )
+            else:
+                entry["phase"] = last_phase
+                entry["focus"] = "Buffer: review, catch up and polish"
+                entry["key_deliverable"] = "Catch up on unfinished tasks"
+
+            weeks.append(entry)
+        return weeks
+
+    def _week_of(self, hour: int, end: bool = False) -> int:
+        """Get the 1-based week containing an hour offset, or ending at it if end."""
+        if end:
+            return max(1, -(-hour // self.hours_per_week))
+        return hour // self.hours_per_week + 1
+
+    @staticmethod
+    def _week_dates(start_date: date, week: int) -> tuple[date, date]:
+        """Get the first and last date of a 1-based week."""
+        week_start = start_date + timedelta(weeks=week - 1)
+        return week_start, week_start + timedelta(days=6)
+
+    @staticmethod
+    def _phase_label(phase: Dict[str, Any]) -> str:
+        """Get the label of a phase used in the weekly breakdown."""
+        number = phase.get("phase_number")
+        title = phase.get("title", "")
+        return f"Phase {number}: {title}" if number is not None else title
@@ -4,11 +4,15 @@ Timeline generation service that creates personalized development timelines.
 
 import json
 import logging
-from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from app.services.llm_service import LLMService
+from app.services.metrics import PARSE_FALLBACKS
+from app.services.session_store import SessionStore
+from app.services.task_graph import TaskGraph, assign_task_ids, task_hours
+from app.services.timeline_scheduler import PRIORITY_RANK, TimelineScheduler
+from app.services.tracing import traced
 from app.prompts.timeline_generation import (
     SYSTEM_PROMPT,
     create_timeline_prompt,
@@ -23,6 +27,7 @@ class TimelineService:
     def __init__(self):
         """Initialize timeline service."""
         self.llm_service = LLMService()
+        self.session_store = SessionStore()
         logger.info("TimelineService initialized")
     
     async def generate_timeline(
@@ -95,12 +100,12 @@ class TimelineService:
                 hours_per_week=hours_per_week,
             )
             
-            # Step 4: Call LLM for timeline generation
+            # Step 4: Call LLM for timeline generation (phases and tasks only)
             logger.info("Calling LLM for timeline generation...")
             llm_response = await self.llm_service.generate_completion(
                 prompt=prompt,
                 system_prompt=SYSTEM_PROMPT,
-                max_tokens=16384,  # Large token limit for comprehensive timeline
+                max_tokens=8192,  # Weekly breakdown is scheduled locally
                 temperature=0.4,  # Slightly higher for creative planning
             )
             
@@ -108,8 +113,9 @@ class TimelineService:
             logger.info("Parsing LLM response...")
             timeline_result = self._parse_llm_response(llm_response)
             
-            # Step 6: Validate timeline data
+            # Step 6: Validate timeline data, repairing the task graph
             logger.info("Validating timeline...")
+            timeline_result.setdefault("metadata", {})["hours_per_week"] = hours_per_week
             timeline_result = self._validate_timeline_data(
                 timeline_result,
                 start_date.isoformat(),
@@ -117,7 +123,14 @@ class TimelineService:
                 weeks_available,
             )
             
-            # Step 7: Save results to file system
+            # Step 7: Schedule tasks into weeks
+            logger.info("Scheduling tasks...")
+            TimelineScheduler(hours_per_week).schedule(
+                timeline_result, start_date, weeks_available,
+                critical_path=timeline_result.get("critical_path"),
+            )
+            
+            # Step 8: Save results to file system
             logger.info("Saving timeline results...")
             self._save_timeline_results(session_id, timeline_result)
             
@@ -143,15 +156,12 @@ class TimelineService:
             Gap analysis dictionary or None if not found
         """
         try:
-            analysis_file = Path(f"data/sessions/{session_id}/gap_analysis.json")
+            data = self.session_store.load(session_id, "gap_analysis")
             
-            if not analysis_file.exists():
+            if data is None:
                 logger.warning(f"Gap analysis not found for session: {session_id}")
                 return None
             
-            with open(analysis_file, "r") as f:
-                data = json.load(f)
-            
             logger.info(f"Loaded gap analysis for session: {session_id}")
             return data
             
@@ -159,6 +169,7 @@ class TimelineService:
             logger.error(f"Failed to load gap analysis: {e}")
             return None
     
+    @traced("timeline.parse_response")
     def _parse_llm_response(self, llm_response: str) -> Dict[str, Any]:
         """
         Parse LLM response into structured format.
@@ -202,14 +213,14 @@ class TimelineService:
                     response = response[start_idx:end_idx + 1]
                     logger.info(f"Extracted JSON from position {start_idx} to {end_idx}")
                     parsed = json.loads(response)
+                    PARSE_FALLBACKS.inc(method="extract")
                 else:
                     raise
             
-            # Validate required fields
+            # Validate required fields; the weekly breakdown is scheduled locally
             required_fields = [
                 "metadata",
                 "phases",
-                "weekly_breakdown",
             ]
             
             for field in required_fields:
@@ -227,6 +238,9 @@ class TimelineService:
                     else:
                         parsed[field] = []
             
+            # Filled in by the scheduler
+            parsed.setdefault("weekly_breakdown", [])
+            
             return parsed
             
         except json.JSONDecodeError as e:
@@ -239,6 +253,7 @@ class TimelineService:
             logger.error(f"Unexpected error parsing response: {e}")
             raise ValueError(f"Failed to parse LLM response: {str(e)}") from e
     
+    @traced("timeline.validate")
     def _validate_timeline_data(
         self,
         timeline_data: Dict[str, Any],
@@ -269,24 +284,20 @@ class TimelineService:
         metadata["target_deadline"] = target_deadline
         metadata["total_weeks"] = weeks_available
         
-        # Calculate total hours from tasks
-        total_hours = 0
-        phases = timeline_data.get("phases", [])
-        
-        for phase in phases:
-            tasks = phase.get("tasks", [])
-            for task in tasks:
-                total_hours += task.get("estimated_hours", 0)
-        
-        metadata["total_hours"] = total_hours
-        
         # Validate hours per week is reasonable
         if "hours_per_week" not in metadata or metadata["hours_per_week"] <= 0:
             metadata["hours_per_week"] = 12
         
-        # Ensure critical_path exists
-        if "critical_path" not in timeline_data:
-            timeline_data["critical_path"] = []
+        # Repair dependencies, defer tasks over the hours budget, and compute
+        # the critical path; the scheduler sets each task's slack
+        phases = timeline_data.get("phases", [])
+        budget_hours = weeks_available * metadata["hours_per_week"]
+        metadata["plan_adjustments"] = self._repair_task_graph(timeline_data, budget_hours)
+        
+        # Calculate total hours from tasks
+        total_hours = sum(task_hours(task) for phase in phases for task in phase.get("tasks", []))
+        metadata["total_hours"] = total_hours
+        metadata["feasible"] = total_hours <= budget_hours
         
         # Ensure flexibility_notes exists
         if "flexibility_notes" not in timeline_data:
@@ -303,6 +314,88 @@ class TimelineService:
         
         return timeline_data
     
+    def _repair_task_graph(self, timeline_data: Dict[str, Any], budget_hours: int) -> List[str]:
+        """
+        Make the task plan feasible without another LLM call.
+        
+        Invalid and cyclic dependencies are removed, and the critical path is
+        computed once for the scheduler. If the tasks need more hours than
+        the budget, tasks that are neither high priority nor on the critical
+        path are deferred, lowest priority and most slack first, as long as no
+        remaining task depends on them. Nothing is deferred when that still
+        would not bring the plan within the budget.
+        
+        Args:
+            timeline_data: Timeline data, updated in place
+            budget_hours: Hours available until the deadline
+            
+        Returns:
+            Descriptions of the changes made
+        """
+        phases = timeline_data.get("phases", [])
+        tasks = [task for phase in phases for task in phase.get("tasks", [])]
+        assign_task_ids(tasks)
+        graph = TaskGraph(tasks)
+        adjustments = graph.repair()
+        
+        timings = graph.compute_timings()
+        critical_path = graph.critical_path(timings)
+        # Deferred tasks never lie on the critical path, so it stays valid
+        timeline_data["critical_path"] = critical_path
+        
+        total_hours = sum(graph.hours.values())
+        if total_hours > budget_hours:
+            critical = set(critical_path)
+            candidates = sorted(
+                (
+                    task_id for task_id in graph.order
+                    if task_id not in critical and graph.tasks[task_id].get("priority") != "high"
+                ),
+                key=lambda task_id: (
+                    -PRIORITY_RANK.get(graph.tasks[task_id].get("priority"), 1),
+                    -timings[task_id].slack,
+                    -graph.hours[task_id],
+                ),
+            )
+            
+            # A task can only go once everything depending on it has gone
+            deferred: List[str] = []
+            remaining_hours = total_hours
+            changed = True
+            while changed and remaining_hours > budget_hours:
+                changed = False
+                for task_id in candidates:
+                    if task_id in deferred or not set(graph.dependents[task_id]) <= set(deferred):
+                        continue
+                    deferred.append(task_id)
+                    remaining_hours -= graph.hours[task_id]
+                    changed = True
+                    if remaining_hours <= budget_hours:
+                        break
+            
+            if remaining_hours > budget_hours:
+                adjustments.append(
+                    f"Tasks need {total_hours} hours, more than the {budget_hours} hours available; "
+                    f"deferring optional tasks would still leave {remaining_hours} hours, so none were deferred"
+                )
+            else:
+                for task_id in deferred:
+                    adjustments.append(
+                        f"Deferred '{graph.tasks[task_id].get('title', task_id)}' "
+                        f"({graph.hours[task_id]} hours) to fit the {budget_hours}-hour budget"
+                    )
+                deferred_ids = set(deferred)
+                timeline_data["deferred_tasks"] = [
+                    graph.tasks[task_id] for task_id in graph.order if task_id in deferred_ids
+                ]
+                for phase in phases:
+                    phase["tasks"] = [task for task in phase.get("tasks", []) if task["task_id"] not in deferred_ids]
+        
+        if adjustments:
+            logger.info(f"Repaired timeline plan: {len(adjustments)} adjustments")
+        return adjustments
+    
+    @traced("timeline.save")
     def _save_timeline_results(
         self,
         session_id: str,
@@ -316,14 +409,8 @@ class TimelineService:
             timeline_result: Timeline results
         """
         try:
-            # Create session directory
-            session_dir = Path(f"data/sessions/{session_id}")
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
             # Save timeline
-            output_file = session_dir / "timeline.json"
-            with open(output_file, "w") as f:
-                json.dump(timeline_result, f, indent=2)
+            output_file = self.session_store.save(session_id, "timeline", timeline_result)
             
             logger.info(f"Timeline results saved to: {output_file}")
             
@@ -342,15 +429,12 @@ class TimelineService:
             Timeline results dictionary or None if not found
         """
         try:
-            output_file = Path(f"data/sessions/{session_id}/timeline.json")
+            results = self.session_store.load(session_id, "timeline")
             
-            if not output_file.exists():
+            if results is None:
                 logger.warning(f"Timeline results not found for session: {session_id}")
                 return None
             
-            with open(output_file, "r") as f:
-                results = json.load(f)
-            
             logger.info(f"Loaded timeline results for session: {session_id}")
             return results
             
@@ -0,0 +1,337 @@
+"""
+Ledger of LLM token usage and its cost.
+
+Every LLM call appends one JSON line with its token counts, attributed to
+the analysis, session, phase, company and model taken from the metric
+context. Costs are computed when the ledger is aggregated, from per-model
+prices, so a price change applies to past usage too. Calls served by the
+fake backend (benchmarks and tests) cost nothing and are reported apart.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.services.metrics import UNKNOWN_LABEL, current_labels
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FILE = Path("data/usage/token_ledger.jsonl")
+
+TOKEN_KINDS = ("input", "output", "cache_read", "cache_creation")
+
+# USD per million tokens by model name prefix, longest prefix first when matching
+MODEL_PRICES: Dict[str, Dict[str, float]] = {
+    "claude-3-5-haiku": {"input": 0.80, "output": 4.00, "cache_read": 0.08, "cache_creation": 1.00},
+    "claude-3-haiku": {"input": 0.25, "output": 1.25, "cache_read": 0.03, "cache_creation": 0.30},
+    "claude-3-5-sonnet": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_creation": 3.75},
+    "claude-3-7-sonnet": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_creation": 3.75},
+    "claude-sonnet-4": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_creation": 3.75},
+    "claude-3-opus": {"input": 15.00, "output": 75.00, "cache_read": 1.50, "cache_creation": 18.75},
+    "claude-opus-4": {"input": 15.00, "output": 75.00, "cache_read": 1.50, "cache_creation": 18.75},
+}
+
+GROUP_FIELDS = ("analysis_id", "session_id", "day", "phase", "company", "model")
+
+# Backends whose calls never reach a paid API
+SIMULATED_BACKENDS = ("fake",)
+
+
+def get_model_prices() -> Dict[str, Dict[str, float]]:
+    """
+    Get prices per million tokens by model name prefix.
+
+    LLM_PRICES may hold a JSON object in the same shape, overriding or
+    adding models, e.g. {"my-model": {"input": 1, "output": 5}}.
+
+    Returns:
+        Prices by model prefix and token kind
+    """
+    prices = dict(MODEL_PRICES)
+    overrides = os.getenv("LLM_PRICES")
+    if overrides:
+        try:
+            prices.update(json.loads(overrides))
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"Ignoring invalid LLM_PRICES: {e}")
+    return prices
+
+
+def price_for(model: str, prices: Optional[Dict[str, Dict[str, float]]] = None) -> Optional[Dict[str, float]]:
+    """
+    Find the prices of a model by the longest matching name prefix.
+
+    Args:
+        model: Model name, possibly with a provider prefix or date suffix
+        prices: Prices by model prefix, defaulting to get_model_prices()
+
+    Returns:
+        Prices per million tokens by kind, or None for unknown models
+    """
+    prices = prices if prices is not None else get_model_prices()
+    # Bedrock IDs look like anthropic.claude-3-5-sonnet-20241022-v2:0
+    name = model.split(".", 1)[1] if model.startswith("anthropic.") else model
+    matches = [prefix for prefix in prices if name.startswith(prefix)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+@dataclass
+class UsageEntry:
+    """Token counts of one LLM call."""
+
+    timestamp: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    analysis_id: str = UNKNOWN_LABEL
+    session_id: str = UNKNOWN_LABEL
+    phase: str = UNKNOWN_LABEL
+    company: str = UNKNOWN_LABEL
+    backend: str = "anthropic"
+
+    @property
+    def day(self) -> str:
+        """UTC date of the call."""
+        return self.timestamp[:10]
+
+    def cost_usd(self, prices: Dict[str, Dict[str, float]]) -> float:
+        """
+        Compute the cost of the call.
+
+        Args:
+            prices: Prices by model prefix
+
+        Returns:
+            Cost in USD, 0 for models without a price
+        """
+        model_prices = price_for(self.model, prices)
+        if not model_prices:
+            return 0.0
+        return sum(
+            getattr(self, f"{kind}_tokens") * model_prices.get(kind, model_prices.get("input", 0))
+            for kind in TOKEN_KINDS
+        ) / 1_000_000
+
+    def cache_savings_usd(self, prices: Dict[str, Dict[str, float]]) -> float:
+        """
+        Compute what caching saved against sending the cached tokens as input.
+
+        Cache writes cost more than plain input, so this is negative when
+        cached prompts are written but rarely read.
+
+        Args:
+            prices: Prices by model prefix
+
+        Returns:
+            Savings in USD
+        """
+        model_prices = price_for(self.model, prices)
+        if not model_prices:
+            return 0.0
+        input_price = model_prices.get("input", 0)
+        saved = self.cache_read_tokens * (input_price - model_prices.get("cache_read", input_price))
+        extra = self.cache_creation_tokens * (model_prices.get("cache_creation", input_price) - input_price)
+        return (saved - extra) / 1_000_000
+
+
+@dataclass
+class UsageTotals:
+    """Summed usage and cost of a group of calls."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cost_usd: float = 0.0
+    cache_savings_usd: float = 0.0
+    by_phase_usd: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, entry: UsageEntry, prices: Dict[str, Dict[str, float]]) -> None:
+        """Add one call to the totals."""
+        cost = entry.cost_usd(prices)
+        self.calls += 1
+        for kind in TOKEN_KINDS:
+            setattr(self, f"{kind}_tokens", getattr(self, f"{kind}_tokens") + getattr(entry, f"{kind}_tokens"))
+        self.cost_usd += cost
+        self.cache_savings_usd += entry.cache_savings_usd(prices)
+        self.by_phase_usd[entry.phase] = self.by_phase_usd.get(entry.phase, 0.0) + cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary with costs rounded to micro-dollars."""
+        data = asdict(self)
+        data["cost_usd"] = round(self.cost_usd, 6)
+        data["cache_savings_usd"] = round(self.cache_savings_usd, 6)
+        data["by_phase_usd"] = {
+            phase: round(cost, 6)
+            for phase, cost in sorted(self.by_phase_usd.items(), key=lambda item: -item[1])
+        }
+        return data
+
+
+class TokenLedger:
+    """Append-only JSONL ledger of token usage per LLM call."""
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        Initialize the ledger.
+
+        Args:
+            path: Ledger file (TOKEN_LEDGER_FILE, default
+                data/usage/token_ledger.jsonl; empty disables the ledger)
+        """
+        self.path = Path(path) if path is not None else Path(os.getenv("TOKEN_LEDGER_FILE", str(LEDGER_FILE)))
+        self.enabled = str(self.path) not in ("", ".")
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        model: str,
+        usage: Any,
+        backend: str = "anthropic",
+        timestamp: Optional[datetime] = None,
+    ) -> Optional[UsageEntry]:
+        """
+        Append the token counts of an LLM call, attributed from the metric context.
+
+        Args:
+            model: Model that served the call
+            usage: Usage block of the API response
+            backend: LLM backend that served the call
+            timestamp: Time of the call, defaulting to now
+
+        Returns:
+            The recorded entry, or None if the ledger is disabled or the write failed
+        """
+        if not self.enabled:
+            return None
+
+        labels = current_labels()
+        counts = {}
+        for kind in TOKEN_KINDS:
+            attribute = f"{kind}_tokens" if kind in ("input", "output") else f"{kind}_input_tokens"
+            tokens = getattr(usage, attribute, None)
+            # Cache counts are absent or None when prompt caching is not used
+            counts[f"{kind}_tokens"] = tokens if isinstance(tokens, int) else 0
+
+        entry = UsageEntry(
+            timestamp=(timestamp or datetime.now(timezone.utc)).isoformat(timespec="seconds"),
+            model=model,
+            analysis_id=labels.get("analysis_id") or UNKNOWN_LABEL,
+            session_id=labels.get("session_id") or UNKNOWN_LABEL,
+            phase=labels.get("phase") or UNKNOWN_LABEL,
+            company=labels.get("company") or UNKNOWN_LABEL,
+            backend=backend,
+            **counts,
+        )
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(entry)) + "\n")
+        except OSError as e:
+            # Losing a ledger line must never fail the analysis
+            logger.error(f"Failed to record token usage: {e}")
+            return None
+        return entry
+
+    def entries(self) -> List[UsageEntry]:
+        """
+        Read every recorded entry, skipping malformed lines.
+
+        Returns:
+            Entries in recording order
+        """
+        if not self.enabled or not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(UsageEntry(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError):
+                    logger.warning(f"Skipping malformed token ledger line in {self.path}")
+        return entries
+
+    def aggregate(
+        self,
+        group_by: str = "day",
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        company: Optional[str] = None,
+        phase: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sum usage and cost per group.
+
+        Args:
+            group_by: One of GROUP_FIELDS
+            since: First UTC day included
+            until: Last UTC day included
+            company: Only calls for this company
+            phase: Only calls in this phase
+
+        Returns:
+            Totals over all matching calls and per group; days in order,
+            other groups most expensive first. Calls served by a simulated
+            backend are left out of both and summed under "simulated", priced
+            as if they had been real.
+
+        Raises:
+            ValueError: If group_by is not a known field
+        """
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"Cannot group usage by {group_by}; expected one of: {', '.join(GROUP_FIELDS)}")
+
+        prices = get_model_prices()
+        total = UsageTotals()
+        simulated = UsageTotals()
+        groups: Dict[str, UsageTotals] = defaultdict(UsageTotals)
+        entries = self.entries()
+        for entry in entries:
+            if since and entry.day < since.isoformat():
+                continue
+            if until and entry.day > until.isoformat():
+                continue
+            if company and entry.company != company:
+                continue
+            if phase and entry.phase != phase:
+                continue
+            if entry.backend in SIMULATED_BACKENDS:
+                simulated.add(entry, prices)
+                continue
+            total.add(entry, prices)
+            groups[getattr(entry, group_by)].add(entry, prices)
+
+        if group_by == "day":
+            ordered = sorted(groups.items())
+        else:
+            ordered = sorted(groups.items(), key=lambda item: (-item[1].cost_usd, item[0]))
+        return {
+            "group_by": group_by,
+            "total": total.to_dict(),
+            "groups": [{group_by: key, **totals.to_dict()} for key, totals in ordered],
+            "simulated": simulated.to_dict(),
+            "unpriced_models": sorted({
+                entry.model for entry in entries if price_for(entry.model, prices) is None
+            }),
+        }
+
+
+_ledger: Optional[TokenLedger] = None
+
+
+def get_token_ledger() -> TokenLedger:
+    """Get the shared token ledger."""
+    global _ledger
+    if _ledger is None:
+        _ledger = TokenLedger()
+    return _ledger
@@ -0,0 +1,279 @@
+"""
+Lightweight tracing of the analysis pipeline.
+
+Spans time a block of work (PDF parsing, an LLM attempt, response parsing,
+validation, a session write) and nest under the span that was open when
+they started. All spans of an analysis share its analysis_id as trace ID,
+so a slow request can be broken down afterwards. Finished spans are exported
+to the log or to a JSON Lines file, chosen with TRACE_EXPORTER.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = Path("data/traces/spans.jsonl")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed block of work within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: str = ""
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Attach a value to the span.
+
+        Args:
+            key: Attribute name
+            value: JSON-compatible value
+        """
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to a JSON-compatible dictionary."""
+        return asdict(self)
+
+
+class SpanExporter:
+    """Base class for span exporters."""
+
+    def export(self, span: Span) -> None:
+        """
+        Export a finished span.
+
+        Args:
+            span: Finished span
+        """
+        raise NotImplementedError
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Writes each finished span as a log line."""
+
+    def export(self, span: Span) -> None:
+        status = "" if span.status == "ok" else f" [{span.status}: {span.error}]"
+        logger.info(
+            f"span {span.name} {span.duration_ms:.1f}ms trace={span.trace_id} "
+            f"span={span.span_id} parent={span.parent_id}{status}"
+        )
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends each finished span to a JSON Lines file."""
+
+    def __init__(self, path: str | Path = DEFAULT_TRACE_FILE):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to append spans to; parent directories are created
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+        except OSError as e:
+            logger.warning(f"Failed to export span {span.name}: {e}")
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_configured = False
+
+
+def create_exporter() -> Optional[SpanExporter]:
+    """
+    Create the span exporter configured in the environment.
+
+    TRACE_EXPORTER is "none" (default), "console" or "file"; the file
+    exporter writes to TRACE_FILE (default data/traces/spans.jsonl).
+
+    Returns:
+        The exporter, or None if tracing is disabled
+
+    Raises:
+        ValueError: If TRACE_EXPORTER is not recognised
+    """
+    name = os.getenv("TRACE_EXPORTER", "none").lower()
+    if name == "none":
+        return None
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(os.getenv("TRACE_FILE", str(DEFAULT_TRACE_FILE)))
+    raise ValueError(f"Unknown TRACE_EXPORTER: {name}")
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    """Get the span exporter, creating it from the environment on first use."""
+    global _exporter, _exporter_configured
+    if not _exporter_configured:
+        _exporter = create_exporter()
+        _exporter_configured = True
+    return _exporter
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """
+    Replace the span exporter.
+
+    Args:
+        exporter: Exporter for finished spans, or None to disable exporting
+    """
+    global _exporter, _exporter_configured
+    _exporter = exporter
+    _exporter_configured = True
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost open span, if any."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block of work as a span.
+
+    The span is a child of the innermost open span and shares its trace ID.
+    Errors raised in the block mark the span as failed and propagate.
+
+    Args:
+        name: Span name, such as "llm.attempt"
+        trace_id: Trace ID for a new trace, such as the analysis_id;
+            defaults to the parent's trace, or a new random ID
+        **attributes: Values attached to the span
+
+    Yields:
+        The open span, for adding attributes
+    """
+    parent = _current_span.get()
+    if trace_id is None:
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+    new_span = Span(
+        name=name,
+        trace_id=trace_id,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent and parent.trace_id == trace_id else None,
+        attributes=attributes,
+        start_time=datetime.now(timezone.utc).isoformat(),
+    )
+
+    token = _current_span.set(new_span)
+    started = time.perf_counter()
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.status = "error"
+        new_span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        new_span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        _current_span.reset(token)
+        exporter = get_exporter()
+        if exporter is not None:
+            exporter.export(new_span)
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorate a function or coroutine function to run inside a span.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def load_trace(path: str | Path, trace_id: str) -> List[Dict[str, Any]]:
+    """
+    Read the spans of one trace from a file written by FileSpanExporter.
+
+    Args:
+        path: Span file
+        trace_id: Trace ID, such as an analysis_id
+
+    Returns:
+        Span dictionaries ordered by start time
+    """
+    spans = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("trace_id") == trace_id:
+                spans.append(record)
+    return sorted(spans, key=lambda record: record["start_time"])
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """
+    Render spans as an indented tree with durations, for finding slow steps.
+
+    Args:
+        spans: Span dictionaries of one trace, ordered by start time
+
+    Returns:
+        One line per span, children indented under their parent
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    span_ids = {record["span_id"] for record in spans}
+    for record in spans:
+        parent = record.get("parent_id") if record.get("parent_id") in span_ids else None
+        children.setdefault(parent, []).append(record)
+
+    lines = []
+    stack = [(record, 0) for record in reversed(children.get(None, []))]
+    while stack:
+        record, depth = stack.pop()
+        status = "" if record.get("status") == "ok" else f"  [{record.get('error')}]"
+        lines.append(f"{'  ' * depth}{record['name']}  {record['duration_ms']:.1f}ms{status}")
+        stack.extend((child, depth + 1) for child in reversed(children.get(record["span_id"], [])))
+    return "\n".join(lines)
@@ -0,0 +1,252 @@
+"""
+Startup warm-up, run before the instance reports ready.
+
+Without it the first analysis after a deploy pays for importing the LLM SDK
+and parsers, creating clients and their TLS connections, loading tenets,
+compiling the skill taxonomy and prompt templates, and starting the parser
+threads. Warm-up runs these steps in the background
+once the app starts; /api/ready reports ready only when they have finished,
+and not at all if a step analyses depend on failed, so a load balancer holds
+traffic back until then. /api/health keeps answering throughout.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import pkgutil
+import string
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import app.prompts
+from app.services.company_service import get_company_registry
+from app.services.executors import get_parser_executor, get_parser_threads, run_in_executor
+from app.services.lazy_imports import load_lazy_modules
+from app.services.resume_parser import ResumeParser
+from app.services.skill_taxonomy import get_skill_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Steps in the order they run
+WARMUP_STEPS = ("imports", "tenets", "skills", "prompts", "services", "connections", "parser_pool")
+
+# Steps without which analyses cannot run; the instance stays not ready if
+# one fails. The caches and parser threads have readiness probes of their
+# own, and a failed connection is retried by the first request.
+REQUIRED_STEPS = ("imports", "services")
+
+# Small resumes, one per supported format, parsed to warm the parser threads
+SAMPLE_RESUMES_DIR = Path("data/warmup")
+
+
+@dataclass
+class WarmupStep:
+    """Outcome of one warm-up step."""
+
+    name: str
+    ok: bool
+    seconds: float
+    detail: str = ""
+
+
+def get_warmup_steps() -> List[str]:
+    """
+    Get the configured warm-up steps.
+
+    WARMUP_STEPS lists them comma-separated (default: all of WARMUP_STEPS);
+    "none" skips warm-up.
+
+    Returns:
+        Step names in run order
+
+    Raises:
+        ValueError: If a step name is unknown
+    """
+    value = os.getenv("WARMUP_STEPS", "all").strip().lower()
+    if value in ("", "none"):
+        return []
+    if value == "all":
+        return list(WARMUP_STEPS)
+    requested = {step.strip() for step in value.split(",") if step.strip()}
+    unknown = requested - set(WARMUP_STEPS)
+    if unknown:
+        raise ValueError(f"Unknown warm-up steps: {', '.join(sorted(unknown))}")
+    return [step for step in WARMUP_STEPS if step in requested]
+
+
+class Warmup:
+    """Runs the warm-up steps and tracks whether they have finished."""
+
+    def __init__(
+        self,
+        services_factory: Optional[Callable[[], List[Any]]] = None,
+        steps: Optional[List[str]] = None,
+        connect_timeout: Optional[float] = None,
+        parser_threads: Optional[int] = None,
+    ):
+        """
+        Initialize the warm-up.
+
+        Args:
+            services_factory: Creates the analysis services, whose LLM
+                clients are created and connected
+            steps: Steps to run (WARMUP_STEPS, default all)
+            connect_timeout: Seconds allowed per LLM connection
+                (WARMUP_CONNECT_TIMEOUT, default 5)
+            parser_threads: Sample resumes parsed at once on the parser
+                threads (default: one per thread, see PARSER_THREADS)
+        """
+        self.services_factory = services_factory
+        self.steps = steps if steps is not None else get_warmup_steps()
+        self.connect_timeout = (
+            connect_timeout if connect_timeout is not None
+            else float(os.getenv("WARMUP_CONNECT_TIMEOUT", "5"))
+        )
+        self.parser_threads = parser_threads or get_parser_threads()
+
+        self.results: List[WarmupStep] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._services: List[Any] = []
+
+    @property
+    def finished(self) -> bool:
+        """Whether every step has run."""
+        return self.finished_at is not None
+
+    async def run(self) -> None:
+        """Run every configured step in order; failures are logged and reported."""
+        self.started_at = time.perf_counter()
+        logger.info(f"Warm-up started: {', '.join(self.steps) or 'no steps'}")
+        for name in self.steps:
+            started = time.perf_counter()
+            try:
+                detail = await getattr(self, f"_warm_{name}")()
+                ok = True
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {e}")
+                detail, ok = str(e), False
+            self.results.append(WarmupStep(name, ok, round(time.perf_counter() - started, 3), detail or ""))
+        self.finished_at = time.perf_counter()
+
+        failed = [step.name for step in self.results if not step.ok]
+        logger.info(
+            f"Warm-up finished in {self.finished_at - self.started_at:.2f}s"
+            + (f"; failed steps: {', '.join(failed)}" if failed else "")
+        )
+
+    def failed_required_steps(self) -> List[str]:
+        """
+        Get the required steps that failed.
+
+        Returns:
+            Names of the failed steps in REQUIRED_STEPS, in run order
+        """
+        return [step.name for step in self.results if not step.ok and step.name in REQUIRED_STEPS]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Describe the warm-up's progress.
+
+        Returns:
+            Whether it finished, its duration so far and each step's outcome
+        """
+        end = self.finished_at or time.perf_counter()
+        return {
+            "finished": self.finished,
+            "seconds": round(end - self.started_at, 3) if self.started_at is not None else 0.0,
+            "steps": [asdict(step) for step in self.results],
+            "pending": [name for name in self.steps[len(self.results):]],
+        }
+
+    async def _warm_imports(self) -> str:
+        """Import the deferred dependencies, off the event loop."""
+        loaded = await asyncio.to_thread(load_lazy_modules)
+        return f"imported {', '.join(loaded)}" if loaded else "already imported"
+
+    async def _warm_tenets(self) -> str:
+        """Load company manifests, tenets and their retrieval indexes."""
+        registry = await asyncio.to_thread(get_company_registry)
+        return f"{len(registry.companies)} companies"
+
+    async def _warm_skills(self) -> str:
+        """Compile the skill taxonomy."""
+        taxonomy = await asyncio.to_thread(get_skill_taxonomy)
+        return f"{len(taxonomy.skills)} skills"
+
+    async def _warm_prompts(self) -> str:
+        """Import the prompt templates and parse their placeholders, off the event loop."""
+        templates = await asyncio.to_thread(_compile_prompt_templates)
+        return f"{templates} templates"
+
+    async def _warm_services(self) -> str:
+        """Create the analysis services and their LLM clients, off the event loop."""
+        if self.services_factory is None:
+            return "no services configured"
+        self._services = await asyncio.to_thread(self.services_factory)
+        return f"{len(self._services)} services"
+
+    async def _warm_connections(self) -> str:
+        """Open a pooled connection for each distinct LLM client."""
+        clients = {}
+        for service in self._services:
+            llm_service = getattr(service, "llm_service", None)
+            if llm_service is not None and llm_service.backend == "anthropic":
+                clients[id(llm_service.client)] = llm_service.client
+        if not clients:
+            return "no API clients"
+
+        # Listing models is free and goes through the same connection pool
+        await asyncio.gather(*(
+            asyncio.to_thread(
+                client.with_options(timeout=self.connect_timeout, max_retries=0).models.list, limit=1
+            )
+            for client in clients.values()
+        ))
+        return f"{len(clients)} clients connected"
+
+    async def _warm_parser_pool(self) -> str:
+        """Parse the sample resumes on the parser threads, starting each thread."""
+        samples = sorted(
+            path for path in SAMPLE_RESUMES_DIR.glob("*") if path.suffix.lower() in (".pdf", ".docx")
+        )
+        if not samples:
+            raise FileNotFoundError(f"No sample resumes in {SAMPLE_RESUMES_DIR}")
+
+        parser = ResumeParser()
+        results = await asyncio.gather(*(
+            run_in_executor(get_parser_executor(), parser.extract_text, str(samples[index % len(samples)]))
+            for index in range(self.parser_threads)
+        ))
+        errors = [error for _, error in results if error]
+        if errors:
+            raise ValueError(f"Sample resume failed to parse: {errors[0]}")
+        return f"{self.parser_threads} samples parsed"
+
+
+def _compile_prompt_templates() -> int:
+    """
+    Import every prompt module and parse its templates.
+
+    Parsing checks each template's placeholders and braces, so a broken
+    template fails warm-up instead of the first analysis using it.
+
+    Returns:
+        Number of templates parsed
+
+    Raises:
+        ValueError: If a template is malformed
+    """
+    formatter = string.Formatter()
+    templates = 0
+    for module_info in pkgutil.iter_modules(app.prompts.__path__):
+        module = importlib.import_module(f"{app.prompts.__name__}.{module_info.name}")
+        for name, value in vars(module).items():
+            # System prompts are sent as they are, not formatted
+            if name.endswith("_PROMPT") and name != "SYSTEM_PROMPT" and isinstance(value, str):
+                list(formatter.parse(value))
+                templates += 1
+    return templates
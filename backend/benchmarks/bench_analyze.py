@@ -0,0 +1,263 @@
+"""
+Offline benchmark of the /api/analyze pipeline.
+
+Runs complete analyses in-process against the fake LLM backend, so no API
+key or network access is needed and results are reproducible. For each
+concurrency level it reports throughput, p50/p90/p99 latency, time spent
+parsing LLM responses and peak memory, and can fail when results regress
+against a saved baseline, for use in CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_analyze --concurrency 1,10,100,500
+    python -m benchmarks.bench_analyze --latency 0.5 --jitter 0.5 --truncate-rate 0.1
+    python -m benchmarks.bench_analyze --output results.json
+    python -m benchmarks.bench_analyze --baseline results.json --max-regression 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import shutil
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.common import (
+    DEFAULT_RESUME,
+    ROLE_DESCRIPTION,
+    add_fake_llm_arguments,
+    fake_backend_workdir,
+    percentile,
+)
+
+# Reported metrics compared against a baseline, and whether higher is better
+COMPARED_METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p99_ms": False,
+}
+
+
+async def run_level(app, resume: Path, concurrency: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run one batch of concurrent analyses and summarize it.
+
+    Args:
+        app: FastAPI application
+        resume: Resume file uploaded for every session
+        concurrency: Number of analyses started at once
+        args: Benchmark options
+
+    Returns:
+        Results for the level
+    """
+    import httpx
+
+    from app.services.metrics import REGISTRY
+    from app.services.tracing import SpanExporter, set_exporter
+
+    class ParseSpanCollector(SpanExporter):
+        """Collects the durations of response parsing spans."""
+
+        def __init__(self):
+            self.durations: Dict[str, List[float]] = {}
+
+        def export(self, span):
+            if span.name.endswith(".parse_response"):
+                self.durations.setdefault(span.name, []).append(span.duration_ms)
+
+    session_ids = []
+    for _ in range(concurrency):
+        session_id = str(uuid.uuid4())
+        shutil.copy(resume, Path("data/resumes") / f"{session_id}_{uuid.uuid4().hex[:8]}{resume.suffix}")
+        session_ids.append(session_id)
+
+    collector = ParseSpanCollector()
+    set_exporter(collector)
+    REGISTRY.clear()
+    if args.trace_memory:
+        tracemalloc.start()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+
+        # Every request arrives at once, so latency includes time spent queued
+        submitted = time.perf_counter()
+
+        async def analyze(session_id: str) -> None:
+            response = await client.post("/api/analyze", json={
+                "session_id": session_id,
+                "company": args.company,
+                "role_description": ROLE_DESCRIPTION,
+                "mode": args.mode,
+            })
+            latencies.append((time.perf_counter() - submitted) * 1000)
+            if response.status_code != 200:
+                errors.append(f"{response.status_code}: {response.text[:200]}")
+
+        await asyncio.gather(*(analyze(session_id) for session_id in session_ids))
+        elapsed = time.perf_counter() - submitted
+
+    peak_traced_mb = None
+    if args.trace_memory:
+        peak_traced_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    set_exporter(None)
+
+    return {
+        "concurrency": concurrency,
+        "requests": concurrency,
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(concurrency / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p90_ms": round(percentile(latencies, 90), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies, default=0.0), 1),
+        "parse_ms": {
+            name.removesuffix(".parse_response"): round(sum(values) / len(values), 3)
+            for name, values in sorted(collector.durations.items())
+        },
+        "peak_traced_mb": peak_traced_mb,
+        # Linux reports kilobytes, macOS bytes
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1
+        ),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run every concurrency level in a temporary working directory.
+
+    Args:
+        args: Benchmark options
+
+    Returns:
+        Benchmark configuration and results per level
+    """
+    resume = Path(args.resume).resolve()
+
+    with fake_backend_workdir(args):
+        # Imported here so that the services read the fake backend settings
+        from app.main import app
+
+        logging.getLogger().setLevel(args.log_level)
+
+        levels = []
+        for concurrency in args.concurrency:
+            result = await run_level(app, resume, concurrency, args)
+            print_level(result)
+            levels.append(result)
+
+    return {
+        "config": {
+            "mode": args.mode,
+            "company": args.company,
+            "latency_s": args.latency,
+            "jitter_s": args.jitter,
+            "truncate_rate": args.truncate_rate,
+            "seed": args.seed,
+            "resume": resume.name,
+            "python": sys.version.split()[0],
+        },
+        "levels": levels,
+    }
+
+
+def print_level(result: Dict[str, Any]) -> None:
+    """Print one level's results as a table row."""
+    parse = ", ".join(f"{phase} {ms}" for phase, ms in result["parse_ms"].items())
+    memory = f"{result['max_rss_mb']} MB RSS"
+    if result["peak_traced_mb"] is not None:
+        memory += f", {result['peak_traced_mb']} MB traced"
+    print(
+        f"c={result['concurrency']:<4} {result['throughput_rps']:>8} req/s  "
+        f"p50 {result['p50_ms']:>9} ms  p90 {result['p90_ms']:>9} ms  p99 {result['p99_ms']:>9} ms  "
+        f"errors {result['errors']}  {memory}\n       parse ms: {parse}"
+    )
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Find metrics that regressed by more than the allowed fraction.
+
+    Args:
+        results: Results of this run
+        baseline: Results of a previous run
+        max_regression: Allowed relative regression, e.g. 0.25 for 25%
+
+    Returns:
+        Descriptions of the regressions
+    """
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    regressions = []
+    for level in results["levels"]:
+        base = previous.get(level["concurrency"])
+        if not base:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), level.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > max_regression:
+                regressions.append(
+                    f"c={level['concurrency']} {metric}: {old} -> {new} ({change:+.0%} worse)"
+                )
+        if level["errors"] > base.get("errors", 0):
+            regressions.append(f"c={level['concurrency']} errors: {base.get('errors', 0)} -> {level['errors']}")
+    return regressions
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,10,50",
+                        type=lambda value: [int(level) for level in value.split(",")],
+                        help="Comma-separated numbers of concurrent sessions (default: 1,10,50)")
+    parser.add_argument("--mode", choices=["full", "preview"], default="full", help="Analysis mode")
+    parser.add_argument("--company", default="amazon", help="Company ID")
+    parser.add_argument("--resume", default=str(DEFAULT_RESUME), help="Resume file uploaded for each session")
+    add_fake_llm_arguments(parser)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Measure peak Python allocations with tracemalloc (slows the run)")
+    parser.add_argument("--log-level", default="WARNING", help="Log level of the app during the run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved by a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed relative regression against the baseline (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the benchmark; returns 1 on errors or regressions."""
+    args = parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    # Truncated responses are expected to fail some analyses
+    failed = not args.truncate_rate and any(level["errors"] for level in results["levels"])
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        failed = failed or bool(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Helpers shared by the benchmarks: fake LLM setup, working directory and statistics.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_RESUME = BACKEND_DIR / "test_resume_sample.pdf"
+DEFAULT_RESPONSES_DIR = BACKEND_DIR / "data" / "fake-llm"
+
+ROLE_DESCRIPTION = """Software Development Engineer Intern - Summer 2026
+
+We are looking for software engineering interns to design and implement scalable
+software. Required: Python, Java or C++, data structures and algorithms, object-oriented
+design and Git. Preferred: AWS, distributed systems, React, SQL and NoSQL databases.
+Responsibilities include writing clean, maintainable code, participating in code reviews
+and debugging and optimizing existing systems."""
+
+# Data written at runtime, which each benchmark run starts without
+_RUNTIME_DATA = {"resumes", "sessions", "role-requirements", "traces", "usage", "profiles"}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Get a percentile of values using the nearest-rank method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def add_fake_llm_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options configuring the fake LLM backend."""
+    parser.add_argument("--responses-dir", default=str(DEFAULT_RESPONSES_DIR), help="Recorded LLM responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake LLM latency per call in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency per call in seconds")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Share of LLM responses cut short")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for latency and truncation")
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Select the fake LLM backend with the requested latency and truncation."""
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_RESPONSES_DIR"] = str(Path(args.responses_dir).resolve())
+    os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+    os.environ["FAKE_LLM_JITTER"] = str(args.jitter)
+    os.environ["FAKE_LLM_TRUNCATE_RATE"] = str(args.truncate_rate)
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    os.environ["LLM_RETRY_DELAY"] = "0"
+    os.environ.setdefault("TRACE_EXPORTER", "none")
+
+
+def prepare_workdir(workdir: Path) -> None:
+    """
+    Create a data directory sharing the read-only app data of the backend.
+
+    Sessions, uploads and caches written by the benchmark stay in workdir.
+    """
+    data_dir = workdir / "data"
+    data_dir.mkdir()
+    for entry in (BACKEND_DIR / "data").iterdir():
+        if entry.name in _RUNTIME_DATA:
+            continue
+        target = data_dir / entry.name
+        try:
+            target.symlink_to(entry, target_is_directory=entry.is_dir())
+        except OSError:
+            if entry.is_dir():
+                shutil.copytree(entry, target)
+            else:
+                shutil.copy2(entry, target)
+    (data_dir / "resumes").mkdir()
+
+
+@contextmanager
+def fake_backend_workdir(args: argparse.Namespace) -> Iterator[Path]:
+    """
+    Run the block in a temporary working directory with the fake LLM backend.
+
+    Import the app inside the block, so that its services read the fake
+    backend settings.
+
+    Args:
+        args: Options added by add_fake_llm_arguments
+
+    Yields:
+        The working directory
+    """
+    configure_environment(args)
+    original_dir = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="ready2intern-bench-") as workdir:
+        prepare_workdir(Path(workdir))
+        os.chdir(workdir)
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(original_dir)
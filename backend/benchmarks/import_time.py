@@ -0,0 +1,153 @@
+"""
+Import-time report for app startup.
+
+Imports the app in fresh interpreters with -X importtime and breaks the cost
+down per top-level package and per module, so slow imports on the path to
+serving /api/health stand out. With --max-ms it fails when the import time
+exceeds a budget, for use in CI.
+
+Usage (from the backend directory):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --top 30 --output imports.json
+    python -m benchmarks.import_time --max-ms 1500
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.common import BACKEND_DIR
+
+# import time:       self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_imports(module: str) -> Dict[str, Dict[str, float]]:
+    """
+    Import a module in a fresh interpreter and record every import's cost.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Self and cumulative milliseconds, and nesting depth, by imported module
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports[name] = {
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            }
+    if module not in imports:
+        raise RuntimeError(f"No import timing found for {module}:\n{completed.stderr[-2000:]}")
+    return imports
+
+
+def build_report(runs: List[Dict[str, Dict[str, float]]], module: str, top: int) -> Dict[str, Any]:
+    """
+    Summarize import timings over several runs using medians.
+
+    Args:
+        runs: Timings of each run, from measure_imports
+        module: Module that was imported
+        top: Number of modules to list
+
+    Returns:
+        Total, per-package and per-module import cost
+    """
+    names = set().union(*runs)
+
+    def median(name: str, key: str) -> float:
+        return statistics.median(run[name][key] if name in run else 0.0 for run in runs)
+
+    packages: Dict[str, float] = {}
+    for name in names:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0.0) + median(name, "self_ms")
+
+    app_prefix = module.split(".", 1)[0] + "."
+    return {
+        "module": module,
+        "runs": len(runs),
+        "total_ms": round(median(module, "cumulative_ms"), 1),
+        "modules_imported": len(names),
+        "packages": [
+            {"package": package, "self_ms": round(ms, 1)}
+            for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+        "slowest_modules": [
+            {"module": name, "self_ms": round(median(name, "self_ms"), 1)}
+            for name in sorted(names, key=lambda name: -median(name, "self_ms"))[:top]
+        ],
+        "app_modules": [
+            {"module": name, "cumulative_ms": round(median(name, "cumulative_ms"), 1)}
+            for name in sorted(
+                (name for name in names if name.startswith(app_prefix)),
+                key=lambda name: -median(name, "cumulative_ms"),
+            )[:top]
+        ],
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report as tables."""
+    print(
+        f"import {report['module']}: {report['total_ms']} ms "
+        f"({report['modules_imported']} modules, median of {report['runs']} runs)"
+    )
+    for title, rows, key, value in [
+        ("By package (self time)", report["packages"], "package", "self_ms"),
+        ("Slowest modules (self time)", report["slowest_modules"], "module", "self_ms"),
+        ("App modules (including their imports)", report["app_modules"], "module", "cumulative_ms"),
+    ]:
+        print(f"\n{title}:")
+        for row in rows:
+            print(f"  {row[value]:>8.1f} ms  {row[key]}")
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to measure (default: 3)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table (default: 15)")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--max-ms", type=float, help="Fail when the import takes longer than this")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Measure and print the report; returns 1 when over the budget."""
+    args = parse_args(argv)
+    runs = [measure_imports(args.module) for _ in range(args.repeat)]
+    report = build_report(runs, args.module, args.top)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nReport written to {args.output}")
+
+    if args.max_ms is not None and report["total_ms"] > args.max_ms:
+        print(f"\nImport time {report['total_ms']} ms exceeds the {args.max_ms:g} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
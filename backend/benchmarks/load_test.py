@@ -0,0 +1,434 @@
+"""
+Load generator for the full upload, analyze and results flow.
+
+Simulated students arrive at a steady average rate (Poisson arrivals) and
+each one uploads the resume, starts an analysis and polls the results until
+the analysis completes. The rate steps up through the given stages until
+the server saturates: errors exceed the allowed rate, or p99 latency grows
+past a multiple of the unloaded latency or an absolute limit.
+
+By default the app is served by uvicorn inside this process, on the same
+event loop, with the fake LLM backend, so results are reproducible and the
+measured event-loop lag is the server's. With --url an already running
+server is loaded instead (start it with LLM_BACKEND=fake); the lag reported
+then is only the load generator's own.
+
+Latency is measured from each student's scheduled arrival, so delays in
+starting requests on a lagging loop are counted rather than hidden.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --rates 0.5,1,2,4,8 --duration 30
+    python -m benchmarks.load_test --mode full --latency 2 --jitter 1 --output capacity.json
+    python -m benchmarks.load_test --url http://localhost:8000 --rates 1,2,4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import (
+    DEFAULT_RESUME,
+    ROLE_DESCRIPTION,
+    add_fake_llm_arguments,
+    fake_backend_workdir,
+    percentile,
+)
+
+STEPS = ("upload", "analyze", "results")
+FINAL_STATUSES = {"completed", "failed"}
+
+
+@dataclass
+class StudentResult:
+    """Outcome of one simulated student's flow."""
+
+    scheduled: float
+    finished: float = 0.0
+    ok: bool = False
+    failed_step: Optional[str] = None
+    error: Optional[str] = None
+    step_ms: Dict[str, float] = field(default_factory=dict)
+    polls: int = 0
+
+    @property
+    def latency_ms(self) -> float:
+        """Time from scheduled arrival to the final result."""
+        return (self.finished - self.scheduled) * 1000
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from short sleeps."""
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Sleep between samples in seconds
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval) * 1000)
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def take(self) -> List[float]:
+        """Return the samples collected since the last call, in milliseconds."""
+        samples, self.samples = self.samples, []
+        return samples
+
+
+async def run_student(
+    client: httpx.AsyncClient,
+    resume: Path,
+    scheduled: float,
+    args: argparse.Namespace,
+) -> StudentResult:
+    """
+    Run one student's upload, analyze and results flow.
+
+    Args:
+        client: HTTP client for the server
+        resume: Resume file to upload
+        scheduled: time.perf_counter() of the scheduled arrival
+        args: Load test options
+
+    Returns:
+        Outcome of the flow
+    """
+    result = StudentResult(scheduled=scheduled)
+    step = "upload"
+    try:
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/upload", files={"file": (resume.name, resume.read_bytes(), "application/octet-stream")}
+        )
+        response.raise_for_status()
+        session_id = response.json()["session_id"]
+        result.step_ms[step] = (time.perf_counter() - started) * 1000
+
+        step = "analyze"
+        started = time.perf_counter()
+        response = await client.post("/api/analyze", json={
+            "session_id": session_id,
+            "company": args.company,
+            "role_description": ROLE_DESCRIPTION,
+            "mode": args.mode,
+        })
+        response.raise_for_status()
+        result.step_ms[step] = (time.perf_counter() - started) * 1000
+
+        step = "results"
+        started = time.perf_counter()
+        deadline = started + args.timeout
+        status = None
+        while True:
+            path = f"/api/results/{session_id}" if args.mode == "full" else f"/api/results/{session_id}/status"
+            response = await client.get(path)
+            result.polls += 1
+            if response.status_code != 404:
+                response.raise_for_status()
+                status = response.json()["status"]
+                if status in FINAL_STATUSES or args.mode == "full":
+                    break
+            if time.perf_counter() >= deadline:
+                raise TimeoutError(f"no final result after {args.timeout}s (status {status})")
+            await asyncio.sleep(args.poll_interval)
+        result.step_ms[step] = (time.perf_counter() - started) * 1000
+
+        if status != "completed":
+            raise RuntimeError(f"analysis ended with status {status}")
+        result.ok = True
+    except Exception as e:
+        result.failed_step = step
+        result.error = f"{type(e).__name__}: {e}"[:200]
+    result.finished = time.perf_counter()
+    return result
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    resume: Path,
+    rate: float,
+    rng: random.Random,
+    lag_monitor: LoopLagMonitor,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    """
+    Send students at an average rate for the stage duration and wait for them.
+
+    Args:
+        client: HTTP client for the server
+        resume: Resume file to upload
+        rate: Average arrivals per second
+        rng: Random generator for arrival gaps
+        lag_monitor: Event-loop lag monitor
+        args: Load test options
+
+    Returns:
+        Stage results
+    """
+    lag_monitor.take()
+    tasks = []
+    started = time.perf_counter()
+    arrival = started
+    while True:
+        arrival += rng.expovariate(rate)
+        if arrival - started > args.duration:
+            break
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        tasks.append(asyncio.create_task(run_student(client, resume, arrival, args)))
+
+    results: List[StudentResult] = list(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - started
+    lag = lag_monitor.take()
+
+    completed = [result for result in results if result.ok]
+    errors: Dict[str, int] = {}
+    for result in results:
+        if not result.ok:
+            errors[result.failed_step] = errors.get(result.failed_step, 0) + 1
+    latencies = [result.latency_ms for result in completed]
+
+    return {
+        "offered_rate": rate,
+        "arrivals": len(results),
+        "completed": len(completed),
+        "errors": sum(errors.values()),
+        "error_rate": round(sum(errors.values()) / len(results), 3) if results else 0.0,
+        "errors_by_step": errors,
+        "error_samples": [result.error for result in results if not result.ok][:3],
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(completed) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p90_ms": round(percentile(latencies, 90), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "step_p99_ms": {
+            step: round(percentile([r.step_ms[step] for r in completed if step in r.step_ms], 99), 1)
+            for step in STEPS
+        },
+        "polls_per_student": round(sum(r.polls for r in results) / len(results), 1) if results else 0.0,
+        "loop_lag_p99_ms": round(percentile(lag, 99), 1),
+        "loop_lag_max_ms": round(max(lag, default=0.0), 1),
+    }
+
+
+def saturation_reason(stage: Dict[str, Any], unloaded_p50_ms: float, args: argparse.Namespace) -> Optional[str]:
+    """
+    Decide whether a stage saturated the server.
+
+    Args:
+        stage: Stage results
+        unloaded_p50_ms: Median latency of the first stage
+        args: Load test options
+
+    Returns:
+        Why the stage counts as saturated, or None
+    """
+    if not stage["arrivals"]:
+        return None
+    if stage["error_rate"] > args.max_error_rate:
+        return f"error rate {stage['error_rate']:.1%} above {args.max_error_rate:.1%}"
+    if args.slo_ms and stage["p99_ms"] > args.slo_ms:
+        return f"p99 {stage['p99_ms']} ms above the {args.slo_ms} ms limit"
+    if unloaded_p50_ms and stage["p99_ms"] > args.latency_factor * unloaded_p50_ms:
+        return f"p99 {stage['p99_ms']} ms above {args.latency_factor}x the unloaded p50 ({unloaded_p50_ms} ms)"
+    return None
+
+
+def print_stage(stage: Dict[str, Any]) -> None:
+    """Print one stage's results."""
+    print(
+        f"{stage['offered_rate']:>6}/s  arrivals {stage['arrivals']:<5} done {stage['completed']:<5} "
+        f"errors {stage['error_rate']:>6.1%}  {stage['throughput_rps']:>7} req/s  "
+        f"p50 {stage['p50_ms']:>9} ms  p99 {stage['p99_ms']:>9} ms  "
+        f"loop lag p99 {stage['loop_lag_p99_ms']} ms, max {stage['loop_lag_max_ms']} ms"
+        + (f"  SATURATED: {stage['saturated']}" if stage.get("saturated") else "")
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    """
+    Wait for the server to finish warming up, so the first stage is not skewed by it.
+
+    Args:
+        client: HTTP client for the server
+        timeout: Seconds to wait
+
+    Raises:
+        TimeoutError: If the server does not become ready in time
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        response = await client.get("/api/ready")
+        # Servers without a readiness endpoint are taken as ready
+        if response.status_code in (200, 404):
+            return
+        if time.perf_counter() >= deadline:
+            raise TimeoutError(f"Server not ready after {timeout}s: {response.text[:200]}")
+        await asyncio.sleep(0.1)
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Step through the arrival rates against a server.
+
+    Args:
+        base_url: Server URL
+        args: Load test options
+
+    Returns:
+        Stage results and the capacity summary
+    """
+    resume = Path(args.resume).resolve()
+    rng = random.Random(args.seed)
+    lag_monitor = LoopLagMonitor()
+    lag_monitor.start()
+
+    stages = []
+    unloaded_p50_ms = 0.0
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_ready(client)
+            for rate in args.rates:
+                stage = await run_stage(client, resume, rate, rng, lag_monitor, args)
+                if not stages:
+                    unloaded_p50_ms = stage["p50_ms"]
+                stage["saturated"] = saturation_reason(stage, unloaded_p50_ms, args)
+                print_stage(stage)
+                stages.append(stage)
+                if stage["saturated"] and not args.keep_going:
+                    break
+    finally:
+        await lag_monitor.stop()
+
+    sustainable = [stage["offered_rate"] for stage in stages if not stage["saturated"]]
+    saturated = [stage["offered_rate"] for stage in stages if stage["saturated"]]
+    return {
+        "max_sustainable_rate": max(sustainable, default=None),
+        "saturation_rate": saturated[0] if saturated else None,
+        "stages": stages,
+    }
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the load test against --url, or against the app served in-process.
+
+    Args:
+        args: Load test options
+
+    Returns:
+        Load test configuration and results
+    """
+    config = {
+        "target": args.url or "in-process",
+        "mode": args.mode,
+        "company": args.company,
+        "rates": args.rates,
+        "duration_s": args.duration,
+        "latency_s": args.latency,
+        "jitter_s": args.jitter,
+        "truncate_rate": args.truncate_rate,
+        "seed": args.seed,
+        "python": sys.version.split()[0],
+    }
+    if args.url:
+        return {"config": config, **await drive(args.url, args)}
+
+    import uvicorn
+
+    with fake_backend_workdir(args):
+        # Imported here so that the services read the fake backend settings
+        from app.main import app
+
+        logging.getLogger().setLevel(args.log_level)
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level=args.log_level.lower()))
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            if serve_task.done():
+                serve_task.result()
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        try:
+            return {"config": config, **await drive(f"http://127.0.0.1:{port}", args)}
+        finally:
+            server.should_exit = True
+            await serve_task
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Load an already running server instead of serving the app in-process")
+    parser.add_argument("--rates", default="0.5,1,2,4,8",
+                        type=lambda value: [float(rate) for rate in value.split(",")],
+                        help="Comma-separated student arrival rates per second (default: 0.5,1,2,4,8)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of arrivals per stage")
+    parser.add_argument("--mode", choices=["full", "preview"], default="preview",
+                        help="Analysis mode; preview polls the status endpoint (default)")
+    parser.add_argument("--company", default="amazon", help="Company ID")
+    parser.add_argument("--resume", default=str(DEFAULT_RESUME), help="Resume file each student uploads")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between results polls")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds a student waits for results")
+    parser.add_argument("--max-connections", type=int, default=1000, help="HTTP connection pool size")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Error rate above which a stage is saturated (default: 0.01)")
+    parser.add_argument("--latency-factor", type=float, default=3.0,
+                        help="p99 above this multiple of the first stage's p50 is saturated (default: 3)")
+    parser.add_argument("--slo-ms", type=float, help="p99 latency above this is saturated")
+    parser.add_argument("--keep-going", action="store_true", help="Run every stage, even after saturation")
+    add_fake_llm_arguments(parser)
+    parser.add_argument("--log-level", default="WARNING", help="Log level of the app during the run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the load test and print the capacity summary."""
+    args = parse_args(argv)
+    results = asyncio.run(run_load_test(args))
+
+    if results["saturation_rate"] is None:
+        print(f"No saturation up to {args.rates[-1]} students/s")
+    else:
+        print(
+            f"Saturated at {results['saturation_rate']} students/s; "
+            f"max sustainable {results['max_sustainable_rate']} students/s"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from app.services import token_ledger
+
+
+@pytest.fixture(autouse=True)
+def isolated_token_ledger(tmp_path, monkeypatch):
+    """Record token usage from LLM calls in a temporary ledger, not data/usage."""
+    monkeypatch.setenv("TOKEN_LEDGER_FILE", str(tmp_path / "usage" / "token_ledger.jsonl"))
+    monkeypatch.setattr(token_ledger, "_ledger", None)
@@ -7,10 +7,24 @@ from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 from pathlib import Path
 from app.main import app
+from app.services.role_matching_service import RoleMatchingService
+from app.services.resume_preview import ResumePreviewService
+from app.services.session_store import SessionStore
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def mock_role_requirements_service():
+    """Skip role requirement extraction unless a test configures it."""
+    mock_service = AsyncMock()
+    mock_service.get_requirements = AsyncMock(return_value=None)
+    with patch(
+        "app.api.routes.analyze.get_role_requirements_service", return_value=mock_service
+    ):
+        yield mock_service
+
+
 @patch("app.api.routes.analyze.get_timeline_service")
 @patch("app.api.routes.analyze.get_gap_analysis_service")
 @patch("app.api.routes.analyze.get_role_matching_service")
@@ -387,3 +401,238 @@ def test_analyze_endpoint_llm_failure(mock_get_resume_service, mock_get_role_ser
         # Cleanup
         if test_file.exists():
             test_file.unlink()
+
+
+@patch("app.api.routes.analyze.get_timeline_service")
+@patch("app.api.routes.analyze.get_gap_analysis_service")
+@patch("app.api.routes.analyze.get_role_matching_service")
+@patch("app.api.routes.analyze.get_resume_analysis_service")
+def test_analyze_endpoint_uses_role_requirements(mock_get_resume_service, mock_get_role_service, mock_get_gap_service, mock_get_timeline_service, mock_role_requirements_service):
+    """Test that phases 2-4 receive the compact extracted requirements."""
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    
+    test_session_id = "test-session-requirements"
+    test_file = resume_dir / f"{test_session_id}_test.pdf"
+    test_file.write_text("test resume content")
+    
+    mock_role_requirements_service.get_requirements = AsyncMock(return_value={
+        "role_title": "Software Engineering Intern",
+        "required_skills": ["Python", "SQL"],
+    })
+    
+    mock_resume_service = AsyncMock()
+    mock_resume_service.analyze_resume = AsyncMock(return_value={})
+    mock_get_resume_service.return_value = mock_resume_service
+    mock_role_service = AsyncMock()
+    mock_role_service.analyze_match = AsyncMock(return_value={})
+    mock_get_role_service.return_value = mock_role_service
+    mock_gap_service = AsyncMock()
+    mock_gap_service.analyze_gaps = AsyncMock(return_value={})
+    mock_get_gap_service.return_value = mock_gap_service
+    mock_timeline_service = AsyncMock()
+    mock_timeline_service.generate_timeline = AsyncMock(return_value={})
+    mock_get_timeline_service.return_value = mock_timeline_service
+    
+    try:
+        response = client.post(
+            "/api/analyze",
+            json={
+                "session_id": test_session_id,
+                "company": "google",
+                "role_description": "We are looking for a software engineering intern. " * 10,
+            }
+        )
+        
+        assert response.status_code == 200
+        expected = "**Role:** Software Engineering Intern\n**Required skills:** Python; SQL"
+        assert mock_role_service.analyze_match.call_args.kwargs["role_description"] == expected
+        assert mock_gap_service.analyze_gaps.call_args.kwargs["role_description"] == expected
+        assert mock_timeline_service.generate_timeline.call_args.kwargs["role_description"] == expected
+        # The local ATS score is computed against the posting itself
+        assert mock_role_service.analyze_match.call_args.kwargs["job_posting"] == (
+            ("We are looking for a software engineering intern. " * 10).strip()
+        )
+    
+    finally:
+        if test_file.exists():
+            test_file.unlink()
+
+
+@patch("app.api.routes.analyze.get_timeline_service")
+@patch("app.api.routes.analyze.get_gap_analysis_service")
+@patch("app.api.routes.analyze.get_role_matching_service")
+@patch("app.api.routes.analyze.get_resume_analysis_service")
+def test_analyze_endpoint_preview_mode(mock_get_resume_service, mock_get_role_service, mock_get_gap_service, mock_get_timeline_service, tmp_path):
+    """Test that preview mode returns provisional results and queues the full analysis."""
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    
+    test_session_id = "test-session-preview"
+    test_file = resume_dir / f"{test_session_id}_test.pdf"
+    test_file.write_text("test resume content")
+    
+    store = SessionStore(tmp_path / "sessions")
+    store.save(test_session_id, "resume_text", {"text": "Jane Doe\njane@example.com\nSkills: Python, React"})
+    preview_service = ResumePreviewService()
+    preview_service.session_store = store
+    
+    for mock_get_service, method in [
+        (mock_get_resume_service, "analyze_resume"),
+        (mock_get_role_service, "analyze_match"),
+        (mock_get_gap_service, "analyze_gaps"),
+        (mock_get_timeline_service, "generate_timeline"),
+    ]:
+        mock_service = AsyncMock()
+        setattr(mock_service, method, AsyncMock(return_value={}))
+        mock_get_service.return_value = mock_service
+    
+    try:
+        with patch("app.api.routes.analyze.get_resume_preview_service", return_value=preview_service):
+            response = client.post(
+                "/api/analyze",
+                json={
+                    "session_id": test_session_id,
+                    "company": "amazon",
+                    "role_description": "Software engineering intern working with Python and React. " * 2,
+                    "mode": "preview",
+                },
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "processing"
+        assert data["preview"]["provisional"] is True
+        assert data["preview"]["personal_info"]["email"] == "jane@example.com"
+        assert data["preview"]["skills"]["programming_languages"] == ["Python"]
+        assert "Python" in data["preview"]["ats_score"]["matched_keywords"]
+        assert store.exists(test_session_id, "preview")
+        
+        # The full analysis ran as a background task
+        mock_get_timeline_service.return_value.generate_timeline.assert_called_once()
+    
+    finally:
+        if test_file.exists():
+            test_file.unlink()
+
+
+@patch("app.api.routes.analyze.get_timeline_service")
+@patch("app.api.routes.analyze.get_gap_analysis_service")
+@patch("app.api.routes.analyze.get_role_matching_service")
+@patch("app.api.routes.analyze.get_resume_analysis_service")
+def test_new_analysis_clears_previous_results(mock_get_resume_service, mock_get_role_service, mock_get_gap_service, mock_get_timeline_service, tmp_path, monkeypatch):
+    """Test that results from an earlier analysis don't hide a new preview."""
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    
+    test_session_id = "test-session-rerun"
+    test_file = resume_dir / f"{test_session_id}_test.pdf"
+    test_file.write_text("test resume content")
+    
+    store = SessionStore(tmp_path / "sessions")
+    store.save(test_session_id, "resume_text", {"text": "Jane Doe\njane@example.com\nSkills: Python, React"})
+    for section in ["resume_analysis", "match_analysis", "gap_analysis", "timeline"]:
+        store.save(test_session_id, section, {"stale": True, "overall_score": {"score": 42}})
+    monkeypatch.setattr("app.api.routes.analyze.session_store", store)
+    monkeypatch.setattr("app.api.routes.results.session_store", store)
+    preview_service = ResumePreviewService()
+    preview_service.session_store = store
+    
+    # The queued full analysis has not written anything yet
+    for mock_get_service, method in [
+        (mock_get_resume_service, "analyze_resume"),
+        (mock_get_role_service, "analyze_match"),
+        (mock_get_gap_service, "analyze_gaps"),
+        (mock_get_timeline_service, "generate_timeline"),
+    ]:
+        mock_service = AsyncMock()
+        setattr(mock_service, method, AsyncMock(return_value={}))
+        mock_get_service.return_value = mock_service
+    
+    try:
+        with patch("app.api.routes.analyze.get_resume_preview_service", return_value=preview_service):
+            response = client.post(
+                "/api/analyze",
+                json={
+                    "session_id": test_session_id,
+                    "company": "amazon",
+                    "role_description": "Software engineering intern working with Python and React. " * 2,
+                    "mode": "preview",
+                },
+            )
+        assert response.status_code == 200
+        
+        results = client.get(f"/api/results/{test_session_id}").json()
+        assert results["status"] == "processing"
+        assert results["overall_score"] is None
+        assert results["preview"]["personal_info"]["email"] == "jane@example.com"
+        assert not store.exists(test_session_id, "match_analysis")
+        # The extracted resume text is kept
+        assert store.exists(test_session_id, "resume_text")
+    
+    finally:
+        if test_file.exists():
+            test_file.unlink()
+
+
+@patch("app.api.routes.analyze.get_timeline_service")
+@patch("app.api.routes.analyze.get_gap_analysis_service")
+@patch("app.api.routes.analyze.get_role_matching_service")
+@patch("app.api.routes.analyze.get_resume_analysis_service")
+def test_analyze_ats_score_matches_ats_endpoint(mock_get_resume_service, mock_get_role_service, mock_get_gap_service, mock_get_timeline_service, mock_role_requirements_service, tmp_path, monkeypatch):
+    """Test that phase 2's ATS score equals /api/ats-score for the same resume and posting."""
+    session_id = "test-session-ats-parity"
+    role_description = (
+        "Software Engineering Intern on our payments platform. You will work with "
+        "Python, React and PostgreSQL, and deploy services on Kubernetes."
+    )
+    store = SessionStore(tmp_path / "sessions")
+    store.save(session_id, "resume_text", {"text": "Skills: Python, React, Docker. Built REST APIs."})
+    store.save(session_id, "resume_analysis", {"summary": "CS student"})
+    monkeypatch.setattr("app.api.routes.ats.preview_service.session_store", store)
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    test_file = resume_dir / f"{session_id}_test.pdf"
+    test_file.write_text("test resume content")
+
+    # The extracted requirements differ from the posting, and mention "build"
+    mock_role_requirements_service.get_requirements = AsyncMock(return_value={
+        "role_title": "Software Engineering Intern",
+        "required_skills": ["Python", "Docker"],
+        "responsibilities": ["Build payment services"],
+    })
+    with patch("app.services.role_matching_service.LLMService"):
+        role_service = RoleMatchingService()
+    role_service.session_store = store
+    role_service.llm_service.generate_completion = AsyncMock(return_value=(
+        '{"ats_score": {"score": 50}, "role_match_score": {"score": 70}, '
+        '"company_fit_score": {"score": 60}, "overall_score": {"score": 62}}'
+    ))
+    mock_get_role_service.return_value = role_service
+    mock_resume_service = AsyncMock()
+    mock_resume_service.analyze_resume = AsyncMock(return_value={})
+    mock_get_resume_service.return_value = mock_resume_service
+    mock_gap_service = AsyncMock()
+    mock_gap_service.analyze_gaps = AsyncMock(return_value={})
+    mock_get_gap_service.return_value = mock_gap_service
+    mock_timeline_service = AsyncMock()
+    mock_timeline_service.generate_timeline = AsyncMock(return_value={})
+    mock_get_timeline_service.return_value = mock_timeline_service
+
+    try:
+        response = client.post(
+            "/api/analyze",
+            json={"session_id": session_id, "company": "amazon", "role_description": role_description},
+        )
+    finally:
+        test_file.unlink()
+    assert response.status_code == 200
+    ats_response = client.post(
+        "/api/ats-score", json={"session_id": session_id, "role_description": role_description}
+    )
+    assert ats_response.status_code == 200
+
+    phase_two = store.load(session_id, "match_analysis")["ats_score"]
+    assert phase_two["score"] == ats_response.json()["score"]
+    assert phase_two["keyword_matches"]["matched_keywords"] == ats_response.json()["matched_keywords"]
+    assert phase_two["keyword_matches"]["missing_keywords"] == ats_response.json()["missing_keywords"]
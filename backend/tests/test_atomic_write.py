@@ -0,0 +1,93 @@
+"""
+Tests for atomic file writes.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from app.services.atomic_write import atomic_write_bytes, get_durability
+from app.services.session_store import SessionStore
+
+
+@pytest.mark.parametrize("durability", ["none", "file", "full"])
+def test_atomic_write_creates_file(tmp_path, durability):
+    """Test writing a new file at every durability level."""
+    output_file = tmp_path / "timeline.json"
+
+    atomic_write_bytes(output_file, b'{"phases":[]}', durability=durability)
+
+    assert output_file.read_bytes() == b'{"phases":[]}'
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+def test_atomic_write_replaces_existing_file(tmp_path):
+    """Test that an existing file is replaced in one step."""
+    output_file = tmp_path / "timeline.json"
+    output_file.write_bytes(b"old")
+
+    atomic_write_bytes(output_file, b"new")
+
+    assert output_file.read_bytes() == b"new"
+
+
+def test_atomic_write_failure_keeps_previous_version(tmp_path):
+    """Test that a failed write leaves the old file and no temp files."""
+    output_file = tmp_path / "timeline.json"
+    output_file.write_bytes(b"old")
+
+    with patch("app.services.atomic_write.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            atomic_write_bytes(output_file, b"new")
+
+    assert output_file.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [output_file]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    """Test that replacing a file keeps its permissions."""
+    output_file = tmp_path / "resume.pdf"
+    output_file.write_bytes(b"old")
+    os.chmod(output_file, 0o644)
+
+    atomic_write_bytes(output_file, b"new")
+
+    assert output_file.stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_atomic_write_new_file_uses_default_mode(tmp_path):
+    """Test that new files get the same permissions as open() would give them."""
+    expected_file = tmp_path / "expected.json"
+    expected_file.write_bytes(b"")
+    output_file = tmp_path / "timeline.json"
+
+    atomic_write_bytes(output_file, b"{}")
+
+    assert output_file.stat().st_mode & 0o777 == expected_file.stat().st_mode & 0o777
+
+
+def test_get_durability_from_env(monkeypatch):
+    """Test durability is configurable via environment variable."""
+    monkeypatch.setenv("SESSION_WRITE_DURABILITY", "full")
+
+    assert get_durability() == "full"
+
+
+def test_get_durability_invalid():
+    """Test that unknown durability levels are rejected."""
+    with pytest.raises(ValueError, match="Invalid durability level"):
+        get_durability("eventually")
+
+
+def test_session_store_save_is_atomic(tmp_path):
+    """Test that SessionStore writes through a temp file and rename."""
+    store = SessionStore(tmp_path / "sessions", durability="none")
+
+    with patch("app.services.atomic_write.os.replace", wraps=os.replace) as mock_replace:
+        output_file = store.save("session-1", "gap_analysis", {"summary": {}})
+
+    mock_replace.assert_called_once()
+    assert mock_replace.call_args[0][1] == output_file
+    assert [p.name for p in output_file.parent.iterdir()] == ["gap_analysis.json"]
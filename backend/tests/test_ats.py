@@ -0,0 +1,62 @@
+"""
+Tests for ATS scoring API endpoint.
+"""
+
+import shutil
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.session_store import SessionStore
+
+client = TestClient(app)
+
+ROLE_DESCRIPTION = "Software Engineering Intern working with Python, React and Kubernetes on our platform."
+
+
+def test_ats_score_parses_uploaded_resume(tmp_path, monkeypatch):
+    """Test instant ATS scoring straight from the uploaded resume file."""
+    store = SessionStore(tmp_path / "sessions")
+    monkeypatch.setattr("app.api.routes.ats.preview_service.session_store", store)
+    monkeypatch.setattr("app.api.routes.ats.UPLOAD_DIR", tmp_path)
+    shutil.copy("test_resume_sample.pdf", tmp_path / "session-ats_abcd1234.pdf")
+
+    response = client.post(
+        "/api/ats-score",
+        json={"session_id": "session-ats", "role_description": ROLE_DESCRIPTION},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["provisional"] is True
+    assert "Python" in data["matched_keywords"]
+    assert 0 <= data["score"] <= 100
+    # The extracted text is kept for the full analysis
+    assert store.exists("session-ats", "resume_text")
+
+
+def test_ats_score_uses_saved_resume_text(tmp_path, monkeypatch):
+    """Test that previously extracted resume text is reused."""
+    store = SessionStore(tmp_path / "sessions")
+    store.save("session-ats", "resume_text", {"text": "Skills: Kubernetes"})
+    monkeypatch.setattr("app.api.routes.ats.preview_service.session_store", store)
+
+    response = client.post(
+        "/api/ats-score",
+        json={"session_id": "session-ats", "role_description": ROLE_DESCRIPTION},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["matched_keywords"] == ["Kubernetes"]
+
+
+def test_ats_score_missing_resume(tmp_path, monkeypatch):
+    """Test ATS scoring for a session without an uploaded resume."""
+    monkeypatch.setattr("app.api.routes.ats.preview_service.session_store", SessionStore(tmp_path / "sessions"))
+    monkeypatch.setattr("app.api.routes.ats.UPLOAD_DIR", tmp_path)
+
+    response = client.post(
+        "/api/ats-score",
+        json={"session_id": "missing", "role_description": ROLE_DESCRIPTION},
+    )
+
+    assert response.status_code == 404
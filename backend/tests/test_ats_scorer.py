@@ -0,0 +1,95 @@
+"""
+Tests for the local ATS scorer.
+"""
+
+from app.services.ats_scorer import ATSScorer
+
+RESUME = """Jane Doe
+jane@example.com | (555) 123-4567
+
+EDUCATION
+B.S. Computer Science, State University
+
+SKILLS
+Python, JS, React.js, PostgreSQL, Docker
+
+EXPERIENCE
+Software Intern, Acme
+- Reduced API latency by 40% with Redis caching
+- Built dashboards used by 2,000 users
+- Cut build time 3x
+
+PROJECTS
+Campus Events: Node.js backend services for event discovery
+"""
+
+ROLE = """Software Engineering Intern. Requirements: Python, JavaScript, TypeScript and
+Kubernetes (k8s). You will build backend services. Experience with backend services
+and caching preferred. Go above and beyond for our customers."""
+
+
+def test_extract_skills_normalizes_aliases():
+    """Test that aliases map to canonical skill names."""
+    scorer = ATSScorer()
+
+    assert scorer.extract_skills("JS, React.js, k8s and Postgres") == [
+        "JavaScript",
+        "React",
+        "Kubernetes",
+        "PostgreSQL",
+    ]
+
+
+def test_extract_skills_multi_word_and_case_sensitive():
+    """Test multi-word aliases and case-sensitive short aliases."""
+    scorer = ATSScorer()
+
+    assert scorer.extract_skills("Machine learning in Go") == ["Machine Learning", "Go"]
+    assert scorer.extract_skills("go above and beyond") == []
+
+
+def test_extract_keywords():
+    """Test that role keywords include skills and repeated role terms."""
+    skills, terms = ATSScorer().extract_keywords(ROLE)
+
+    assert skills == ["Python", "JavaScript", "TypeScript", "Kubernetes"]
+    assert terms == ["backend", "services"]
+
+
+def test_score():
+    """Test keyword coverage and matched and missing keywords."""
+    result = ATSScorer().score(RESUME, ROLE)
+
+    assert result["matched_keywords"] == ["Python", "JavaScript", "backend", "services"]
+    assert result["missing_keywords"] == ["TypeScript", "Kubernetes"]
+    # Skills weigh 2, terms 1: (2 + 2 + 1 + 1) / (4 * 2 + 2)
+    assert result["keyword_coverage"] == 60
+    assert 0 <= result["score"] <= 100
+
+
+def test_score_is_deterministic():
+    """Test that the same inputs always give the same result."""
+    scorer = ATSScorer()
+
+    assert scorer.score(RESUME, ROLE) == scorer.score(RESUME, ROLE)
+
+
+def test_score_formatting():
+    """Test the formatting heuristic on well and poorly structured resumes."""
+    scorer = ATSScorer()
+
+    good_score, _ = scorer.score_formatting(RESUME + " word" * 250)
+    poor_score, notes = scorer.score_formatting("Python developer")
+
+    assert good_score == 100
+    assert poor_score == 0
+    assert "No email address found" in notes
+    assert "Missing standard section headings" in notes
+
+
+def test_score_without_keywords():
+    """Test scoring a role description with no recognizable keywords."""
+    result = ATSScorer().score(RESUME, "An internship.")
+
+    assert result["keyword_coverage"] == 0
+    assert result["matched_keywords"] == []
@@ -86,3 +86,30 @@ def test_company_logo_urls_are_valid():
         logo_url = company["logo_url"]
         assert logo_url.startswith("/logos/")
         assert logo_url.endswith(".svg")
+
+
+def test_get_companies_search():
+    """Test prefix search on GET /api/companies."""
+    response = client.get("/api/companies", params={"q": "goo"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["id"] for c in data["companies"]] == ["google"]
+    assert data["total"] == 1
+
+
+def test_get_companies_pagination():
+    """Test pagination on GET /api/companies."""
+    response = client.get("/api/companies", params={"offset": 1, "limit": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["companies"]) == 1
+    assert data["total"] == 3
+
+
+def test_get_companies_invalid_limit():
+    """Test that out-of-range page sizes are rejected."""
+    response = client.get("/api/companies", params={"limit": 0})
+
+    assert response.status_code == 422
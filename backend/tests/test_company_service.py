@@ -2,9 +2,13 @@
 Tests for CompanyService.
 """
 
+import json
+import os
 import pytest
 from pathlib import Path
-from app.services.company_service import CompanyService
+from unittest.mock import patch
+
+from app.services.company_service import CompanyRegistry, CompanyService
 
 
 @pytest.fixture
@@ -80,3 +84,142 @@ def test_all_companies_have_tenets_files(company_service):
         # Note: File may not exist in test environment, so we just check the path is valid
         assert company.tenets_file.endswith(".txt")
         assert len(company.tenets_file) > 0
+
+
+def test_company_services_share_registry():
+    """Test that services for the same directory share one registry."""
+    assert CompanyService().registry is CompanyService().registry
+
+
+def test_tenets_reloaded_when_file_changes(tmp_path):
+    """Test that tenets are cached and only re-read after the file changes."""
+    tenets_file = tmp_path / "amazon-leadership-principles.txt"
+    tenets_file.write_text("1. Customer Obsession")
+    service = CompanyService(tenets_dir=str(tmp_path))
+
+    assert service.get_company_tenets("amazon") == "1. Customer Obsession"
+
+    with patch.object(Path, "read_text") as mock_read:
+        assert service.get_company_tenets("amazon") == "1. Customer Obsession"
+    mock_read.assert_not_called()
+
+    tenets_file.write_text("1. Ownership")
+    stat = tenets_file.stat()
+    os.utime(tenets_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert service.get_company_tenets("amazon") == "1. Ownership"
+
+
+def test_tenets_missing_file(tmp_path):
+    """Test that tenets are None for companies without a tenets file."""
+    service = CompanyService(tenets_dir=str(tmp_path))
+
+    assert service.get_company_tenets("meta") is None
+
+
+def test_get_companies_json(company_service):
+    """Test that the pre-serialized response matches the company list."""
+    data = json.loads(company_service.get_companies_json())
+
+    assert [c["id"] for c in data["companies"]] == ["amazon", "google", "meta"]
+    assert data["total"] == 3
+
+
+def _manifest_json(company_id, display_name):
+    """Serialize a company manifest."""
+    return json.dumps({
+        "id": company_id,
+        "name": company_id,
+        "display_name": display_name,
+        "color": "#000000",
+        "logo_url": f"/logos/{company_id}.svg",
+        "tenets_file": f"{company_id}.txt",
+        "description": f"Evaluated against {display_name}'s values",
+    })
+
+
+def _write_manifest(manifest_dir, company_id, display_name):
+    """Write a company manifest file."""
+    (manifest_dir / f"{company_id}.json").write_text(_manifest_json(company_id, display_name))
+
+
+def test_registry_hot_reloads_manifests(tmp_path):
+    """Test that added and removed manifests are picked up."""
+    _write_manifest(tmp_path, "stripe", "Stripe")
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    assert [c.id for c in registry.companies] == ["stripe"]
+
+    _write_manifest(tmp_path, "netflix", "Netflix")
+    (tmp_path / "stripe.json").unlink()
+
+    assert registry.get_company("netflix") is not None
+    assert registry.get_company("stripe") is None
+
+
+def test_registry_keeps_manifest_order(tmp_path):
+    """Test that companies are listed in manifest order, not by display name."""
+    (tmp_path / "companies.json").write_text(json.dumps([
+        json.loads(_manifest_json("zeta", "Zeta")),
+        json.loads(_manifest_json("alpha", "Alpha")),
+    ]))
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    assert [c.id for c in registry.companies] == ["zeta", "alpha"]
+
+
+def test_registry_finds_mixed_case_ids(tmp_path):
+    """Test that manifest IDs are matched as given, then case-insensitively."""
+    _write_manifest(tmp_path, "OpenAI", "OpenAI")
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    assert registry.find_company("OpenAI").id == "OpenAI"
+    assert registry.find_company("openai").id == "OpenAI"
+    assert registry.find_company("anthropic") is None
+
+
+def test_company_service_loads_registry_lazily(tmp_path):
+    """Test that creating the service does not load the manifests."""
+    with patch("app.services.company_service.get_company_registry") as get_registry:
+        service = CompanyService(tenets_dir=tmp_path, manifest_dir=tmp_path)
+        get_registry.assert_not_called()
+
+        service.get_all_companies()
+        get_registry.assert_called_once_with(tmp_path, tmp_path)
+
+
+def test_registry_skips_unchanged_manifests(tmp_path):
+    """Test that manifests are not re-parsed when nothing changed."""
+    _write_manifest(tmp_path, "stripe", "Stripe")
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    assert registry.reload() is False
+
+
+def test_registry_skips_invalid_manifest(tmp_path):
+    """Test that a malformed manifest does not break the registry."""
+    _write_manifest(tmp_path, "stripe", "Stripe")
+    (tmp_path / "broken.json").write_text("{not json")
+
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    assert [c.id for c in registry.companies] == ["stripe"]
+
+
+def test_registry_search_and_pagination(tmp_path):
+    """Test prefix search and pagination over many companies."""
+    for i in range(250):
+        _write_manifest(tmp_path, f"company{i:03d}", f"Company {i:03d}")
+    _write_manifest(tmp_path, "acme", "Acme Corp")
+    registry = CompanyRegistry(tmp_path, tmp_path, reload_interval=0)
+
+    page, total = registry.search(offset=10, limit=5)
+    assert total == 251
+    assert [c.id for c in page] == [f"company{i:03d}" for i in range(9, 14)]
+
+    matches, total = registry.search("Company 12")
+    assert total == 10
+    assert matches[0].id == "company120"
+
+    matches, total = registry.search("ACM")
+    assert [c.id for c in matches] == ["acme"]
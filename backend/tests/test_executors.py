@@ -0,0 +1,56 @@
+"""
+Tests for the dedicated thread pools.
+"""
+
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from app.services import executors
+from app.services.executors import get_llm_executor, run_in_executor
+
+
+@pytest.fixture
+def fresh_llm_executor(monkeypatch):
+    """Create the LLM pool anew for the test, and shut it down after."""
+    monkeypatch.setattr(executors, "_llm_executor", None)
+    yield
+    if executors._llm_executor is not None:
+        executors._llm_executor.shutdown(wait=False)
+
+
+def test_llm_pool_is_sized_to_the_in_flight_limit(monkeypatch, fresh_llm_executor):
+    monkeypatch.setenv("READY_MAX_LLM_IN_FLIGHT", "48")
+
+    assert get_llm_executor()._max_workers == 48
+
+
+def test_llm_pool_falls_back_when_the_limit_is_disabled(monkeypatch, fresh_llm_executor):
+    monkeypatch.setenv("READY_MAX_LLM_IN_FLIGHT", "0")
+
+    assert get_llm_executor()._max_workers == 32
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_keeps_the_callers_context(fresh_llm_executor):
+    label: ContextVar[str] = ContextVar("label", default="unset")
+    label.set("analysis")
+
+    def read(suffix):
+        return f"{label.get()}{suffix} on {threading.current_thread().name}"
+
+    result = await run_in_executor(get_llm_executor(), read, suffix="!")
+
+    assert result.startswith("analysis! on llm")
+
+
+def test_parser_pool_size_from_environment(monkeypatch):
+    monkeypatch.setattr(executors, "_parser_executor", None)
+    monkeypatch.setenv("PARSER_THREADS", "3")
+
+    pool = executors.get_parser_executor()
+    try:
+        assert pool._max_workers == 3
+    finally:
+        pool.shutdown(wait=False)
@@ -0,0 +1,172 @@
+"""
+Tests for the fake LLM backend and the offline benchmark.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.prompts import gap_analysis, timeline_generation
+from app.services.fake_llm import (
+    FakeAnthropicClient,
+    create_fake_client,
+    detect_phase,
+    load_recordings,
+    record_response,
+)
+from app.services.llm_service import LLMService
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def create(client, system_prompt, max_tokens=4096):
+    return client.messages.create(
+        model="fake-model",
+        max_tokens=max_tokens,
+        temperature=0.3,
+        system=system_prompt,
+        messages=[{"role": "user", "content": "Analyze this"}],
+    )
+
+
+def test_detect_phase_from_system_prompt():
+    assert detect_phase(gap_analysis.SYSTEM_PROMPT) == "gap_analysis"
+    assert detect_phase(timeline_generation.SYSTEM_PROMPT) == "timeline"
+    assert detect_phase("Something else") == "unknown"
+
+
+def test_replays_recordings_in_order():
+    client = FakeAnthropicClient({"gap_analysis": ['{"a": 1}', '{"b": 2}']})
+
+    texts = [create(client, gap_analysis.SYSTEM_PROMPT).content[0].text for _ in range(3)]
+
+    assert texts == ['{"a": 1}', '{"b": 2}', '{"a": 1}']
+    assert client.calls == 3
+
+
+def test_missing_recording_raises():
+    client = FakeAnthropicClient({})
+    with pytest.raises(ValueError, match="No recorded fake LLM response"):
+        create(client, gap_analysis.SYSTEM_PROMPT)
+
+
+def test_truncation_is_deterministic():
+    text = json.dumps({"items": list(range(200))})
+    runs = []
+    for _ in range(2):
+        client = FakeAnthropicClient({"timeline": [text]}, truncate_rate=0.5, seed=7)
+        runs.append([create(client, timeline_generation.SYSTEM_PROMPT) for _ in range(10)])
+
+    assert [r.content[0].text for r in runs[0]] == [r.content[0].text for r in runs[1]]
+    truncated = [r for r in runs[0] if r.stop_reason == "max_tokens"]
+    assert 0 < len(truncated) < 10
+    assert all(text.startswith(r.content[0].text) and len(r.content[0].text) < len(text) for r in truncated)
+
+
+def test_latency_and_usage():
+    client = FakeAnthropicClient({"timeline": ['{"phases": []}']}, latency=0.05)
+
+    started = time.perf_counter()
+    response = create(client, timeline_generation.SYSTEM_PROMPT)
+
+    assert time.perf_counter() - started >= 0.05
+    assert response.usage.input_tokens > 0
+    assert response.usage.output_tokens > 0
+
+
+def test_record_and_load(tmp_path):
+    record_response(tmp_path, gap_analysis.SYSTEM_PROMPT, '{"summary": {}}')
+    (tmp_path / "timeline.json").write_text('{"phases": []}')
+
+    recordings = load_recordings(tmp_path)
+
+    assert recordings == {"gap_analysis": ['{"summary": {}}'], "timeline": ['{"phases": []}']}
+
+
+def test_shipped_recordings_cover_every_phase():
+    recordings = load_recordings(BACKEND_DIR / "data" / "fake-llm")
+    assert set(recordings) == {
+        "resume_analysis", "role_requirements", "role_matching", "gap_analysis", "timeline"
+    }
+    for texts in recordings.values():
+        for text in texts:
+            json.loads(text)
+
+
+@pytest.mark.asyncio
+async def test_llm_service_uses_fake_backend(monkeypatch, tmp_path):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("FAKE_LLM_RESPONSES_DIR", str(tmp_path))
+    (tmp_path / "gap_analysis.json").write_text('{"summary": {}}')
+
+    service = LLMService()
+    result = await service.generate_completion(prompt="Test", system_prompt=gap_analysis.SYSTEM_PROMPT)
+
+    assert result == '{"summary": {}}'
+    assert isinstance(service.client, FakeAnthropicClient)
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "carrier-pigeon")
+    with pytest.raises(ValueError, match="Unknown LLM_BACKEND"):
+        LLMService()
+
+
+def test_create_fake_client_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("FAKE_LLM_RESPONSES_DIR", str(tmp_path))
+    monkeypatch.setenv("FAKE_LLM_LATENCY", "0.25")
+    monkeypatch.setenv("FAKE_LLM_TRUNCATE_RATE", "0.1")
+
+    client = create_fake_client()
+
+    assert client.latency == 0.25
+    assert client.truncate_rate == 0.1
+    assert client.recordings == {}
+
+
+def test_benchmark_runs_offline(tmp_path):
+    output = tmp_path / "results.json"
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_analyze", "--concurrency", "1,2", "--output", str(output)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    results = json.loads(output.read_text())
+    assert [level["concurrency"] for level in results["levels"]] == [1, 2]
+    assert all(level["errors"] == 0 for level in results["levels"])
+    assert results["levels"][0]["p99_ms"] > 0
+    assert "gap_analysis" in results["levels"][0]["parse_ms"]
+
+
+def test_load_test_runs_offline(tmp_path):
+    output = tmp_path / "capacity.json"
+
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.load_test", "--rates", "2,4", "--duration", "1",
+            "--poll-interval", "0.05", "--keep-going", "--output", str(output),
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    results = json.loads(output.read_text())
+    assert [stage["offered_rate"] for stage in results["stages"]] == [2.0, 4.0]
+    first = results["stages"][0]
+    assert first["arrivals"] == first["completed"] > 0
+    assert first["errors"] == 0
+    assert set(first["step_p99_ms"]) == {"upload", "analyze", "results"}
+    assert first["loop_lag_max_ms"] >= 0
@@ -4,9 +4,9 @@ Tests for gap analysis service.
 
 import json
 import pytest
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.services.session_store import SessionStore
 from app.services.gap_analysis_service import GapAnalysisService
 
 
@@ -212,17 +212,17 @@ class TestGapAnalysisService:
         match_file = session_dir / "match_analysis.json"
         match_file.write_text(json.dumps(match_data))
 
-        # Mock Path to use tmp_path
-        with patch("app.services.gap_analysis_service.Path") as mock_path:
-            mock_path.return_value = match_file
-            result = gap_analysis_service._load_match_analysis(session_id)
+        # Point the session store at tmp_path
+        gap_analysis_service.session_store = SessionStore(tmp_path / "data" / "sessions")
+        result = gap_analysis_service._load_match_analysis(session_id)
 
         assert result is not None
         assert result["ats_score"]["score"] == 85
 
-    def test_load_match_analysis_not_found(self, gap_analysis_service):
+    def test_load_match_analysis_not_found(self, gap_analysis_service, tmp_path):
         """Test loading match analysis when file doesn't exist."""
         session_id = "nonexistent-session"
+        gap_analysis_service.session_store = SessionStore(tmp_path / "data" / "sessions")
 
         result = gap_analysis_service._load_match_analysis(session_id)
 
@@ -324,22 +324,18 @@ class TestGapAnalysisService:
         """Test saving gap results to file system."""
         session_id = "test-session-123"
 
-        # Mock Path to use tmp_path
-        with patch("app.services.gap_analysis_service.Path") as mock_path:
-            session_dir = tmp_path / "data" / "sessions" / session_id
-            session_dir.mkdir(parents=True)
-            mock_path.return_value = session_dir
-
-            gap_analysis_service._save_gap_results(session_id, sample_gap_analysis)
+        # Point the session store at tmp_path
+        gap_analysis_service.session_store = SessionStore(tmp_path / "data" / "sessions")
+        gap_analysis_service._save_gap_results(session_id, sample_gap_analysis)
 
-            # Verify file was created
-            output_file = session_dir / "gap_analysis.json"
-            assert output_file.exists()
+        # Verify file was created
+        output_file = tmp_path / "data" / "sessions" / session_id / "gap_analysis.json"
+        assert output_file.exists()
 
-            # Verify content
-            with open(output_file) as f:
-                saved_data = json.load(f)
-            assert saved_data["summary"]["total_gaps"] == 8
+        # Verify content
+        with open(output_file) as f:
+            saved_data = json.load(f)
+        assert saved_data["summary"]["total_gaps"] == 8
 
     def test_load_gap_results_success(self, gap_analysis_service, tmp_path):
         """Test loading gap results from file system."""
@@ -352,17 +348,17 @@ class TestGapAnalysisService:
         gap_file = session_dir / "gap_analysis.json"
         gap_file.write_text(json.dumps(gap_data))
 
-        # Mock Path to use tmp_path
-        with patch("app.services.gap_analysis_service.Path") as mock_path:
-            mock_path.return_value = gap_file
-            result = gap_analysis_service.load_gap_results(session_id)
+        # Point the session store at tmp_path
+        gap_analysis_service.session_store = SessionStore(tmp_path / "data" / "sessions")
+        result = gap_analysis_service.load_gap_results(session_id)
 
         assert result is not None
         assert result["summary"]["total_gaps"] == 5
 
-    def test_load_gap_results_not_found(self, gap_analysis_service):
+    def test_load_gap_results_not_found(self, gap_analysis_service, tmp_path):
         """Test loading gap results when file doesn't exist."""
         session_id = "nonexistent-session"
+        gap_analysis_service.session_store = SessionStore(tmp_path / "data" / "sessions")
 
         result = gap_analysis_service.load_gap_results(session_id)
 
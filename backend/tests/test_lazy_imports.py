@@ -0,0 +1,103 @@
+"""
+Tests for deferred imports, the startup report and the import-time report.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.lazy_imports import LazyModule, deferred_modules, lazy_import, load_lazy_modules
+from benchmarks.import_time import build_report, measure_imports
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["anthropic", "PyPDF2", "docx", "json_repair"]
+
+
+def test_lazy_module_imports_on_first_use():
+    sys.modules.pop("wave", None)
+    module = LazyModule("wave")
+
+    assert not module.loaded
+    assert "wave" not in sys.modules
+    assert module.Error.__name__ == "Error"
+    assert module.loaded
+    assert "wave" in sys.modules
+
+
+def test_lazy_import_shares_stand_ins():
+    assert lazy_import("json_repair") is lazy_import("json_repair")
+
+
+def test_patching_stand_in_shadows_module():
+    module = LazyModule("colorsys")
+
+    with patch.object(module, "rgb_to_hsv", return_value="patched"):
+        assert module.rgb_to_hsv(0, 0, 0) == "patched"
+    assert module.rgb_to_hsv(0, 0, 0) == (0, 0, 0)
+
+
+def test_app_import_defers_heavy_dependencies():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    assert completed.stdout.strip() == ""
+
+
+def test_load_lazy_modules_imports_deferred():
+    load_lazy_modules()
+
+    assert deferred_modules() == []
+    assert "anthropic" in sys.modules
+
+
+def test_lifespan_records_startup_report(monkeypatch):
+    # Keep the background tasks away from the working directory's data
+    monkeypatch.setenv("SESSION_TTL_HOURS", "0")
+    monkeypatch.setenv("LOOP_LAG_INTERVAL", "0")
+    monkeypatch.setenv("WARMUP_STEPS", "none")
+
+    with TestClient(app) as client:
+        assert client.get("/api/health").status_code == 200
+        report = app.state.startup_report
+
+    assert report["import_seconds"] > 0
+    assert report["startup_seconds"] >= 0
+    assert isinstance(report["deferred_modules"], list)
+
+
+def test_import_time_report():
+    runs = [
+        {
+            "app.main": {"self_ms": 5.0, "cumulative_ms": 30.0, "depth": 0},
+            "fastapi": {"self_ms": 20.0, "cumulative_ms": 20.0, "depth": 1},
+            "fastapi.routing": {"self_ms": 4.0, "cumulative_ms": 4.0, "depth": 2},
+        },
+        {
+            "app.main": {"self_ms": 7.0, "cumulative_ms": 40.0, "depth": 0},
+            "fastapi": {"self_ms": 30.0, "cumulative_ms": 30.0, "depth": 1},
+        },
+    ]
+
+    report = build_report(runs, "app.main", top=5)
+
+    assert report["total_ms"] == 35.0
+    assert report["packages"] == [{"package": "fastapi", "self_ms": 27.0}, {"package": "app", "self_ms": 6.0}]
+    assert report["slowest_modules"][0] == {"module": "fastapi", "self_ms": 25.0}
+    assert report["app_modules"] == [{"module": "app.main", "cumulative_ms": 35.0}]
+
+
+def test_measure_imports_parses_importtime():
+    imports = measure_imports("json")
+
+    assert imports["json"]["cumulative_ms"] > 0
+    assert imports["json.decoder"]["depth"] >= 1
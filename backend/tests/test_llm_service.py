@@ -2,8 +2,10 @@
 Tests for LLM service.
 """
 
+import asyncio
 import pytest
 import os
+import threading
 from unittest.mock import Mock, patch, AsyncMock
 from anthropic import APIError, APITimeoutError, RateLimitError
 from app.services.llm_service import LLMService
@@ -52,7 +54,7 @@ class TestLLMService:
             LLMService()
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
+    @patch("app.services.llm_service.anthropic.Anthropic")
     async def test_generate_completion_success(
         self, mock_anthropic_class, llm_service, mock_anthropic_response
     ):
@@ -73,7 +75,7 @@ class TestLLMService:
         mock_client.messages.create.assert_called_once()
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
+    @patch("app.services.llm_service.anthropic.Anthropic")
     async def test_generate_completion_with_custom_params(
         self, mock_anthropic_class, llm_service, mock_anthropic_response
     ):
@@ -98,8 +100,8 @@ class TestLLMService:
         assert call_args.kwargs["temperature"] == 0.5
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
-    @patch("time.sleep", return_value=None)  # Mock sleep to speed up tests
+    @patch("app.services.llm_service.anthropic.Anthropic")
+    @patch("app.services.llm_service.asyncio.sleep", new_callable=AsyncMock)  # Mock sleep to speed up tests
     async def test_generate_completion_retry_on_rate_limit(
         self, mock_sleep, mock_anthropic_class, llm_service, mock_anthropic_response
     ):
@@ -128,11 +130,11 @@ class TestLLMService:
         
         assert result == "This is a test response from Claude"
         assert mock_client.messages.create.call_count == 2
-        mock_sleep.assert_called_once()  # Verify exponential backoff was used
+        mock_sleep.assert_awaited_once_with(1)  # Verify exponential backoff was used
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
-    @patch("time.sleep", return_value=None)
+    @patch("app.services.llm_service.anthropic.Anthropic")
+    @patch("app.services.llm_service.asyncio.sleep", new_callable=AsyncMock)
     async def test_generate_completion_retry_on_timeout(
         self, mock_sleep, mock_anthropic_class, llm_service, mock_anthropic_response
     ):
@@ -154,8 +156,8 @@ class TestLLMService:
         assert mock_client.messages.create.call_count == 2
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
-    @patch("time.sleep", return_value=None)
+    @patch("app.services.llm_service.anthropic.Anthropic")
+    @patch("app.services.llm_service.asyncio.sleep", new_callable=AsyncMock)
     async def test_generate_completion_max_retries_exceeded(
         self, mock_sleep, mock_anthropic_class, llm_service
     ):
@@ -183,7 +185,7 @@ class TestLLMService:
         assert mock_client.messages.create.call_count == 3  # max_retries
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
+    @patch("app.services.llm_service.anthropic.Anthropic")
     async def test_generate_completion_empty_response(
         self, mock_anthropic_class, llm_service
     ):
@@ -202,9 +204,10 @@ class TestLLMService:
             await llm_service.generate_completion(prompt="Test")
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
+    @patch("app.services.llm_service.anthropic.Anthropic")
+    @patch("app.services.llm_service.asyncio.sleep", new_callable=AsyncMock)
     async def test_generate_completion_api_error(
-        self, mock_anthropic_class, llm_service
+        self, mock_sleep, mock_anthropic_class, llm_service
     ):
         """Test handling of generic API error."""
         mock_client = Mock()
@@ -221,7 +224,7 @@ class TestLLMService:
             await llm_service.generate_completion(prompt="Test")
     
     @pytest.mark.asyncio
-    @patch("app.services.llm_service.Anthropic")
+    @patch("app.services.llm_service.anthropic.Anthropic")
     async def test_generate_completion_unexpected_error(
         self, mock_anthropic_class, llm_service
     ):
@@ -234,3 +237,46 @@ class TestLLMService:
         
         with pytest.raises(Exception, match="Unexpected error"):
             await llm_service.generate_completion(prompt="Test")
+    
+    @pytest.mark.asyncio
+    async def test_generate_completion_runs_on_llm_threads(self, llm_service, mock_anthropic_response):
+        """Test that API calls wait on the dedicated LLM threads, not the default executor."""
+        threads = []
+        
+        def create(**kwargs):
+            threads.append(threading.current_thread().name)
+            return mock_anthropic_response
+        
+        llm_service.client = Mock()
+        llm_service.client.messages.create.side_effect = create
+        
+        await llm_service.generate_completion(prompt="Test")
+        
+        assert len(threads) == 1
+        assert threads[0].startswith("llm")
+    
+    @pytest.mark.asyncio
+    async def test_retry_backoff_does_not_block_event_loop(self, llm_service, mock_anthropic_response):
+        """Test that waiting between retries leaves the event loop free."""
+        llm_service.base_delay = 0.2
+        llm_service.client = Mock()
+        llm_service.client.messages.create.side_effect = [
+            APITimeoutError("Request timeout"),
+            mock_anthropic_response,
+        ]
+        ticks = 0
+        
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        ticker = asyncio.create_task(tick())
+        try:
+            result = await llm_service.generate_completion(prompt="Test")
+        finally:
+            ticker.cancel()
+        
+        assert result == "This is a test response from Claude"
+        assert ticks >= 5
@@ -0,0 +1,98 @@
+"""
+Tests for the event-loop lag sampler and blocking-call detector.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.loop_monitor import LoopMonitor
+from app.services.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_SECONDS, REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Start each test with no recorded values."""
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+async def _run_monitor(monitor: LoopMonitor, workload) -> None:
+    """Run the monitor around a workload, then stop it."""
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    await workload()
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def _block_the_loop():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_reported_with_stack():
+    monitor = LoopMonitor(interval_seconds=0.01, block_threshold_seconds=0.1)
+
+    async def workload():
+        _block_the_loop()
+
+    await _run_monitor(monitor, workload)
+
+    assert len(monitor.blocks) == 1
+    report = monitor.blocks[0]
+    assert 0.2 < report.duration_seconds < 0.5
+    assert "_block_the_loop" in report.stack
+    assert EVENT_LOOP_BLOCKS.value() == 1
+    assert monitor.max_lag_seconds >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_awaiting_work_is_not_reported():
+    monitor = LoopMonitor(interval_seconds=0.01, block_threshold_seconds=0.1)
+
+    async def workload():
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(time.sleep, 0.2)
+
+    await _run_monitor(monitor, workload)
+
+    assert not monitor.blocks
+    assert EVENT_LOOP_BLOCKS.value() == 0
+    assert EVENT_LOOP_LAG_SECONDS.count() > 10
+
+
+def test_block_detection_off_by_default(monkeypatch):
+    monkeypatch.delenv("LOOP_BLOCK_THRESHOLD_MS", raising=False)
+    monkeypatch.setenv("LOOP_LAG_INTERVAL", "0.25")
+
+    monitor = LoopMonitor()
+
+    assert monitor.enabled
+    assert monitor.interval_seconds == 0.25
+    assert monitor.block_threshold_seconds == 0
+
+
+def test_threshold_shortens_sampling_interval(monkeypatch):
+    monkeypatch.setenv("LOOP_LAG_INTERVAL", "0.5")
+    monkeypatch.setenv("LOOP_BLOCK_THRESHOLD_MS", "100")
+
+    monitor = LoopMonitor()
+
+    assert monitor.block_threshold_seconds == 0.1
+    assert monitor.interval_seconds == 0.05
+
+
+def test_loop_metrics_exposed():
+    EVENT_LOOP_LAG_SECONDS.observe(0.002)
+
+    response = TestClient(app).get("/metrics")
+
+    assert "event_loop_lag_seconds_count 1" in response.text
+    assert "# TYPE event_loop_blocks_total counter" in response.text
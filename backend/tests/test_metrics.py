@@ -0,0 +1,142 @@
+"""
+Tests for in-process metrics and the /metrics endpoint.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from anthropic import RateLimitError
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.llm_service import LLMService
+from app.services.metrics import (
+    LLM_RETRIES,
+    LLM_TOKENS,
+    PHASE_SECONDS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    metric_context,
+    track_phase,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Start each test with no recorded values."""
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency.", ["phase"], buckets=(1, 5)))
+    histogram.observe(0.5, phase="a")
+    histogram.observe(3, phase="a")
+    histogram.observe(10, phase="a")
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{phase="a",le="1"} 1',
+        'latency_seconds_bucket{phase="a",le="5"} 2',
+        'latency_seconds_bucket{phase="a",le="+Inf"} 3',
+        'latency_seconds_sum{phase="a"} 13.5',
+        'latency_seconds_count{phase="a"} 3',
+    ]
+
+
+def test_counter_labels_come_from_context():
+    counter = Counter("fallbacks_total", "Fallbacks.", ["phase", "company", "method"])
+
+    with metric_context(phase="gap_analysis", company="amazon"):
+        with metric_context(company="google"):
+            counter.inc(method="repair")
+    counter.inc(method="repair")
+
+    assert counter.value(phase="gap_analysis", company="google", method="repair") == 1
+    assert counter.value(phase="unknown", company="unknown", method="repair") == 1
+    assert 'fallbacks_total{phase="unknown",company="unknown",method="repair"} 1' in counter.render()
+
+
+def test_gauge_tracks_work_in_progress():
+    gauge = Gauge("jobs_in_progress", "Jobs.", ["mode"])
+
+    with gauge.track(mode="full"):
+        gauge.inc(mode="preview")
+        assert gauge.value(mode="full") == 1
+        assert gauge.total() == 2
+    gauge.dec(mode="preview")
+
+    assert gauge.total() == 0
+    assert gauge.render()[1] == "# TYPE jobs_in_progress gauge"
+    assert 'jobs_in_progress{mode="full"} 0' in gauge.render()
+
+
+def test_unknown_labels_are_rejected():
+    counter = Counter("things_total", "Things.", ["phase"])
+    with pytest.raises(ValueError, match="Unknown labels"):
+        counter.inc(colour="red")
+
+
+def test_track_phase_records_status():
+    with track_phase("gap_analysis", "amazon", "model-a"):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_phase("gap_analysis", "amazon", "model-a"):
+            raise RuntimeError("boom")
+
+    labels = {"phase": "gap_analysis", "company": "amazon", "model": "model-a"}
+    assert PHASE_SECONDS.count(status="ok", **labels) == 1
+    assert PHASE_SECONDS.count(status="error", **labels) == 1
+
+
+@pytest.mark.asyncio
+@patch("time.sleep", return_value=None)
+async def test_llm_service_records_tokens_and_retries(mock_sleep, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
+    monkeypatch.setenv("ANTHROPIC_MODEL", "model-a")
+    service = LLMService()
+
+    rate_limit_error = RateLimitError(
+        "Rate limit exceeded",
+        response=Mock(status_code=429),
+        body={"error": "rate_limit"},
+    )
+    response = Mock()
+    response.content = [Mock(text="{}")]
+    response.usage = Mock(
+        input_tokens=1200, output_tokens=300, cache_read_input_tokens=800, cache_creation_input_tokens=None
+    )
+    service.client = Mock()
+    service.client.messages.create.side_effect = [rate_limit_error, response]
+
+    with track_phase("role_matching", "amazon", "model-a"):
+        await service.generate_completion(prompt="Test")
+
+    labels = {"phase": "role_matching", "company": "amazon", "model": "model-a"}
+    assert LLM_RETRIES.value(reason="rate_limit", **labels) == 1
+    assert LLM_TOKENS.sum(kind="input", **labels) == 1200
+    assert LLM_TOKENS.sum(kind="output", **labels) == 300
+    assert LLM_TOKENS.sum(kind="cache_read", **labels) == 800
+    assert LLM_TOKENS.count(kind="cache_creation", **labels) == 0
+
+
+def test_metrics_endpoint():
+    with track_phase("timeline", "amazon", "model-a"):
+        pass
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE analysis_phase_seconds histogram" in response.text
+    assert (
+        'analysis_phase_seconds_count{phase="timeline",model="model-a",company="amazon",status="ok"} 1'
+        in response.text
+    )
@@ -0,0 +1,256 @@
+"""
+Tests for the sampling profiler and the admin profiling endpoints.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.profiler import (
+    PROFILES_DIR,
+    SamplingProfiler,
+    exclusive_profile,
+    load_profile,
+    profile_running,
+    save_profile,
+)
+
+client = TestClient(app)
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+def _spin(seconds: float) -> None:
+    """Keep the CPU busy."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    """Enable the admin endpoints."""
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+
+def test_profiler_samples_all_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="idle-worker")
+    worker.start()
+    try:
+        profiler = SamplingProfiler()
+        profiler.sample()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples == 1
+    stacks = profiler.folded().splitlines()
+    assert any(line.startswith("idle-worker;") for line in stacks)
+    assert any("test_profiler:test_profiler_samples_all_threads" in line for line in stacks)
+
+
+def test_profiler_context_restricts_to_block():
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, name="idle-worker")
+    worker.start()
+    try:
+        with SamplingProfiler(interval_seconds=0.001) as profiler:
+            _spin(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 0
+    stacks = list(profiler.stacks)
+    assert stacks
+    assert all(
+        stack.startswith("MainThread;tests.test_profiler:test_profiler_context_restricts_to_block")
+        for stack in stacks
+    )
+    assert any("tests.test_profiler:_spin" in stack for stack in stacks)
+
+
+def test_folded_output_format():
+    profiler = SamplingProfiler()
+    profiler.stacks.update({"MainThread;a:f;a:g": 3, "MainThread;a:f": 1})
+
+    assert profiler.folded() == "MainThread;a:f;a:g 3\nMainThread;a:f 1\n"
+
+
+def test_profiler_stops_sampling_after_max_seconds():
+    profiler = SamplingProfiler(interval_seconds=0.001, max_seconds=0.05)
+    profiler.start()
+    time.sleep(0.2)
+    samples = profiler.samples
+    time.sleep(0.05)
+    profiler.stop()
+
+    assert 0 < profiler.samples == samples
+    assert profiler.duration_seconds == 0.05
+
+
+@pytest.mark.asyncio
+async def test_only_one_profile_runs_at_a_time():
+    async with exclusive_profile():
+        with pytest.raises(RuntimeError):
+            async with exclusive_profile():
+                pass
+
+    async with exclusive_profile() as profiler:
+        await asyncio.sleep(0.01)
+    assert profiler.samples > 0
+
+
+@pytest.mark.asyncio
+async def test_profile_is_released_and_saved_when_it_reaches_max_seconds(tmp_path):
+    def save(profiler):
+        save_profile("capped", profiler, tmp_path)
+
+    async with exclusive_profile(max_seconds=0.05, on_stop=save):
+        assert profile_running()
+        await asyncio.sleep(0.2)
+
+        # The block is still running, but sampling has stopped
+        assert not profile_running()
+        assert load_profile("capped", tmp_path) is not None
+        async with exclusive_profile() as second:
+            await asyncio.sleep(0.01)
+        assert second.samples > 0
+
+
+def test_save_and_load_profile(tmp_path):
+    profiler = SamplingProfiler()
+    profiler.stacks["MainThread;a:f"] = 2
+
+    save_profile("analysis-1", profiler, tmp_path)
+
+    assert load_profile("analysis-1", tmp_path) == "MainThread;a:f 2\n"
+    assert load_profile("missing", tmp_path) is None
+    assert load_profile("../analysis-1", tmp_path) is None
+
+
+def test_admin_endpoints_disabled_without_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+
+    response = client.get("/api/admin/profile?seconds=0.1", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 404
+
+
+def test_admin_endpoints_reject_wrong_token(admin_token):
+    response = client.get("/api/admin/profile?seconds=0.1", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+
+    response = client.get("/api/admin/profile?seconds=0.1")
+    assert response.status_code == 403
+
+
+def test_profile_endpoint_returns_folded_stacks(admin_token):
+    response = client.get("/api/admin/profile?seconds=0.2&interval_ms=2", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_profile_endpoint_limits_duration(admin_token, monkeypatch):
+    monkeypatch.setenv("PROFILE_MAX_SECONDS", "5")
+
+    response = client.get("/api/admin/profile?seconds=30", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 400
+
+
+def test_analyze_with_profile_header(admin_token):
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    test_file = resume_dir / "test-profile-session_test.pdf"
+    test_file.write_text("test resume content")
+
+    async def fake_phases(request, resume_file_path):
+        _spin(0.1)
+
+    try:
+        with patch("app.api.routes.analyze._run_phases", side_effect=fake_phases):
+            response = client.post(
+                "/api/analyze",
+                json={"session_id": "test-profile-session", "company": "amazon", "role_description": "A" * 100},
+                headers={"X-Profile": "true", **ADMIN_HEADERS},
+            )
+        assert response.status_code == 200
+        analysis_id = response.json()["analysis_id"]
+
+        response = client.get(f"/api/admin/profiles/{analysis_id}", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert "tests.test_profiler:_spin" in response.text
+        # Rooted at the analysis, whichever thread the test client runs the app on
+        assert all(
+            line.split(";")[1] == "app.api.routes.analyze:_run_analysis"
+            for line in response.text.splitlines()
+        )
+    finally:
+        test_file.unlink(missing_ok=True)
+        for path in PROFILES_DIR.glob("*.folded"):
+            path.unlink()
+
+
+def test_analyze_profile_header_requires_admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    response = client.post(
+        "/api/analyze",
+        json={"session_id": "any-session", "company": "amazon", "role_description": "A" * 100},
+        headers={"X-Profile": "true"},
+    )
+
+    assert response.status_code == 403
+
+
+def test_analyze_profile_header_rejected_while_profiling(admin_token):
+    with patch("app.api.routes.analyze.profile_running", return_value=True):
+        response = client.post(
+            "/api/analyze",
+            json={"session_id": "any-session", "company": "amazon", "role_description": "A" * 100},
+            headers={"X-Profile": "true", **ADMIN_HEADERS},
+        )
+
+    assert response.status_code == 409
+
+
+def test_analyze_profile_is_capped(admin_token, monkeypatch):
+    monkeypatch.setenv("PROFILE_MAX_SECONDS", "0.05")
+    resume_dir = Path("data/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    test_file = resume_dir / "test-profile-session_test.pdf"
+    test_file.write_text("test resume content")
+
+    async def fake_phases(request, resume_file_path):
+        _spin(0.3)
+
+    try:
+        with patch("app.api.routes.analyze._run_phases", side_effect=fake_phases):
+            response = client.post(
+                "/api/analyze",
+                json={"session_id": "test-profile-session", "company": "amazon", "role_description": "A" * 100},
+                headers={"X-Profile": "true", **ADMIN_HEADERS},
+            )
+        assert response.status_code == 200
+
+        folded = load_profile(response.json()["analysis_id"])
+        samples = sum(int(line.rsplit(" ", 1)[1]) for line in folded.splitlines())
+        # At the default 5 ms interval, 0.3s unbounded would give about 60
+        assert 0 < samples <= 12
+    finally:
+        test_file.unlink(missing_ok=True)
+        for path in PROFILES_DIR.glob("*.folded"):
+            path.unlink()
@@ -0,0 +1,129 @@
+"""
+Tests for token-budgeted prompt assembly.
+"""
+
+from app.prompts.gap_analysis import create_gap_analysis_prompt
+from app.prompts.timeline_generation import create_timeline_prompt
+from app.services.metrics import PROMPT_BUDGET_OVERRUNS, PROMPT_ITEMS_DROPPED, PROMPT_TOKENS, REGISTRY
+from app.services.prompt_budget import PromptBudget, estimate_tokens, get_token_budget
+
+TEMPLATE = "Header\n{items}\nFooter {fixed}"
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hi, there!") == 5
+    # Long words count as several tokens
+    assert estimate_tokens("internationalization") == 5
+    assert estimate_tokens("word " * 100) == 100
+
+
+def test_everything_fits_within_a_large_budget():
+    budget = PromptBudget("test", token_budget=1000)
+    section = budget.section("items", header="Items:")
+    section.add_all(["- one", "- two", "- three"])
+
+    prompt = budget.render(TEMPLATE, fixed="text")
+
+    assert prompt == "Header\nItems:\n- one\n- two\n- three\nFooter text"
+    assert budget.dropped_items == 0
+    assert budget.prompt_tokens == estimate_tokens(prompt)
+
+
+def test_items_are_chosen_by_priority_and_rendered_in_order():
+    budget = PromptBudget("test", token_budget=estimate_tokens(TEMPLATE.format(items="", fixed="x")) + 8)
+    section = budget.section("items")
+    section.add("- low priority", priority=5)
+    section.add("- high", priority=0)
+    section.add("- medium", priority=1)
+
+    prompt = budget.render(TEMPLATE, fixed="x")
+
+    assert prompt == "Header\n- high\n- medium\nFooter x"
+    assert budget.dropped_items == 1
+
+
+def test_prompt_size_is_recorded_as_metrics():
+    REGISTRY.clear()
+    try:
+        budget = PromptBudget("test", token_budget=estimate_tokens(TEMPLATE.format(items="", fixed="x")) + 2)
+        budget.section("items").add_all(["- one", "- two", "- three"])
+        budget.render(TEMPLATE, fixed="x")
+
+        assert PROMPT_TOKENS.count(phase="test") == 1
+        assert PROMPT_TOKENS.sum(phase="test") == budget.prompt_tokens
+        assert PROMPT_ITEMS_DROPPED.value(phase="test") == budget.dropped_items > 0
+        assert PROMPT_BUDGET_OVERRUNS.value(phase="test") == 0
+
+        # Fixed content alone over budget
+        PromptBudget("test", token_budget=1).render(TEMPLATE, items="", fixed="x")
+
+        assert PROMPT_TOKENS.count(phase="test") == 2
+        assert PROMPT_BUDGET_OVERRUNS.value(phase="test") == 1
+    finally:
+        REGISTRY.clear()
+
+
+def test_children_are_dropped_with_their_parent():
+    budget = PromptBudget("test", token_budget=estimate_tokens(TEMPLATE.format(items="", fixed="x")) + 6)
+    section = budget.section("items")
+    parent = section.add("- a rather long parent line that does not fit", priority=1)
+    section.add("  child", priority=0, parent=parent)
+    section.add("- short", priority=2)
+
+    assert budget.render(TEMPLATE, fixed="x") == "Header\n- short\nFooter x"
+
+
+def test_empty_placeholder_and_separator():
+    budget = PromptBudget("test", token_budget=1000)
+    budget.section("items", separator=", ")
+
+    assert budget.render(TEMPLATE, empty="None", fixed="x") == "Header\nNone\nFooter x"
+
+    budget = PromptBudget("test", token_budget=1000)
+    budget.section("items", separator=", ").add_all(["a", "b"])
+    assert budget.render(TEMPLATE, fixed="x") == "Header\na, b\nFooter x"
+
+
+def test_token_budget_from_environment(monkeypatch):
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET_GAP_ANALYSIS", "1234")
+
+    assert get_token_budget("gap_analysis") == 1234
+    assert PromptBudget("gap_analysis").token_budget == 1234
+
+
+def test_gap_prompt_keeps_gaps_before_strengths():
+    match_analysis = {
+        "ats_score": {"keyword_matches": {
+            "matched_keywords": [f"matched{i}" for i in range(200)],
+            "missing_keywords": ["kubernetes"],
+        }},
+        "role_match_score": {"technical_skills_match": {"missing_skills": ["Go", "Rust"]}},
+    }
+    full = create_gap_analysis_prompt(match_analysis, "role", "tenets", token_budget=100000)
+    small_budget = estimate_tokens(full) - 300
+
+    prompt = create_gap_analysis_prompt(match_analysis, "role", "tenets", token_budget=small_budget)
+
+    assert "**Missing Skills:** Go, Rust" in prompt
+    assert "**Missing Keywords:** kubernetes" in prompt
+    assert "matched0" in prompt
+    assert "matched199" not in prompt
+    assert estimate_tokens(prompt) <= small_budget
+
+
+def test_timeline_prompt_keeps_high_priority_gaps():
+    gap_analysis = {
+        "technical_gaps": [
+            {"title": f"Low gap {i}", "description": "x " * 50, "priority": "low"} for i in range(20)
+        ] + [{"title": "Critical gap", "description": "Needed", "priority": "high"}],
+    }
+    full = create_timeline_prompt(gap_analysis, "role", "2026-03-01", "2026-01-01", 8, token_budget=100000)
+
+    prompt = create_timeline_prompt(
+        gap_analysis, "role", "2026-03-01", "2026-01-01", 8, token_budget=estimate_tokens(full) - 500
+    )
+
+    assert "[HIGH] Critical gap" in prompt
+    assert "Low gap 19" not in prompt
+    assert "None identified" in prompt  # Empty categories
@@ -0,0 +1,196 @@
+"""
+Tests for the readiness probes and the /api/ready saturation checks.
+"""
+
+import asyncio
+import shutil
+import threading
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import ANALYSES_IN_PROGRESS, LLM_CALLS_IN_FLIGHT, REGISTRY
+from app.services.llm_service import LLMService
+from app.services.readiness import ReadinessChecker
+from app.services.warmup import Warmup
+
+client = TestClient(app)
+
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free"])
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Start each test with nothing in progress."""
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+@pytest.fixture
+def finished_warmup(monkeypatch):
+    """An app whose warm-up has finished, with no readiness checker yet."""
+    warmup = Warmup(steps=[])
+    asyncio.run(warmup.run())
+    monkeypatch.setattr(app.state, "warmup", warmup, raising=False)
+    monkeypatch.setattr(app.state, "readiness", None, raising=False)
+    return warmup
+
+
+def checker(**limits) -> ReadinessChecker:
+    defaults = {"max_queue_depth": 2, "max_llm_in_flight": 2, "min_free_mb": 1, "pool_timeout_seconds": 5}
+    return ReadinessChecker(**{**defaults, **limits})
+
+
+def probes_by_name(results):
+    return {result.name: result for result in results}
+
+
+@pytest.mark.asyncio
+async def test_all_probes_pass_when_idle():
+    results = probes_by_name(await checker().check())
+
+    assert list(results) == ["queue", "llm", "disk", "caches", "parser_pool"]
+    assert all(result.ok for result in results.values())
+    assert results["caches"].detail["companies"] > 0
+    assert results["caches"].detail["skills"] > 0
+    assert results["disk"].detail["free_mb"] > 0
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_over_limit_is_not_ready():
+    ANALYSES_IN_PROGRESS.inc(2, mode="preview")
+    ANALYSES_IN_PROGRESS.inc(mode="full")
+
+    queue = probes_by_name(await checker().check())["queue"]
+
+    assert not queue.ok
+    assert queue.detail == {"depth": 3, "full": 1, "preview": 2, "limit": 2}
+
+    # A limit of 0 disables the check
+    assert probes_by_name(await checker(max_queue_depth=0).check())["queue"].ok
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_in_flight_over_limit_is_not_ready():
+    with LLM_CALLS_IN_FLIGHT.track(), LLM_CALLS_IN_FLIGHT.track(), LLM_CALLS_IN_FLIGHT.track():
+        llm = probes_by_name(await checker().check())["llm"]
+
+    assert not llm.ok
+    assert llm.detail["in_flight"] == 3
+    assert probes_by_name(await checker().check())["llm"].ok
+
+
+@pytest.mark.asyncio
+async def test_low_disk_headroom_is_not_ready():
+    usage = DiskUsage(total=100 * 2**20, used=99.5 * 2**20, free=0.5 * 2**20)
+    with patch("app.services.readiness.shutil.disk_usage", return_value=usage):
+        disk = probes_by_name(await checker(min_free_mb=1).check())["disk"]
+
+    assert not disk.ok
+    assert disk.detail["free_mb"] == 0.5
+    assert disk.detail["free_percent"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_failing_probe_is_reported_not_raised():
+    with patch("app.services.readiness.get_skill_taxonomy", side_effect=OSError("taxonomy missing")):
+        caches = probes_by_name(await checker().check())["caches"]
+
+    assert not caches.ok
+    assert "taxonomy missing" in caches.error
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_timeout_is_not_ready():
+    async def never_finishes(executor, func, *args):
+        await asyncio.sleep(1)
+
+    with patch("app.services.readiness.run_in_executor", never_finishes):
+        pool = await checker(pool_timeout_seconds=0.01)._probe_parser_pool()
+
+    assert not pool.ok
+    assert pool.error == "parser threads did not respond"
+
+
+def test_ready_when_not_saturated(finished_warmup):
+    response = client.get("/api/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["failing"] == []
+    assert set(data["probes"]) == {"queue", "llm", "disk", "caches", "parser_pool"}
+
+
+def test_not_ready_when_saturated(finished_warmup, monkeypatch):
+    monkeypatch.setattr(app.state, "readiness", checker(max_queue_depth=1), raising=False)
+    ANALYSES_IN_PROGRESS.inc(2, mode="preview")
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["failing"] == ["queue"]
+    assert data["probes"]["queue"]["depth"] == 2
+    # Liveness is unaffected
+    assert client.get("/api/health").status_code == 200
+
+
+def test_not_ready_when_services_failed_to_warm_up(monkeypatch):
+    def broken_factory():
+        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+
+    warmup = Warmup(services_factory=broken_factory, steps=["services", "connections"])
+    asyncio.run(warmup.run())
+    monkeypatch.setattr(app.state, "warmup", warmup, raising=False)
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["failing"] == ["warmup.services"]
+    assert "ANTHROPIC_API_KEY" in data["warmup"]["steps"][0]["detail"]
+
+
+@pytest.mark.asyncio
+async def test_ready_sees_llm_calls_in_flight(finished_warmup, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
+    monkeypatch.setattr(app.state, "readiness", checker(max_llm_in_flight=0), raising=False)
+    llm_service = LLMService()
+    release = threading.Event()
+
+    def slow_create(**kwargs):
+        release.wait(5)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="done")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+    llm_service.client = SimpleNamespace(messages=SimpleNamespace(create=slow_create))
+    call = asyncio.create_task(llm_service.generate_completion("prompt"))
+    try:
+        await asyncio.sleep(0.05)
+        # The app answers on the same event loop while the call is waiting
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            response = await http.get("/api/ready")
+
+        assert response.json()["probes"]["llm"]["in_flight"] == 1
+    finally:
+        release.set()
+        assert await call == "done"
+    assert LLM_CALLS_IN_FLIGHT.total() == 0
+
+
+def test_preview_analysis_counts_while_queued():
+    ANALYSES_IN_PROGRESS.inc(mode="preview")
+    assert ANALYSES_IN_PROGRESS.value(mode="preview") == 1
+    assert "analyses_in_progress" in REGISTRY.render()
@@ -3,11 +3,16 @@ Tests for results API endpoint.
 """
 
 import json
+import os
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.api.routes.results import _accepts_encoding
+from app.services.compression import GzipCodec
+from app.services.serializers import JSONSerializer
+from app.services.session_store import SessionStore
 
 client = TestClient(app)
 
@@ -63,8 +68,8 @@ def test_get_results_success(test_session_dir, monkeypatch):
     """Test successful retrieval of complete results."""
     session_id, session_dir = test_session_dir
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -88,8 +93,8 @@ def test_get_results_partial(test_session_dir, monkeypatch):
     # Remove timeline file to simulate partial results
     (session_dir / "timeline.json").unlink()
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -109,8 +114,8 @@ def test_get_results_partial(test_session_dir, monkeypatch):
 
 def test_get_results_session_not_found(tmp_path, monkeypatch):
     """Test error when session directory doesn't exist."""
-    # Monkeypatch to use tmp_path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: tmp_path / x)
+    # Point the session store at tmp_path
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(tmp_path / "data" / "sessions"))
     
     response = client.get("/api/results/nonexistent-session")
     
@@ -124,8 +129,8 @@ def test_get_results_no_results(tmp_path, monkeypatch):
     session_dir = tmp_path / "data" / "sessions" / session_id
     session_dir.mkdir(parents=True)
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -141,8 +146,8 @@ def test_get_results_invalid_json(test_session_dir, monkeypatch):
     with open(session_dir / "timeline.json", "w") as f:
         f.write("invalid json {")
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -168,8 +173,8 @@ def test_get_results_missing_overall_score(test_session_dir, monkeypatch):
     with open(session_dir / "match_analysis.json", "w") as f:
         json.dump(match_analysis, f)
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -189,8 +194,8 @@ def test_get_results_only_resume_analysis(test_session_dir, monkeypatch):
     (session_dir / "gap_analysis.json").unlink()
     (session_dir / "timeline.json").unlink()
     
-    # Monkeypatch the data directory path
-    monkeypatch.setattr("app.api.routes.results.Path", lambda x: Path(str(session_dir.parent.parent.parent / x)))
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
     
     response = client.get(f"/api/results/{session_id}")
     
@@ -201,3 +206,204 @@ def test_get_results_only_resume_analysis(test_session_dir, monkeypatch):
     assert data["overall_score"] is None
     assert data["resume_analysis"] is not None
     assert data["match_analysis"] is None
+
+
+def test_get_results_with_sections(test_session_dir, monkeypatch):
+    """Test that only requested sections are returned."""
+    session_id, session_dir = test_session_dir
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}?sections=match_analysis,gap_analysis")
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["status"] == "completed"
+    assert data["overall_score"] == 80
+    assert data["match_analysis"] is not None
+    assert data["gap_analysis"] is not None
+    assert data["resume_analysis"] is None
+    assert data["timeline"] is None
+
+
+def test_get_results_unrequested_sections_not_parsed(test_session_dir, monkeypatch):
+    """Test that unrequested sections are only checked for existence."""
+    session_id, session_dir = test_session_dir
+    
+    # A corrupt timeline doesn't affect the status unless it is requested
+    with open(session_dir / "timeline.json", "w") as f:
+        f.write("invalid json {")
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}?sections=resume_analysis")
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+
+
+def test_get_results_invalid_section(test_session_dir, monkeypatch):
+    """Test error when an unknown section is requested."""
+    session_id, session_dir = test_session_dir
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}?sections=timeline,bogus")
+    
+    assert response.status_code == 400
+    assert "bogus" in response.json()["detail"]
+
+
+def test_get_results_status(test_session_dir, monkeypatch):
+    """Test status polling endpoint returns no result sections."""
+    session_id, session_dir = test_session_dir
+    
+    # Remove timeline file to simulate partial results
+    (session_dir / "timeline.json").unlink()
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}/status")
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["status"] == "partial"
+    assert data["overall_score"] == 80
+    assert "timeline" in data["message"]
+    for key in ["resume_analysis", "match_analysis", "gap_analysis", "timeline"]:
+        assert data[key] is None
+
+
+def test_get_result_section(test_session_dir, monkeypatch):
+    """Test fetching a single result section."""
+    session_id, session_dir = test_session_dir
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}/gap_analysis")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["summary"]["total_gaps"] == 5
+
+
+def test_get_result_section_counts_as_access(test_session_dir, monkeypatch):
+    """Reading a section keeps the session from being evicted as idle."""
+    session_id, session_dir = test_session_dir
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    os.utime(session_dir, (0, 0))
+    
+    response = client.get(f"/api/results/{session_id}/gap_analysis")
+    
+    assert response.status_code == 200
+    assert session_dir.stat().st_mtime > 0
+
+
+def test_get_result_section_missing(test_session_dir, monkeypatch):
+    """Test fetching a section that hasn't been generated yet."""
+    session_id, session_dir = test_session_dir
+    (session_dir / "timeline.json").unlink()
+    
+    # Point the session store at the test data directory
+    monkeypatch.setattr("app.api.routes.results.session_store", SessionStore(session_dir.parent))
+    
+    response = client.get(f"/api/results/{session_id}/timeline")
+    assert response.status_code == 404
+    
+    response = client.get(f"/api/results/{session_id}/bogus")
+    assert response.status_code == 404
+
+
+def test_get_result_section_compressed_passthrough(tmp_path, monkeypatch):
+    """Test that gzip-compressed sections are sent with Content-Encoding."""
+    session_id = "compressed-session"
+    store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=GzipCodec())
+    store.save(session_id, "timeline", {"phases": [], "metadata": {"total_weeks": 12}})
+    
+    monkeypatch.setattr("app.api.routes.results.session_store", store)
+    
+    response = client.get(
+        f"/api/results/{session_id}/timeline",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["metadata"]["total_weeks"] == 12
+
+
+def test_get_result_section_compressed_without_accept_encoding(tmp_path, monkeypatch):
+    """Test that compressed sections are decompressed for clients that can't accept them."""
+    session_id = "compressed-session"
+    store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=GzipCodec())
+    store.save(session_id, "timeline", {"phases": [], "metadata": {"total_weeks": 12}})
+    
+    monkeypatch.setattr("app.api.routes.results.session_store", store)
+    
+    response = client.get(
+        f"/api/results/{session_id}/timeline",
+        headers={"Accept-Encoding": "identity"},
+    )
+    
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert json.loads(response.content)["metadata"]["total_weeks"] == 12
+
+
+def test_get_results_preview_while_processing(tmp_path, monkeypatch):
+    """Test that the provisional preview is returned until the full results exist."""
+    store = SessionStore(tmp_path / "sessions")
+    store.save("session-preview", "preview", {
+        "provisional": True,
+        "ats_score": {"score": 64},
+        "full_analysis_status": "processing",
+    })
+    monkeypatch.setattr("app.api.routes.results.session_store", store)
+    
+    response = client.get("/api/results/session-preview")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "processing"
+    assert data["preview"]["ats_score"]["score"] == 64
+    assert data["resume_analysis"] is None
+
+
+def test_get_results_preview_replaced_when_complete(test_session_dir, monkeypatch):
+    """Test that complete results no longer include the preview."""
+    session_id, session_dir = test_session_dir
+    store = SessionStore(session_dir.parent)
+    store.save(session_id, "preview", {"provisional": True, "full_analysis_status": "processing"})
+    monkeypatch.setattr("app.api.routes.results.session_store", store)
+    
+    response = client.get(f"/api/results/{session_id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "completed"
+    assert data["preview"] is None
+
+
+@pytest.mark.parametrize("header, accepted", [
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("gzip, deflate, gzip;q=0", False),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("*, gzip;q=0", False),
+    ("gzip;q=0.8, *;q=0", True),
+    ("br;q=1.0, *", True),
+    ("identity", False),
+    ("gzip;q=abc", False),
+    (None, False),
+])
+def test_accepts_encoding_honours_every_entry(header, accepted):
+    """Test that q-values of all entries are honoured, including q=0 exclusions."""
+    assert _accepts_encoding(header, "gzip") is accepted
@@ -136,7 +136,7 @@ class TestResumeParser:
         assert error != ""
         assert "empty" in error.lower()
     
-    @patch("app.services.resume_parser.Document")
+    @patch("app.services.resume_parser.docx.Document")
     def test_extract_from_docx_success(
         self, mock_document, resume_parser, sample_docx_paragraphs, tmp_path
     ):
@@ -159,7 +159,7 @@ class TestResumeParser:
         assert "Data Scientist" in text
         assert "Python" in text
     
-    @patch("app.services.resume_parser.Document")
+    @patch("app.services.resume_parser.docx.Document")
     def test_extract_from_docx_with_tables(
         self, mock_document, resume_parser, tmp_path
     ):
@@ -188,7 +188,7 @@ class TestResumeParser:
         assert "Skill" in text
         assert "Python" in text
     
-    @patch("app.services.resume_parser.Document")
+    @patch("app.services.resume_parser.docx.Document")
     def test_extract_from_docx_empty(self, mock_document, resume_parser, tmp_path):
         """Test DOCX extraction with empty content."""
         test_file = tmp_path / "empty.docx"
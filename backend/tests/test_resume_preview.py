@@ -0,0 +1,76 @@
+"""
+Tests for the local resume preview service.
+"""
+
+import pytest
+
+from app.services.resume_preview import ResumePreviewService
+from app.services.session_store import SessionStore
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe | github.com/janedoe
+
+EDUCATION
+State University, B.S. Computer Science
+
+Experience
+Software Intern, Acme
+- Cut API latency by 40% with Redis caching
+
+Projects
+Chat app in React and Node.js
+
+Skills: Python, JS, k8s, PostgreSQL
+"""
+
+ROLE_DESCRIPTION = "Software Engineering Intern using Python, React and Kubernetes to build services."
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ResumePreviewService()
+    service.session_store = SessionStore(tmp_path / "sessions")
+    return service
+
+
+def test_split_sections():
+    sections = ResumePreviewService.split_sections(RESUME_TEXT)
+
+    assert list(sections) == ["header", "education", "experience", "projects", "skills"]
+    assert sections["education"] == "State University, B.S. Computer Science"
+    assert sections["skills"] == "Python, JS, k8s, PostgreSQL"
+
+
+def test_extract_contact_info():
+    info = ResumePreviewService.extract_contact_info(RESUME_TEXT)
+
+    assert info == {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "(555) 123-4567",
+        "linkedin": "linkedin.com/in/janedoe",
+        "github": "github.com/janedoe",
+    }
+
+
+def test_build_preview(service):
+    preview = service.build_preview(RESUME_TEXT, ROLE_DESCRIPTION)
+
+    assert preview["provisional"] is True
+    assert preview["skills"]["programming_languages"] == ["Python", "JavaScript"]
+    assert "Kubernetes" in preview["skills"]["tools_technologies"]
+    assert "Python" in preview["ats_score"]["matched_keywords"]
+    assert 0 <= preview["ats_score"]["score"] <= 100
+
+
+@pytest.mark.asyncio
+async def test_get_resume_text_reuses_saved_text(service, tmp_path):
+    service.session_store.save("session-1", "resume_text", {"text": RESUME_TEXT})
+
+    assert await service.get_resume_text("session-1", tmp_path) == RESUME_TEXT
+
+
+@pytest.mark.asyncio
+async def test_get_resume_text_missing_upload(service, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        await service.get_resume_text("missing", tmp_path)
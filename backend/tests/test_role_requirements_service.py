@@ -0,0 +1,130 @@
+"""
+Tests for role requirements service.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.prompts.role_requirements import format_role_requirements
+from app.services.role_requirements_service import (
+    RoleRequirementsService,
+    role_description_hash,
+)
+
+ROLE_DESCRIPTION = """Software Engineering Intern
+
+Requirements: Python, SQL, pursuing a BS in Computer Science.
+Nice to have: React, AWS."""
+
+LLM_RESPONSE = json.dumps({
+    "role_title": "Software Engineering Intern",
+    "seniority": "Intern",
+    "required_skills": ["Python", "SQL"],
+    "preferred_skills": ["React", "AWS"],
+    "responsibilities": [],
+    "qualifications": ["Pursuing BS in Computer Science"],
+    "soft_skills": [],
+    "keywords": ["Python", "SQL"],
+    "logistics": "Not specified",
+})
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Create a RoleRequirementsService with a mocked LLM and temp cache."""
+    with patch("app.services.role_requirements_service.LLMService"):
+        service = RoleRequirementsService(cache_dir=tmp_path / "role-requirements")
+    service.llm_service.generate_completion = AsyncMock(return_value=LLM_RESPONSE)
+    return service
+
+
+def test_hash_ignores_whitespace_and_case():
+    """Test that trivially different pastes share a cache key."""
+    assert role_description_hash("Python  Intern\n") == role_description_hash("python intern")
+    assert role_description_hash("Python Intern") != role_description_hash("Java Intern")
+
+
+@pytest.mark.asyncio
+async def test_get_requirements_extracts_and_caches(service):
+    """Test that requirements are extracted once and then served from cache."""
+    first = await service.get_requirements(ROLE_DESCRIPTION)
+    second = await service.get_requirements(ROLE_DESCRIPTION.upper())
+
+    assert first["required_skills"] == ["Python", "SQL"]
+    assert second == first
+    service.llm_service.generate_completion.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_requirements_disk_cache_shared(service, tmp_path):
+    """Test that a new service instance reads the on-disk cache."""
+    await service.get_requirements(ROLE_DESCRIPTION)
+
+    with patch("app.services.role_requirements_service.LLMService"):
+        other = RoleRequirementsService(cache_dir=tmp_path / "role-requirements")
+    other.llm_service.generate_completion = AsyncMock()
+
+    requirements = await other.get_requirements(ROLE_DESCRIPTION)
+
+    assert requirements["role_title"] == "Software Engineering Intern"
+    other.llm_service.generate_completion.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_extraction(service):
+    """Test that concurrent requests for one posting make a single LLM call."""
+    async def slow_completion(**kwargs):
+        await asyncio.sleep(0.01)
+        return LLM_RESPONSE
+
+    service.llm_service.generate_completion = AsyncMock(side_effect=slow_completion)
+
+    results = await asyncio.gather(*[service.get_requirements(ROLE_DESCRIPTION) for _ in range(5)])
+
+    assert all(result == results[0] for result in results)
+    service.llm_service.generate_completion.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_falls_back_and_is_not_cached(service):
+    """Test that failures return None and are retried on the next request."""
+    service.llm_service.generate_completion = AsyncMock(side_effect=Exception("API down"))
+
+    assert await service.get_requirements(ROLE_DESCRIPTION) is None
+
+    service.llm_service.generate_completion = AsyncMock(return_value=LLM_RESPONSE)
+
+    assert await service.get_requirements(ROLE_DESCRIPTION) is not None
+
+
+@pytest.mark.asyncio
+async def test_empty_extraction_falls_back(service):
+    """Test that an extraction with no requirements is rejected."""
+    service.llm_service.generate_completion = AsyncMock(return_value='```json\n{"role_title": "Intern"}\n```')
+
+    assert await service.get_requirements(ROLE_DESCRIPTION) is None
+
+
+def test_memory_cache_is_bounded(service):
+    """Test that the memory cache evicts the least recently used entry."""
+    service.memory_cache_size = 2
+
+    for key in ["a", "b", "c"]:
+        service._remember(key, {"required_skills": [key]})
+
+    assert list(service._memory_cache) == ["b", "c"]
+
+
+def test_format_role_requirements():
+    """Test compact formatting of requirements."""
+    formatted = format_role_requirements(json.loads(LLM_RESPONSE))
+
+    assert formatted.splitlines() == [
+        "**Role:** Software Engineering Intern (Intern)",
+        "**Required skills:** Python; SQL",
+        "**Preferred skills:** React; AWS",
+        "**Qualifications:** Pursuing BS in Computer Science",
+        "**Keywords:** Python; SQL",
+    ]
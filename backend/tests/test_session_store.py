@@ -0,0 +1,173 @@
+"""
+Tests for SessionStore and session artifact serializers.
+"""
+
+import gzip
+import json
+import pytest
+
+from app.services.compression import GzipCodec, get_codec
+from app.services.serializers import JSONSerializer, get_serializer
+from app.services.session_store import SessionStore
+
+
+@pytest.fixture
+def sample_document():
+    """Sample analysis document."""
+    return {
+        "summary": {"total_gaps": 3, "overall_assessment": "Solid candidate ✓"},
+        "technical_gaps": [{"gap_id": "tech_1", "priority": "high"}],
+    }
+
+
+@pytest.fixture
+def session_store(tmp_path):
+    """Create a SessionStore rooted in a temporary directory."""
+    return SessionStore(tmp_path / "sessions", serializer=JSONSerializer())
+
+
+def test_save_and_load_roundtrip(session_store, sample_document):
+    """Test that saved documents load back unchanged."""
+    output_file = session_store.save("session-1", "gap_analysis", sample_document)
+
+    assert output_file.name == "gap_analysis.json"
+    assert session_store.load("session-1", "gap_analysis") == sample_document
+
+
+def test_save_is_compact(session_store, sample_document):
+    """Test that JSON is written without indentation."""
+    output_file = session_store.save("session-1", "gap_analysis", sample_document)
+
+    content = output_file.read_text(encoding="utf-8")
+    assert content == json.dumps(sample_document, separators=(",", ":"), ensure_ascii=False)
+
+
+def test_load_pretty_printed_file(session_store, sample_document):
+    """Test that files written by older versions are still readable."""
+    session_dir = session_store.session_dir("session-1")
+    session_dir.mkdir(parents=True)
+    (session_dir / "timeline.json").write_text(json.dumps(sample_document, indent=2))
+
+    assert session_store.load("session-1", "timeline") == sample_document
+
+
+def test_load_missing_document(session_store):
+    """Test that missing documents load as None."""
+    assert session_store.load("session-1", "timeline") is None
+    assert session_store.exists("session-1", "timeline") is False
+
+
+def test_load_corrupt_document_raises(session_store):
+    """Test that undecodable documents raise instead of returning None."""
+    session_dir = session_store.session_dir("session-1")
+    session_dir.mkdir(parents=True)
+    (session_dir / "timeline.json").write_text("invalid json {")
+
+    with pytest.raises(Exception):
+        session_store.load("session-1", "timeline")
+
+
+def test_orjson_serializer_roundtrip(tmp_path, sample_document):
+    """Test the orjson serializer reads and writes plain JSON files."""
+    pytest.importorskip("orjson")
+    store = SessionStore(tmp_path / "sessions", serializer=get_serializer("orjson"))
+
+    output_file = store.save("session-1", "match_analysis", sample_document)
+
+    assert output_file.name == "match_analysis.json"
+    assert json.loads(output_file.read_bytes()) == sample_document
+    assert store.load("session-1", "match_analysis") == sample_document
+
+
+def test_msgpack_serializer_reads_existing_json(tmp_path, sample_document):
+    """Test switching formats keeps older files readable and removes stale copies."""
+    pytest.importorskip("msgpack")
+    json_store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer())
+    json_store.save("session-1", "timeline", sample_document)
+
+    msgpack_store = SessionStore(tmp_path / "sessions", serializer=get_serializer("msgpack"))
+    assert msgpack_store.load("session-1", "timeline") == sample_document
+
+    output_file = msgpack_store.save("session-1", "timeline", sample_document)
+
+    assert output_file.name == "timeline.msgpack"
+    assert not (tmp_path / "sessions" / "session-1" / "timeline.json").exists()
+    assert json_store.load("session-1", "timeline") == sample_document
+
+
+def test_get_serializer_from_env(monkeypatch):
+    """Test the serializer is configurable via environment variable."""
+    monkeypatch.setenv("SESSION_SERIALIZER", "json")
+
+    assert get_serializer().name == "json"
+
+
+def test_get_serializer_unknown():
+    """Test that unknown serializers are rejected."""
+    with pytest.raises(ValueError, match="Unknown serializer"):
+        get_serializer("yaml")
+
+
+def test_gzip_compressed_roundtrip(tmp_path, sample_document):
+    """Test that documents are compressed on write and streamed back on read."""
+    store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=GzipCodec())
+
+    output_file = store.save("session-1", "timeline", sample_document)
+
+    assert output_file.name == "timeline.json.gz"
+    assert json.loads(gzip.decompress(output_file.read_bytes())) == sample_document
+    assert store.load("session-1", "timeline") == sample_document
+
+
+def test_compression_switch_keeps_documents_readable(tmp_path, sample_document):
+    """Test that uncompressed and compressed documents are readable either way."""
+    plain_store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=get_codec("none"))
+    gzip_store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=GzipCodec())
+
+    plain_store.save("session-1", "gap_analysis", sample_document)
+    assert gzip_store.load("session-1", "gap_analysis") == sample_document
+
+    gzip_store.save("session-1", "gap_analysis", sample_document)
+    assert not (tmp_path / "sessions" / "session-1" / "gap_analysis.json").exists()
+    assert plain_store.load("session-1", "gap_analysis") == sample_document
+
+
+def test_zstd_compressed_roundtrip(tmp_path, sample_document):
+    """Test the zstd codec when zstandard is installed."""
+    pytest.importorskip("zstandard")
+    store = SessionStore(tmp_path / "sessions", serializer=JSONSerializer(), codec=get_codec("zstd"))
+
+    output_file = store.save("session-1", "timeline", sample_document)
+
+    assert output_file.name == "timeline.json.zst"
+    assert store.load("session-1", "timeline") == sample_document
+
+
+def test_get_codec_from_env(monkeypatch):
+    """Test the codec and level are configurable via environment variables."""
+    monkeypatch.setenv("SESSION_COMPRESSION", "gzip")
+    monkeypatch.setenv("SESSION_COMPRESSION_LEVEL", "9")
+
+    codec = get_codec()
+
+    assert codec.name == "gzip"
+    assert codec.level == 9
+
+
+def test_get_codec_unknown():
+    """Test that unknown codecs are rejected."""
+    with pytest.raises(ValueError, match="Unknown compression codec"):
+        get_codec("lz4")
+
+
+def test_delete_removes_every_format(tmp_path, sample_document):
+    """Test that delete removes the document whatever format it was saved in."""
+    json_store = SessionStore(tmp_path, serializer=JSONSerializer(), codec=get_codec("none"))
+    gzip_store = SessionStore(tmp_path, serializer=JSONSerializer(), codec=GzipCodec())
+    json_store.save("session-1", "timeline", sample_document)
+    (tmp_path / "session-1" / "timeline.json.gz").write_bytes(gzip.compress(b"{}"))
+
+    assert gzip_store.delete("session-1", "timeline") is True
+    assert not json_store.exists("session-1", "timeline")
+    assert gzip_store.delete("session-1", "timeline") is False
+    assert gzip_store.delete("missing-session", "timeline") is False
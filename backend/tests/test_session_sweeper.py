@@ -0,0 +1,150 @@
+"""
+Tests for the session sweeper.
+"""
+
+import os
+import time
+import pytest
+
+from app.services.session_sweeper import SessionSweeper
+
+
+def _create_session(tmp_path, session_id, age_hours, size=100):
+    """Create a session directory and resume file last accessed ``age_hours`` ago."""
+    timestamp = time.time() - age_hours * 3600
+
+    session_dir = tmp_path / "sessions" / session_id
+    session_dir.mkdir(parents=True)
+    for name in ["resume_analysis.json", "timeline.json"]:
+        file_path = session_dir / name
+        file_path.write_bytes(b"x" * size)
+        os.utime(file_path, (timestamp, timestamp))
+    os.utime(session_dir, (timestamp, timestamp))
+
+    resume_dir = tmp_path / "resumes"
+    resume_dir.mkdir(exist_ok=True)
+    resume_file = resume_dir / f"{session_id}_abcd1234.pdf"
+    resume_file.write_bytes(b"x" * size)
+    os.utime(resume_file, (timestamp, timestamp))
+
+    return session_dir, resume_file
+
+
+def _create_sweeper(tmp_path, **kwargs):
+    """Create a sweeper over the temporary data directories."""
+    return SessionSweeper(
+        sessions_dir=tmp_path / "sessions",
+        resumes_dir=tmp_path / "resumes",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep_evicts_expired_sessions(tmp_path):
+    """Test that sessions older than the TTL are deleted with their resumes."""
+    old_dir, old_resume = _create_session(tmp_path, "old-session", age_hours=100)
+    new_dir, new_resume = _create_session(tmp_path, "new-session", age_hours=1)
+
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=72 * 3600, disk_budget_bytes=0)
+    report = await sweeper.sweep()
+
+    assert not old_dir.exists()
+    assert not old_resume.exists()
+    assert new_dir.exists()
+    assert new_resume.exists()
+    assert report.sessions_scanned == 2
+    assert report.sessions_evicted == 1
+    assert report.files_reclaimed == 3
+    assert report.bytes_reclaimed == 300
+    assert sweeper.total_bytes_reclaimed == 300
+
+
+@pytest.mark.asyncio
+async def test_sweep_enforces_disk_budget_lru(tmp_path):
+    """Test that the least recently accessed sessions are evicted first."""
+    oldest_dir, _ = _create_session(tmp_path, "oldest", age_hours=10)
+    middle_dir, _ = _create_session(tmp_path, "middle", age_hours=5)
+    newest_dir, _ = _create_session(tmp_path, "newest", age_hours=2)
+
+    # Each session uses 300 bytes; keep at most two
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=0, disk_budget_bytes=600, batch_size=1)
+    report = await sweeper.sweep()
+
+    assert not oldest_dir.exists()
+    assert middle_dir.exists()
+    assert newest_dir.exists()
+    assert report.sessions_evicted == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_skips_active_sessions(tmp_path):
+    """Test that recently accessed sessions survive even when over budget."""
+    active_dir, _ = _create_session(tmp_path, "active", age_hours=0)
+
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=0, disk_budget_bytes=1)
+    report = await sweeper.sweep()
+
+    assert active_dir.exists()
+    assert report.sessions_evicted == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_evicts_sessions_with_subdirectories(tmp_path):
+    """Test that nested files are counted and removed with their session."""
+    session_dir, resume_file = _create_session(tmp_path, "old-session", age_hours=100)
+    nested = session_dir / "exports" / "old"
+    nested.mkdir(parents=True)
+    (nested / "timeline.pdf").write_bytes(b"x" * 50)
+    old = time.time() - 100 * 3600
+    for path in (nested / "timeline.pdf", session_dir):
+        os.utime(path, (old, old))
+
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=72 * 3600, disk_budget_bytes=0)
+    report = await sweeper.sweep()
+
+    assert not session_dir.exists()
+    assert not resume_file.exists()
+    assert report.files_reclaimed == 4
+    assert report.bytes_reclaimed == 350
+
+
+@pytest.mark.asyncio
+async def test_sweep_missing_directories(tmp_path):
+    """Test sweeping when no data has been written yet."""
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=3600, disk_budget_bytes=0)
+    report = await sweeper.sweep()
+
+    assert report.sessions_scanned == 0
+    assert report.files_reclaimed == 0
+
+
+def test_sweeper_config_from_env(tmp_path, monkeypatch):
+    """Test sweeper configuration via environment variables."""
+    monkeypatch.setenv("SESSION_TTL_HOURS", "24")
+    monkeypatch.setenv("SESSION_DISK_BUDGET_MB", "10")
+    monkeypatch.setenv("SESSION_SWEEP_INTERVAL", "60")
+
+    sweeper = _create_sweeper(tmp_path)
+
+    assert sweeper.ttl_seconds == 24 * 3600
+    assert sweeper.disk_budget_bytes == 10 * 1024 * 1024
+    assert sweeper.interval_seconds == 60
+    assert sweeper.enabled is True
+
+
+def test_sweeper_disabled(tmp_path):
+    """Test that the sweeper is disabled without a TTL or budget."""
+    sweeper = _create_sweeper(tmp_path, ttl_seconds=0, disk_budget_bytes=0)
+
+    assert sweeper.enabled is False
+
+
+def test_sweeper_disabled_by_default(tmp_path, monkeypatch):
+    """Test that nothing is deleted unless a TTL or budget is configured."""
+    monkeypatch.delenv("SESSION_TTL_HOURS", raising=False)
+    monkeypatch.delenv("SESSION_DISK_BUDGET_MB", raising=False)
+
+    sweeper = SessionSweeper(sessions_dir=tmp_path / "sessions", resumes_dir=tmp_path / "resumes")
+
+    assert sweeper.ttl_seconds == 0
+    assert sweeper.enabled is False
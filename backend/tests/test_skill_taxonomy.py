@@ -0,0 +1,90 @@
+"""
+Tests for the skill taxonomy.
+"""
+
+import time
+
+from app.services.skill_taxonomy import (
+    Skill,
+    SkillTaxonomy,
+    get_skill_taxonomy,
+    load_skill_taxonomy,
+)
+
+
+def make_taxonomy():
+    return SkillTaxonomy([
+        Skill("Java", "programming_languages", ["java"]),
+        Skill("JavaScript", "programming_languages", ["javascript", "js"]),
+        Skill("C", "programming_languages", case_sensitive_aliases=["C"]),
+        Skill("C++", "programming_languages", ["c++", "cpp"]),
+        Skill("Go", "programming_languages", ["golang"], ["Go"]),
+        Skill("Spring", "frameworks_libraries", ["spring framework"]),
+        Skill("Spring Boot", "frameworks_libraries", ["spring boot"]),
+        Skill("Node.js", "frameworks_libraries", ["node.js", "nodejs", "node"]),
+        Skill("Kubernetes", "tools_technologies", ["kubernetes", "k8s"]),
+    ])
+
+
+def test_aliases_map_to_canonical_names():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("Built services in JS on K8S") == ["JavaScript", "Kubernetes"]
+
+
+def test_matches_respect_word_boundaries():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("JavaScript and C++") == ["JavaScript", "C++"]
+    assert taxonomy.extract("Java, C and cpp") == ["Java", "C", "C++"]
+
+
+def test_longest_match_wins():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("Spring Boot APIs on Node.js") == ["Spring Boot", "Node.js"]
+
+    matches = taxonomy.find("spring boot")
+    assert [(m.start, m.end) for m in matches] == [(0, 11)]
+
+
+def test_case_sensitive_aliases():
+    taxonomy = make_taxonomy()
+    assert taxonomy.extract("Services written in Go") == ["Go"]
+    assert taxonomy.extract("We go fast") == []
+    assert taxonomy.extract("Go above and beyond. Go further.") == []
+    assert taxonomy.extract("Wrote golang tooling") == ["Go"]
+
+
+def test_canonicalize_list():
+    taxonomy = make_taxonomy()
+    assert taxonomy.canonicalize("k8s") == "Kubernetes"
+    assert taxonomy.canonicalize(" Rust ") == "Rust"
+    assert taxonomy.canonicalize_list(["JS", "JavaScript", "nodejs", "", "Rust"]) == [
+        "JavaScript", "Node.js", "Rust"
+    ]
+
+
+def test_load_missing_file_gives_empty_taxonomy(tmp_path):
+    taxonomy = load_skill_taxonomy(tmp_path / "missing.json")
+    assert taxonomy.skills == {}
+    assert taxonomy.extract("Python and Java") == []
+
+
+def test_shipped_taxonomy():
+    taxonomy = get_skill_taxonomy()
+    assert len(taxonomy.skills) > 100
+    assert taxonomy.extract("JS, React.js, k8s and Postgres") == [
+        "JavaScript", "React", "Kubernetes", "PostgreSQL"
+    ]
+
+
+def test_scales_to_thousands_of_skills():
+    skills = [Skill(f"Skill{i}", "tools_technologies", [f"skill{i}", f"tool {i} suite"]) for i in range(5000)]
+    taxonomy = SkillTaxonomy(skills)
+    text = " ".join(f"worked with skill{i} and tool {i} suite daily" for i in range(0, 5000, 10))
+
+    started = time.perf_counter()
+    found = taxonomy.extract(text)
+    elapsed = time.perf_counter() - started
+
+    assert len(found) == 500
+    assert found[0] == "Skill0"
+    assert elapsed < 1.0
@@ -0,0 +1,102 @@
+"""
+Tests for the timeline task graph.
+"""
+
+import pytest
+
+from app.services.task_graph import (
+    CyclicDependencyError,
+    TaskGraph,
+    assign_task_ids,
+    task_hours,
+)
+
+
+def make_task(task_id, hours, dependencies=None):
+    return {"task_id": task_id, "estimated_hours": hours, "dependencies": dependencies or []}
+
+
+def make_graph():
+    #   a(4) -> b(6) -> d(5)
+    #   a(4) -> c(2) -> d(5)
+    #   e(3)
+    return TaskGraph([
+        make_task("a", 4),
+        make_task("b", 6, ["a"]),
+        make_task("c", 2, ["a"]),
+        make_task("d", 5, ["b", "c"]),
+        make_task("e", 3),
+    ])
+
+
+def test_compute_timings():
+    timings = make_graph().compute_timings()
+
+    assert timings["a"].earliest_start == 0
+    assert timings["b"].earliest_start == 4
+    assert timings["d"].earliest_start == 10
+    assert timings["d"].earliest_finish == 15
+    assert timings["c"].latest_start == 8
+    assert timings["c"].slack == 4
+    assert timings["e"].slack == 12
+    assert [timings[task].slack for task in "abd"] == [0, 0, 0]
+
+
+def test_critical_path():
+    assert make_graph().critical_path() == ["a", "b", "d"]
+
+
+def test_topological_order_uses_key_for_ties():
+    order = make_graph().topological_order(key=lambda task_id: -ord(task_id))
+
+    assert order.index("a") < order.index("b") < order.index("d")
+    assert order[0] == "e"
+
+
+def test_cycle_detection():
+    graph = TaskGraph([make_task("a", 1, ["c"]), make_task("b", 1, ["a"]), make_task("c", 1, ["b"])])
+
+    with pytest.raises(CyclicDependencyError) as exc_info:
+        graph.compute_timings()
+
+    assert sorted(exc_info.value.task_ids) == ["a", "b", "c"]
+
+
+def test_repair_breaks_cycles_and_removes_invalid_dependencies():
+    tasks = [
+        make_task("a", 1, ["c", "a"]),
+        make_task("b", 1, ["a", "missing"]),
+        make_task("c", 1, ["b"]),
+    ]
+    graph = TaskGraph(tasks)
+
+    repairs = graph.repair()
+
+    assert len(repairs) == 3
+    # The dependency closing the cycle back to the first written task goes
+    assert tasks[0]["dependencies"] == ["c"]
+    assert tasks[1]["dependencies"] == []
+    assert graph.topological_order() == ["b", "c", "a"]
+
+
+def test_large_chain_is_linear():
+    tasks = [make_task(f"t{i}", 1, [f"t{i - 1}"] if i else []) for i in range(20000)]
+    graph = TaskGraph(tasks)
+
+    assert graph.find_back_edges() == []
+    assert len(graph.critical_path()) == 20000
+
+
+def test_assign_task_ids():
+    tasks = [{"title": "x"}, {"task_id": "task_1"}, {"task_id": "task_1"}]
+
+    assign_task_ids(tasks)
+
+    assert len({task["task_id"] for task in tasks}) == 3
+
+
+def test_task_hours_handles_invalid_values():
+    assert task_hours({"estimated_hours": "7.6"}) == 8
+    assert task_hours({"estimated_hours": None}) == 0
+    assert task_hours({"estimated_hours": "lots"}) == 0
+    assert task_hours({"estimated_hours": -3}) == 0
@@ -0,0 +1,115 @@
+"""
+Tests for tenet retrieval.
+"""
+
+from pathlib import Path
+
+from app.services.tenet_retrieval import (
+    TenetIndex,
+    collect_text,
+    select_relevant_tenets,
+    split_tenets,
+    tokenize,
+)
+
+TENETS = """Example Principles
+
+Example evaluates interns against these principles.
+
+Core Values:
+
+1. Move Fast
+We ship quickly and iterate.
+
+For interns: Show rapid prototyping and shipped projects.
+
+2. Be Data-Driven
+We decide with metrics and experiments.
+
+For interns: Show analytics and A/B testing.
+
+3. Build Community
+We bring people together.
+
+---
+
+Technical Excellence:
+
+Example also values:
+- Code Quality: Clean, tested code
+- System Design: Scalable distributed systems
+"""
+
+
+def test_tokenize_removes_stopwords_and_stems():
+    """Test tokenization of free text."""
+    assert tokenize("Shipping the Projects with React") == ["shipp", "project", "react"]
+
+
+def test_split_tenets():
+    """Test splitting a tenets file into principles and sections."""
+    document = split_tenets(TENETS)
+
+    assert document.preamble.startswith("Example Principles")
+    assert [p.title for p in document.principles] == [
+        "Move Fast",
+        "Be Data-Driven",
+        "Build Community",
+        "Code Quality",
+        "System Design",
+    ]
+    # "For interns" notes stay with their principle
+    assert "rapid prototyping" in document.principles[0].text
+    assert document.principles[3].heading == "Example also values:"
+
+
+def test_select_ranks_relevant_principles():
+    """Test that the principles matching the query are kept."""
+    selected = TenetIndex(TENETS).select("A/B testing experiments and metrics dashboards", top_k=1)
+
+    assert "2. Be Data-Driven" in selected
+    assert "1. Move Fast" not in selected
+    assert "Core Values:" in selected
+    assert selected.startswith("Example Principles")
+
+
+def test_select_keeps_bullet_heading():
+    """Test that selected bullets keep the line introducing their list."""
+    selected = TenetIndex(TENETS).select("distributed systems design", top_k=1)
+
+    assert "Example also values:\n- System Design" in selected
+    assert "Code Quality" not in selected
+
+
+def test_select_returns_full_text_when_top_k_covers_all():
+    """Test that nothing is dropped when top_k is not smaller than the file."""
+    assert select_relevant_tenets(TENETS, "anything", top_k=5) == TENETS
+    assert select_relevant_tenets(TENETS, "anything", top_k=0) == TENETS
+
+
+def test_top_k_from_env(monkeypatch):
+    """Test configuring top_k via environment variable."""
+    monkeypatch.setenv("TENET_TOP_K", "2")
+
+    selected = select_relevant_tenets(TENETS, "scalable distributed system design clean code")
+
+    assert "System Design" in selected
+    assert "Code Quality" in selected
+    assert "Move Fast" not in selected
+
+
+def test_collect_text():
+    """Test flattening nested analysis data."""
+    data = {"skills": {"languages": ["Python", "Go"]}, "score": 80, "summary": "Backend"}
+
+    assert collect_text(data) == "Python Go Backend"
+
+
+def test_company_tenets_shrink():
+    """Test that the real tenets files are reduced to the selected principles."""
+    for tenets_file in Path("data/company-tenets").glob("*.txt"):
+        tenets = tenets_file.read_text(encoding="utf-8")
+
+        selected = select_relevant_tenets(tenets, "Python backend intern shipping projects", top_k=4)
+
+        assert len(selected) < len(tenets) / 2
@@ -0,0 +1,153 @@
+"""
+Tests for the timeline scheduler.
+"""
+
+from datetime import date
+
+from app.services.timeline_scheduler import TimelineScheduler
+
+
+def make_task(task_id, hours, dependencies=None, priority="medium"):
+    return {
+        "task_id": task_id,
+        "title": f"Task {task_id}",
+        "estimated_hours": hours,
+        "priority": priority,
+        "dependencies": dependencies or [],
+    }
+
+
+def make_timeline():
+    return {
+        "metadata": {"intensity_level": "moderate", "feasibility_assessment": "Realistic"},
+        "phases": [
+            {
+                "phase_id": "phase_1",
+                "phase_number": 1,
+                "title": "Foundation",
+                "tasks": [
+                    make_task("t1", 10, priority="low"),
+                    make_task("t2", 5, ["t3"], priority="high"),
+                    make_task("t3", 8),
+                ],
+                "milestones": [{"milestone_id": "m1", "title": "Foundation done"}],
+            },
+            {
+                "phase_id": "phase_2",
+                "phase_number": 2,
+                "title": "Projects",
+                "tasks": [make_task("t4", 20, ["t2"], priority="high")],
+            },
+        ],
+    }
+
+
+def test_order_tasks_respects_dependencies_then_priority():
+    scheduler = TimelineScheduler(12)
+    tasks = make_timeline()["phases"][0]["tasks"]
+
+    ordered = [task["task_id"] for task in scheduler.order_tasks(tasks)]
+
+    # t2 is high priority but waits for t3
+    assert ordered == ["t3", "t2", "t1"]
+
+
+def test_order_tasks_keeps_phase_order():
+    scheduler = TimelineScheduler(12)
+    tasks = [make_task("a", 5, priority="low"), make_task("b", 5, priority="high")]
+
+    ordered = scheduler.order_tasks(tasks, {"a": 0, "b": 1})
+
+    assert [task["task_id"] for task in ordered] == ["a", "b"]
+
+
+def test_order_tasks_with_cycle_schedules_everything():
+    scheduler = TimelineScheduler(12)
+    tasks = [make_task("a", 5, ["b"]), make_task("b", 5, ["a"]), make_task("c", 5, ["missing"])]
+
+    ordered = scheduler.order_tasks(tasks)
+
+    assert sorted(task["task_id"] for task in ordered) == ["a", "b", "c"]
+
+
+def test_schedule_packs_weeks_under_budget():
+    timeline = TimelineScheduler(12).schedule(make_timeline(), date(2026, 1, 5), 5)
+
+    weeks = timeline["weekly_breakdown"]
+    assert len(weeks) == 5
+    assert [week["estimated_hours"] for week in weeks] == [12, 12, 12, 7, 0]
+    assert weeks[0]["tasks"] == ["Task t3", "Task t2"]
+    assert weeks[0]["start_date"] == "2026-01-05"
+    assert weeks[0]["end_date"] == "2026-01-11"
+    assert weeks[0]["key_deliverable"] == "Complete: Task t3"
+    assert weeks[4]["tasks"] == []
+    assert timeline["metadata"]["scheduled_weeks"] == 4
+    assert timeline["metadata"]["hours_per_week"] == 12
+
+
+def test_schedule_sets_task_phase_and_milestone_weeks():
+    timeline = TimelineScheduler(12).schedule(make_timeline(), date(2026, 1, 5), 5)
+
+    phase_1, phase_2 = timeline["phases"]
+    t4 = phase_2["tasks"][0]
+    assert (t4["start_week"], t4["end_week"]) == (2, 4)
+    assert (phase_1["start_week"], phase_1["end_week"]) == (1, 2)
+    assert (phase_2["start_week"], phase_2["end_week"]) == (2, 4)
+    assert phase_1["milestones"][0]["target_date"] == "2026-01-18"
+
+
+def test_schedule_extends_past_deadline_when_over_budget():
+    timeline = TimelineScheduler(10).schedule(make_timeline(), date(2026, 1, 5), 2)
+
+    assert timeline["metadata"]["scheduled_weeks"] == 5
+    assert len(timeline["weekly_breakdown"]) == 5
+
+
+def test_critical_path_is_longest_dependency_chain():
+    timeline = TimelineScheduler(12).schedule(make_timeline(), date(2026, 1, 5), 5)
+
+    assert timeline["critical_path"] == ["t3", "t2", "t4"]
+
+
+def test_slack_comes_from_the_dependency_chains():
+    timeline = TimelineScheduler(12).schedule(make_timeline(), date(2026, 1, 5), 5)
+
+    tasks = {task["task_id"]: task for phase in timeline["phases"] for task in phase["tasks"]}
+    # t3 -> t2 -> t4 takes 33 hours; t1 depends on nothing and nothing on it
+    assert {task_id: task["earliest_start"] for task_id, task in tasks.items()} == {
+        "t3": 0, "t2": 8, "t1": 0, "t4": 13,
+    }
+    assert {task_id: task["slack"] for task_id, task in tasks.items()} == {
+        "t3": 0, "t2": 0, "t1": 23, "t4": 0,
+    }
+    assert tasks["t1"]["latest_start"] == 23
+
+
+def test_critical_path_tasks_have_no_slack():
+    for hours_per_week, weeks in [(12, 5), (10, 2)]:
+        timeline = TimelineScheduler(hours_per_week).schedule(make_timeline(), date(2026, 1, 5), weeks)
+
+        tasks = {task["task_id"]: task for phase in timeline["phases"] for task in phase["tasks"]}
+        assert timeline["critical_path"]
+        assert all(tasks[task_id]["slack"] == 0 for task_id in timeline["critical_path"])
+        assert all(task["slack"] > 0 for task_id, task in tasks.items() if task_id not in timeline["critical_path"])
+
+
+def test_given_critical_path_is_used():
+    timeline = TimelineScheduler(12).schedule(make_timeline(), date(2026, 1, 5), 5, critical_path=["t3"])
+
+    assert timeline["critical_path"] == ["t3"]
+
+
+def test_missing_and_duplicate_task_ids_are_assigned():
+    timeline = {"phases": [{"phase_number": 1, "title": "P", "tasks": [
+        {"title": "No ID", "estimated_hours": 2},
+        make_task("x", 3),
+        make_task("x", 4),
+    ]}]}
+
+    TimelineScheduler(12).schedule(timeline, date(2026, 1, 5), 1)
+
+    task_ids = [task["task_id"] for task in timeline["phases"][0]["tasks"]]
+    assert len(set(task_ids)) == 3
+
@@ -4,10 +4,10 @@ Tests for timeline service.
 
 import json
 import pytest
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 
+from app.services.session_store import SessionStore
 from app.services.timeline_service import TimelineService
 
 
@@ -136,7 +136,8 @@ async def test_generate_timeline_success(timeline_service, sample_gap_analysis,
     """Test successful timeline generation."""
     session_id = "test-session-123"
     role_description = "Software Engineer Intern"
-    target_deadline = "2026-03-12"
+    # Eight weeks from today, whenever the test runs
+    target_deadline = (datetime.now() + timedelta(weeks=8)).date().isoformat()
     
     # Mock _load_gap_analysis to return sample data
     timeline_service._load_gap_analysis = MagicMock(return_value=sample_gap_analysis)
@@ -161,7 +162,16 @@ async def test_generate_timeline_success(timeline_service, sample_gap_analysis,
     assert "weekly_breakdown" in result
     assert result["metadata"]["total_weeks"] == 8
     assert len(result["phases"]) == 1
-    assert len(result["weekly_breakdown"]) == 1
+    # The scheduler plans every available week: the 4-hour task fits in the
+    # first, and the rest are buffer weeks
+    weeks = result["weekly_breakdown"]
+    assert len(weeks) == 8
+    assert weeks[0]["tasks"] == ["Update resume with keywords"]
+    assert weeks[0]["estimated_hours"] == 4
+    assert all(week["tasks"] == [] for week in weeks[1:])
+    tasks = {task["task_id"]: task for phase in result["phases"] for task in phase["tasks"]}
+    assert result["critical_path"] == ["task_1"]
+    assert tasks["task_1"]["slack"] == 0
 
 
 @pytest.mark.asyncio
@@ -227,50 +237,44 @@ async def test_generate_timeline_short_deadline(timeline_service, sample_gap_ana
 
 
 @pytest.mark.asyncio
-async def test_generate_timeline_gap_analysis_not_found(timeline_service):
+async def test_generate_timeline_gap_analysis_not_found(timeline_service, tmp_path):
     """Test timeline generation when gap analysis is missing."""
     session_id = "test-session-123"
     role_description = "Software Engineer Intern"
     
-    # Mock gap analysis file does not exist
-    with patch("app.services.timeline_service.Path") as mock_path:
-        mock_gap_file = MagicMock()
-        mock_gap_file.exists.return_value = False
-        mock_path.return_value = mock_gap_file
-        
-        with pytest.raises(Exception) as exc_info:
-            await timeline_service.generate_timeline(
-                session_id=session_id,
-                role_description=role_description,
-            )
-        
-        assert "Gap analysis not found" in str(exc_info.value)
+    # Gap analysis file does not exist
+    timeline_service.session_store = SessionStore(tmp_path / "sessions")
+    
+    with pytest.raises(Exception) as exc_info:
+        await timeline_service.generate_timeline(
+            session_id=session_id,
+            role_description=role_description,
+        )
+    
+    assert "Gap analysis not found" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
-async def test_generate_timeline_llm_failure(timeline_service, sample_gap_analysis):
+async def test_generate_timeline_llm_failure(timeline_service, sample_gap_analysis, tmp_path):
     """Test timeline generation when LLM call fails."""
     session_id = "test-session-123"
     role_description = "Software Engineer Intern"
     
-    with patch("app.services.timeline_service.Path") as mock_path:
-        mock_gap_file = MagicMock()
-        mock_gap_file.exists.return_value = True
-        mock_path.return_value = mock_gap_file
-        
-        with patch("builtins.open", mock_open(read_data=json.dumps(sample_gap_analysis))):
-            # Mock LLM failure
-            timeline_service.llm_service.generate_completion = AsyncMock(
-                side_effect=Exception("LLM API error")
-            )
-            
-            with pytest.raises(Exception) as exc_info:
-                await timeline_service.generate_timeline(
-                    session_id=session_id,
-                    role_description=role_description,
-                )
-            
-            assert "Failed to generate timeline" in str(exc_info.value)
+    timeline_service.session_store = SessionStore(tmp_path / "sessions")
+    timeline_service.session_store.save(session_id, "gap_analysis", sample_gap_analysis)
+    
+    # Mock LLM failure
+    timeline_service.llm_service.generate_completion = AsyncMock(
+        side_effect=Exception("LLM API error")
+    )
+    
+    with pytest.raises(Exception) as exc_info:
+        await timeline_service.generate_timeline(
+            session_id=session_id,
+            role_description=role_description,
+        )
+    
+    assert "Failed to generate timeline" in str(exc_info.value)
 
 
 def test_parse_llm_response_valid_json(timeline_service, sample_timeline):
@@ -361,48 +365,135 @@ def test_validate_timeline_data_missing_metadata(timeline_service):
     assert result["metadata"]["total_weeks"] == 8
 
 
-def test_load_timeline_results_success(timeline_service, sample_timeline):
+def test_load_timeline_results_success(timeline_service, sample_timeline, tmp_path):
     """Test loading saved timeline results."""
     session_id = "test-session-123"
     
-    with patch("app.services.timeline_service.Path") as mock_path:
-        mock_file = MagicMock()
-        mock_file.exists.return_value = True
-        mock_path.return_value = mock_file
-        
-        with patch("builtins.open", mock_open(read_data=json.dumps(sample_timeline))):
-            result = timeline_service.load_timeline_results(session_id)
+    # Timelines written by older versions are pretty-printed
+    session_dir = tmp_path / "sessions" / session_id
+    session_dir.mkdir(parents=True)
+    (session_dir / "timeline.json").write_text(json.dumps(sample_timeline, indent=2))
+    
+    timeline_service.session_store = SessionStore(tmp_path / "sessions")
+    result = timeline_service.load_timeline_results(session_id)
     
     assert result == sample_timeline
 
 
-def test_load_timeline_results_not_found(timeline_service):
+def test_load_timeline_results_not_found(timeline_service, tmp_path):
     """Test loading timeline when file doesn't exist."""
     session_id = "test-session-123"
     
-    with patch("app.services.timeline_service.Path") as mock_path:
-        mock_file = MagicMock()
-        mock_file.exists.return_value = False
-        mock_path.return_value = mock_file
-        
-        result = timeline_service.load_timeline_results(session_id)
+    timeline_service.session_store = SessionStore(tmp_path / "sessions")
+    result = timeline_service.load_timeline_results(session_id)
     
     assert result is None
 
 
-def test_save_timeline_results(timeline_service, sample_timeline):
+def test_save_timeline_results(timeline_service, sample_timeline, tmp_path):
     """Test saving timeline results."""
     session_id = "test-session-123"
     
-    with patch("app.services.timeline_service.Path") as mock_path:
-        mock_dir = MagicMock()
-        mock_path.return_value = mock_dir
-        
-        with patch("builtins.open", mock_open()) as mock_file:
-            timeline_service._save_timeline_results(session_id, sample_timeline)
-            
-            # Verify directory creation
-            mock_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
-            
-            # Verify file write
-            mock_file.assert_called_once()
+    timeline_service.session_store = SessionStore(tmp_path / "sessions")
+    timeline_service._save_timeline_results(session_id, sample_timeline)
+    
+    # Verify compact file write
+    output_file = tmp_path / "sessions" / session_id / "timeline.json"
+    assert output_file.exists()
+    assert "\n" not in output_file.read_text()
+    assert json.loads(output_file.read_text()) == sample_timeline
+
+
+@pytest.mark.asyncio
+async def test_generate_timeline_schedules_weeks_locally(timeline_service, sample_gap_analysis, sample_timeline):
+    """Test that the weekly breakdown is built locally rather than by the LLM."""
+    timeline_service._load_gap_analysis = MagicMock(return_value=sample_gap_analysis)
+    llm_timeline = {key: sample_timeline[key] for key in ["metadata", "phases", "flexibility_notes", "motivation_tips"]}
+    timeline_service.llm_service.generate_completion = AsyncMock(return_value=json.dumps(llm_timeline))
+    timeline_service._save_timeline_results = MagicMock()
+    
+    result = await timeline_service.generate_timeline(
+        session_id="test-session-123",
+        role_description="Software Engineer Intern",
+        target_deadline=None,  # 12 weeks at 12 hours/week
+    )
+    
+    prompt = timeline_service.llm_service.generate_completion.call_args.kwargs["prompt"]
+    assert '"weekly_breakdown"' not in prompt
+    assert len(result["weekly_breakdown"]) == 12
+    assert result["weekly_breakdown"][0]["tasks"] == ["Update resume with keywords"]
+    assert result["weekly_breakdown"][0]["start_date"] == result["metadata"]["start_date"]
+    assert result["critical_path"] == ["task_1"]
+    assert result["metadata"]["total_hours"] == 4
+
+
+def _timeline_with_tasks(tasks):
+    return {"metadata": {"hours_per_week": 10}, "phases": [{"phase_id": "phase_1", "tasks": tasks}]}
+
+
+def test_validate_timeline_data_computes_critical_path(timeline_service):
+    """Test that the critical path is computed, leaving slack to the scheduler."""
+    timeline_data = _timeline_with_tasks([
+        {"task_id": "a", "estimated_hours": 4, "priority": "high", "dependencies": []},
+        {"task_id": "b", "estimated_hours": 6, "priority": "high", "dependencies": ["a"]},
+        {"task_id": "c", "estimated_hours": 2, "priority": "low", "dependencies": ["a"]},
+    ])
+    
+    result = timeline_service._validate_timeline_data(timeline_data, "2026-01-15", "2026-03-12", 8)
+    
+    assert result["critical_path"] == ["a", "b"]
+    assert all("slack" not in task for task in result["phases"][0]["tasks"])
+    assert result["metadata"]["feasible"] is True
+    assert result["metadata"]["plan_adjustments"] == []
+
+
+def test_validate_timeline_data_repairs_cycles(timeline_service):
+    """Test that cyclic and unknown dependencies are repaired locally."""
+    timeline_data = _timeline_with_tasks([
+        {"task_id": "a", "estimated_hours": 4, "dependencies": ["b"]},
+        {"task_id": "b", "estimated_hours": 6, "dependencies": ["a", "ghost"]},
+    ])
+    
+    result = timeline_service._validate_timeline_data(timeline_data, "2026-01-15", "2026-03-12", 8)
+    
+    assert len(result["metadata"]["plan_adjustments"]) == 2
+    a, b = result["phases"][0]["tasks"]
+    assert a["dependencies"] == [] or b["dependencies"] == []
+    assert result["critical_path"] in (["a", "b"], ["b", "a"])
+
+
+def test_validate_timeline_data_defers_tasks_over_budget(timeline_service):
+    """Test that low-priority tasks are deferred when the plan exceeds the budget."""
+    timeline_data = _timeline_with_tasks([
+        {"task_id": "core", "title": "Core skill", "estimated_hours": 15, "priority": "high", "dependencies": []},
+        {"task_id": "nice", "title": "Nice to have", "estimated_hours": 8, "priority": "low", "dependencies": []},
+        {"task_id": "base", "title": "Prerequisite", "estimated_hours": 3, "priority": "medium", "dependencies": []},
+        {"task_id": "polish", "title": "Polish", "estimated_hours": 4, "priority": "medium", "dependencies": ["base"]},
+    ])
+    
+    # Two weeks at 10 hours/week = 20 hours for 30 hours of tasks
+    result = timeline_service._validate_timeline_data(timeline_data, "2026-01-15", "2026-01-29", 2)
+    
+    remaining = [task["task_id"] for task in result["phases"][0]["tasks"]]
+    assert "core" in remaining
+    assert [task["task_id"] for task in result["deferred_tasks"]] == ["nice", "polish"]
+    assert result["metadata"]["total_hours"] == 18
+    assert result["metadata"]["feasible"] is True
+    assert any("Nice to have" in note for note in result["metadata"]["plan_adjustments"])
+
+
+def test_validate_timeline_data_keeps_tasks_when_deferring_cannot_fit(timeline_service):
+    """Test that nothing is deferred when the essential tasks alone exceed the budget."""
+    timeline_data = _timeline_with_tasks([
+        {"task_id": "core", "title": "Core skill", "estimated_hours": 25, "priority": "high", "dependencies": []},
+        {"task_id": "nice", "title": "Nice to have", "estimated_hours": 8, "priority": "low", "dependencies": []},
+    ])
+    
+    # Two weeks at 10 hours/week = 20 hours, less than the 25-hour core task
+    result = timeline_service._validate_timeline_data(timeline_data, "2026-01-15", "2026-01-29", 2)
+    
+    assert [task["task_id"] for task in result["phases"][0]["tasks"]] == ["core", "nice"]
+    assert "deferred_tasks" not in result
+    assert result["metadata"]["feasible"] is False
+    assert len(result["metadata"]["plan_adjustments"]) == 1
+    assert "none were deferred" in result["metadata"]["plan_adjustments"][0]
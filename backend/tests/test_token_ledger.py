@@ -0,0 +1,181 @@
+"""
+Tests for the token usage ledger and the /api/usage endpoint.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.llm_service import LLMService
+from app.services.metrics import metric_context
+from app.services.token_ledger import TokenLedger, UsageEntry, price_for
+
+client = TestClient(app)
+
+SONNET = "claude-3-5-sonnet-20241022"
+
+
+def _usage(input_tokens=0, output_tokens=0, cache_read=None, cache_creation=None):
+    """Build a usage block like the API's."""
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=cache_creation,
+    )
+
+
+def _at(day: str) -> datetime:
+    return datetime.fromisoformat(f"{day}T12:00:00").replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return TokenLedger(tmp_path / "usage" / "ledger.jsonl")
+
+
+def test_record_attributes_usage_from_context(ledger):
+    with metric_context(analysis_id="a1", session_id="s1", company="amazon"):
+        with metric_context(phase="gap_analysis"):
+            entry = ledger.record(SONNET, _usage(1000, 200, cache_read=500))
+
+    assert entry.analysis_id == "a1"
+    assert entry.session_id == "s1"
+    assert entry.phase == "gap_analysis"
+    assert entry.company == "amazon"
+    assert entry.cache_read_tokens == 500
+    assert entry.cache_creation_tokens == 0
+    line = json.loads(ledger.path.read_text().splitlines()[0])
+    assert line["input_tokens"] == 1000
+    assert line["model"] == SONNET
+
+
+def test_record_outside_analysis_is_unknown(ledger):
+    entry = ledger.record(SONNET, _usage(10, 5))
+
+    assert entry.analysis_id == "unknown"
+    assert entry.phase == "unknown"
+
+
+def test_disabled_ledger_records_nothing(monkeypatch):
+    monkeypatch.setenv("TOKEN_LEDGER_FILE", "")
+    ledger = TokenLedger()
+
+    assert not ledger.enabled
+    assert ledger.record(SONNET, _usage(10, 5)) is None
+    assert ledger.entries() == []
+
+
+def test_cost_and_cache_savings():
+    prices = {"claude-3-5-sonnet": {"input": 3.0, "output": 15.0, "cache_read": 0.3, "cache_creation": 3.75}}
+    entry = UsageEntry(
+        timestamp="2026-10-01T00:00:00+00:00",
+        model=SONNET,
+        input_tokens=1_000_000,
+        output_tokens=100_000,
+        cache_read_tokens=1_000_000,
+        cache_creation_tokens=100_000,
+    )
+
+    assert entry.cost_usd(prices) == pytest.approx(3.0 + 1.5 + 0.3 + 0.375)
+    assert entry.cache_savings_usd(prices) == pytest.approx(2.7 - 0.075)
+
+
+def test_price_lookup_by_prefix(monkeypatch):
+    monkeypatch.setenv("LLM_PRICES", '{"claude-3-5-sonnet": {"input": 1, "output": 2}}')
+
+    assert price_for(SONNET)["input"] == 1
+    assert price_for("anthropic.claude-3-5-haiku-20241022-v1:0")["output"] == 4.0
+    assert price_for("my-local-model") is None
+
+
+def test_aggregate_per_day_and_analysis(ledger):
+    for day, analysis_id, phase, tokens in [
+        ("2026-10-01", "a1", "resume_analysis", 1000),
+        ("2026-10-01", "a1", "gap_analysis", 3000),
+        ("2026-10-02", "a2", "gap_analysis", 2000),
+        ("2026-10-03", "a3", "timeline", 500),
+    ]:
+        with metric_context(analysis_id=analysis_id, phase=phase, company="amazon"):
+            ledger.record(SONNET, _usage(tokens, tokens // 10), timestamp=_at(day))
+    ledger.record("my-local-model", _usage(100, 10), timestamp=_at("2026-10-02"))
+
+    by_day = ledger.aggregate("day", since=date(2026, 10, 1), until=date(2026, 10, 2))
+    assert [group["day"] for group in by_day["groups"]] == ["2026-10-01", "2026-10-02"]
+    assert by_day["total"]["calls"] == 4
+    assert by_day["groups"][0]["input_tokens"] == 4000
+    assert by_day["unpriced_models"] == ["my-local-model"]
+
+    by_analysis = ledger.aggregate("analysis_id", phase="gap_analysis")
+    assert [group["analysis_id"] for group in by_analysis["groups"]] == ["a1", "a2"]
+    assert list(by_analysis["groups"][0]["by_phase_usd"]) == ["gap_analysis"]
+    # 3000 input and 300 output tokens at $3 and $15 per million
+    assert by_analysis["groups"][0]["cost_usd"] == pytest.approx(0.0135)
+
+    with pytest.raises(ValueError):
+        ledger.aggregate("user")
+
+
+def test_aggregate_reports_fake_backend_calls_apart(ledger):
+    ledger.record(SONNET, _usage(1000, 100))
+    ledger.record(SONNET, _usage(2000, 200), backend="fake")
+
+    usage = ledger.aggregate("model")
+
+    assert usage["total"]["calls"] == 1
+    assert usage["total"]["input_tokens"] == 1000
+    assert usage["groups"][0]["calls"] == 1
+    assert usage["simulated"]["calls"] == 1
+    assert usage["simulated"]["input_tokens"] == 2000
+    assert usage["simulated"]["cost_usd"] > 0
+
+
+def test_aggregate_skips_malformed_lines(ledger):
+    ledger.record(SONNET, _usage(10, 5))
+    with open(ledger.path, "a") as f:
+        f.write("not json\n")
+
+    assert ledger.aggregate("model")["total"]["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_service_records_usage(monkeypatch, ledger):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key-12345")
+    monkeypatch.delenv("ANTHROPIC_MODEL", raising=False)
+    service = LLMService()
+    response = Mock()
+    response.content = [Mock(text="ok")]
+    response.usage = _usage(120, 30, cache_creation=40)
+
+    with patch.object(service.client.messages, "create", return_value=response), \
+            patch("app.services.llm_service.get_token_ledger", return_value=ledger), \
+            metric_context(analysis_id="a1", phase="timeline", company="google"):
+        await service.generate_completion("prompt")
+
+    [entry] = ledger.entries()
+    # Written on a worker thread, still attributed from the caller's context
+    assert (entry.analysis_id, entry.phase, entry.company, entry.model) == ("a1", "timeline", "google", SONNET)
+    assert (entry.input_tokens, entry.output_tokens, entry.cache_creation_tokens) == (120, 30, 40)
+
+
+def test_usage_endpoint(monkeypatch, ledger):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    with metric_context(analysis_id="a1", phase="gap_analysis"):
+        ledger.record(SONNET, _usage(1000, 100), timestamp=_at("2026-10-01"))
+
+    with patch("app.api.routes.usage.get_token_ledger", return_value=ledger):
+        response = client.get("/api/usage?group_by=analysis_id", headers={"X-Admin-Token": "secret"})
+        invalid = client.get("/api/usage?group_by=user", headers={"X-Admin-Token": "secret"})
+        unauthorized = client.get("/api/usage")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["groups"][0]["analysis_id"] == "a1"
+    assert data["total"]["cost_usd"] == pytest.approx(0.0045)
+    assert invalid.status_code == 400
+    assert unauthorized.status_code == 403
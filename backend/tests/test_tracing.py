@@ -0,0 +1,145 @@
+"""
+Tests for pipeline tracing.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from app.services.llm_service import LLMService
+from app.services.tracing import (
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    SpanExporter,
+    create_exporter,
+    format_trace,
+    load_trace,
+    set_exporter,
+    span,
+    traced,
+)
+
+
+class CollectingExporter(SpanExporter):
+    """Keeps finished spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter():
+    collecting = CollectingExporter()
+    set_exporter(collecting)
+    yield collecting
+    set_exporter(None)
+
+
+def test_spans_nest_under_the_trace(exporter):
+    with span("analysis", trace_id="analysis-1") as root:
+        with span("phase.gap_analysis") as phase:
+            with span("gap_analysis.parse_response"):
+                pass
+
+    names = [s.name for s in exporter.spans]
+    assert names == ["gap_analysis.parse_response", "phase.gap_analysis", "analysis"]
+    assert {s.trace_id for s in exporter.spans} == {"analysis-1"}
+    assert exporter.spans[0].parent_id == phase.span_id
+    assert phase.parent_id == root.span_id
+    assert root.parent_id is None
+
+
+def test_errors_mark_the_span(exporter):
+    with pytest.raises(ValueError):
+        with span("timeline.validate"):
+            raise ValueError("bad data")
+
+    assert exporter.spans[0].status == "error"
+    assert exporter.spans[0].error == "ValueError: bad data"
+    assert exporter.spans[0].duration_ms >= 0
+
+
+@pytest.mark.asyncio
+async def test_traced_decorator(exporter):
+    @traced("work.sync")
+    def sync_work():
+        return 1
+
+    @traced("work.async")
+    async def async_work():
+        return sync_work() + 1
+
+    with span("analysis", trace_id="analysis-2"):
+        assert await async_work() == 2
+
+    sync_span, async_span, root = exporter.spans
+    assert (sync_span.name, async_span.name) == ("work.sync", "work.async")
+    assert sync_span.parent_id == async_span.span_id
+    assert async_span.parent_id == root.span_id
+
+
+@pytest.mark.asyncio
+async def test_llm_attempts_are_traced(exporter, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
+    service = LLMService()
+    response = Mock()
+    response.content = [Mock(text="ok")]
+    response.usage = Mock(input_tokens=10, output_tokens=5)
+    service.client = Mock()
+    service.client.messages.create.return_value = response
+
+    with span("analysis", trace_id="analysis-3"):
+        await service.generate_completion(prompt="Test")
+
+    attempt = exporter.spans[0]
+    assert attempt.name == "llm.attempt"
+    assert attempt.trace_id == "analysis-3"
+    assert attempt.attributes["attempt"] == 1
+    assert attempt.attributes["input_tokens"] == 10
+
+
+def test_file_exporter_and_trace_report(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    set_exporter(FileSpanExporter(path))
+    try:
+        with span("analysis", trace_id="analysis-4"):
+            with span("resume_parser.extract_text"):
+                pass
+            with span("phase.timeline"):
+                with span("timeline.save"):
+                    pass
+        with span("analysis", trace_id="other"):
+            pass
+    finally:
+        set_exporter(None)
+
+    spans = load_trace(path, "analysis-4")
+    assert [record["name"] for record in spans] == [
+        "analysis", "resume_parser.extract_text", "phase.timeline", "timeline.save"
+    ]
+
+    lines = format_trace(spans).splitlines()
+    assert lines[0].startswith("analysis  ")
+    assert lines[1].startswith("  resume_parser.extract_text  ")
+    assert lines[3].startswith("    timeline.save  ")
+    assert lines[3].endswith("ms")
+
+
+def test_create_exporter_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("TRACE_EXPORTER", raising=False)
+    assert create_exporter() is None
+
+    monkeypatch.setenv("TRACE_EXPORTER", "console")
+    assert isinstance(create_exporter(), ConsoleSpanExporter)
+
+    monkeypatch.setenv("TRACE_EXPORTER", "file")
+    monkeypatch.setenv("TRACE_FILE", str(tmp_path / "spans.jsonl"))
+    exporter = create_exporter()
+    assert isinstance(exporter, FileSpanExporter)
+    assert exporter.path == tmp_path / "spans.jsonl"
+
+    monkeypatch.setenv("TRACE_EXPORTER", "zipkin")
+    with pytest.raises(ValueError, match="Unknown TRACE_EXPORTER"):
+        create_exporter()
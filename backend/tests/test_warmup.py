@@ -0,0 +1,175 @@
+"""
+Tests for the startup warm-up and the /api/ready endpoint.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import warmup as warmup_module
+from app.services.warmup import WARMUP_STEPS, Warmup, get_warmup_steps
+
+client = TestClient(app)
+
+
+def test_warmup_steps_from_environment(monkeypatch):
+    monkeypatch.delenv("WARMUP_STEPS", raising=False)
+    assert get_warmup_steps() == list(WARMUP_STEPS)
+
+    monkeypatch.setenv("WARMUP_STEPS", "none")
+    assert get_warmup_steps() == []
+
+    # Run order is fixed, whatever order they are listed in
+    monkeypatch.setenv("WARMUP_STEPS", "parser_pool, skills")
+    assert get_warmup_steps() == ["skills", "parser_pool"]
+
+    monkeypatch.setenv("WARMUP_STEPS", "skills,tls")
+    with pytest.raises(ValueError):
+        get_warmup_steps()
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_steps_in_order():
+    fake_llm = SimpleNamespace(backend="fake", client=object())
+    warmup = Warmup(
+        services_factory=lambda: [SimpleNamespace(llm_service=fake_llm), object()],
+        steps=["imports", "tenets", "skills", "prompts", "services", "connections", "parser_pool"],
+        parser_threads=2,
+    )
+
+    assert not warmup.finished
+    await warmup.run()
+
+    assert warmup.finished
+    report = warmup.report()
+    assert [step["name"] for step in report["steps"]] == list(WARMUP_STEPS)
+    assert all(step["ok"] for step in report["steps"])
+    assert report["pending"] == []
+    details = {step["name"]: step["detail"] for step in report["steps"]}
+    assert details["prompts"] == "5 templates"
+    assert details["services"] == "2 services"
+    assert details["connections"] == "no API clients"
+    assert details["parser_pool"] == "2 samples parsed"
+
+
+@pytest.mark.asyncio
+async def test_services_are_created_off_the_event_loop():
+    loop_thread = threading.current_thread()
+    factory_threads = []
+
+    def factory():
+        factory_threads.append(threading.current_thread())
+        return []
+
+    await Warmup(services_factory=factory, steps=["services"]).run()
+
+    assert factory_threads and factory_threads[0] is not loop_thread
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_parses_samples_on_the_parser_threads(monkeypatch):
+    threads = []
+    extract_text = warmup_module.ResumeParser.extract_text
+
+    def recording_extract_text(self, file_path):
+        threads.append(threading.current_thread().name)
+        return extract_text(self, file_path)
+
+    monkeypatch.setattr(warmup_module.ResumeParser, "extract_text", recording_extract_text)
+    warmup = Warmup(steps=["parser_pool"], parser_threads=2)
+
+    await warmup.run()
+
+    assert warmup.results[0].ok
+    assert len(threads) == 2
+    assert all(name.startswith("parser") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_parser_pool_fails_without_sample_resumes(monkeypatch, tmp_path):
+    monkeypatch.setattr(warmup_module, "SAMPLE_RESUMES_DIR", tmp_path)
+    warmup = Warmup(steps=["parser_pool"], parser_threads=1)
+
+    await warmup.run()
+
+    assert not warmup.results[0].ok
+    assert "No sample resumes" in warmup.results[0].detail
+
+
+@pytest.mark.asyncio
+async def test_warmup_connects_each_api_client_once():
+    api_client = MagicMock()
+    llm_service = SimpleNamespace(backend="anthropic", client=api_client)
+    warmup = Warmup(
+        services_factory=lambda: [SimpleNamespace(llm_service=llm_service)] * 3,
+        steps=["services", "connections"],
+        connect_timeout=2,
+    )
+
+    await warmup.run()
+
+    api_client.with_options.assert_called_once_with(timeout=2, max_retries=0)
+    api_client.with_options.return_value.models.list.assert_called_once_with(limit=1)
+    assert warmup.results[1].detail == "1 clients connected"
+
+
+@pytest.mark.asyncio
+async def test_failed_step_is_reported_and_warmup_finishes():
+    def broken_factory():
+        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+
+    warmup = Warmup(services_factory=broken_factory, steps=["services", "parser_pool"], parser_threads=1)
+
+    await warmup.run()
+
+    assert warmup.finished
+    services, parser_pool = warmup.results
+    assert not services.ok
+    assert "ANTHROPIC_API_KEY" in services.detail
+    assert parser_pool.ok
+
+
+def test_ready_before_startup(monkeypatch):
+    monkeypatch.delattr(app.state, "warmup", raising=False)
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_ready_while_warming_up(monkeypatch):
+    warmup = Warmup(steps=["skills", "parser_pool"])
+    monkeypatch.setattr(app.state, "warmup", warmup, raising=False)
+
+    response = client.get("/api/ready")
+
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "warming_up"
+    assert data["warmup"]["pending"] == ["skills", "parser_pool"]
+
+
+def test_ready_after_warmup_on_startup(monkeypatch):
+    monkeypatch.setenv("WARMUP_STEPS", "skills,parser_pool")
+    monkeypatch.setenv("SESSION_TTL_HOURS", "0")
+    monkeypatch.setenv("LOOP_LAG_INTERVAL", "0")
+
+    with TestClient(app) as started:
+        deadline = time.monotonic() + 10
+        response = started.get("/api/ready")
+        while response.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = started.get("/api/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert [step["name"] for step in data["warmup"]["steps"]] == ["skills", "parser_pool"]
+        # Liveness is independent of readiness
+        assert started.get("/api/health").status_code == 200